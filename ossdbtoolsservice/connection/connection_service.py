@@ -24,6 +24,7 @@ from ossdbtoolsservice.connection.contracts import (
 )
 
 from ossdbtoolsservice.hosting import RequestContext, ServiceProvider
+from ossdbtoolsservice.hosting.executors import CONNECTION_POOL
 from ossdbtoolsservice.utils import constants
 from ossdbtoolsservice.utils.cancellation import CancellationToken
 from ossdbtoolsservice.driver import ServerConnection, ConnectionManager
@@ -181,13 +182,9 @@ class ConnectionService:
     # REQUEST HANDLERS #####################################################
     def handle_connect_request(self, request_context: RequestContext, params: ConnectRequestParams) -> None:
         """Kick off a connection in response to an incoming connection request"""
-        thread = threading.Thread(
-            target=self._connect_and_respond,
-            args=(request_context, params)
+        self.owner_to_thread_map[params.owner_uri] = self._service_provider.executors.submit(
+            CONNECTION_POOL, self._connect_and_respond, request_context, params
         )
-        thread.daemon = True
-        thread.start()
-        self.owner_to_thread_map[params.owner_uri] = thread
 
         request_context.send_response(True)
 
@@ -3,6 +3,6 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from ossdbtoolsservice.converters.converters import get_bytes_to_any_converter, get_any_to_bytes_converter
+from ossdbtoolsservice.converters.converters import get_bytes_to_any_converter, get_any_to_bytes_converter, get_struct_format
 
-__all__ = ["get_bytes_to_any_converter", "get_any_to_bytes_converter"]
+__all__ = ["get_bytes_to_any_converter", "get_any_to_bytes_converter", "get_struct_format"]
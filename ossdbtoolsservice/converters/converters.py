@@ -3,13 +3,13 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from typing import Any, Callable  # noqa
+from typing import Any, Callable, Optional  # noqa
 
 import ossdbtoolsservice.utils as utils
 from ossdbtoolsservice.converters.mysql_converters import (
-    MYSQL_DATATYPE_READER_MAP, MYSQL_DATATYPE_WRITER_MAP)
+    MYSQL_DATATYPE_READER_MAP, MYSQL_DATATYPE_STRUCT_FORMAT_MAP, MYSQL_DATATYPE_WRITER_MAP)
 from ossdbtoolsservice.converters.pg_converters import (
-    PG_DATATYPE_READER_MAP, PG_DATATYPE_WRITER_MAP, convert_bytes_to_str,
+    PG_DATATYPE_READER_MAP, PG_DATATYPE_STRUCT_FORMAT_MAP, PG_DATATYPE_WRITER_MAP, convert_bytes_to_str,
     convert_str)
 
 WRITERS = {
@@ -22,6 +22,11 @@ READERS = {
     utils.constants.PG_PROVIDER_NAME: PG_DATATYPE_READER_MAP
 }
 
+STRUCT_FORMATS = {
+    utils.constants.MYSQL_PROVIDER_NAME: MYSQL_DATATYPE_STRUCT_FORMAT_MAP,
+    utils.constants.PG_PROVIDER_NAME: PG_DATATYPE_STRUCT_FORMAT_MAP
+}
+
 
 def get_any_to_bytes_converter(type_value: object, provider: str) -> Callable[[Any], bytearray]:
     writer_map: dict = WRITERS[provider]
@@ -31,3 +36,9 @@ def get_any_to_bytes_converter(type_value: object, provider: str) -> Callable[[A
 def get_bytes_to_any_converter(type_value: str, provider: str) -> Callable[[bytes], Any]:
     reader_map: dict = READERS[provider]
     return reader_map.get(type_value, convert_bytes_to_str)
+
+
+def get_struct_format(type_value: object, provider: str) -> Optional[str]:
+    """ Returns the struct format of the bytes written for the type, or None when they are not fixed width """
+    struct_format_map: dict = STRUCT_FORMATS[provider]
+    return struct_format_map.get(type_value)
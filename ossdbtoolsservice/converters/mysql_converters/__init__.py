@@ -3,7 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from ossdbtoolsservice.converters.mysql_converters.any_to_bytes_converters import MYSQL_DATATYPE_WRITER_MAP
+from ossdbtoolsservice.converters.mysql_converters.any_to_bytes_converters import MYSQL_DATATYPE_STRUCT_FORMAT_MAP, MYSQL_DATATYPE_WRITER_MAP
 from ossdbtoolsservice.converters.mysql_converters.bytes_to_any_converters import MYSQL_DATATYPE_READER_MAP
 
-__all__ = ["MYSQL_DATATYPE_READER_MAP", "MYSQL_DATATYPE_WRITER_MAP"]
+__all__ = ["MYSQL_DATATYPE_READER_MAP", "MYSQL_DATATYPE_STRUCT_FORMAT_MAP", "MYSQL_DATATYPE_WRITER_MAP"]
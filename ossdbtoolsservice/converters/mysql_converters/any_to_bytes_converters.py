@@ -95,3 +95,15 @@ MYSQL_DATATYPE_WRITER_MAP = {
     FIELD_TYPE.GEOMETRY: convert_str,
     FIELD_TYPE.ENUM: convert_str
 }
+
+# struct formats of the types written with a fixed number of bytes, matching the converters above
+MYSQL_DATATYPE_STRUCT_FORMAT_MAP = {
+    FIELD_TYPE.TINY: 'i',
+    FIELD_TYPE.SHORT: 'i',
+    FIELD_TYPE.LONG: 'i',
+    FIELD_TYPE.FLOAT: 'd',
+    FIELD_TYPE.DOUBLE: 'd',
+    FIELD_TYPE.LONGLONG: 'q',
+    FIELD_TYPE.INT24: 'i',
+    FIELD_TYPE.YEAR: 'i'
+}
@@ -25,7 +25,8 @@ def convert_bytes_to_long_long(value) -> int:
 
 
 def convert_bytes_to_str(value) -> str:
-    return value.decode(ENCODING_TYPE)
+    """ Accepts any bytes-like value, so cells can be decoded straight from a memoryview """
+    return str(value, ENCODING_TYPE)
 
 
 def convert_bytes_to_decimal(value) -> str:
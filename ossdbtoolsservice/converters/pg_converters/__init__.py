@@ -3,7 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from ossdbtoolsservice.converters.pg_converters.any_to_bytes_converters import PG_DATATYPE_WRITER_MAP, convert_str
+from ossdbtoolsservice.converters.pg_converters.any_to_bytes_converters import PG_DATATYPE_STRUCT_FORMAT_MAP, PG_DATATYPE_WRITER_MAP, convert_str
 from ossdbtoolsservice.converters.pg_converters.bytes_to_any_converters import PG_DATATYPE_READER_MAP, convert_bytes_to_str
 
-__all__ = ["PG_DATATYPE_READER_MAP", "PG_DATATYPE_WRITER_MAP", "convert_str", "convert_bytes_to_str"]
+__all__ = ["PG_DATATYPE_READER_MAP", "PG_DATATYPE_STRUCT_FORMAT_MAP", "PG_DATATYPE_WRITER_MAP", "convert_str", "convert_bytes_to_str"]
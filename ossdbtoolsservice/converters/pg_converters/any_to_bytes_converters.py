@@ -287,3 +287,14 @@ PG_DATATYPE_WRITER_MAP = {
     datatypes.DATATYPE_REGDICTIONARY_ARRAY: convert_list,
     datatypes.DATATYPE_PG_LSN_ARRAY: convert_list
 }
+
+# struct formats of the types written with a fixed number of bytes, matching the converters above
+PG_DATATYPE_STRUCT_FORMAT_MAP = {
+    datatypes.DATATYPE_BOOL: '?',
+    datatypes.DATATYPE_REAL: 'd',
+    datatypes.DATATYPE_DOUBLE: 'd',
+    datatypes.DATATYPE_SMALLINT: 'h',
+    datatypes.DATATYPE_INTEGER: 'i',
+    datatypes.DATATYPE_BIGINT: 'q',
+    datatypes.DATATYPE_OID: 'i'
+}
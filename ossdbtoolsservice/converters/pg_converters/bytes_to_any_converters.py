@@ -46,7 +46,8 @@ def convert_bytes_to_decimal(value) -> str:
 
 
 def convert_bytes_to_str(value) -> str:
-    return value.decode(DECODING_METHOD)
+    """ Accepts any bytes-like value, so cells can be decoded straight from a memoryview """
+    return str(value, DECODING_METHOD)
 
 
 def convert_bytes_to_date(value) -> str:
@@ -74,12 +75,12 @@ def convert_bytes_to_uuid(value) -> str:
 
 
 def convert_bytes_to_memoryview(value) -> str:
-    return str(value)
+    return str(bytes(value))
 
 
 def convert_bytes_to_dict(value) -> dict:
     """ Decode bytes to str, and convert it to a valid JSON format """
-    value_str = value.decode(DECODING_METHOD)
+    value_str = convert_bytes_to_str(value)
     return json.loads(value_str)
 
 
@@ -0,0 +1,8 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from ossdbtoolsservice.data_import.contracts.import_csv import IMPORT_CSV_REQUEST, ImportCsvParams
+
+__all__ = ['IMPORT_CSV_REQUEST', 'ImportCsvParams']
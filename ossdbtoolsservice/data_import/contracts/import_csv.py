@@ -0,0 +1,30 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Module containing contracts for CSV import operations"""
+
+from typing import List  # noqa
+
+from ossdbtoolsservice.hosting import IncomingMessageConfiguration
+from ossdbtoolsservice.serialization import Serializable
+
+
+class ImportCsvParams(Serializable):
+    """Parameters for a request importing a CSV file into a table"""
+
+    def __init__(self):
+        self.owner_uri: str = None
+        self.file_path: str = None
+        self.schema_name: str = None
+        self.table_name: str = None
+        self.column_names: List[str] = None
+        self.has_headers: bool = None
+        self.delimiter: str = None
+        self.text_identifier: str = None
+        self.null_value: str = None
+        self.encoding: str = None
+
+
+IMPORT_CSV_REQUEST = IncomingMessageConfiguration('import/importCsv', ImportCsvParams)
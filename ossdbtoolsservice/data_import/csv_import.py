@@ -0,0 +1,107 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Module loading CSV files into tables"""
+
+import csv
+import time
+from typing import Callable, List  # noqa
+
+from ossdbtoolsservice.data_import.contracts import ImportCsvParams
+from ossdbtoolsservice.driver import ServerConnection
+from ossdbtoolsservice.query.data_storage.save_as_csv_writer import DEFAULT_DELIMITER, DEFAULT_TEXT_IDENTIFIER
+
+# Number of rows inserted by each INSERT statement, for servers without COPY
+IMPORT_BATCH_SIZE = 1000
+
+# Minimum number of seconds between two progress reports
+PROGRESS_INTERVAL = 1
+
+# Text read as NULL values, unquoted empty fields as in the CSV format of COPY
+DEFAULT_NULL_VALUE = ''
+
+
+class ImportCanceledError(Exception):
+    """Raised by the reader of an imported file once the import is canceled"""
+
+
+class ImportFileReader:
+    """
+    Reads the file being imported for the server or the CSV reader, reporting the share of the file read so far
+    and failing the reads once the import is canceled, which stops the load of the rows wherever it is
+    """
+
+    def __init__(self, file, file_size: int, on_progress: Callable[[int, int], None] = None) -> None:
+        '''
+        :param file: text file opened on the imported file
+        :param on_progress: called with the number of bytes read and the size of the file
+        '''
+        self._file = file
+        self._file_size = file_size
+        self._on_progress = on_progress
+        self._next_update_time = time.monotonic() + PROGRESS_INTERVAL
+        self.is_canceled = False
+
+    def cancel(self) -> None:
+        self.is_canceled = True
+
+    def read(self, size: int = -1) -> str:
+        self._check_progress()
+        return self._file.read(size)
+
+    def readline(self, size: int = -1) -> str:
+        self._check_progress()
+        return self._file.readline(size)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.readline()
+
+        if not line:
+            raise StopIteration
+
+        return line
+
+    def _check_progress(self) -> None:
+        if self.is_canceled:
+            raise ImportCanceledError('The import was canceled')
+
+        if self._on_progress is not None and time.monotonic() >= self._next_update_time:
+            self._next_update_time = time.monotonic() + PROGRESS_INTERVAL
+            self._on_progress(self._file.buffer.tell(), self._file_size)
+
+
+def import_csv(connection: ServerConnection, params: ImportCsvParams, reader: ImportFileReader) -> int:
+    """
+    Loads the rows of a CSV file into a table and returns the number of rows imported. Servers that support it
+    read the file with COPY FROM STDIN, the others get the rows in batches of multi-row INSERT statements in a
+    single transaction, which the caller commits
+    """
+    delimiter = params.delimiter or DEFAULT_DELIMITER
+    text_identifier = params.text_identifier or DEFAULT_TEXT_IDENTIFIER
+    null_value = params.null_value if params.null_value is not None else DEFAULT_NULL_VALUE
+
+    if connection.supports_copy_from:
+        return connection.copy_table_from(
+            params.schema_name, params.table_name, params.column_names, reader, delimiter, text_identifier, null_value, bool(params.has_headers))
+
+    csv_reader = csv.reader(reader, delimiter=delimiter, quotechar=text_identifier)
+
+    if params.has_headers:
+        next(csv_reader, None)
+
+    row_count = 0
+    rows: List[list] = []
+
+    for row in csv_reader:
+        rows.append([None if value == null_value else value for value in row])
+
+        if len(rows) >= IMPORT_BATCH_SIZE:
+            row_count += connection.insert_rows(params.schema_name, params.table_name, params.column_names, rows)
+            rows = []
+
+    return row_count + connection.insert_rows(params.schema_name, params.table_name, params.column_names, rows)
@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Module containing the data import service, loading local files into tables"""
+
+import functools
+import io
+import ntpath
+import os
+import uuid
+
+from ossdbtoolsservice.connection import ConnectionInfo
+from ossdbtoolsservice.connection.contracts import ConnectRequestParams, ConnectionType
+from ossdbtoolsservice.data_import.contracts import IMPORT_CSV_REQUEST, ImportCsvParams
+from ossdbtoolsservice.data_import.csv_import import ImportFileReader, import_csv
+from ossdbtoolsservice.hosting import RequestContext, ServiceProvider
+from ossdbtoolsservice.query.data_storage.save_as_csv_file_stream_factory import DEFAULT_ENCODING
+from ossdbtoolsservice.tasks import Task, TaskResult, TaskStatus
+from ossdbtoolsservice.utils import constants
+
+
+class DataImportService:
+    """Import files into tables"""
+
+    def __init__(self) -> None:
+        self._service_provider: ServiceProvider = None
+
+    def register(self, service_provider: ServiceProvider) -> None:
+        """Register handlers with the service provider"""
+        self._service_provider = service_provider
+
+        # Register the handlers for the service
+        self._service_provider.server.set_request_handler(IMPORT_CSV_REQUEST, self.handle_import_csv_request)
+
+    def handle_import_csv_request(self, request_context: RequestContext, params: ImportCsvParams) -> None:
+        """
+        Respond to import/importCsv requests by starting a task loading the file into the table
+
+        :param request_context: The request context
+        :param params: The ImportCsvParams object for this request
+        """
+        connection_service = self._service_provider[constants.CONNECTION_SERVICE_NAME]
+        connection_info: ConnectionInfo = connection_service.get_connection_info(params.owner_uri)
+        if connection_info is None:
+            request_context.send_error('No connection corresponding to the given owner URI')  # TODO: Localize
+            return
+        provider: str = self._service_provider.provider
+        host = connection_info.details.options['host']
+        database = connection_info.details.options['dbname']
+        file_name = ntpath.basename(params.file_path)
+        task = Task('Import', f'File: {file_name}, Table: {params.table_name}', provider, host, database, request_context,  # TODO: Localize
+                    functools.partial(_perform_import, connection_service, connection_info, params))
+        self._service_provider[constants.TASK_SERVICE_NAME].start_task(task)
+        request_context.send_response({})
+
+
+def _perform_import(connection_service, connection_info: ConnectionInfo, params: ImportCsvParams, task: Task) -> TaskResult:
+    """Load the file into the table on a connection of its own, so that the import doesn't wait for the queries of the editor"""
+    new_owner_uri = str(uuid.uuid4())
+
+    try:
+        connection_service.connect(ConnectRequestParams(connection_info.details, new_owner_uri, ConnectionType.QUERY))
+        connection = connection_service.get_connection(new_owner_uri, ConnectionType.QUERY)
+
+        with io.open(params.file_path, 'r', encoding=params.encoding or DEFAULT_ENCODING, newline='') as file:
+            reader = ImportFileReader(file, os.path.getsize(params.file_path),
+                                      lambda bytes_read, file_size: task.report_progress(_get_progress_message(bytes_read, file_size)))
+
+            with task.cancellation_lock:
+                if task.canceled:
+                    return TaskResult(TaskStatus.CANCELED)
+                task.on_cancel = reader.cancel
+
+            try:
+                row_count = import_csv(connection, params, reader)
+            except Exception:
+                # The driver may wrap the error raised by the reader of a canceled import
+                if reader.is_canceled:
+                    return TaskResult(TaskStatus.CANCELED)
+                raise
+
+        connection.commit()
+        task.report_progress(f'{row_count} rows imported')  # TODO: Localize
+        return TaskResult(TaskStatus.SUCCEEDED)
+
+    except Exception as e:
+        return TaskResult(TaskStatus.FAILED, str(e))
+
+    finally:
+        # Rows inserted without a commit are rolled back with the connection
+        connection_service.disconnect(new_owner_uri, ConnectionType.QUERY)
+
+
+def _get_progress_message(bytes_read: int, file_size: int) -> str:
+    percent = 100 * bytes_read // file_size if file_size else 100
+    return f'{percent}% of the file imported'  # TODO: Localize
@@ -3,7 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from typing import Tuple
+from typing import List, Tuple
 from abc import ABC, abstractmethod
 
 
@@ -163,3 +163,41 @@ class ServerConnection(ABC):
         """
         Closes this current connection.
         """
+
+    @property
+    def supports_copy_to(self) -> bool:
+        """Returns bool indicating if the server can stream the results of a query as CSV with copy_query_to"""
+        return False
+
+    def copy_query_to(self, query: str, stream, delimiter: str, quote: str, null: str, quote_all: bool, include_headers: bool) -> int:
+        """
+        Streams the results of a query as CSV from the server to the stream
+        :param stream: writable file the server output is written to
+        :param null: text written for NULL values
+        :return: the number of rows written
+        """
+        raise NotImplementedError()
+
+    @property
+    def supports_copy_from(self) -> bool:
+        """Returns bool indicating if the server can load CSV into a table with copy_table_from"""
+        return False
+
+    def copy_table_from(self, schema_name: str, table_name: str, column_names: List[str], stream, delimiter: str, quote: str, null: str,
+                        has_headers: bool) -> int:
+        """
+        Streams CSV from the stream to the server, which inserts its rows into the table
+        :param column_names: the columns of the table the fields of the rows go to, or None for all the columns of the table
+        :param stream: readable file the CSV is read from
+        :param null: text read as NULL values
+        :return: the number of rows inserted
+        """
+        raise NotImplementedError()
+
+    def insert_rows(self, schema_name: str, table_name: str, column_names: List[str], rows: List[list]) -> int:
+        """
+        Inserts rows into a table, in the current transaction
+        :param column_names: the columns of the table the values of the rows go to, or None for all the columns of the table
+        :return: the number of rows inserted
+        """
+        raise NotImplementedError()
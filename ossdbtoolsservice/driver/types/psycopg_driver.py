@@ -15,6 +15,10 @@ from ossdbtoolsservice.workspace.contracts import Configuration
 
 PG_CANCELLATION_QUERY = 'SELECT pg_cancel_backend ({})'
 
+PG_COPY_TO_QUERY = 'COPY (\n{}\n) TO STDOUT WITH ({})'
+
+PG_COPY_FROM_QUERY = 'COPY {}{} FROM STDIN WITH ({})'
+
 # Dictionary mapping connection option names to their corresponding PostgreSQL connection string keys.
 # If a name is not present in this map, the name should be used as the key.
 PG_CONNECTION_OPTION_KEY_MAP = {
@@ -268,3 +272,81 @@ class PostgreSQLConnection(ServerConnection):
         Closes this current connection.
         """
         self._conn.close()
+
+    @property
+    def supports_copy_to(self) -> bool:
+        """Returns bool indicating if the server can stream the results of a query as CSV with copy_query_to"""
+        return True
+
+    def copy_query_to(self, query: str, stream, delimiter: str, quote: str, null: str, quote_all: bool, include_headers: bool) -> int:
+        """
+        Streams the results of a query as CSV from the server to the stream with COPY TO STDOUT
+        :param stream: writable file the server output is written to
+        :param null: text written for NULL values
+        :return: the number of rows written
+        """
+        options = [
+            'FORMAT csv',
+            'HEADER {}'.format('true' if include_headers else 'false'),
+            'DELIMITER {}'.format(_quote_copy_option(delimiter)),
+            'QUOTE {}'.format(_quote_copy_option(quote)),
+            'NULL {}'.format(_quote_copy_option(null))
+        ]
+
+        if quote_all:
+            options.append('FORCE_QUOTE *')
+
+        # COPY takes a single statement without its terminator
+        copy_query = PG_COPY_TO_QUERY.format(query.strip().rstrip(';'), ', '.join(options))
+
+        cur: cursor = self._conn.cursor()
+
+        try:
+            cur.copy_expert(copy_query, stream)
+            return cur.rowcount
+        finally:
+            cur.close()
+
+    @property
+    def supports_copy_from(self) -> bool:
+        """Returns bool indicating if the server can load CSV into a table with copy_table_from"""
+        return True
+
+    def copy_table_from(self, schema_name: str, table_name: str, column_names: List[str], stream, delimiter: str, quote: str, null: str,
+                        has_headers: bool) -> int:
+        """
+        Streams CSV from the stream to the server with COPY FROM STDIN, which inserts its rows into the table
+        :param column_names: the columns of the table the fields of the rows go to, or None for all the columns of the table
+        :param stream: readable file the CSV is read from
+        :param null: text read as NULL values
+        :return: the number of rows inserted
+        """
+        options = [
+            'FORMAT csv',
+            'HEADER {}'.format('true' if has_headers else 'false'),
+            'DELIMITER {}'.format(_quote_copy_option(delimiter)),
+            'QUOTE {}'.format(_quote_copy_option(quote)),
+            'NULL {}'.format(_quote_copy_option(null))
+        ]
+
+        table = _quote_identifier(table_name) if not schema_name else '{}.{}'.format(_quote_identifier(schema_name), _quote_identifier(table_name))
+        columns = ' ({})'.format(', '.join(_quote_identifier(name) for name in column_names)) if column_names else ''
+        copy_query = PG_COPY_FROM_QUERY.format(table, columns, ', '.join(options))
+
+        cur: cursor = self._conn.cursor()
+
+        try:
+            cur.copy_expert(copy_query, stream)
+            return cur.rowcount
+        finally:
+            cur.close()
+
+
+def _quote_identifier(name: str) -> str:
+    """Quotes a table or column name"""
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _quote_copy_option(value: str) -> str:
+    """Quotes the value of a COPY option as an escape string literal"""
+    return "E'{}'".format(value.replace('\\', '\\\\').replace("'", "''"))
@@ -44,6 +44,8 @@ GROUP BY
     table_schema;
 """
 
+MYSQL_INSERT_QUERY = 'INSERT INTO {}{} VALUES ({})'
+
 
 class MySQLConnection(ServerConnection):
     """Wrapper for a pymysql connection that makes various properties easier to access"""
@@ -322,3 +324,26 @@ class MySQLConnection(ServerConnection):
         if not self._connection_closed:
             self._conn.close()
             self._connection_closed = True
+
+    def insert_rows(self, schema_name: str, table_name: str, column_names: List[str], rows: List[list]) -> int:
+        """
+        Inserts rows into a table with a multi-row INSERT, in the current transaction
+        :param column_names: the columns of the table the values of the rows go to, or None for all the columns of the table
+        :return: the number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        table = _quote_identifier(table_name) if not schema_name else '{}.{}'.format(_quote_identifier(schema_name), _quote_identifier(table_name))
+        columns = ' ({})'.format(', '.join(_quote_identifier(name) for name in column_names)) if column_names else ''
+        insert_query = MYSQL_INSERT_QUERY.format(table, columns, ', '.join(['%s'] * len(rows[0])))
+
+        # PyMySQL sends the rows of an INSERT ... VALUES as a single multi-row statement
+        self._conn.ping()
+        with self._conn.cursor() as cursor:
+            return cursor.executemany(insert_query, rows)
+
+
+def _quote_identifier(name: str) -> str:
+    """Quotes a table or column name"""
+    return '`{}`'.format(name.replace('`', '``'))
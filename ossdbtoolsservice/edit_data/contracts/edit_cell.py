@@ -5,6 +5,8 @@
 
 
 from ossdbtoolsservice.query.contracts import DbCellValue
+from ossdbtoolsservice.query.contracts.column import serialize_db_cell_value
+from ossdbtoolsservice.utils.serialization import register_serializer
 
 
 class EditCell(DbCellValue):
@@ -12,3 +14,12 @@ class EditCell(DbCellValue):
     def __init__(self, db_cell_value: DbCellValue, is_dirty: bool, row_id: int = None):
         DbCellValue.__init__(self, db_cell_value.display_value, db_cell_value.is_null, db_cell_value.raw_object, row_id)
         self.is_dirty = is_dirty
+
+
+def _serialize_edit_cell(cell: EditCell) -> dict:
+    serialized = serialize_db_cell_value(cell)
+    serialized['isDirty'] = cell.is_dirty
+    return serialized
+
+
+register_serializer(EditCell, _serialize_edit_cell)
@@ -3,7 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from typing import Callable, Dict, List, Optional, Tuple  # noqa
+from typing import Callable, Dict, List, Optional, Tuple, Union  # noqa
 from psycopg2 import sql
 import threading
 
@@ -17,6 +17,7 @@ from ossdbtoolsservice.edit_data import SmoEditTableMetadataFactory, EditTableMe
 from ossdbtoolsservice.query.contracts import DbColumn, ResultSetSubset
 import ossdbtoolsservice.utils as utils
 from ossdbtoolsservice.driver import ServerConnection
+from ossdbtoolsservice.hosting.executors import ExecutorPool, WorkItem, run_in_background
 
 
 class DataEditSessionExecutionState:
@@ -29,12 +30,13 @@ class DataEditSessionExecutionState:
 class DataEditorSession():
     """ This class will hold the logic to maintain the edit session and handle the operations """
 
-    def __init__(self, metadata_factory: SmoEditTableMetadataFactory):
+    def __init__(self, metadata_factory: SmoEditTableMetadataFactory, executor: ExecutorPool = None):
         self._session_cache: Dict[int, RowEdit] = {}
         self._metadata_factory = metadata_factory
         self._last_row_id: int = None
         self._is_initialized = False
-        self._commit_task: threading.Thread = None
+        self._executor = executor
+        self._commit_task: Union[threading.Thread, WorkItem] = None
 
         self._result_set: ResultSet = None
         self.table_metadata: EditTableMetadata = None
@@ -100,14 +102,7 @@ class DataEditorSession():
         if self._commit_task is not None and self._commit_task.is_alive() is True:
             raise ValueError('Previous commit in progress')
 
-        thread = threading.Thread(
-            target=self._do_commit,
-            args=(connection, success, failure)
-        )
-        thread.daemon = True
-        self._commit_task = thread
-
-        thread.start()
+        self._commit_task = run_in_background(self._executor, self._do_commit, connection, success, failure)
 
     def revert_row(self, row_id: int) -> None:
         if not self._is_initialized:
@@ -7,6 +7,7 @@
 from typing import Callable, Dict, List  # noqa
 
 from ossdbtoolsservice.hosting import RequestContext, ServiceProvider
+from ossdbtoolsservice.hosting.executors import EDIT_DATA_POOL
 from ossdbtoolsservice.edit_data.contracts import (
     CREATE_ROW_REQUEST, CreateRowRequest, DELETE_ROW_REQUEST, DeleteRowRequest, DISPOSE_REQUEST, DisposeRequest,
     DisposeResponse, EDIT_COMMIT_REQUEST, EDIT_SUBSET_REQUEST, EditRow, EditRowState, EditCommitRequest, EditCommitResponse, EditSubsetParams,
@@ -54,7 +55,7 @@ class EditDataService(object):
         utils.validate.is_object_params_not_none_or_whitespace('params', params, 'owner_uri', 'schema_name', 'object_name', 'object_type')
 
         connection = self._connection_service.get_connection(params.owner_uri, ConnectionType.QUERY)
-        session = DataEditorSession(SmoEditTableMetadataFactory())
+        session = DataEditorSession(SmoEditTableMetadataFactory(), self._service_provider.executors.get_pool(EDIT_DATA_POOL))
         self._active_sessions[params.owner_uri] = session
 
         if params.query_string is not None:
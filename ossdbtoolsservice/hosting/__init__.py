@@ -9,9 +9,10 @@ from ossdbtoolsservice.hosting.json_rpc_server import (
     IncomingMessageConfiguration,
     RequestContext
 )
+from ossdbtoolsservice.hosting.async_json_rpc_server import AsyncJSONRPCServer
 from ossdbtoolsservice.hosting.service_provider import ServiceProvider
 
 __all__ = [
-    'JSONRPCServer', 'NotificationContext', 'IncomingMessageConfiguration', 'RequestContext',
+    'AsyncJSONRPCServer', 'JSONRPCServer', 'NotificationContext', 'IncomingMessageConfiguration', 'RequestContext',
     'ServiceProvider'
 ]
@@ -0,0 +1,453 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor  # noqa
+import os
+import stat
+import threading
+from typing import Dict, List, Optional  # noqa
+
+from ossdbtoolsservice.hosting.json_message import JSONRPCMessage, JSONRPCMessageType
+from ossdbtoolsservice.hosting.json_reader import JSONRPCReader
+from ossdbtoolsservice.hosting.json_rpc_server import JSONRPCServer, NotificationContext
+from ossdbtoolsservice.hosting.request_dispatcher import RequestDispatcher
+from ossdbtoolsservice.utils.serialization import decode_json
+
+
+class AsyncJSONRPCServer(JSONRPCServer):
+    """
+    Handles requests, notifications and responses on an asyncio event loop run by a thread of its own, reading and
+    writing the streams with asyncio streams. Handlers defined with async def run on the event loop, other handlers
+    run on a pool of worker threads. Messages for the same owner URI are handled in the order they are received.
+    Requests canceled with $/cancelRequest are dropped until their handler starts, async handlers are interrupted
+    """
+    # CONSTANTS ############################################################
+    EVENT_LOOP_THREAD_NAME = u"JSON_RPC_Event_Loop_Thread"
+    INPUT_FEED_THREAD_NAME = u"JSON_RPC_Input_Feed_Thread"
+
+    # Number of bytes read at once from input streams that are not pipes
+    READ_SIZE = 65536
+
+    # Number of seconds the handlers being run when the server stops are given to send their responses
+    STOP_TIMEOUT = 5
+
+    def __init__(self, in_stream, out_stream, logger=None, version='0', max_coalesce_latency=0, max_workers=JSONRPCServer.DEFAULT_MAX_WORKERS):
+        """
+        Initializes internal state of the server and sets up a few useful built-in request handlers
+        :param in_stream: Input stream that will provide messages from the client
+        :param out_stream: Output stream that will send message to the client
+        :param logger: Optional logger
+        :param version: Protocol version. Defaults to 0
+        :param max_coalesce_latency: Number of seconds the output may wait for more messages to send along with the
+        first queued one. Defaults to 0, sending only the messages already queued
+        :param max_workers: Maximum number of handlers that are not async run at once. If 0, they run on the event loop
+        """
+        JSONRPCServer.__init__(self, in_stream, out_stream, logger, version, max_coalesce_latency, max_workers=0)
+
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=RequestDispatcher.WORKER_THREAD_NAME) if max_workers > 0 else None
+
+        # Contexts put their messages from any thread, the output coroutine takes them on the event loop
+        self._output_queue = _EventLoopQueue(self._loop)
+        self._input_task: Optional[asyncio.Task] = None
+
+        # State of the event loop, only used on the event loop thread
+        self._lane_tails: Dict[str, asyncio.Future] = {}
+        self._in_flight_requests: Dict[object, _InFlightRequest] = {}
+
+    # METHODS ##############################################################
+
+    def start(self):
+        """
+        Starts the thread running the event loop, which listens for requests and sends responses over the streams
+        """
+        if self._logger is not None:
+            self._logger.info("JSON RPC server starting...")
+
+        self._loop_thread = threading.Thread(target=self._run_event_loop, name=self.EVENT_LOOP_THREAD_NAME)
+        self._loop_thread.daemon = True
+        self._loop_thread.start()
+
+    def stop(self):
+        """
+        Signal the input coroutine to halt asap. The output coroutine halts once the handlers being run respond
+        """
+        self._stop_requested = True
+        if self._logger is not None:
+            self._logger.info('JSON RPC server stopping...')
+
+        try:
+            self._loop.call_soon_threadsafe(self._cancel_input)
+        except RuntimeError:
+            # The event loop has already been closed
+            pass
+
+    def wait_for_exit(self):
+        """
+        Blocks until the event loop returns, ie, until the server stops.
+        """
+        self._loop_thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._logger is not None:
+            self._logger.info('Event loop has completed')
+
+        self.reader.close()
+        self.writer.close()
+
+    # IMPLEMENTATION DETAILS ###############################################
+
+    def _cancel_request(self, request_id) -> bool:
+        # Answer the request and cancel its token, then stop the task handling it. Called on the event loop
+        is_canceled = JSONRPCServer._cancel_request(self, request_id)
+        in_flight_request = self._in_flight_requests.get(request_id)
+        if in_flight_request is None:
+            return is_canceled
+
+        if in_flight_request.future is None:
+            # The request is waiting for its turn, or handled by an async handler
+            in_flight_request.task.cancel()
+        else:
+            # Canceling the future of a handler that has not started wakes the task up with CancelledError.
+            # A handler that is already running cannot be interrupted, it can check its cancellation token
+            in_flight_request.future.cancel()
+        return True
+
+    def _run_event_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        except Exception as error:
+            self._log_exception(error, self.EVENT_LOOP_THREAD_NAME)
+        finally:
+            self._loop.close()
+
+    async def _serve(self):
+        self._output_queue.open()
+        stream_reader, write_messages, close_streams = await self._open_streams()
+
+        self._input_task = self._loop.create_task(self._consume_input_async(stream_reader))
+        output_task = self._loop.create_task(self._consume_output_async(write_messages))
+        if self._stop_requested:
+            self._input_task.cancel()
+
+        await asyncio.wait([self._input_task])
+
+        # Let the handlers being run send their responses, then stop the output once it has sent them
+        handler_tasks = [task for task in asyncio.all_tasks() if task not in (asyncio.current_task(), output_task)]
+        if handler_tasks:
+            await asyncio.wait(handler_tasks, timeout=self.STOP_TIMEOUT)
+        self._output_queue.queue.put_nowait(None)
+        await asyncio.wait([output_task])
+        close_streams()
+
+        # Drop the handlers that did not complete. Handlers running on worker threads are left to complete
+        pending_tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending_tasks:
+            task.cancel()
+        await asyncio.gather(*pending_tasks, return_exceptions=True)
+
+    async def _open_streams(self):
+        """
+        Connects the streams to the event loop. Streams that are not pipes, such as files, are read by a thread of
+        their own and written on a worker thread
+        :return: The reader of the input, the coroutine function writing messages, and the function closing the pipes
+        """
+        transports = []
+
+        def close_streams():
+            for transport in transports:
+                transport.close()
+
+        stream_reader = asyncio.StreamReader()
+        if _is_pipe(self.reader.stream):
+            read_transport, _ = await self._loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stream_reader), self.reader.stream)
+            transports.append(read_transport)
+        else:
+            feed_thread = threading.Thread(target=self._feed_input, args=(stream_reader,), name=self.INPUT_FEED_THREAD_NAME)
+            feed_thread.daemon = True
+            feed_thread.start()
+
+        if not _is_pipe(self.writer.stream):
+            async def write_to_stream(messages):
+                await self._loop.run_in_executor(None, self.writer.send_messages, messages)
+
+            return stream_reader, write_to_stream, close_streams
+
+        write_transport, protocol = await self._loop.connect_write_pipe(asyncio.streams.FlowControlMixin, self.writer.stream)
+        transports.append(write_transport)
+        stream_writer = asyncio.StreamWriter(write_transport, protocol, None, self._loop)
+
+        async def write_to_pipe(messages):
+            buffer, encoded_messages = self.writer.encode_messages(messages)
+            if buffer:
+                stream_writer.write(buffer)
+                await stream_writer.drain()
+                self.writer.log_sent_messages(encoded_messages)
+
+        return stream_reader, write_to_pipe, close_streams
+
+    def _feed_input(self, stream_reader):
+        """
+        Reads an input stream that cannot be connected to the event loop, handing the bytes to the reader of the loop
+        """
+        try:
+            while True:
+                data = self.reader.stream.read(self.READ_SIZE)
+                if not data:
+                    break
+                self._loop.call_soon_threadsafe(stream_reader.feed_data, data)
+        except Exception as error:
+            self._log_exception(error, self.INPUT_FEED_THREAD_NAME)
+
+        try:
+            self._loop.call_soon_threadsafe(stream_reader.feed_eof)
+        except RuntimeError:
+            # The event loop has already been closed
+            pass
+
+    def _cancel_input(self):
+        if self._input_task is not None:
+            self._input_task.cancel()
+
+    async def _consume_input_async(self, stream_reader):
+        """
+        Listen for messages from the input stream and dispatch them to the registered listeners
+        """
+        if self._logger is not None:
+            self._logger.info('Input coroutine started')
+
+        while not self._stop_requested:
+            try:
+                message = await self._read_message(stream_reader)
+                self._dispatch_message(message)
+
+            except asyncio.CancelledError:
+                raise
+            except EOFError as error:
+                # Halt once we read EOF
+                self._log_exception(error, self.EVENT_LOOP_THREAD_NAME)
+                self.stop()
+                break
+            except (LookupError, ValueError) as error:
+                # LookupError: Content-Length header was not found
+                # ValueError: JSON deserialization failed
+                self._log_exception(error, self.EVENT_LOOP_THREAD_NAME)
+            except Exception as error:
+                # Catch generic exceptions
+                self._log_exception(error, self.EVENT_LOOP_THREAD_NAME)
+
+    async def _read_message(self, stream_reader) -> JSONRPCMessage:
+        """
+        Reads the next JSON RPC message of the input
+        :raises EOFError: The stream ended before a complete message
+        :raises LookupError: The content-length header was not found
+        :raises ValueError: The content-length is invalid or the content is not a JSON object
+        """
+        try:
+            header_bytes = await stream_reader.readuntil(JSONRPCReader.HEADER_DELIMITER)
+        except asyncio.IncompleteReadError as error:
+            raise EOFError('End of stream reached, no output.') from error
+
+        headers = {}
+        for header in header_bytes[:-len(JSONRPCReader.HEADER_DELIMITER)].decode('ascii').split('\n'):
+            name, separator, value = header.partition(':')
+            if separator:
+                headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' not in headers:
+            raise LookupError('Content-Length was not found in headers received.')
+
+        try:
+            content = await stream_reader.readexactly(int(headers['content-length']))
+        except asyncio.IncompleteReadError as error:
+            raise EOFError('End of stream reached, no output.') from error
+
+        return JSONRPCMessage.from_dictionary(decode_json(content, self.reader.encoding))
+
+    async def _consume_output_async(self, write_messages):
+        """
+        Send output over the output stream, coalescing the queued messages into a single write
+        """
+        if self._logger is not None:
+            self._logger.info('Output coroutine started')
+
+        queue = self._output_queue.queue
+        while True:
+            message = await queue.get()
+            if message is not None and self._max_coalesce_latency > 0 and queue.empty():
+                await asyncio.sleep(self._max_coalesce_latency)
+
+            # Take the messages queued after the first one, stopping at None which is queued to stop the server
+            messages = []
+            while message is not None:
+                messages.append(message)
+                if len(messages) >= self.MAX_COALESCED_MESSAGES or queue.empty():
+                    break
+                message = queue.get_nowait()
+
+            try:
+                if messages:
+                    await write_messages(messages)
+            except ValueError as error:
+                # Stream is closed, break out of the loop
+                self._log_exception(error, self.EVENT_LOOP_THREAD_NAME)
+                break
+            except Exception as error:
+                self._log_exception(error, self.EVENT_LOOP_THREAD_NAME)
+
+            if message is None:
+                break
+
+    def _run_handler(self, handler, message, handle):
+        """
+        Calls a handler on the event loop if it is inline, otherwise starts a task calling it in order with the other
+        messages for the same owner URI unless the handler is not ordered
+        """
+        if handler.inline:
+            result = handle()
+            if asyncio.iscoroutine(result):
+                self._loop.create_task(result)
+            return
+
+        key = self._get_dispatch_key(message) if handler.ordered else None
+        request_id = message.message_id if message.message_type is JSONRPCMessageType.Request else None
+        previous_turn = self._lane_tails.get(key) if key is not None else None
+
+        task = self._loop.create_task(self._run_in_turn(handler, handle, previous_turn, request_id))
+        if request_id is not None:
+            self._in_flight_requests[request_id] = _InFlightRequest(task)
+            task.add_done_callback(lambda done_task: self._end_request(message, done_task))
+        if key is not None:
+            # The next message for the owner URI waits for the turn of this one, not for its task
+            turn = self._loop.create_future()
+            self._lane_tails[key] = turn
+            task.add_done_callback(lambda done_task: self._end_turn(key, previous_turn, turn))
+
+    async def _run_in_turn(self, handler, handle, previous_turn, request_id):
+        try:
+            if previous_turn is not None:
+                await asyncio.wait([previous_turn])
+
+            if asyncio.iscoroutinefunction(handler.handler):
+                await handle()
+            elif self._executor is None:
+                handle()
+            else:
+                future = self._executor.submit(handle)
+                if request_id is not None:
+                    self._in_flight_requests[request_id].future = future
+                await asyncio.wrap_future(future)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self._log_exception(error, self.EVENT_LOOP_THREAD_NAME)
+
+    def _end_request(self, message, task):
+        # Canceled requests have been answered by their context when they were canceled
+        in_flight_request = self._in_flight_requests.get(message.message_id)
+        if in_flight_request is not None and in_flight_request.task is task:
+            del self._in_flight_requests[message.message_id]
+
+    def _end_turn(self, key, previous_turn, turn):
+        # A task canceled while it waits for its turn is done before the previous one. Its turn only ends with the
+        # previous turn, so that the messages queued behind it keep waiting
+        if previous_turn is None or previous_turn.done():
+            self._finish_turn(key, turn)
+        else:
+            previous_turn.add_done_callback(lambda done_turn: self._finish_turn(key, turn))
+
+    def _finish_turn(self, key, turn):
+        turn.set_result(None)
+
+        # The lane is removed once its last turn is over
+        if self._lane_tails.get(key) is turn:
+            del self._lane_tails[key]
+
+    def _handle_request(self, handler, request_context, message):
+        if not asyncio.iscoroutinefunction(handler.handler):
+            return JSONRPCServer._handle_request(self, handler, request_context, message)
+        return self._handle_request_async(handler, request_context, message)
+
+    async def _handle_request_async(self, handler, request_context, message):
+        deserialized_object = self._deserialize_params(handler, message)
+        try:
+            await handler.handler(request_context, deserialized_object)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error_message = f'Unhandled exception while handling request method {message.message_method}: "{e}"'  # TODO: Localize
+            if self._logger is not None:
+                self._logger.exception(error_message)
+            request_context.send_error(error_message, code=-32603)
+
+    def _handle_notification(self, handler, message):
+        if not asyncio.iscoroutinefunction(handler.handler):
+            return JSONRPCServer._handle_notification(self, handler, message)
+        return self._handle_notification_async(handler, message)
+
+    async def _handle_notification_async(self, handler, message):
+        notification_context = NotificationContext(self._output_queue)
+        deserialized_object = self._deserialize_params(handler, message)
+        try:
+            await handler.handler(notification_context, deserialized_object)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            error_message = f'Unhandled exception while handling notification method {message.message_method}'
+            if self._logger is not None:
+                self._logger.exception(error_message)
+
+
+def _is_pipe(stream) -> bool:
+    """Returns whether a stream can be connected to the event loop, as pipes, sockets and terminals can"""
+    try:
+        mode = os.fstat(stream.fileno()).st_mode
+    except (AttributeError, OSError, ValueError):
+        return False
+    return stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode)
+
+
+class _InFlightRequest:
+    """Task handling a request, and the future of its handler once it is submitted to a worker thread"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.future: Optional[Future] = None
+
+
+class _EventLoopQueue:
+    """
+    Output queue of the contexts. Messages can be put from any thread, they are handed to an asyncio queue on the
+    event loop. Messages put before the event loop runs are kept until it opens the queue
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._pending: List[JSONRPCMessage] = []
+        self.queue: Optional[asyncio.Queue] = None
+
+    def open(self):
+        """Creates the asyncio queue, must be called on the event loop"""
+        self.queue = asyncio.Queue()
+        for message in self._pending:
+            self.queue.put_nowait(message)
+        self._pending = []
+
+    def put(self, message):
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The event loop has been closed, the server has stopped
+            pass
+
+    def _put(self, message):
+        if self.queue is None:
+            self._pending.append(message)
+        else:
+            self.queue.put_nowait(message)
@@ -0,0 +1,266 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Module containing the pools of worker threads shared by the services"""
+
+from concurrent.futures import Future, wait
+from queue import Queue
+import threading
+from typing import Callable, Dict, List, Optional, Union  # noqa
+
+# Names of the pools, one per class of workload
+CONNECTION_POOL = 'connection'
+QUERY_POOL = 'query'
+SAVE_AS_POOL = 'save_as'
+EDIT_DATA_POOL = 'edit_data'
+METADATA_POOL = 'metadata'
+OBJECT_EXPLORER_POOL = 'object_explorer'
+LANGUAGE_POOL = 'language'
+
+# Maximum number of work items each pool runs at once. Queries and saves can run for long, so their pools are the largest
+DEFAULT_POOL_SIZES: Dict[str, int] = {
+    CONNECTION_POOL: 8,
+    QUERY_POOL: 32,
+    SAVE_AS_POOL: 8,
+    EDIT_DATA_POOL: 4,
+    METADATA_POOL: 4,
+    OBJECT_EXPLORER_POOL: 8,
+    LANGUAGE_POOL: 4
+}
+
+# Size of the pools without a size of their own
+DEFAULT_POOL_SIZE = 4
+
+
+class WorkItem:
+    """
+    Handle of a function submitted to an executor pool. Like a thread, it can be joined and checked for being alive
+    """
+
+    def __init__(self, future: Future):
+        self.future = future
+
+    def join(self, timeout: float = None) -> None:
+        """Blocks until the function returns, or until the timeout elapses"""
+        wait([self.future], timeout)
+
+    def is_alive(self) -> bool:
+        """Returns whether the function is queued or running"""
+        return not self.future.done()
+
+
+class PoolMetrics:
+    """
+    Snapshot of the work of an executor pool
+    Attributes:
+        name:               Name of the pool
+        max_workers:        Maximum number of work items run at once
+        active_count:       Number of work items being run
+        queued_count:       Number of work items waiting for a worker
+        completed_count:    Number of work items run so far, including the failed ones
+        failed_count:       Number of work items that raised an exception
+    """
+
+    def __init__(self, name: str, max_workers: int, active_count: int, queued_count: int, completed_count: int, failed_count: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.active_count = active_count
+        self.queued_count = queued_count
+        self.completed_count = completed_count
+        self.failed_count = failed_count
+
+
+class ExecutorPool:
+    """
+    Bounded pool of worker threads running the functions submitted to it in order. Workers are started as work is
+    submitted, up to the maximum, and are daemon threads so that a long running query does not hold the process on exit
+    """
+
+    def __init__(self, name: str, max_workers: int, logger=None):
+        """
+        Initializes the pool
+        :param name: Name of the pool, given to its threads
+        :param max_workers: Maximum number of work items run at once
+        :param logger: Optional destination for logging
+        """
+        if max_workers <= 0:
+            raise ValueError('Executor pool {0} needs at least one worker'.format(name))
+
+        self.name = name
+        self.max_workers = max_workers
+        self._logger = logger
+
+        self._queue = Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._is_shutdown = False
+
+        self._idle_count = 0
+        self._active_count = 0
+        self._queued_count = 0
+        self._completed_count = 0
+        self._failed_count = 0
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        with self._lock:
+            return PoolMetrics(self.name, self.max_workers, self._active_count, self._queued_count, self._completed_count, self._failed_count)
+
+    def submit(self, function: Callable, *args) -> WorkItem:
+        """
+        Queues a function to run on a worker thread with the given arguments
+        :raises RuntimeError: The pool has been shut down
+        :return: Handle of the work item
+        """
+        future = Future()
+        thread = None
+
+        with self._lock:
+            if self._is_shutdown:
+                raise RuntimeError('Executor pool {0} has been shut down'.format(self.name))
+
+            self._queued_count += 1
+            self._queue.put((future, function, args))
+
+            # Start a worker unless an idle one will take the work item
+            if self._queued_count > self._idle_count and len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, name='{0}_{1}'.format(self.name, len(self._threads)), daemon=True)
+                self._threads.append(thread)
+
+        # The worker takes the lock as it starts, so it is started once the lock is released
+        if thread is not None:
+            thread.start()
+
+        return WorkItem(future)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stops the workers once the queued work items are run. Work cannot be submitted afterwards
+        :param wait: Whether to block until the workers stop
+        """
+        with self._lock:
+            if self._is_shutdown:
+                return
+            self._is_shutdown = True
+            threads = list(self._threads)
+
+        for _ in threads:
+            self._queue.put(None)
+
+        if wait:
+            for thread in threads:
+                # A worker added by a concurrent submit may not have been started yet
+                if thread.ident is not None:
+                    thread.join()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                self._idle_count += 1
+
+            work_item = self._queue.get()
+
+            with self._lock:
+                self._idle_count -= 1
+                if work_item is None:
+                    return
+                self._queued_count -= 1
+                self._active_count += 1
+
+            future, function, args = work_item
+            is_running = future.set_running_or_notify_cancel()
+            result = None
+            exception = None
+
+            if is_running:
+                try:
+                    result = function(*args)
+                except BaseException as error:
+                    exception = error
+                    if self._logger is not None:
+                        self._logger.exception('Executor pool %s encountered exception %s', self.name, error)
+
+            with self._lock:
+                self._active_count -= 1
+                self._completed_count += 1
+                if exception is not None:
+                    self._failed_count += 1
+
+            # The work item is done once it is logged and counted, so that joining it sees the metrics up to date
+            if is_running:
+                if exception is not None:
+                    future.set_exception(exception)
+                else:
+                    future.set_result(result)
+
+
+class Executors:
+    """
+    Named pools of worker threads shared by the services, one per class of workload, created on first use
+    """
+
+    def __init__(self, pool_sizes: Optional[Dict[str, int]] = None, logger=None):
+        """
+        Initializes the executors
+        :param pool_sizes: Maximum number of work items run at once by name of pool, in place of the defaults
+        :param logger: Optional destination for logging
+        """
+        self._pool_sizes = dict(DEFAULT_POOL_SIZES)
+        if pool_sizes is not None:
+            self._pool_sizes.update(pool_sizes)
+
+        self._logger = logger
+        self._pools: Dict[str, ExecutorPool] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> Dict[str, PoolMetrics]:
+        """Returns the metrics of the pools created so far, by name"""
+        with self._lock:
+            pools = list(self._pools.values())
+        return {pool.name: pool.metrics for pool in pools}
+
+    def get_pool(self, name: str) -> ExecutorPool:
+        """Returns the pool with the given name, creating it if needed"""
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = ExecutorPool(name, self._pool_sizes.get(name, DEFAULT_POOL_SIZE), self._logger)
+                self._pools[name] = pool
+            return pool
+
+    def submit(self, pool_name: str, function: Callable, *args) -> WorkItem:
+        """
+        Queues a function to run on a worker thread of the named pool with the given arguments
+        :return: Handle of the work item
+        """
+        return self.get_pool(pool_name).submit(function, *args)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Shuts down all the pools, letting the work items already queued run
+        :param wait: Whether to block until the workers stop
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+
+        for pool in pools:
+            pool.shutdown(wait)
+
+        if self._logger is not None:
+            self._logger.info('Executor pools shut down')
+
+
+def run_in_background(executor: Optional[ExecutorPool], function: Callable, *args) -> Union[threading.Thread, WorkItem]:
+    """
+    Runs a function on a worker of the executor, or in a daemon thread of its own without one, for the classes
+    that can be used apart from a service provider. Both handles can be joined and checked for being alive
+    """
+    if executor is not None:
+        return executor.submit(function, *args)
+
+    thread = threading.Thread(target=function, args=args, daemon=True)
+    thread.start()
+    return thread
@@ -4,9 +4,9 @@
 # --------------------------------------------------------------------------------------------
 
 from enum import Enum
-import json
 
 from ossdbtoolsservice.hosting.json_message import JSONRPCMessage
+from ossdbtoolsservice.utils.serialization import decode_json
 
 
 class JSONRPCReader:
@@ -15,10 +15,11 @@ class JSONRPCReader:
     """
 
     # CONSTANTS ############################################################
-    CR = 13
-    LF = 10
+    HEADER_DELIMITER = b'\r\n\r\n'
     BUFFER_RESIZE_TRIGGER = 0.25
     DEFAULT_BUFFER_SIZE = 8192
+    # Buffers grown larger than this for a large message are not kept once the message is read
+    MAX_RETAINED_BUFFER_SIZE = 1024 * 1024
 
     class ReadState(Enum):
         Header = 1,
@@ -65,9 +66,9 @@ class JSONRPCReader:
         :raises ValueError: if the body-content cannot be serialized to a JSON object
         :return: JsonRpcMessage that was received
         """
-        # Using a mutable list to hold the value since an immutable string passed by reference won't
+        # Using a mutable list to hold the value since an immutable view passed by reference won't
         # change the value
-        content = ['']
+        content = [None]
         try:
             while not self._needs_more_data or self._read_next_chunk():
                 # We should have all the data we need to form a message in the buffer. If we need
@@ -92,14 +93,17 @@ class JSONRPCReader:
             # if self._logger is not None:
             #     self._logger.debug(f'{content[0]}')
 
-            return JSONRPCMessage.from_dictionary(json.loads(content[0]))
+            # The content is decoded straight from the buffer, without copying it first
+            return JSONRPCMessage.from_dictionary(decode_json(content[0], self.encoding))
         except ValueError as ve:
             # Response has invalid json object
             if self._logger is not None:
                 self._logger.warn('JSON RPC reader on read_message() encountered exception: {}'.format(ve))
             raise
         finally:
-            # Remove the bytes that have been read
+            # Release the view of the content so the buffer can be moved, and remove the bytes that have been read
+            if content[0] is not None:
+                content[0].release()
             self._trim_buffer_and_resize(self._read_offset)
 
     # IMPLEMENTATION DETAILS ###############################################
@@ -111,13 +115,17 @@ class JSONRPCReader:
         :raises ValueError: Stream was closed externally
         :return: True on successful read of a message chunk
         """
-        # Check if we need to resize the buffer
+        # Check if we need room in the buffer, making it first by moving the unread bytes to its start
         current_buffer_size = len(self._buffer)
         if (current_buffer_size - self._buffer_end_offset) / current_buffer_size < self.BUFFER_RESIZE_TRIGGER:
-            # Resize the buffer, copy the old contents, and point to the new buffer
-            resized_buffer = bytearray(current_buffer_size * 2)
-            resized_buffer[0:current_buffer_size] = self._buffer
-            self._buffer = resized_buffer
+            self._compact_buffer()
+
+        if (current_buffer_size - self._buffer_end_offset) / current_buffer_size < self.BUFFER_RESIZE_TRIGGER:
+            # Resize the buffer, growing it at once to the size of the expected content when it is larger
+            new_buffer_size = current_buffer_size * 2
+            if self._read_state is self.ReadState.Content:
+                new_buffer_size = max(new_buffer_size, self._read_offset + self._expected_content_length + self.DEFAULT_BUFFER_SIZE)
+            self._buffer.extend(bytes(new_buffer_size - current_buffer_size))
 
         # Memory view is required in order to read into a subset of a byte array
         try:
@@ -146,17 +154,10 @@ class JSONRPCReader:
         :return: True on successful read of headers, False on failure to find headers
         """
         # Scan the buffer up until right before the \r\n\r\n
-        scan_offset = self._read_offset
-        while scan_offset + 3 < self._buffer_end_offset and (
-            self._buffer[scan_offset] != self.CR or
-            self._buffer[scan_offset + 1] != self.LF or
-            self._buffer[scan_offset + 2] != self.CR or
-            self._buffer[scan_offset + 3] != self.LF
-        ):
-            scan_offset += 1
+        scan_offset = self._buffer.find(self.HEADER_DELIMITER, self._read_offset, self._buffer_end_offset)
 
         # If we reached the end of the buffer and haven't found the control sequence, we haven't found the headers
-        if scan_offset + 3 >= self._buffer_end_offset:
+        if scan_offset == -1:
             return False
 
         # Split the headers by newline
@@ -200,7 +201,7 @@ class JSONRPCReader:
     def _try_read_content(self, content):
         """
         Try to read content from internal buffer
-        :param content: Location to store the content
+        :param content: Location to store a view of the content in the buffer, to release once decoded
         :return: True on successful reading of content, False on incomplete read of content (based on content-length)
         """
         # TODO: Take into consideration that the implementation of this protocol should place
@@ -209,8 +210,7 @@ class JSONRPCReader:
             # We buffered less than the expected content length
             return False
 
-        content[0] = self._buffer[self._read_offset:self._read_offset + self._expected_content_length]\
-            .decode(self.encoding)
+        content[0] = memoryview(self._buffer)[self._read_offset:self._read_offset + self._expected_content_length]
         self._read_offset += self._expected_content_length
 
         self._read_state = self.ReadState.Header
@@ -219,26 +219,35 @@ class JSONRPCReader:
 
     def _trim_buffer_and_resize(self, bytes_to_remove):
         """
-        Trim the buffer by the passed in bytes_to_remove by creating a new buffer that is at a minimum the
-        default max size
-        :param bytes_to_remove: Number of bytes to remove from the current buffer
+        Trim the buffer by the passed in bytes_to_remove. The remaining bytes are left in place until room is needed
+        to read more, and a buffer grown past the maximum retained size is replaced by one of the default size
+        :param bytes_to_remove: Offset of the buffer up to which bytes are removed
         """
-        current_buffer_size = len(self._buffer)
+        self._read_offset = bytes_to_remove
 
-        # Create a new buffer with either minimum size of leftover size
-        new_buffer = bytearray(max(current_buffer_size - bytes_to_remove, self.DEFAULT_BUFFER_SIZE))
+        if self._read_offset >= self._buffer_end_offset:
+            # Everything was read, the buffer is reused from its start
+            self._read_offset = 0
+            self._buffer_end_offset = 0
 
-        # If we have content we did not read, copy that portion to the new buffer
-        if bytes_to_remove <= current_buffer_size:
-            new_buffer[:self._buffer_end_offset - bytes_to_remove] = \
-                self._buffer[bytes_to_remove:self._buffer_end_offset]
-
-        # Point to the new buffer
-        self._buffer = new_buffer
-
-        # Reset pointers after the shift
-        self._read_offset = 0
-        self._buffer_end_offset -= bytes_to_remove
+        if len(self._buffer) > self.MAX_RETAINED_BUFFER_SIZE and self._buffer_end_offset - self._read_offset <= self.DEFAULT_BUFFER_SIZE:
+            new_buffer = bytearray(self.DEFAULT_BUFFER_SIZE)
+            new_buffer[:self._buffer_end_offset - self._read_offset] = self._buffer[self._read_offset:self._buffer_end_offset]
+            self._buffer = new_buffer
+            self._buffer_end_offset -= self._read_offset
+            self._read_offset = 0
 
         # Reset the headers
         self._headers = {}
+
+    def _compact_buffer(self):
+        """
+        Move the bytes that have not been read to the start of the buffer, in place
+        """
+        if self._read_offset == 0:
+            return
+
+        unread_length = self._buffer_end_offset - self._read_offset
+        self._buffer[:unread_length] = self._buffer[self._read_offset:self._buffer_end_offset]
+        self._read_offset = 0
+        self._buffer_end_offset = unread_length
@@ -3,13 +3,24 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from queue import Queue
+from queue import Empty, Queue
 import threading
+import time
 import uuid
+import weakref
+
 
 from ossdbtoolsservice.hosting.json_message import JSONRPCMessage, JSONRPCMessageType
 from ossdbtoolsservice.hosting.json_reader import JSONRPCReader
 from ossdbtoolsservice.hosting.json_writer import JSONRPCWriter
+from ossdbtoolsservice.hosting.request_dispatcher import DispatchMetrics, RequestDispatcher
+from ossdbtoolsservice.utils.cancellation import CancellationToken
+
+# Method of the notification the client sends to cancel one of its requests
+CANCEL_REQUEST_METHOD = '$/cancelRequest'
+
+# Error code of the response to a request that was canceled before it was handled
+REQUEST_CANCELLED_ERROR_CODE = -32800
 
 
 class JSONRPCServer:
@@ -20,26 +31,41 @@ class JSONRPCServer:
     OUTPUT_THREAD_NAME = u"JSON_RPC_Output_Thread"
     INPUT_THREAD_NAME = u"JSON_RPC_Input_Thread"
 
+    # Maximum number of queued messages sent with a single write of the output stream
+    MAX_COALESCED_MESSAGES = 1000
+
+    # Default number of worker threads running the handlers of incoming messages
+    DEFAULT_MAX_WORKERS = 8
+
     class Handler:
-        def __init__(self, class_, handler):
+        def __init__(self, class_, handler, inline=False, ordered=True):
             self.class_ = class_
             self.handler = handler
+            self.inline = inline
+            self.ordered = ordered
 
-    def __init__(self, in_stream, out_stream, logger=None, version='0'):
+    def __init__(self, in_stream, out_stream, logger=None, version='0', max_coalesce_latency=0, max_workers=DEFAULT_MAX_WORKERS):
         """
         Initializes internal state of the server and sets up a few useful built-in request handlers
         :param in_stream: Input stream that will provide messages from the client
         :param out_stream: Output stream that will send message to the client
         :param logger: Optional logger
         :param version: Protocol version. Defaults to 0
+        :param max_coalesce_latency: Number of seconds the output thread may wait for more messages to send along
+        with the first queued one. Defaults to 0, sending only the messages already queued
+        :param max_workers: Maximum number of handlers of incoming messages run at once. Messages for the same owner
+        URI are handled in the order they are received. If 0, messages are handled on the input thread
         """
         self.writer = JSONRPCWriter(out_stream, logger=logger)
         self.reader = JSONRPCReader(in_stream, logger=logger)
         self._logger = logger
         self._version = version
         self._stop_requested = False
+        self._max_coalesce_latency = max_coalesce_latency
 
         self._output_queue = Queue()
+        self._cancellation_registry = CancellationRegistry()
+        self._dispatcher = RequestDispatcher(max_workers, logger) if max_workers > 0 else None
 
         self._request_handlers = {}
         self._notification_handlers = {}
@@ -48,20 +74,24 @@ class JSONRPCServer:
         self._output_consumer = None
         self._input_consumer = None
 
-        # Register built-in handlers
+        # Register built-in handlers, which are fast enough to be handled on the input thread
         # 1) Echo
         echo_config = IncomingMessageConfiguration('echo', None)
-        self.set_request_handler(echo_config, self._handle_echo_request)
+        self.set_request_handler(echo_config, self._handle_echo_request, inline=True)
 
         # 2) Protocol version
         version_config = IncomingMessageConfiguration('version', None)
-        self.set_request_handler(version_config, self._handle_version_request)
+        self.set_request_handler(version_config, self._handle_version_request, inline=True)
 
         # 3) Shutdown/exit
         shutdown_config = IncomingMessageConfiguration('shutdown', None)
-        self.set_request_handler(shutdown_config, self._handle_shutdown_request)
+        self.set_request_handler(shutdown_config, self._handle_shutdown_request, inline=True)
         exit_config = IncomingMessageConfiguration('exit', None)
-        self.set_request_handler(exit_config, self._handle_shutdown_request)
+        self.set_request_handler(exit_config, self._handle_shutdown_request, inline=True)
+
+        # 4) Cancellation of requests, handled ahead of the queued requests it may cancel
+        cancel_config = IncomingMessageConfiguration(CANCEL_REQUEST_METHOD, None)
+        self.set_notification_handler(cancel_config, self._handle_cancel_request, inline=True)
 
     # METHODS ##############################################################
 
@@ -72,6 +102,13 @@ class JSONRPCServer:
         """
         self._shutdown_handlers.append(handler)
 
+    @property
+    def dispatch_metrics(self) -> DispatchMetrics:
+        """
+        Returns the queue depths of the handlers of incoming messages, or None if they are handled on the input thread
+        """
+        return self._dispatcher.metrics if self._dispatcher is not None else None
+
     def count_shutdown_handlers(self) -> int:
         """
         Returns the number of shutdown handlers registered
@@ -140,27 +177,34 @@ class JSONRPCServer:
         # Add the message to the output queue
         self._output_queue.put(message)
 
-    def set_request_handler(self, config, handler):
+    def set_request_handler(self, config, handler, inline=False, ordered=True):
         """
         Sets the handler for a request with a given configuration
         :param config: Configuration of the request to listen for
         :param handler: Handler to call when the server receives a request that matches the config
+        :param inline: Whether the handler is called on the input thread, ahead of the queued requests. Meant for
+        handlers that only do in-process bookkeeping, such as $/cancelRequest
+        :param ordered: Whether the handler waits for the queued messages for the same owner URI. Handlers that are
+        not ordered are still called on a worker thread, such as the cancellation of a running query
         """
-        self._request_handlers[config.method] = self.Handler(config.parameter_class, handler)
+        self._request_handlers[config.method] = self.Handler(config.parameter_class, handler, inline, ordered)
 
-    def set_notification_handler(self, config, handler):
+    def set_notification_handler(self, config, handler, inline=False):
         """
         Sets the handler for a notification with a given configuration
         :param config: Configuration of the notification to listen for
         :param handler: Handler to call when the server receives a notification that matches the config
+        :param inline: Whether the handler is called on the input thread, ahead of the queued messages
         """
-        self._notification_handlers[config.method] = self.Handler(config.parameter_class, handler)
+        self._notification_handlers[config.method] = self.Handler(config.parameter_class, handler, inline)
 
     def wait_for_exit(self):
         """
         Blocks until both input and output threads return, ie, until the server stops.
         """
         self._input_consumer.join()
+        if self._dispatcher is not None:
+            self._dispatcher.shutdown(wait=False)
         self._output_consumer.join()
         if self._logger is not None:
             self._logger.info('Input and output threads have completed')
@@ -191,6 +235,10 @@ class JSONRPCServer:
 
         self.stop()
 
+    def _handle_cancel_request(self, notification_context, params):
+        request_id = params.get('id') if isinstance(params, dict) else None
+        self._cancel_request(request_id)
+
     # IMPLEMENTATION DETAILS ###############################################
 
     def _consume_input(self):
@@ -225,7 +273,7 @@ class JSONRPCServer:
 
     def _consume_output(self):
         """
-        Send output over the output stream
+        Send output over the output stream, coalescing the queued messages into a single write
         """
         if self._logger is not None:
             self._logger.info('Output thread started')
@@ -233,11 +281,9 @@ class JSONRPCServer:
         while not self._stop_requested:
             try:
                 # Block until queue contains a message to send
-                message = self._output_queue.get()
-                if message is not None:
-                    # It is necessary to check for None here b/c unblock the queue get by adding
-                    # None when we want to stop the service
-                    self.writer.send_message(message)
+                messages = self._get_output_messages()
+                if messages:
+                    self.writer.send_messages(messages)
 
             except ValueError as error:
                 # Stream is closed, break out of the loop
@@ -247,6 +293,30 @@ class JSONRPCServer:
                 # Catch generic exceptions without breaking out of loop
                 self._log_exception(error, self.OUTPUT_THREAD_NAME)
 
+    def _get_output_messages(self):
+        """
+        Blocks until a message is queued, then takes it along with the messages queued after it, in order. Messages
+        are taken until the queue is empty once the coalesce latency has elapsed, or the maximum count is reached
+        """
+        messages = []
+        message = self._output_queue.get()
+        deadline = time.monotonic() + self._max_coalesce_latency
+
+        # It is necessary to check for None here b/c unblock the queue get by adding
+        # None when we want to stop the service
+        while message is not None:
+            messages.append(message)
+            if len(messages) >= self.MAX_COALESCED_MESSAGES:
+                break
+
+            try:
+                timeout = deadline - time.monotonic()
+                message = self._output_queue.get(timeout=timeout) if timeout > 0 else self._output_queue.get_nowait()
+            except Empty:
+                break
+
+        return messages
+
     def _dispatch_message(self, message):
         """
         Dispatches a message that was received to the necessary handler
@@ -263,6 +333,7 @@ class JSONRPCServer:
                 self._logger.info('Received request id=%s method=%s', message.message_id, message.message_method)
             handler = self._request_handlers.get(message.message_method)
             request_context = RequestContext(message, self._output_queue)
+            self._cancellation_registry.add(request_context)
 
             # Make sure we got a handler for the request
             if handler is None:
@@ -272,20 +343,7 @@ class JSONRPCServer:
                     self._logger.warn('Requested method is unsupported: %s', message.message_method)
                 return
 
-            # Call the handler with a request context and the deserialized parameter object
-            if handler.class_ is None:
-                # Don't attempt to do complex deserialization
-                deserialized_object = message.message_params
-            else:
-                # Use the complex deserializer
-                deserialized_object = handler.class_.from_dict(message.message_params)
-            try:
-                handler.handler(request_context, deserialized_object)
-            except Exception as e:
-                error_message = f'Unhandled exception while handling request method {message.message_method}: "{e}"'  # TODO: Localize
-                if self._logger is not None:
-                    self._logger.exception(error_message)
-                request_context.send_error(error_message, code=-32603)
+            self._run_handler(handler, message, lambda: self._handle_request(handler, request_context, message))
         elif message.message_type is JSONRPCMessageType.Notification:
             if self._logger is not None:
                 self._logger.info('Received notification method=%s', message.message_method)
@@ -297,27 +355,90 @@ class JSONRPCServer:
                     self._logger.warn('Notification method %s is unsupported', message.message_method)
                 return
 
-            # Call the handler with a notification context
-            notification_context = NotificationContext(self._output_queue)
-            deserialized_object = None
-            if handler.class_ is None:
-                # Don't attempt to do complex deserialization
-                deserialized_object = message.message_params
-            else:
-                # Use the complex deserializer
-                deserialized_object = handler.class_.from_dict(message.message_params)
-            try:
-                handler.handler(notification_context, deserialized_object)
-            except Exception:
-                error_message = f'Unhandled exception while handling notification method {message.message_method}'
-                if self._logger is not None:
-                    self._logger.exception(error_message)
+            self._run_handler(handler, message, lambda: self._handle_notification(handler, message))
         else:
             # If this happens we have a serious issue with the JSON RPC reader
             if self._logger is not None:
                 self._logger.warn('Received unsupported message type %s', message.message_type)
             return
 
+    def _run_handler(self, handler, message, handle):
+        """
+        Calls a handler on the input thread if it is inline, otherwise queues it for a worker thread, in order
+        with the other messages for the same owner URI unless the handler is not ordered
+        """
+        if handler.inline or self._dispatcher is None:
+            handle()
+        else:
+            self._dispatcher.dispatch(handle, self._get_dispatch_key(message) if handler.ordered else None)
+
+    def _cancel_request(self, request_id) -> bool:
+        """
+        Cancels a request that has not been answered yet, or whose handler is still working for it
+        :return: Whether the request was found
+        """
+        if not self._cancellation_registry.cancel(request_id):
+            # The request has already been handled
+            return False
+
+        if self._logger is not None:
+            self._logger.info('Canceled request id=%s', request_id)
+        return True
+
+    def _handle_request(self, handler, request_context, message):
+        if request_context.cancellation_token.canceled:
+            # The request was canceled while it was queued, it has been answered already
+            if self._logger is not None:
+                self._logger.info('Skipping canceled request id=%s method=%s', message.message_id, message.message_method)
+            return
+
+        # Call the handler with a request context and the deserialized parameter object
+        deserialized_object = self._deserialize_params(handler, message)
+        try:
+            handler.handler(request_context, deserialized_object)
+        except Exception as e:
+            error_message = f'Unhandled exception while handling request method {message.message_method}: "{e}"'  # TODO: Localize
+            if self._logger is not None:
+                self._logger.exception(error_message)
+            request_context.send_error(error_message, code=-32603)
+
+    def _handle_notification(self, handler, message):
+        # Call the handler with a notification context
+        notification_context = NotificationContext(self._output_queue)
+        deserialized_object = self._deserialize_params(handler, message)
+        try:
+            handler.handler(notification_context, deserialized_object)
+        except Exception:
+            error_message = f'Unhandled exception while handling notification method {message.message_method}'
+            if self._logger is not None:
+                self._logger.exception(error_message)
+
+    @staticmethod
+    def _deserialize_params(handler, message):
+        """
+        Returns the params of a message as an instance of the parameter class of its handler
+        """
+        if handler.class_ is None:
+            # Don't attempt to do complex deserialization
+            return message.message_params
+
+        # Use the complex deserializer
+        return handler.class_.from_dict(message.message_params)
+
+    @staticmethod
+    def _get_dispatch_key(message):
+        """
+        Returns the owner URI of a message, taken from the ownerUri or the text document of its params, or None
+        """
+        params = message.message_params
+        if not isinstance(params, dict):
+            return None
+
+        owner_uri = params.get('ownerUri')
+        if owner_uri is None and isinstance(params.get('textDocument'), dict):
+            owner_uri = params['textDocument'].get('uri')
+        return owner_uri
+
     def _log_exception(self, ex, thread_name):
         """
         Logs an exception if the logger is defined
@@ -341,6 +462,44 @@ class IncomingMessageConfiguration:
         self.parameter_class = parameter_class
 
 
+class CancellationRegistry:
+    """
+    Contexts of the requests that can be canceled, by request id. Contexts are weakly referenced, so a request can be
+    canceled for as long as its handler, or the work it started, holds on to its context
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._request_contexts = weakref.WeakValueDictionary()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._request_contexts)
+
+    def add(self, request_context: 'RequestContext') -> None:
+        """
+        Registers the context of a request received from the client
+        :param request_context: Context of the request, keyed by the id of its message
+        """
+        with self._lock:
+            self._request_contexts[request_context._message.message_id] = request_context
+
+    def cancel(self, request_id) -> bool:
+        """
+        Cancels the request with the given id
+        :param request_id: Id of the request the client canceled
+        :return: Whether a request with the id was found
+        """
+        with self._lock:
+            request_context = self._request_contexts.pop(request_id, None)
+
+        if request_context is None:
+            return False
+
+        request_context.cancel()
+        return True
+
+
 class RequestContext:
     """
     Context for a received message
@@ -354,6 +513,28 @@ class RequestContext:
         """
         self._message = message
         self._queue = queue
+        self._cancellation_token = CancellationToken()
+        self._lock = threading.Lock()
+        self._is_answered = False
+
+    @property
+    def cancellation_token(self) -> CancellationToken:
+        """Token canceled when the client cancels the request, checked by handlers to drop the work for it early"""
+        return self._cancellation_token
+
+    def cancel(self):
+        """
+        Cancels the request. It is answered with a request canceled error unless it has been answered already, and
+        responses sent for it afterwards are dropped
+        """
+        with self._lock:
+            self._cancellation_token.cancel()
+            if self._is_answered:
+                return
+            self._is_answered = True
+
+        message = JSONRPCMessage.create_error(self._message.message_id, REQUEST_CANCELLED_ERROR_CODE, 'Request was canceled', None)  # TODO: Localize
+        self._queue.put(message)
 
     def send_response(self, params):
         """
@@ -361,7 +542,7 @@ class RequestContext:
         :param params: Data to send back with the response
         """
         message = JSONRPCMessage.create_response(self._message.message_id, params)
-        self._queue.put(message)
+        self._send_answer(message)
 
     def send_notification(self, method, params):
         """
@@ -381,12 +562,21 @@ class RequestContext:
         """
 
         message = JSONRPCMessage.create_error(self._message.message_id, code, message, data)
-        self._queue.put(message)
+        self._send_answer(message)
 
     def send_unhandled_error_response(self, ex: Exception):
         """Send response for any unhandled exceptions"""
         self.send_error('Unhandled exception: {}'.format(str(ex)))  # TODO: Localize
 
+    def _send_answer(self, message):
+        with self._lock:
+            if self._cancellation_token.canceled:
+                # The request was answered when it was canceled
+                return
+            self._is_answered = True
+
+        self._queue.put(message)
+
 
 class NotificationContext:
     """
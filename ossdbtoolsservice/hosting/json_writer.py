@@ -3,8 +3,11 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import codecs
 import json
 
+from ossdbtoolsservice.utils.serialization import encode_json
+
 
 class JSONRPCWriter:
     """
@@ -22,6 +25,7 @@ class JSONRPCWriter:
         """
         self.stream = stream
         self.encoding = encoding or 'UTF-8'
+        self._is_utf8 = codecs.lookup(self.encoding).name == 'utf-8'
         self._logger = logger
 
     # METHODS ##############################################################
@@ -40,21 +44,71 @@ class JSONRPCWriter:
         Sends JSON RPC message as defined by message object
         :param message: Message to send
         """
-        # Generate the message string and header string
-        json_content = json.dumps(message.dictionary, sort_keys=True)
-        header = self.HEADER.format(str(len(json_content)))
+        self.send_messages([message])
+
+    def send_messages(self, messages):
+        """
+        Sends JSON RPC messages in order with a single write of the stream, which spares a system call per message
+        on unbuffered streams. Messages that cannot be encoded are logged and skipped
+        :param messages: Messages to send
+        """
+        buffer, sent_messages = self.encode_messages(messages)
+        if not buffer:
+            return
 
-        # Write the message to the stream
-        self.stream.write(header.encode(u"ascii"))
-        self.stream.write(json_content.encode(self.encoding))
+        # Write the messages to the stream, raw streams may write only part of the buffer at once
+        view = memoryview(buffer)
+        while view:
+            view = view[self.stream.write(view):]
         self.stream.flush()
 
+        self.log_sent_messages(sent_messages)
+
+    def encode_messages(self, messages):
+        """
+        Encodes JSON RPC messages with their headers into a single buffer. Messages that cannot be encoded are logged and skipped
+        :param messages: Messages to encode
+        :return: The buffer, and the messages it holds
+        """
+        buffer = bytearray()
+        encoded_messages = []
+
+        for message in messages:
+            try:
+                buffer += self.encode_message(message)
+                encoded_messages.append(message)
+            except (TypeError, ValueError) as e:
+                if self._logger is not None:
+                    self._logger.exception(f'Failed to encode {message.message_type.name} message id={message.message_id} '
+                                           f'method={message.message_method}: {e}')
+
+        return buffer, encoded_messages
+
+    def log_sent_messages(self, messages):
+        """
+        Logs the messages that have been sent
+        :param messages: Messages that were sent
+        """
         if self._logger is not None:
-            self._logger.info("{} message sent id={} method={}".format(
-                message.message_type.name,
-                message.message_id,
-                message.message_method
-            ))
-
-            # Uncomment for verbose logging
-            # self._logger.debug(f'{json_content}')
+            for message in messages:
+                self._logger.info("{} message sent id={} method={}".format(
+                    message.message_type.name,
+                    message.message_id,
+                    message.message_method
+                ))
+
+    def encode_message(self, message) -> bytes:
+        """
+        Encodes a JSON RPC message with its header
+        :param message: Message to encode
+        """
+        if self._is_utf8:
+            json_content = encode_json(message.dictionary)
+        else:
+            json_content = json.dumps(message.dictionary).encode(self.encoding)
+        header = self.HEADER.format(str(len(json_content)))
+
+        # Uncomment for verbose logging
+        # self._logger.debug(f'{json_content}')
+
+        return header.encode(u"ascii") + json_content
@@ -0,0 +1,132 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Callable, Deque, Dict  # noqa
+
+
+class DispatchMetrics:
+    """
+    Snapshot of the work of a request dispatcher
+    Attributes:
+        queued_count:       Number of work items waiting for a worker or for the items of their key before them
+        running_count:      Number of work items being run
+        completed_count:    Number of work items run so far
+        max_queued_count:   Highest number of work items waiting at once
+        queued_by_key:      Number of work items waiting behind a running one, by key
+    """
+
+    def __init__(self, queued_count: int, running_count: int, completed_count: int, max_queued_count: int, queued_by_key: Dict[str, int]):
+        self.queued_count = queued_count
+        self.running_count = running_count
+        self.completed_count = completed_count
+        self.max_queued_count = max_queued_count
+        self.queued_by_key = queued_by_key
+
+
+class RequestDispatcher:
+    """
+    Runs the handlers of incoming messages on a bounded pool of worker threads. Work items dispatched with the
+    same key, such as the owner URI of the messages, run one at a time in the order they were dispatched. Work
+    items without a key run as soon as a worker is free
+    """
+
+    WORKER_THREAD_NAME = u"JSON_RPC_Worker"
+
+    def __init__(self, max_workers: int, logger=None):
+        """
+        Initializes the dispatcher
+        :param max_workers: Maximum number of work items run at once
+        :param logger: Optional destination for logging
+        """
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=self.WORKER_THREAD_NAME)
+        self._logger = logger
+
+        # Work items waiting behind the running one of their key. A key has a lane while one of its items is queued or running
+        self._lanes: Dict[str, Deque[Callable[[], None]]] = {}
+
+        self._queued_count = 0
+        self._running_count = 0
+        self._completed_count = 0
+        self._max_queued_count = 0
+        self._idle = threading.Condition()
+
+    @property
+    def metrics(self) -> DispatchMetrics:
+        with self._idle:
+            return DispatchMetrics(
+                self._queued_count,
+                self._running_count,
+                self._completed_count,
+                self._max_queued_count,
+                {key: len(lane) for key, lane in self._lanes.items() if lane}
+            )
+
+    def dispatch(self, work: Callable[[], None], key: str = None) -> None:
+        """
+        Queues a work item to run on a worker thread
+        :param work: Function to call without arguments
+        :param key: Optional key of the work items to run in order
+        """
+        with self._idle:
+            self._queued_count += 1
+            self._max_queued_count = max(self._max_queued_count, self._queued_count)
+
+            if key is not None:
+                lane = self._lanes.get(key)
+                if lane is not None:
+                    # An item of the key is queued or running, this one runs after it
+                    lane.append(work)
+                    return
+                self._lanes[key] = deque()
+
+        self._executor.submit(self._run, work, key)
+
+    def wait_for_idle(self, timeout: float = None) -> bool:
+        """
+        Blocks until no work item is queued or running, returning whether it happened within the timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._queued_count == 0 and self._running_count == 0, timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the worker threads once the work items are run
+        :param wait: Whether to block until the queued work items are run
+        """
+        if wait:
+            self.wait_for_idle()
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, work: Callable[[], None], key: str) -> None:
+        with self._idle:
+            self._queued_count -= 1
+            self._running_count += 1
+
+        try:
+            work()
+        except Exception as error:
+            if self._logger is not None:
+                self._logger.exception('Thread %s encountered exception %s', threading.current_thread().name, error)
+        finally:
+            next_work = None
+            with self._idle:
+                self._running_count -= 1
+                self._completed_count += 1
+
+                if key is not None:
+                    lane = self._lanes[key]
+                    if lane:
+                        next_work = lane.popleft()
+                    else:
+                        del self._lanes[key]
+
+                self._idle.notify_all()
+
+            # The next item of the key keeps the lane, it runs on a worker of its own so other keys get their turn
+            if next_work is not None:
+                self._executor.submit(self._run, next_work, key)
@@ -7,6 +7,7 @@ from logging import Logger
 from typing import Optional
 
 from ossdbtoolsservice.hosting import JSONRPCServer
+from ossdbtoolsservice.hosting.executors import Executors
 
 
 class ServiceProvider:
@@ -15,6 +16,7 @@ class ServiceProvider:
         self._logger = logger
         self._server = json_rpc_server
         self._provider_name = provider
+        self._executors = Executors(logger=logger)
         self._services = {service_name: service_class() for (service_name, service_class) in services.items()}
 
     # PROPERTIES ###########################################################
@@ -31,6 +33,11 @@ class ServiceProvider:
     def provider(self) -> str:
         return self._provider_name
 
+    @property
+    def executors(self) -> Executors:
+        """Pools of worker threads the services run their background work on"""
+        return self._executors
+
     def __getitem__(self, item: str):
         """
         If the service exists, it is returned by its lookup key
@@ -57,5 +64,9 @@ class ServiceProvider:
         # other up. This is important since services can register callbacks with each other
         self._is_initialized = True
 
+        # Let the work queued by the services finish when the server shuts down, without accepting more
+        if self._server is not None:
+            self._server.add_shutdown_handler(self._executors.shutdown)
+
         for service_key in self._services:
             self._services[service_key].register(self)
@@ -22,6 +22,7 @@ from ossdbtoolsservice.connection.contracts import ConnectionType
 from ossdbtoolsservice.hosting import (JSONRPCServer,  # noqa
                                        NotificationContext, RequestContext,
                                        ServiceProvider)
+from ossdbtoolsservice.hosting.executors import LANGUAGE_POOL, WorkItem
 from ossdbtoolsservice.language.contracts import (
     COMPLETION_REQUEST, COMPLETION_RESOLVE_REQUEST, DEFINITION_REQUEST,
     DOCUMENT_FORMATTING_REQUEST, DOCUMENT_RANGE_FORMATTING_REQUEST,
@@ -130,7 +131,8 @@ class LanguageService:
         operation = QueuedOperation(script_parse_info.connection_key,
                                     functools.partial(self.send_definition_using_connected_completions, request_context, script_parse_info,
                                                       text_document_position),
-                                    functools.partial(do_send_default_empty_response))
+                                    functools.partial(do_send_default_empty_response),
+                                    request_context.cancellation_token)
         self.operations_queue.add_operation(operation)
         request_context.send_notification(STATUS_CHANGE_NOTIFICATION, StatusChangeParams(owner_uri=text_document_position.text_document.uri,
                                                                                          status="DefinitionRequestCompleted"))
@@ -163,7 +165,8 @@ class LanguageService:
             script_parse_info.document = Document(text, cursor_position)
             operation = QueuedOperation(script_parse_info.connection_key,
                                         functools.partial(self.send_connected_completions, request_context, script_parse_info, params),
-                                        functools.partial(self._send_default_completions, request_context, script_file, params))
+                                        functools.partial(self._send_default_completions, request_context, script_file, params),
+                                        request_context.cancellation_token)
             self.operations_queue.add_operation(operation)
 
     def handle_completion_resolve_request(self, request_context: RequestContext, params: CompletionItem) -> None:
@@ -242,9 +245,9 @@ class LanguageService:
         do_send_default_empty_response()
 
     # SERVICE NOTIFICATION HANDLERS #####################################################
-    def on_connect(self, conn_info: ConnectionInfo) -> threading.Thread:
+    def on_connect(self, conn_info: ConnectionInfo) -> WorkItem:
         """Set up intellisense cache on connection to a new database"""
-        return utils.thread.run_as_thread(self._build_intellisense_cache_thread, conn_info)
+        return self._service_provider.executors.submit(LANGUAGE_POOL, self._build_intellisense_cache_thread, conn_info)
 
     # PROPERTIES ###########################################################
     @property
@@ -16,6 +16,7 @@ from ossdbtoolsservice.connection.contracts import ConnectRequestParams, Connect
 from ossdbtoolsservice.hosting import ServiceProvider
 from ossdbtoolsservice.language.completion_refresher import CompletionRefresher
 from ossdbtoolsservice.driver import ServerConnection
+from ossdbtoolsservice.utils.cancellation import CancellationToken
 
 INTELLISENSE_URI = 'intellisense://'
 
@@ -45,15 +46,18 @@ class ConnectionContext:
 class QueuedOperation:
     """Information about an operation to be queued"""
 
-    def __init__(self, key: str, task: Callable[[Completer], bool], timeout_task: Callable[[None], bool]):
+    def __init__(self, key: str, task: Callable[[Completer], bool], timeout_task: Callable[[None], bool],
+                 cancellation_token: Optional[CancellationToken] = None):
         """
         Initializes a queued operation with a key defining the connection it maps to,
         a task to be run for a connected queue, and a timeout task. Currently the timeout
-        task is just used if the queue is not yet connected
+        task is just used if the queue is not yet connected. Operations whose cancellation
+        token is canceled before they are processed are dropped
         """
         self.key = key
         self.task: Callable[[Completer], bool] = task
         self.timeout_task: Callable[[None], bool] = timeout_task
+        self.cancellation_token: Optional[CancellationToken] = cancellation_token
         self.context: ConnectionContext = None
 
 
@@ -196,6 +200,10 @@ class OperationsQueue:
         Processes an operation. Seperated for test purposes from the threaded logic
         """
         if operation is not None:
+            if operation.cancellation_token is not None and operation.cancellation_token.canceled:
+                # Nobody is waiting for the result of the operation anymore
+                return
+
             # Try to process the task, falling back to the timeout
             # task if disconnected or regular task failed
             is_connected = operation.context is not None and operation.context.is_connected
@@ -3,12 +3,12 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-import threading
 from typing import List
 
 from ossdbtoolsservice.driver import ServerConnection
 from ossdbtoolsservice.connection.contracts import ConnectionType
 from ossdbtoolsservice.hosting import RequestContext, ServiceProvider
+from ossdbtoolsservice.hosting.executors import METADATA_POOL
 from ossdbtoolsservice.metadata.contracts import (
     MetadataListParameters, MetadataListResponse, METADATA_LIST_REQUEST, MetadataType, ObjectMetadata)
 from ossdbtoolsservice.utils import constants
@@ -76,12 +76,7 @@ class MetadataService:
     def _handle_metadata_list_request(self, request_context: RequestContext, params: MetadataListParameters) -> None:
         # psycopg is thread safe while PyMYSQL is not
         if self._service_provider.provider == constants.PG_PROVIDER_NAME:
-            thread = threading.Thread(
-                target=self._metadata_list_worker,
-                args=(request_context, params)
-            )
-            thread.daemon = True
-            thread.start()
+            self._service_provider.executors.submit(METADATA_POOL, self._metadata_list_worker, request_context, params)
         else:
             self._metadata_list_worker(request_context, params)
 
@@ -11,6 +11,7 @@ from urllib.parse import quote, urlparse
 from ossdbtoolsservice.driver import ServerConnection
 from ossdbtoolsservice.connection.contracts import ConnectRequestParams, ConnectionDetails, ConnectionType
 from ossdbtoolsservice.hosting import RequestContext, ServiceProvider
+from ossdbtoolsservice.hosting.executors import OBJECT_EXPLORER_POOL
 from ossdbtoolsservice.object_explorer.contracts import (
     NodeInfo,
     CreateSessionResponse, CREATE_SESSION_REQUEST, SessionCreatedParameters, SESSION_CREATED_METHOD,
@@ -117,9 +118,7 @@ class ObjectExplorerService(object):
 
         # Step 2: Connect the session and lookup the root node asynchronously
         try:
-            session.init_task = threading.Thread(target=self._initialize_session, args=(request_context, session))
-            session.init_task.daemon = True
-            session.init_task.start()
+            session.init_task = self._service_provider.executors.submit(OBJECT_EXPLORER_POOL, self._initialize_session, request_context, session)
         except Exception as e:
             # TODO: Localize
             self._session_created_error(request_context, session, f'Failed to start OE init task: {str(e)}')
@@ -197,12 +196,12 @@ class ObjectExplorerService(object):
             else:
                 task = session.expand_tasks.get(key)
 
-            if task is not None and task.isAlive():
+            if task is not None and task.is_alive():
                 return
 
-            new_task = threading.Thread(target=self._expand_node_thread, args=(is_refresh, request_context, params, session))
-            new_task.daemon = True
-            new_task.start()
+            new_task = self._service_provider.executors.submit(
+                OBJECT_EXPLORER_POOL, self._expand_node_thread, is_refresh, request_context, params, session
+            )
 
             if is_refresh:
                 session.refresh_tasks[key] = new_task
@@ -213,6 +212,15 @@ class ObjectExplorerService(object):
             self._expand_node_error(request_context, params, str(e))
 
     def _expand_node_thread(self, is_refresh: bool, request_context: RequestContext, params: ExpandParameters, session: ObjectExplorerSession):
+        if request_context.cancellation_token.canceled:
+            # The client canceled the expand while it was waiting for a worker, don't query the catalog for it. The
+            # request has been answered already, so the node is still completed for the client to stop loading it
+            response = ExpandCompletedParameters(session.id, params.node_path)
+            response.error_message = 'Expanding the node was canceled'    # TODO: Localize
+
+            request_context.send_notification(EXPAND_COMPLETED_METHOD, response)
+            return
+
         try:
             response = ExpandCompletedParameters(session.id, params.node_path)
             response.nodes = self._route_request(is_refresh, session, params.node_path)
@@ -3,12 +3,12 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-import threading                    # noqa
 from typing import Callable, Dict, List, Optional, TypeVar
 from urllib.parse import urljoin
 
 from pgsmo import Server            # noqa
 from ossdbtoolsservice.connection.contracts import ConnectionDetails
+from ossdbtoolsservice.hosting.executors import WorkItem
 from ossdbtoolsservice.object_explorer.contracts import NodeInfo
 
 
@@ -19,9 +19,9 @@ class ObjectExplorerSession:
         self.is_ready: bool = False
         self.server: Optional[Server] = None
 
-        self.init_task: Optional[threading.Thread] = None
-        self.expand_tasks: Dict[str, threading.Thread] = {}
-        self.refresh_tasks: Dict[str, threading.Thread] = {}
+        self.init_task: Optional[WorkItem] = None
+        self.expand_tasks: Dict[str, WorkItem] = {}
+        self.refresh_tasks: Dict[str, WorkItem] = {}
         self.cache: Dict[str, List[NodeInfo]] = {}
 
 
@@ -13,8 +13,9 @@ import ptvsd
 from ossdbtoolsservice.admin import AdminService
 from ossdbtoolsservice.capabilities.capabilities_service import CapabilitiesService
 from ossdbtoolsservice.connection import ConnectionService
+from ossdbtoolsservice.data_import import DataImportService
 from ossdbtoolsservice.disaster_recovery.disaster_recovery_service import DisasterRecoveryService
-from ossdbtoolsservice.hosting import JSONRPCServer, ServiceProvider
+from ossdbtoolsservice.hosting import AsyncJSONRPCServer, JSONRPCServer, ServiceProvider
 from ossdbtoolsservice.language import LanguageService
 from ossdbtoolsservice.metadata import MetadataService
 from ossdbtoolsservice.object_explorer import ObjectExplorerService
@@ -25,16 +26,25 @@ from ossdbtoolsservice.tasks import TaskService
 from ossdbtoolsservice.utils import constants
 from ossdbtoolsservice.workspace import WorkspaceService
 
+# Classes of the JSON RPC server by the value of the --server-mode argument
+SERVER_MODES = {
+    'threaded': JSONRPCServer,
+    'async': AsyncJSONRPCServer
+}
 
-def _create_server(input_stream, output_stream, server_logger, provider):
+
+def _create_server(input_stream, output_stream, server_logger, provider, max_coalesce_latency=0, max_workers=JSONRPCServer.DEFAULT_MAX_WORKERS,
+                   server_mode='threaded'):
     # Create the server, but don't start it yet
-    rpc_server = JSONRPCServer(input_stream, output_stream, server_logger)
+    server_class = SERVER_MODES[server_mode]
+    rpc_server = server_class(input_stream, output_stream, server_logger, max_coalesce_latency=max_coalesce_latency, max_workers=max_workers)
 
     # Create the service provider and add the providers to it
     services = {
         constants.ADMIN_SERVICE_NAME: AdminService,
         constants.CAPABILITIES_SERVICE_NAME: CapabilitiesService,
         constants.CONNECTION_SERVICE_NAME: ConnectionService,
+        constants.DATA_IMPORT_SERVICE_NAME: DataImportService,
         constants.DISASTER_RECOVERY_SERVICE_NAME: DisasterRecoveryService,
         constants.LANGUAGE_SERVICE_NAME: LanguageService,
         constants.METADATA_SERVICE_NAME: MetadataService,
@@ -55,6 +65,9 @@ if __name__ == '__main__':
     wait_for_debugger = False
     log_dir = None
     stdin = None
+    max_coalesce_latency = 0
+    max_workers = JSONRPCServer.DEFAULT_MAX_WORKERS
+    server_mode = 'threaded'
     # Setting a default provider name to test PG extension
     provider_name = constants.PG_PROVIDER_NAME
     if len(sys.argv) > 1:
@@ -78,6 +91,17 @@ if __name__ == '__main__':
                     wait_for_debugger = True
             elif arg_parts[0] == '--log-dir':
                 log_dir = arg_parts[1]
+            elif arg_parts[0] == '--max-coalesce-latency':
+                # Milliseconds the output thread may wait to send more messages with a single write
+                max_coalesce_latency = int(arg_parts[1]) / 1000
+            elif arg_parts[0] == '--max-workers':
+                # Number of threads handling requests, 0 handles them one at a time on the input thread
+                max_workers = int(arg_parts[1])
+            elif arg_parts[0] == '--server-mode':
+                # 'threaded' reads and writes the streams on threads of their own, 'async' on an asyncio event loop
+                server_mode = arg_parts[1]
+                if server_mode not in SERVER_MODES:
+                    raise AssertionError("{} is not a supported server mode".format(server_mode))
             elif arg_parts[0] == 'provider':
                 provider_name = arg_parts[1]
                 # Check if we support the given provider
@@ -104,7 +128,8 @@ if __name__ == '__main__':
         logger.debug('Waiting for a debugger to attach...')
         ptvsd.wait_for_attach()
 
-    # Wrap standard in and out in io streams to add readinto support
+    # Wrap standard in and out in io streams to add readinto support. Output is left unbuffered since the
+    # server coalesces its queued messages into a single write
     if stdin is None:
         stdin = io.open(sys.stdin.fileno(), 'rb', buffering=0, closefd=False)
 
@@ -113,7 +138,7 @@ if __name__ == '__main__':
     logger.info('{0} Tools Service is starting up...'.format(provider_name))
 
     # Create the server, but don't start it yet
-    server = _create_server(stdin, std_out_wrapped, logger, provider_name)
+    server = _create_server(stdin, std_out_wrapped, logger, provider_name, max_coalesce_latency, max_workers, server_mode)
 
     # Start the server
     server.start()
@@ -8,9 +8,12 @@ from ossdbtoolsservice.query.query import (
     compute_selection_data_for_batches, ExecutionState, Query, QueryEvents, QueryExecutionSettings
 )
 from ossdbtoolsservice.query.result_set import ResultSet
+from ossdbtoolsservice.query.save_as_fan_out import SaveAsFanOut, SaveAsTarget
+from ossdbtoolsservice.query.save_as_progress import SaveAsCanceledError, SaveAsProgress
 
 
 __all__ = [
     'Batch', 'BatchEvents', 'compute_selection_data_for_batches', 'create_batch', 'create_result_set',
-    'ExecutionState', 'ResultSet', 'ResultSetStorageType', 'Query', 'QueryEvents', 'QueryExecutionSettings'
+    'ExecutionState', 'ResultSet', 'ResultSetStorageType', 'Query', 'QueryEvents', 'QueryExecutionSettings',
+    'SaveAsCanceledError', 'SaveAsFanOut', 'SaveAsProgress', 'SaveAsTarget'
 ]
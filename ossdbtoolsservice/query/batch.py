@@ -11,26 +11,34 @@ import uuid
 import sqlparse
 
 from ossdbtoolsservice.driver import ServerConnection
+from ossdbtoolsservice.hosting.executors import ExecutorPool
 from ossdbtoolsservice.utils.time import get_time_str, get_elapsed_time_str
 from ossdbtoolsservice.query.contracts import BatchSummary, SaveResultsRequestParams, SelectionData
-from ossdbtoolsservice.query.result_set import ResultSet  # noqa
+from ossdbtoolsservice.query.result_set import ResultSet, ResultSetEvents  # noqa
 from ossdbtoolsservice.query.file_storage_result_set import FileStorageResultSet
+from ossdbtoolsservice.query.hybrid_result_set import HybridResultSet
 from ossdbtoolsservice.query.in_memory_result_set import InMemoryResultSet
 from ossdbtoolsservice.query.data_storage import FileStreamFactory
-from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
+from ossdbtoolsservice.query.save_as_fan_out import SaveAsTarget
+from ossdbtoolsservice.query.save_as_progress import SaveAsProgress
+from ossdbtoolsservice.utils.constants import (
+    DEFAULT_FETCH_BATCH_SIZE, DEFAULT_RESULT_SET_MEMORY_BUDGET, DEFAULT_RESULT_SET_MEMORY_ROW_COUNT, PG_PROVIDER_NAME
+)
 
 
 class ResultSetStorageType(Enum):
     IN_MEMORY = 1,
-    FILE_STORAGE = 2
+    FILE_STORAGE = 2,
+    HYBRID = 3
 
 
 class BatchEvents:
 
-    def __init__(self, on_execution_started=None, on_execution_completed=None, on_result_set_completed=None):
+    def __init__(self, on_execution_started=None, on_execution_completed=None, on_result_set_completed=None, on_result_set_partially_loaded=None):
         self._on_execution_started = on_execution_started
         self._on_execution_completed = on_execution_completed
         self._on_result_set_completed = on_result_set_completed
+        self._on_result_set_partially_loaded = on_result_set_partially_loaded
 
 
 class SelectBatchEvents(BatchEvents):
@@ -48,7 +56,11 @@ class Batch:
             ordinal: int,
             selection: SelectionData,
             batch_events: BatchEvents = None,
-            storage_type: ResultSetStorageType = ResultSetStorageType.FILE_STORAGE
+            storage_type: ResultSetStorageType = ResultSetStorageType.FILE_STORAGE,
+            fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+            memory_budget: int = DEFAULT_RESULT_SET_MEMORY_BUDGET,
+            compress_result_buffers: bool = False,
+            memory_row_count: int = DEFAULT_RESULT_SET_MEMORY_ROW_COUNT
     ) -> None:
         self.id = ordinal
         self.selection = selection
@@ -62,6 +74,10 @@ class Batch:
         self._notices: List[str] = []
         self._batch_events = batch_events
         self._storage_type = storage_type
+        self._fetch_batch_size = fetch_batch_size
+        self._memory_budget = memory_budget
+        self._compress_result_buffers = compress_result_buffers
+        self._memory_row_count = memory_row_count
 
     @property
     def batch_summary(self) -> BatchSummary:
@@ -153,25 +169,46 @@ class Batch:
             self.create_result_set(cursor)
 
     def create_result_set(self, cursor):
-        result_set = create_result_set(self._storage_type, 0, self.id)
-        result_set.read_result_to_end(cursor)
-        self._result_set = result_set
+        events = None
+        if self._batch_events and self._batch_events._on_result_set_partially_loaded:
+            events = ResultSetEvents(on_result_set_partially_loaded=self._batch_events._on_result_set_partially_loaded)
+
+        # The result set is exposed before it is read so that the rows already fetched can be served
+        self._result_set = create_result_set(
+            self._storage_type, 0, self.id, events, self._fetch_batch_size, self._memory_budget, self._compress_result_buffers, self._memory_row_count)
+        self._result_set.read_result_to_end(cursor)
 
     def get_subset(self, start_index: int, end_index: int):
         return self._result_set.get_subset(start_index, end_index)
 
-    def save_as(self, params: SaveResultsRequestParams, file_factory: FileStreamFactory, on_success, on_failure) -> None:
+    def dispose(self) -> None:
+        if self._result_set is not None:
+            self._result_set.dispose()
+
+    def save_as(self, params: SaveResultsRequestParams, file_factory: FileStreamFactory, on_success, on_failure, progress: SaveAsProgress = None,
+                executor: ExecutorPool = None) -> None:
+
+        if params.result_set_index != 0:
+            raise IndexError('Result set index should be always 0')
+
+        self._result_set.save_as(params, file_factory, on_success, on_failure, progress, executor)
+
+    def save_as_multi(self, params: SaveResultsRequestParams, targets: List[SaveAsTarget], on_progress, on_complete,
+                      executor: ExecutorPool = None) -> None:
 
         if params.result_set_index != 0:
             raise IndexError('Result set index should be always 0')
 
-        self._result_set.save_as(params, file_factory, on_success, on_failure)
+        self._result_set.save_as_multi(params, targets, on_progress, on_complete, executor)
 
 
 class SelectBatch(Batch):
 
-    def __init__(self, batch_text: str, ordinal: int, selection: SelectionData, batch_events: SelectBatchEvents, storage_type: ResultSetStorageType) -> None:
-        Batch.__init__(self, batch_text, ordinal, selection, batch_events, storage_type)
+    def __init__(self, batch_text: str, ordinal: int, selection: SelectionData, batch_events: SelectBatchEvents, storage_type: ResultSetStorageType,
+                 fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE, memory_budget: int = DEFAULT_RESULT_SET_MEMORY_BUDGET,
+                 compress_result_buffers: bool = False, memory_row_count: int = DEFAULT_RESULT_SET_MEMORY_ROW_COUNT) -> None:
+        Batch.__init__(self, batch_text, ordinal, selection, batch_events, storage_type, fetch_batch_size, memory_budget, compress_result_buffers,
+                       memory_row_count)
 
     def get_cursor(self, connection: ServerConnection):
         cursor_name = str(uuid.uuid4())
@@ -184,15 +221,22 @@ class SelectBatch(Batch):
         super().create_result_set(cursor)
 
 
-def create_result_set(storage_type: ResultSetStorageType, result_set_id: int, batch_id: int) -> ResultSet:
+def create_result_set(storage_type: ResultSetStorageType, result_set_id: int, batch_id: int, events: ResultSetEvents = None,
+                      fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE, memory_budget: int = DEFAULT_RESULT_SET_MEMORY_BUDGET,
+                      compress_result_buffers: bool = False, memory_row_count: int = DEFAULT_RESULT_SET_MEMORY_ROW_COUNT) -> ResultSet:
 
     if storage_type is ResultSetStorageType.FILE_STORAGE:
-        return FileStorageResultSet(result_set_id, batch_id)
+        return FileStorageResultSet(result_set_id, batch_id, events, fetch_batch_size, compress_result_buffers)
+
+    if storage_type is ResultSetStorageType.HYBRID:
+        return HybridResultSet(result_set_id, batch_id, events, fetch_batch_size, memory_budget, compress_result_buffers, memory_row_count)
 
-    return InMemoryResultSet(result_set_id, batch_id)
+    return InMemoryResultSet(result_set_id, batch_id, events)
 
 
-def create_batch(batch_text: str, ordinal: int, selection: SelectionData, batch_events: BatchEvents, storage_type: ResultSetStorageType) -> Batch:
+def create_batch(batch_text: str, ordinal: int, selection: SelectionData, batch_events: BatchEvents, storage_type: ResultSetStorageType,
+                 fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE, memory_budget: int = DEFAULT_RESULT_SET_MEMORY_BUDGET,
+                 compress_result_buffers: bool = False, memory_row_count: int = DEFAULT_RESULT_SET_MEMORY_ROW_COUNT) -> Batch:
     sql = sqlparse.parse(batch_text)
     statement = sql[0]
 
@@ -201,6 +245,7 @@ def create_batch(batch_text: str, ordinal: int, selection: SelectionData, batch_
         second_token = statement.token_next(index)
 
         if second_token[1].value.lower() != 'into':
-            return SelectBatch(batch_text, ordinal, selection, batch_events, storage_type)
+            return SelectBatch(batch_text, ordinal, selection, batch_events, storage_type, fetch_batch_size, memory_budget, compress_result_buffers,
+                               memory_row_count)
 
-    return Batch(batch_text, ordinal, selection, batch_events, storage_type)
+    return Batch(batch_text, ordinal, selection, batch_events, storage_type, fetch_batch_size, memory_budget, compress_result_buffers, memory_row_count)
@@ -4,6 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 import ossdbtoolsservice.parsers.datatypes as datatypes
+from ossdbtoolsservice.utils.serialization import register_serializer
 
 DESC = {'name': 0, 'type_code': 1, 'display_size': 2, 'internal_size': 3, 'precision': 4, 'scale': 5, 'null_ok': 6}
 
@@ -106,9 +107,37 @@ class DbColumn:
 
 
 class DbCellValue:
+    """
+    Value of a single cell. Result sets create one per cell of every row they return, so the class holds no
+    instance dictionary and the display value is only converted to a string when it is first read
+    """
+
+    __slots__ = ('_display_value', 'is_null', 'row_id', 'raw_object')
 
     def __init__(self, display_value: any, is_null: bool, raw_object: object, row_id: int):
-        self.display_value: str = '' if (display_value is None) else str(display_value)
+        self._display_value = display_value
         self.is_null: bool = is_null
         self.row_id: int = row_id
         self.raw_object = raw_object
+
+    @property
+    def display_value(self) -> str:
+        display_value = self._display_value
+
+        if type(display_value) is not str:
+            display_value = '' if (display_value is None) else str(display_value)
+            self._display_value = display_value
+
+        return display_value
+
+    @display_value.setter
+    def display_value(self, display_value: any):
+        self._display_value = display_value
+
+
+def serialize_db_cell_value(cell: DbCellValue) -> dict:
+    """ Returns the json-ready representation of a cell """
+    return {'displayValue': cell.display_value, 'isNull': cell.is_null, 'rowId': cell.row_id, 'rawObject': cell.raw_object}
+
+
+register_serializer(DbCellValue, serialize_db_cell_value)
@@ -6,16 +6,31 @@
 from ossdbtoolsservice.query.data_storage.storage_data_reader import StorageDataReader
 from ossdbtoolsservice.query.data_storage.service_buffer_file_stream_writer import ServiceBufferFileStreamWriter
 from ossdbtoolsservice.query.data_storage.service_buffer_file_stream_reader import ServiceBufferFileStreamReader
+from ossdbtoolsservice.query.data_storage.service_buffer_column_codec import ServiceBufferColumnCodec, get_column_codecs
+from ossdbtoolsservice.query.data_storage.service_buffer_block import ServiceBufferBlock
+from ossdbtoolsservice.query.data_storage.service_buffer_block_cache import ServiceBufferBlockCache
+from ossdbtoolsservice.query.data_storage.service_buffer_row_index import ServiceBufferRowIndex
+from ossdbtoolsservice.query.data_storage.service_buffer_block_writer import ServiceBufferBlockWriter
+from ossdbtoolsservice.query.data_storage.service_buffer_block_reader import ServiceBufferBlockReader
+from ossdbtoolsservice.query.data_storage.service_buffer_memory_mapped_reader import ServiceBufferMemoryMappedReader
 from ossdbtoolsservice.query.data_storage.file_stream_factory import FileStreamFactory
 from ossdbtoolsservice.query.data_storage.save_as_csv_writer import SaveAsCsvWriter
 from ossdbtoolsservice.query.data_storage.save_as_csv_file_stream_factory import SaveAsCsvFileStreamFactory
 from ossdbtoolsservice.query.data_storage.save_as_json_writer import SaveAsJsonWriter
 from ossdbtoolsservice.query.data_storage.save_as_json_file_stream_factory import SaveAsJsonFileStreamFactory
+from ossdbtoolsservice.query.data_storage.save_as_ndjson_writer import SaveAsNdjsonWriter
+from ossdbtoolsservice.query.data_storage.save_as_ndjson_file_stream_factory import SaveAsNdjsonFileStreamFactory
 from ossdbtoolsservice.query.data_storage.save_as_excel_writer import SaveAsExcelWriter
 from ossdbtoolsservice.query.data_storage.save_as_excel_writer_factory import SaveAsExcelFileStreamFactory
+from ossdbtoolsservice.query.data_storage.save_as_arrow_writer import SaveAsArrowWriter
+from ossdbtoolsservice.query.data_storage.save_as_arrow_file_stream_factory import SaveAsArrowFileStreamFactory
+from ossdbtoolsservice.query.data_storage.save_as_parquet_writer import SaveAsParquetWriter
+from ossdbtoolsservice.query.data_storage.save_as_parquet_file_stream_factory import SaveAsParquetFileStreamFactory
 
 __all__ = [
     'FileStreamFactory', 'SaveAsCsvWriter', 'SaveAsJsonWriter', 'SaveAsExcelWriter', 'SaveAsExcelFileStreamFactory',
-    'SaveAsJsonFileStreamFactory', 'SaveAsCsvFileStreamFactory', 'ServiceBufferFileStreamWriter',
-    'ServiceBufferFileStreamReader', 'StorageDataReader'
+    'SaveAsArrowWriter', 'SaveAsArrowFileStreamFactory', 'SaveAsParquetWriter', 'SaveAsParquetFileStreamFactory',
+    'SaveAsJsonFileStreamFactory', 'SaveAsNdjsonWriter', 'SaveAsNdjsonFileStreamFactory', 'SaveAsCsvFileStreamFactory', 'ServiceBufferFileStreamWriter',
+    'ServiceBufferFileStreamReader', 'ServiceBufferColumnCodec', 'get_column_codecs', 'ServiceBufferBlock', 'ServiceBufferBlockCache',
+    'ServiceBufferBlockWriter', 'ServiceBufferBlockReader', 'ServiceBufferMemoryMappedReader', 'ServiceBufferRowIndex', 'StorageDataReader'
 ]
@@ -7,7 +7,7 @@ from abc import ABCMeta, abstractmethod
 import os
 import io
 
-from ossdbtoolsservice.query.data_storage import ServiceBufferFileStreamReader
+from ossdbtoolsservice.query.data_storage import ServiceBufferBlockReader
 
 
 class FileStreamFactory(metaclass=ABCMeta):
@@ -20,7 +20,7 @@ class FileStreamFactory(metaclass=ABCMeta):
         pass
 
     def get_reader(self, file_name: str):
-        return ServiceBufferFileStreamReader(io.open(file_name, 'rb'))
+        return ServiceBufferBlockReader(io.open(file_name, 'rb'))
 
     def delete_file(self, file_name: str):
         os.remove(file_name)
@@ -0,0 +1,190 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+from typing import Callable, List  # noqa
+
+import pyarrow
+from pymysql.constants import FIELD_TYPE
+
+import ossdbtoolsservice.parsers.datatypes as datatypes
+from ossdbtoolsservice.query.data_storage.save_as_writer import SaveAsWriter, get_typed_value_parser
+from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, SaveResultsRequestParams
+from ossdbtoolsservice.utils import constants
+
+# Number of rows of each record batch, and of each row group of Parquet files
+ARROW_BATCH_ROW_COUNT = 65536
+
+# Compression of the record batches of Arrow files when the request does not set one
+DEFAULT_ARROW_COMPRESSION = 'lz4'
+
+# Largest precision of Arrow decimals, numbers with a larger or unknown precision are written as text
+MAX_DECIMAL_PRECISION = 38
+
+PG_ARROW_TYPES = {
+    datatypes.DATATYPE_BOOL: pyarrow.bool_(),
+    datatypes.DATATYPE_SMALLINT: pyarrow.int16(),
+    datatypes.DATATYPE_INTEGER: pyarrow.int32(),
+    datatypes.DATATYPE_BIGINT: pyarrow.int64(),
+    datatypes.DATATYPE_OID: pyarrow.int64(),
+    datatypes.DATATYPE_REAL: pyarrow.float32(),
+    datatypes.DATATYPE_DOUBLE: pyarrow.float64(),
+    datatypes.DATATYPE_DATE: pyarrow.date32(),
+    datatypes.DATATYPE_TIME: pyarrow.time64('us'),
+    datatypes.DATATYPE_TIMESTAMP: pyarrow.timestamp('us'),
+    datatypes.DATATYPE_TIMESTAMP_WITH_TIMEZONE: pyarrow.timestamp('us', tz='UTC'),
+    datatypes.DATATYPE_INTERVAL: pyarrow.duration('us'),
+    datatypes.DATATYPE_BYTEA: pyarrow.binary()
+}
+
+MYSQL_ARROW_TYPES = {
+    FIELD_TYPE.TINY: pyarrow.int64(),
+    FIELD_TYPE.SHORT: pyarrow.int64(),
+    FIELD_TYPE.INT24: pyarrow.int64(),
+    FIELD_TYPE.LONG: pyarrow.int64(),
+    FIELD_TYPE.LONGLONG: pyarrow.int64(),
+    FIELD_TYPE.YEAR: pyarrow.int64(),
+    FIELD_TYPE.FLOAT: pyarrow.float32(),
+    FIELD_TYPE.DOUBLE: pyarrow.float64(),
+    FIELD_TYPE.DATE: pyarrow.date32(),
+    FIELD_TYPE.NEWDATE: pyarrow.date32(),
+    FIELD_TYPE.DATETIME: pyarrow.timestamp('us'),
+    FIELD_TYPE.TIMESTAMP: pyarrow.timestamp('us'),
+    FIELD_TYPE.TIME: pyarrow.duration('us')
+}
+
+PG_DECIMAL_TYPES = [datatypes.DATATYPE_NUMERIC]
+
+MYSQL_DECIMAL_TYPES = [FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL]
+
+
+def get_arrow_type(column: DbColumn) -> pyarrow.DataType:
+    """ Maps the data type of a column to an Arrow type. Types without an exact Arrow equivalent are written as text """
+    if column.provider in (constants.MYSQL_PROVIDER_NAME, constants.MARIADB_PROVIDER_NAME):
+        arrow_types, decimal_types = MYSQL_ARROW_TYPES, MYSQL_DECIMAL_TYPES
+    else:
+        arrow_types, decimal_types = PG_ARROW_TYPES, PG_DECIMAL_TYPES
+
+    if column.data_type in decimal_types:
+        precision, scale = column.numeric_precision, column.numeric_scale
+
+        if precision is not None and 0 < precision <= MAX_DECIMAL_PRECISION and scale is not None and 0 <= scale <= precision:
+            return pyarrow.decimal128(precision, scale)
+
+        return pyarrow.string()
+
+    return arrow_types.get(column.data_type, pyarrow.string())
+
+
+def _get_display_value(cell: DbCellValue):
+    return None if cell.is_null else cell.display_value
+
+
+def _get_raw_value(cell: DbCellValue):
+    return None if cell.is_null else cell.raw_object
+
+
+def _get_value_getter(column: DbColumn, arrow_type: pyarrow.DataType) -> Callable[[DbCellValue], object]:
+    if arrow_type == pyarrow.string():
+        return _get_display_value
+
+    parse = get_typed_value_parser(column)
+    if parse is None:
+        return _get_raw_value
+
+    return lambda cell: None if cell.is_null else parse(cell.raw_object)
+
+
+class SaveAsArrowWriter(SaveAsWriter):
+    """
+    Writes the rows to an Arrow IPC file. Rows are gathered in record batches, which are built column by column
+    with the Arrow type of each column and written compressed
+    """
+
+    def __init__(self, stream: io.BufferedWriter, params: SaveResultsRequestParams) -> None:
+        SaveAsWriter.__init__(self, stream, params)
+
+        self._schema: pyarrow.Schema = None
+        self._value_getters: List[Callable[[DbCellValue], object]] = None
+        self._column_indexes: List[int] = None
+        self._columns: List[list] = None
+        self._row_count = 0
+        self._writer = None
+
+    def write_row(self, row: List[DbCellValue], columns: List[DbColumn]):
+        if self._schema is None:
+            self._open(columns)
+
+        for field, values, column_index, get_value in zip(self._schema, self._columns, self._column_indexes, self._value_getters):
+            try:
+                values.append(get_value(row[column_index]))
+            except (SyntaxError, ValueError) as error:
+                raise ValueError('Column {0} cannot be written as {1}: {2}'.format(field.name, field.type, error))
+
+        self._row_count += 1
+
+        if self._row_count >= ARROW_BATCH_ROW_COUNT:
+            self._write_batch()
+
+    def complete_write(self):
+        if self._schema is None:
+            # Without rows the columns are unknown, the file holds an empty schema
+            self._schema = pyarrow.schema([])
+            self._columns = []
+            self._writer = self._open_writer(self._schema)
+
+        try:
+            if self._row_count > 0:
+                self._write_batch()
+        finally:
+            self._close_writer()
+
+    def __exit__(self, type, value, traceback):
+        # A failed write leaves the writer open, it is closed before the file so that it does not write to it afterwards
+        try:
+            if self._writer is not None:
+                self._close_writer()
+        except Exception:
+            # The error of the failed write is the one raised
+            if type is None:
+                raise
+        finally:
+            SaveAsWriter.__exit__(self, type, value, traceback)
+
+    def _open(self, columns: List[DbColumn]) -> None:
+        selected_columns = columns[self.get_start_index(): self.get_end_index(columns)]
+        fields = [pyarrow.field(column.column_name, get_arrow_type(column)) for column in selected_columns]
+
+        self._schema = pyarrow.schema(fields)
+        self._value_getters = [_get_value_getter(column, field.type) for column, field in zip(selected_columns, fields)]
+        self._column_indexes = list(range(self.get_start_index(), self.get_start_index() + len(selected_columns)))
+        self._columns = [[] for _ in selected_columns]
+        self._writer = self._open_writer(self._schema)
+
+    def _write_batch(self) -> None:
+        arrays = []
+
+        for field, values in zip(self._schema, self._columns):
+            try:
+                arrays.append(pyarrow.array(values, type=field.type))
+            except (pyarrow.ArrowException, OverflowError, TypeError, ValueError) as error:
+                raise ValueError('Column {0} cannot be written as {1}: {2}'.format(field.name, field.type, error))
+
+        self._write_record_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=self._schema))
+
+        self._columns = [[] for _ in self._columns]
+        self._row_count = 0
+
+    def _close_writer(self) -> None:
+        writer, self._writer = self._writer, None
+        writer.close()
+
+    def _open_writer(self, schema: pyarrow.Schema):
+        compression = getattr(self._params, 'compression', None) or DEFAULT_ARROW_COMPRESSION
+        options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+        return pyarrow.ipc.new_file(self._file_stream, schema, options=options)
+
+    def _write_record_batch(self, batch: pyarrow.RecordBatch) -> None:
+        self._writer.write_batch(batch)
@@ -7,6 +7,11 @@ import io
 
 from ossdbtoolsservice.query.data_storage import FileStreamFactory, SaveAsCsvWriter
 
+DEFAULT_ENCODING = 'utf-8'
+
+# Size of the buffer of the file, which takes the rows written by batch
+CSV_BUFFER_SIZE = 1024 * 1024
+
 
 class SaveAsCsvFileStreamFactory(FileStreamFactory):
 
@@ -14,4 +19,6 @@ class SaveAsCsvFileStreamFactory(FileStreamFactory):
         FileStreamFactory.__init__(self, params)
 
     def get_writer(self, file_name: str):
-        return SaveAsCsvWriter(io.open(file_name, 'w'), self._params)
+        # Line endings are written by the csv writer, so the file must not translate them
+        encoding = getattr(self._params, 'encoding', None) or DEFAULT_ENCODING
+        return SaveAsCsvWriter(io.open(file_name, 'w', buffering=CSV_BUFFER_SIZE, encoding=encoding, newline=''), self._params)
@@ -10,25 +10,63 @@ from typing import List
 from ossdbtoolsservice.query.data_storage.save_as_writer import SaveAsWriter
 from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, SaveResultsRequestParams
 
+# Defaults of the CSV format when the request doesn't set them
+DEFAULT_DELIMITER = ','
+DEFAULT_TEXT_IDENTIFIER = '"'
+DEFAULT_LINE_SEPARATOR = '\r\n'
+
+# Number of rows gathered before they are written with a single writerows call
+CSV_WRITE_BATCH_SIZE = 1000
+
 
 class SaveAsCsvWriter(SaveAsWriter):
+    """
+    Writes the rows as CSV. Rows are gathered and written by batch through a single csv writer, and result sets
+    stored in a buffer file hand the display values of their rows over without building cell values
+    """
+
+    writes_display_rows = True
 
     def __init__(self, stream: io.BufferedWriter, params: SaveResultsRequestParams) -> None:
         SaveAsWriter.__init__(self, stream, params)
         self._header_written = False
+        self._pending_rows: List[List[str]] = []
+
+        self._writer = csv.writer(
+            stream,
+            delimiter=getattr(params, 'delimiter', None) or DEFAULT_DELIMITER,
+            quotechar=getattr(params, 'text_identifier', None) or DEFAULT_TEXT_IDENTIFIER,
+            quoting=csv.QUOTE_ALL if getattr(params, 'quote_all_values', None) else csv.QUOTE_MINIMAL,
+            lineterminator=getattr(params, 'line_seperator', None) or DEFAULT_LINE_SEPARATOR
+        )
 
     def write_row(self, row: List[DbCellValue], columns: List[DbColumn]):
+        self._write_header(columns)
+
+        self._pending_rows.append([cell.display_value for cell in row[self.get_start_index(): self.get_end_index(columns)]])
+
+        if len(self._pending_rows) >= CSV_WRITE_BATCH_SIZE:
+            self._flush_rows()
+
+    def write_display_rows(self, rows: List[tuple], columns: List[DbColumn]):
+        self._write_header(columns)
+        self._flush_rows()
+
+        self._writer.writerows(rows)
 
-        writer = csv.writer(self._file_stream, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+    def complete_write(self):
+        self._flush_rows()
 
-        if self._params.include_headers and not self._header_written:
-            selected_column_names = [column.column_name for column in columns[
-                self.get_start_index(): self.get_end_index(columns)]]
-            writer.writerow(selected_column_names)
+    def _write_header(self, columns: List[DbColumn]):
+        if self._header_written:
+            return
 
-            self._header_written = True
+        self._header_written = True
 
-        selected_cells = [cell.display_value for cell in row[
-            self.get_start_index(): self.get_end_index(columns)]]
+        if self._params.include_headers:
+            self._writer.writerow([column.column_name for column in columns[self.get_start_index(): self.get_end_index(columns)]])
 
-        writer.writerow(selected_cells)
+    def _flush_rows(self):
+        if self._pending_rows:
+            self._writer.writerows(self._pending_rows)
+            self._pending_rows = []
@@ -3,41 +3,105 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import datetime
+import decimal
 import io
-from typing import List
+import math
+from typing import Any, Callable, List, Optional  # noqa
 import xlsxwriter
-import string
 
-from ossdbtoolsservice.query.data_storage.save_as_writer import SaveAsWriter
+from ossdbtoolsservice.query.data_storage.save_as_writer import SaveAsWriter, get_typed_value_parser
 from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, SaveResultsRequestParams
 
+# Number of rows of a worksheet, header included. Rows past it go to a new worksheet
+MAX_SHEET_ROW_COUNT = 1048576
+
+# First year of Excel dates, earlier ones are written as text
+MIN_DATE_YEAR = 1900
+
+# Integers beyond the precision of Excel numbers are written as text so that no digit is lost
+MAX_EXACT_INTEGER = 2 ** 53
+
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+DATE_FORMAT = 'yyyy-mm-dd'
+TIME_FORMAT = 'hh:mm:ss'
+
 
 class SaveAsExcelWriter(SaveAsWriter):
+    """
+    Writes the rows to an Excel workbook. The workbook is written in constant memory mode, which flushes each
+    row to disk once the next one is started, and rows past the row limit of a worksheet go to a new one
+    """
 
     def __init__(self, stream: io.BufferedWriter, params: SaveResultsRequestParams) -> None:
         SaveAsWriter.__init__(self, stream, params)
 
-        self._header_written = False
-        self._workbook = xlsxwriter.Workbook(self._file_stream.name)
+        self._workbook = xlsxwriter.Workbook(self._file_stream.name, {'constant_memory': True, 'remove_timezone': True})
         self._worksheet = self._workbook.add_worksheet()
         self._current_row = 1
 
+        self._header_format = self._workbook.add_format({'bold': 1})
+        self._datetime_format = self._workbook.add_format({'num_format': DATETIME_FORMAT})
+        self._date_format = self._workbook.add_format({'num_format': DATE_FORMAT})
+        self._time_format = self._workbook.add_format({'num_format': TIME_FORMAT})
+
+        self._header_columns: List[DbColumn] = None
+        self._value_parsers: List[Optional[Callable[[Any], Any]]] = None
+
     def write_row(self, row: List[DbCellValue], columns: List[DbColumn]):
 
         column_start_index = self.get_start_index()
         column_end_index = self.get_end_index(columns)
 
-        if not self._header_written:
-            bold = self._workbook.add_format({'bold': 1})
-            for index, column in enumerate(columns[column_start_index: column_end_index]):
-                self._worksheet.write(string.ascii_uppercase[index] + '1', column.column_name, bold)
+        if self._header_columns is None:
+            self._header_columns = columns[column_start_index: column_end_index]
+            self._value_parsers = [get_typed_value_parser(column) for column in self._header_columns]
+            self._write_header()
 
-            self._header_written = True
+        if self._current_row >= MAX_SHEET_ROW_COUNT:
+            self._worksheet = self._workbook.add_worksheet()
+            self._current_row = 1
+            self._write_header()
 
         for loop_index, column_index in enumerate(range(column_start_index, column_end_index)):
-            self._worksheet.write(self._current_row, loop_index, row[column_index].display_value)
+            self._write_cell(loop_index, row[column_index])
 
         self._current_row += 1
 
     def complete_write(self):
         self._workbook.close()
+
+    def _write_header(self):
+        for index, column in enumerate(self._header_columns):
+            self._worksheet.write_string(0, index, column.column_name, self._header_format)
+
+    def _write_cell(self, column: int, cell: DbCellValue):
+        value = cell.raw_object
+        row = self._current_row
+        parse = self._value_parsers[column]
+
+        if parse is not None and not cell.is_null:
+            # Dates and numbers read from the buffer file are text, they are written with their type
+            try:
+                value = parse(value)
+            except (SyntaxError, ValueError):
+                pass
+
+        if cell.is_null or value is None:
+            self._worksheet.write_string(row, column, cell.display_value)
+        elif isinstance(value, bool):
+            self._worksheet.write_boolean(row, column, value)
+        elif isinstance(value, int) and abs(value) <= MAX_EXACT_INTEGER:
+            self._worksheet.write_number(row, column, value)
+        elif isinstance(value, (float, decimal.Decimal)) and math.isfinite(value):
+            self._worksheet.write_number(row, column, value)
+        elif isinstance(value, datetime.date) and value.year < MIN_DATE_YEAR:
+            self._worksheet.write_string(row, column, cell.display_value)
+        elif isinstance(value, datetime.datetime):
+            self._worksheet.write_datetime(row, column, value, self._datetime_format)
+        elif isinstance(value, datetime.date):
+            self._worksheet.write_datetime(row, column, value, self._date_format)
+        elif isinstance(value, datetime.time) and value.tzinfo is None:
+            self._worksheet.write_datetime(row, column, value, self._time_format)
+        else:
+            self._worksheet.write_string(row, column, cell.display_value)
@@ -12,25 +12,32 @@ from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, SaveResults
 
 
 class SaveAsJsonWriter(SaveAsWriter):
+    """
+    Writes the rows as a JSON array of objects keyed by column name. Each row is written to the stream as it
+    arrives, so that saving a result set does not hold all of its rows in memory
+    """
 
     def __init__(self, stream: io.BufferedWriter, params: SaveResultsRequestParams) -> None:
         SaveAsWriter.__init__(self, stream, params)
-
-        self._data = []
+        self._row_count = 0
 
     def write_row(self, row: List[DbCellValue], columns: List[DbColumn]):
+        # Rows are separated from the previous one, the first one from the opening bracket of the array
+        self._file_stream.write(',\n ' if self._row_count > 0 else '[\n ')
+        self._file_stream.write(json.dumps(self.get_json_row(row, columns), indent=True).replace('\n', '\n '))
+        self._row_count += 1
+
+    def complete_write(self):
+        self._file_stream.write('\n]' if self._row_count > 0 else '[]')
 
+    def get_json_row(self, row: List[DbCellValue], columns: List[DbColumn]) -> dict:
         column_start_index = self.get_start_index()
         column_end_index = self.get_end_index(columns)
 
         json_row = {}
-
         for index in range(column_start_index, column_end_index):
             column_name = columns[index].column_name
             column_value = row[index].display_value
             json_row[column_name] = column_value
 
-        self._data.append(json_row)
-
-    def complete_write(self):
-        json.dump(self._data, self._file_stream, indent=True)
+        return json_row
@@ -0,0 +1,22 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+from typing import List
+
+from ossdbtoolsservice.query.data_storage.save_as_json_writer import SaveAsJsonWriter
+from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue
+
+
+class SaveAsNdjsonWriter(SaveAsJsonWriter):
+    """ Writes the rows as newline delimited JSON, one object keyed by column name per line """
+
+    def write_row(self, row: List[DbCellValue], columns: List[DbColumn]):
+        self._file_stream.write(json.dumps(self.get_json_row(row, columns)))
+        self._file_stream.write('\n')
+        self._row_count += 1
+
+    def complete_write(self):
+        pass
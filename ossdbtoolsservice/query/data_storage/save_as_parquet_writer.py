@@ -0,0 +1,29 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+
+import pyarrow
+import pyarrow.parquet
+
+from ossdbtoolsservice.query.data_storage.save_as_arrow_writer import SaveAsArrowWriter
+from ossdbtoolsservice.query.contracts import SaveResultsRequestParams
+
+# Compression of the row groups of Parquet files when the request does not set one
+DEFAULT_PARQUET_COMPRESSION = 'snappy'
+
+
+class SaveAsParquetWriter(SaveAsArrowWriter):
+    """ Writes the rows to a Parquet file, each record batch being a compressed row group """
+
+    def __init__(self, stream: io.BufferedWriter, params: SaveResultsRequestParams) -> None:
+        SaveAsArrowWriter.__init__(self, stream, params)
+
+    def _open_writer(self, schema: pyarrow.Schema):
+        compression = getattr(self._params, 'compression', None) or DEFAULT_PARQUET_COMPRESSION
+        return pyarrow.parquet.ParquetWriter(self._file_stream, schema, compression=compression)
+
+    def _write_record_batch(self, batch: pyarrow.RecordBatch) -> None:
+        self._writer.write_table(pyarrow.Table.from_batches([batch]))
@@ -4,15 +4,105 @@
 # --------------------------------------------------------------------------------------------
 
 from abc import abstractmethod
+import ast
+import datetime
+import decimal
 import io
-from typing import List
+import re
+from typing import Any, Callable, List, Optional  # noqa
 
+from pymysql.constants import FIELD_TYPE
+
+import ossdbtoolsservice.parsers.datatypes as datatypes
 from ossdbtoolsservice.query.data_storage.service_buffer import ServiceBufferFileStream
 from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue
+from ossdbtoolsservice.utils import constants
+
+# Format of intervals written to the buffer file, such as '-1 day, 23:59:59.000001'
+TIMEDELTA_PATTERN = re.compile(r'^(?:(-?\d+) days?, )?(-?\d+):(\d{2}):(\d{2})(?:\.(\d{1,6}))?$')
+
+
+def parse_decimal(value: str) -> decimal.Decimal:
+    try:
+        return decimal.Decimal(value)
+    except decimal.InvalidOperation:
+        raise ValueError('Invalid number {0}'.format(value))
+
+
+def parse_date(value: str) -> datetime.date:
+    return datetime.date.fromisoformat(value)
+
+
+def parse_time(value: str) -> datetime.time:
+    return datetime.time.fromisoformat(value)
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+def parse_timedelta(value: str) -> datetime.timedelta:
+    match = TIMEDELTA_PATTERN.match(value)
+    if match is None:
+        raise ValueError('Invalid interval {0}'.format(value))
+
+    days, hours, minutes, seconds, microseconds = match.groups()
+    return datetime.timedelta(days=int(days or 0), hours=int(hours), minutes=int(minutes), seconds=int(seconds),
+                              microseconds=int((microseconds or '0').ljust(6, '0')))
+
+
+def parse_bytes(value: str) -> bytes:
+    # Binary values are written to the buffer file as the representation of their bytes, such as b'\\x00'
+    parsed_value = ast.literal_eval(value)
+    if not isinstance(parsed_value, bytes):
+        raise ValueError('Invalid binary value {0}'.format(value))
+    return parsed_value
+
+
+PG_TYPED_VALUE_PARSERS = {
+    datatypes.DATATYPE_NUMERIC: parse_decimal,
+    datatypes.DATATYPE_DATE: parse_date,
+    datatypes.DATATYPE_TIME: parse_time,
+    datatypes.DATATYPE_TIME_WITH_TIMEZONE: parse_time,
+    datatypes.DATATYPE_TIMESTAMP: parse_datetime,
+    datatypes.DATATYPE_TIMESTAMP_WITH_TIMEZONE: parse_datetime,
+    datatypes.DATATYPE_INTERVAL: parse_timedelta,
+    datatypes.DATATYPE_BYTEA: parse_bytes
+}
+
+MYSQL_TYPED_VALUE_PARSERS = {
+    FIELD_TYPE.DECIMAL: parse_decimal,
+    FIELD_TYPE.NEWDECIMAL: parse_decimal,
+    FIELD_TYPE.DATE: parse_date,
+    FIELD_TYPE.NEWDATE: parse_date,
+    FIELD_TYPE.DATETIME: parse_datetime,
+    FIELD_TYPE.TIMESTAMP: parse_datetime,
+    FIELD_TYPE.TIME: parse_timedelta
+}
+
+
+def get_typed_value_parser(column: DbColumn) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns the function turning the raw values of a column back into the values of the driver, for the types
+    whose values are read from the buffer file as text, such as dates. Values that are not text, such as the ones
+    of in-memory result sets, are returned as they are
+    """
+    if column.provider in (constants.MYSQL_PROVIDER_NAME, constants.MARIADB_PROVIDER_NAME):
+        parse = MYSQL_TYPED_VALUE_PARSERS.get(column.data_type)
+    else:
+        parse = PG_TYPED_VALUE_PARSERS.get(column.data_type)
+
+    if parse is None:
+        return None
+
+    return lambda value: parse(value) if isinstance(value, str) else value
 
 
 class SaveAsWriter(ServiceBufferFileStream):
 
+    # Whether the writer takes rows of display values straight from the result buffer through write_display_rows
+    writes_display_rows = False
+
     def __init__(self, stream: io.BufferedWriter, params):
         ServiceBufferFileStream.__init__(self, stream)
 
@@ -29,6 +119,10 @@ class SaveAsWriter(ServiceBufferFileStream):
     def complete_write(self):
         pass
 
+    def write_display_rows(self, rows: List[tuple], columns: List[DbColumn]):
+        """ Writes rows given as the display values of the selected columns """
+        raise NotImplementedError()
+
     def get_start_index(self):
         return self._column_start_index if self._column_start_index else 0
 
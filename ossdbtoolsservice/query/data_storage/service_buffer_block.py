@@ -0,0 +1,194 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Block layout of the service buffer file format. A buffer file is a sequence of blocks, each one holding
+a group of consecutive rows so that it can be written and read back with a single call:
+
+    header        row count, column count and data length (BLOCK_HEADER)
+    offset table  row count * column count + 1 unsigned ints, the start of every cell within the data
+    null map      one byte per cell, non-zero when the cell is NULL
+    data          packed cell bytes as produced by the any-to-bytes converters
+
+Cells are stored column by column, so cell (row, column) is found at position column * row_count + row
+of the offset table and the null map. The cells of a fixed-width column all have the same size, NULL ones
+included, so that the whole column can be unpacked at once.
+
+Blocks can also be written compressed with zlib, each one on its own so that a block is read back without
+decompressing the rest of the file. Compressed files carry no marker: the reader has to know it.
+"""
+
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence  # noqa
+import struct
+import zlib
+
+from ossdbtoolsservice.query.contracts.column import DbCellValue
+from ossdbtoolsservice.query.data_storage.service_buffer_column_codec import ServiceBufferColumnCodec
+
+BLOCK_HEADER = struct.Struct('III')
+OFFSET_FORMAT = 'I'
+OFFSET_SIZE = array(OFFSET_FORMAT).itemsize
+
+# Defaults for the number of rows and the amount of cell data gathered before a block is written
+BLOCK_MAX_ROW_COUNT = 1000
+BLOCK_MAX_DATA_SIZE = 1024 * 1024
+
+# zlib level of compressed blocks, favoring speed as blocks are compressed while the results are fetched
+BLOCK_COMPRESSION_LEVEL = 1
+
+BLOCK_DATA_ERROR = 'Block data is truncated or corrupted'
+
+
+def encode_block(row_count: int, columns: List[List[Optional[bytes]]]) -> bytes:
+    """
+    Encodes rows into a block
+    :param row_count: number of rows held by the block
+    :param columns: the cell bytes of each column, in row order. None marks a NULL cell
+    """
+    cells = [cell for column in columns for cell in column]
+
+    cell_sizes = (len(cell) if cell is not None else 0 for cell in cells)
+    null_map = bytes(cell is None for cell in cells)
+    data = b''.join(cell for cell in cells if cell is not None)
+
+    return pack_block(row_count, len(columns), cell_sizes, null_map, data)
+
+
+def pack_block(row_count: int, column_count: int, cell_sizes: Iterable[int], null_map: bytes, data: bytes) -> bytes:
+    """
+    Assembles a block from its parts
+    :param cell_sizes: the number of bytes of each cell within the data, in column-major order
+    :param null_map: one byte per cell, non-zero when the cell is NULL
+    :param data: packed cell bytes
+    """
+    offsets = array(OFFSET_FORMAT, [0])
+    offsets.extend(accumulate(cell_sizes))
+
+    return b''.join((BLOCK_HEADER.pack(row_count, column_count, len(data)), offsets.tobytes(), null_map, data))
+
+
+def compress_block(block: bytes, level: int = BLOCK_COMPRESSION_LEVEL) -> bytes:
+    return zlib.compress(block, level)
+
+
+def decompress_block(buffer) -> bytes:
+    try:
+        return zlib.decompress(buffer)
+    except zlib.error as exc:
+        raise IOError(BLOCK_DATA_ERROR) from exc
+
+
+class ServiceBufferBlock:
+    """ Read-only view over the bytes of a single service buffer block """
+
+    def __init__(self, buffer) -> None:
+        if len(buffer) < BLOCK_HEADER.size:
+            raise IOError(BLOCK_DATA_ERROR)
+
+        self.row_count, self.column_count, data_length = BLOCK_HEADER.unpack_from(buffer)
+
+        cell_count = self.row_count * self.column_count
+        offsets_start = BLOCK_HEADER.size
+        null_map_start = offsets_start + (cell_count + 1) * OFFSET_SIZE
+        data_start = null_map_start + cell_count
+
+        if len(buffer) != data_start + data_length:
+            raise IOError(BLOCK_DATA_ERROR)
+
+        self._buffer = buffer
+        self._offsets = memoryview(buffer)[offsets_start:null_map_start].cast(OFFSET_FORMAT)
+        self._null_map = buffer[null_map_start:data_start]
+        self._data_start = data_start
+
+        # Values of the fixed-width columns, unpacked on first use. None when a column can't be unpacked at once
+        self._column_values: Dict[int, Optional[tuple]] = {}
+
+    def is_null(self, row_index: int, column_index: int) -> bool:
+        return self._null_map[column_index * self.row_count + row_index] != 0
+
+    def get_bytes(self, row_index: int, column_index: int):
+        """ Returns a slice of the block buffer, which is a memoryview when the block is backed by one """
+        cell_index = column_index * self.row_count + row_index
+        start = self._data_start + self._offsets[cell_index]
+        end = self._data_start + self._offsets[cell_index + 1]
+        return self._buffer[start:end]
+
+    def get_row(self, row_index: int, row_id: int, codecs: List[ServiceBufferColumnCodec]) -> List[DbCellValue]:
+        """ Decodes a row of the block into cell values, using the codecs of the columns of the result set """
+        if row_index < 0 or row_index >= self.row_count:
+            raise IndexError(f'Row {row_index} is not in the block')
+
+        results = []  # list of DbCellValue as return
+
+        for index, codec in enumerate(codecs):
+            if codec.is_null_type:
+                value = DbCellValue(display_value=None, is_null=True, raw_object=None, row_id=row_id)
+            elif self.is_null(row_index, index):
+                value = DbCellValue(display_value=str("NULL"), is_null=True, raw_object=None, row_id=row_id)
+            else:
+                result_object = self._get_value(row_index, index, codec)
+                value = DbCellValue(display_value=result_object, is_null=False, raw_object=result_object, row_id=row_id)
+
+            results.append(value)
+
+        return results
+
+    def get_display_rows(self, row_indexes: Sequence[int], column_indexes: Sequence[int], codecs: List[ServiceBufferColumnCodec]) -> List[tuple]:
+        """
+        Formats rows of the block straight into the display values of the given columns, column by column,
+        without building the cell values of the rows
+        """
+        columns = [self._get_display_column(row_indexes, index, codecs[index]) for index in column_indexes]
+        return list(zip(*columns)) if columns else [() for _ in row_indexes]
+
+    def _get_display_column(self, row_indexes: Sequence[int], column_index: int, codec: ServiceBufferColumnCodec) -> List[str]:
+        if codec.is_null_type:
+            return [''] * len(row_indexes)
+
+        first_cell = column_index * self.row_count
+        null_map = self._null_map[first_cell:first_cell + self.row_count]
+        format_value = codec.format
+
+        values = None
+        if codec.is_fixed_width:
+            if column_index not in self._column_values:
+                self._column_values[column_index] = self._unpack_column(column_index, codec)
+
+            values = self._column_values[column_index]
+
+        if not any(null_map):
+            if values is not None:
+                return [format_value(values[row_index]) for row_index in row_indexes]
+
+            return [format_value(codec.decode(self.get_bytes(row_index, column_index))) for row_index in row_indexes]
+
+        return [
+            'NULL' if null_map[row_index] else format_value(self._get_value(row_index, column_index, codec))
+            for row_index in row_indexes
+        ]
+
+    def _get_value(self, row_index: int, column_index: int, codec: ServiceBufferColumnCodec):
+        if codec.is_fixed_width:
+            if column_index not in self._column_values:
+                self._column_values[column_index] = self._unpack_column(column_index, codec)
+
+            column_values = self._column_values[column_index]
+
+            if column_values is not None:
+                return column_values[row_index]
+
+        return codec.decode(self.get_bytes(row_index, column_index))
+
+    def _unpack_column(self, column_index: int, codec: ServiceBufferColumnCodec) -> Optional[tuple]:
+        first_cell = column_index * self.row_count
+        start = self._offsets[first_cell]
+
+        # Blocks with NULL cells not stored at full width have to be decoded cell by cell
+        if self._offsets[first_cell + self.row_count] - start != self.row_count * codec.cell_size:
+            return None
+
+        return codec.unpack_column(self._buffer, self._data_start + start, self.row_count)
@@ -0,0 +1,49 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from collections import OrderedDict
+import threading
+
+from ossdbtoolsservice.query.data_storage.service_buffer_block import ServiceBufferBlock
+
+
+class ServiceBufferBlockCache:
+    """
+    Least recently used cache of decoded blocks, keyed by block index. It spares decompressing the same
+    block again when consecutive pages of a result set are read
+    """
+
+    def __init__(self, max_block_count: int) -> None:
+        if max_block_count <= 0:
+            raise ValueError('Maximum number of cached blocks must be greater than zero')
+
+        self._max_block_count = max_block_count
+        self._blocks: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def get(self, block_index: int) -> ServiceBufferBlock:
+        """ Returns the cached block, or None when it is not cached """
+        with self._lock:
+            block = self._blocks.get(block_index)
+
+            if block is not None:
+                self._blocks.move_to_end(block_index)
+
+            return block
+
+    def put(self, block_index: int, block: ServiceBufferBlock) -> None:
+        with self._lock:
+            self._blocks[block_index] = block
+            self._blocks.move_to_end(block_index)
+
+            while len(self._blocks) > self._max_block_count:
+                self._blocks.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
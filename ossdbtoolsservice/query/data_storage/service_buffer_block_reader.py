@@ -0,0 +1,44 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+
+from ossdbtoolsservice.query.data_storage.service_buffer import ServiceBufferFileStream
+from ossdbtoolsservice.query.data_storage.service_buffer_block import ServiceBufferBlock
+
+
+class ServiceBufferBlockReader(ServiceBufferFileStream):
+    """ Reader for block formatted service buffer file streams """
+
+    READER_STREAM_NONE_ERROR = "Stream argument is None"
+    READER_STREAM_NOT_SUPPORT_READING_ERROR = "Stream argument doesn't support reading"
+    READER_DATA_READ_ERROR = "Data read error"
+
+    def __init__(self, stream: io.BufferedReader) -> None:
+
+        if stream is None:
+            raise ValueError(ServiceBufferBlockReader.READER_STREAM_NONE_ERROR)
+
+        if not stream.readable():
+            raise ValueError(ServiceBufferBlockReader.READER_STREAM_NOT_SUPPORT_READING_ERROR)
+
+        ServiceBufferFileStream.__init__(self, stream)
+
+    def read_block(self, file_offset: int, length: int) -> ServiceBufferBlock:
+        """ Read a whole block with a single read """
+        return ServiceBufferBlock(self.read_block_bytes(file_offset, length))
+
+    def read_block_bytes(self, file_offset: int, length: int) -> bytes:
+        """ Read the bytes of a whole block as they are stored, which is needed for compressed blocks """
+        try:
+            self._file_stream.seek(file_offset)
+            buffer = self._file_stream.read(length)
+        except Exception as exc:
+            raise IOError(ServiceBufferBlockReader.READER_DATA_READ_ERROR) from exc
+
+        if len(buffer) != length:
+            raise IOError(ServiceBufferBlockReader.READER_DATA_READ_ERROR)
+
+        return buffer
@@ -0,0 +1,142 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+from itertools import repeat
+from typing import Any, List  # noqa
+
+from ossdbtoolsservice.query.contracts.column import DbColumn  # noqa
+from ossdbtoolsservice.query.data_storage.service_buffer import ServiceBufferFileStream
+from ossdbtoolsservice.query.data_storage.service_buffer_block import BLOCK_MAX_DATA_SIZE, BLOCK_MAX_ROW_COUNT, compress_block, pack_block
+from ossdbtoolsservice.query.data_storage.service_buffer_column_codec import ServiceBufferColumnCodec, get_column_codecs  # noqa
+from ossdbtoolsservice.query.data_storage import StorageDataReader
+
+
+class ServiceBufferBlockWriter(ServiceBufferFileStream):
+    """
+    Writer for block formatted service buffer file streams. Rows are gathered in memory and written
+    as one block when flush_block is called, compressed when the writer is created with is_compressed.
+    """
+
+    WRITER_STREAM_NONE_ERROR = "Stream argument is None"
+    WRITER_STREAM_NOT_SUPPORT_WRITING_ERROR = "Stream argument doesn't support writing"
+    WRITER_DATA_WRITE_ERROR = "Data write error"
+
+    def __init__(self, stream: io.BufferedWriter, max_row_count: int = BLOCK_MAX_ROW_COUNT, max_data_size: int = BLOCK_MAX_DATA_SIZE,
+                 is_compressed: bool = False) -> None:
+
+        if stream is None:
+            raise ValueError(ServiceBufferBlockWriter.WRITER_STREAM_NONE_ERROR)
+
+        if not stream.writable():
+            raise ValueError(ServiceBufferBlockWriter.WRITER_STREAM_NOT_SUPPORT_WRITING_ERROR)
+
+        ServiceBufferFileStream.__init__(self, stream)
+
+        self._max_row_count = max_row_count
+        self._max_data_size = max_data_size
+        self._is_compressed = is_compressed
+
+        # Codecs of the columns being written, resolved once for all the rows of the same columns
+        self._columns_info: List[DbColumn] = None
+        self._codecs: List[ServiceBufferColumnCodec] = []
+        self._variable_width_columns: List[int] = []
+        self._fixed_width_columns: List[int] = []
+        self._fixed_width_row_size = 0
+
+        # Cells of the pending rows by column. Fixed-width columns hold the values, which are packed when the
+        # block is written, and the other columns the converted bytes. None marks a NULL cell
+        self._pending_columns: List[List[Any]] = []
+        self._pending_row_count = 0
+        self._pending_data_size = 0
+
+    @property
+    def pending_row_count(self) -> int:
+        return self._pending_row_count
+
+    @property
+    def is_block_full(self) -> bool:
+        return self._pending_row_count >= self._max_row_count or self._pending_data_size >= self._max_data_size
+
+    def write_row(self, reader: StorageDataReader) -> None:
+        """ Add the current row of the reader to the pending block """
+        if self._pending_row_count == 0:
+            # The rows of a block share the same columns
+            if reader.columns_info is not self._columns_info:
+                self._set_columns(reader.columns_info)
+
+            self._pending_columns = [[] for _ in self._codecs]
+
+        row = reader.get_values()
+
+        for index in self._fixed_width_columns:
+            self._pending_columns[index].append(row[index])
+
+        for index in self._variable_width_columns:
+            value = row[index]
+
+            if value is None:
+                self._pending_columns[index].append(None)
+            else:
+                value_to_write = self._codecs[index].encode(value)
+                self._pending_data_size += len(value_to_write)
+                self._pending_columns[index].append(value_to_write)
+
+        self._pending_data_size += self._fixed_width_row_size
+        self._pending_row_count += 1
+
+    def flush_block(self) -> int:
+        """
+        Write the pending rows as a single block and return the number of bytes written. The stream is flushed
+        so that the block can be read from the file while the writer is still open
+        """
+        if self._pending_row_count == 0:
+            return 0
+
+        block = self._encode_block()
+
+        if self._is_compressed:
+            block = compress_block(block)
+
+        try:
+            written_byte_number = self._file_stream.write(block)
+            self._file_stream.flush()
+        except Exception as exc:
+            raise IOError(ServiceBufferBlockWriter.WRITER_DATA_WRITE_ERROR) from exc
+
+        self._pending_columns = []
+        self._pending_row_count = 0
+        self._pending_data_size = 0
+
+        return written_byte_number
+
+    def seek(self, offset):
+        self._file_stream.seek(offset, io.SEEK_SET)
+
+    def _set_columns(self, columns_info: List[DbColumn]) -> None:
+        self._columns_info = columns_info
+        self._codecs = get_column_codecs(columns_info)
+        self._fixed_width_columns = [index for index, codec in enumerate(self._codecs) if codec.is_fixed_width]
+        self._variable_width_columns = [index for index, codec in enumerate(self._codecs) if not codec.is_fixed_width]
+        self._fixed_width_row_size = sum(self._codecs[index].cell_size for index in self._fixed_width_columns)
+
+    def _encode_block(self) -> bytes:
+        row_count = self._pending_row_count
+        cell_sizes: List[int] = []
+        null_map = bytearray()
+        data = []
+
+        for codec, cells in zip(self._codecs, self._pending_columns):
+            if codec.is_fixed_width:
+                # The whole column is packed in a single call
+                data.append(codec.pack_column(cells))
+                cell_sizes.extend(repeat(codec.cell_size, row_count))
+            else:
+                data.extend(cell for cell in cells if cell is not None)
+                cell_sizes.extend(len(cell) if cell is not None else 0 for cell in cells)
+
+            null_map.extend(cell is None for cell in cells)
+
+        return pack_block(row_count, len(self._codecs), cell_sizes, bytes(null_map), b''.join(data))
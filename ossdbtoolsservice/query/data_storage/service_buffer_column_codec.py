@@ -0,0 +1,70 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from typing import Any, Callable, Dict, List, Optional  # noqa
+import struct
+
+from ossdbtoolsservice.converters import get_any_to_bytes_converter, get_bytes_to_any_converter, get_struct_format
+from ossdbtoolsservice.parsers import datatypes
+from ossdbtoolsservice.query.contracts.column import DbColumn
+
+
+class ServiceBufferColumnCodec:
+    """
+    Converters of a single column of a result set, resolved once for all the rows. Columns of a fixed-width type
+    also get a struct format, which packs or unpacks all the cells of the column within a block in a single call
+    """
+
+    def __init__(self, column: DbColumn) -> None:
+        self.column = column
+        self.is_null_type = column.data_type == datatypes.DATATYPE_NULL
+
+        self.encode: Callable[[Any], bytearray] = get_any_to_bytes_converter(column.data_type, provider=column.provider)
+        self.decode: Callable[[bytes], Any] = get_bytes_to_any_converter(column.data_type, provider=column.provider)
+
+        # Formats decoded values as the display values of their cells
+        self.format: Callable[[Any], str] = str
+
+        struct_format = get_struct_format(column.data_type, provider=column.provider)
+        self._cell_format = struct_format
+        self._cell_struct = struct.Struct(struct_format) if struct_format is not None else None
+        self._column_structs: Dict[int, struct.Struct] = {}
+
+    @property
+    def is_fixed_width(self) -> bool:
+        return self._cell_struct is not None
+
+    @property
+    def cell_size(self) -> int:
+        """ Number of bytes of every cell of a fixed-width column """
+        return self._cell_struct.size
+
+    def pack_column(self, values: List[Any]) -> bytes:
+        """ Packs the cells of a fixed-width column. NULL cells are packed as zero so that every cell has the same size """
+        return self._get_column_struct(len(values)).pack(*[0 if value is None else value for value in values])
+
+    def unpack_column(self, buffer, offset: int, cell_count: int) -> tuple:
+        """ Unpacks the cells of a fixed-width column starting at the offset of the buffer """
+        return self._get_column_struct(cell_count).unpack_from(buffer, offset)
+
+    def convert(self, value: Any) -> Any:
+        """ Converts a value of the driver to the value decoded from a buffer file block, without writing it """
+        if self._cell_struct is not None:
+            return self._cell_struct.unpack(self._cell_struct.pack(value))[0]
+
+        return self.decode(self.encode(value))
+
+    def _get_column_struct(self, cell_count: int) -> struct.Struct:
+        column_struct = self._column_structs.get(cell_count)
+
+        if column_struct is None:
+            column_struct = struct.Struct(f'{cell_count}{self._cell_format}')
+            self._column_structs[cell_count] = column_struct
+
+        return column_struct
+
+
+def get_column_codecs(columns_info: List[DbColumn]) -> List[ServiceBufferColumnCodec]:
+    return [ServiceBufferColumnCodec(column) for column in columns_info]
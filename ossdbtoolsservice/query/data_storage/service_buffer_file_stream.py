@@ -7,8 +7,8 @@ import tempfile
 import io
 import os
 
-from ossdbtoolsservice.query.data_storage.service_buffer_file_stream_writer import ServiceBufferFileStreamWriter
-from ossdbtoolsservice.query.data_storage.service_buffer_file_stream_reader import ServiceBufferFileStreamReader
+from ossdbtoolsservice.query.data_storage.service_buffer_block_writer import ServiceBufferBlockWriter
+from ossdbtoolsservice.query.data_storage.service_buffer_memory_mapped_reader import ServiceBufferMemoryMappedReader
 
 
 def create_file() -> str:
@@ -16,11 +16,12 @@ def create_file() -> str:
 
 
 def get_reader(file_name: str):
-    return ServiceBufferFileStreamReader(io.open(file_name, 'rb'))
+    return ServiceBufferMemoryMappedReader(io.open(file_name, 'rb'))
 
 
-def get_writer(file_name: str):
-    return ServiceBufferFileStreamWriter(io.open(file_name, 'wb'))
+def get_writer(file_name: str, append: bool = False, is_compressed: bool = False):
+    """ Returns a writer for the file. When append is set the existing content of the file is kept """
+    return ServiceBufferBlockWriter(io.open(file_name, 'r+b' if append else 'wb'), is_compressed=is_compressed)
 
 
 def delete_file(file_name: str):
@@ -0,0 +1,90 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import mmap
+import os
+import threading
+
+from ossdbtoolsservice.query.data_storage.service_buffer import ServiceBufferFileStream
+from ossdbtoolsservice.query.data_storage.service_buffer_block import ServiceBufferBlock
+
+
+class ServiceBufferMemoryMappedReader(ServiceBufferFileStream):
+    """
+    Reader for block formatted service buffer files that maps the file into memory. It is meant to stay
+    open while the file is in use: blocks are returned as views over the mapping without copying, and the
+    mapping is extended when blocks appended after it was created are requested.
+    """
+
+    READER_STREAM_NONE_ERROR = "Stream argument is None"
+    READER_STREAM_NOT_SUPPORT_READING_ERROR = "Stream argument doesn't support reading"
+    READER_DATA_READ_ERROR = "Data read error"
+
+    def __init__(self, stream: io.BufferedReader) -> None:
+
+        if stream is None:
+            raise ValueError(ServiceBufferMemoryMappedReader.READER_STREAM_NONE_ERROR)
+
+        if not stream.readable():
+            raise ValueError(ServiceBufferMemoryMappedReader.READER_STREAM_NOT_SUPPORT_READING_ERROR)
+
+        ServiceBufferFileStream.__init__(self, stream)
+
+        self._mapping: mmap.mmap = None
+        self._view: memoryview = None
+        self._lock = threading.Lock()
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def read_block(self, file_offset: int, length: int) -> ServiceBufferBlock:
+        """ Return a view over a whole block """
+        return ServiceBufferBlock(self.read_block_bytes(file_offset, length))
+
+    def read_block_bytes(self, file_offset: int, length: int) -> memoryview:
+        """ Return a view over the bytes of a whole block as they are stored, which is needed for compressed blocks """
+        view = self._get_view(file_offset + length)
+        return view[file_offset:file_offset + length]
+
+    def close(self):
+        with self._lock:
+            self._release_mapping()
+            self._file_stream.close()
+
+    def _get_view(self, size: int) -> memoryview:
+        with self._lock:
+            if self._view is None or len(self._view) < size:
+                self._release_mapping()
+                self._map_file()
+
+            if self._view is None or len(self._view) < size:
+                raise IOError(ServiceBufferMemoryMappedReader.READER_DATA_READ_ERROR)
+
+            return self._view
+
+    def _map_file(self):
+        try:
+            file_size = os.fstat(self._file_stream.fileno()).st_size
+
+            # Empty files cannot be mapped
+            if file_size > 0:
+                self._mapping = mmap.mmap(self._file_stream.fileno(), file_size, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mapping)
+        except Exception as exc:
+            raise IOError(ServiceBufferMemoryMappedReader.READER_DATA_READ_ERROR) from exc
+
+    def _release_mapping(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # Blocks handed out earlier still reference the mapping. It is unmapped once they are released
+                pass
+            self._mapping = None
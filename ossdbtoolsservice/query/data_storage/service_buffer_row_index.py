@@ -0,0 +1,109 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from array import array
+import bisect
+from typing import Iterable, Iterator, List  # noqa
+
+# Format of the items of the index, 8 bytes per row
+ROW_INDEX_FORMAT = 'q'
+
+# Tombstones are compacted once they outnumber this share of the slots of the index
+TOMBSTONE_COMPACTION_RATIO = 8
+TOMBSTONE_COMPACTION_MIN_COUNT = 1024
+
+
+class ServiceBufferRowIndex:
+    """
+    Maps the index of each row of a result set to the number of the written row of the buffer file holding
+    its values. Numbers are kept in an array of 8-byte integers. Removed rows leave a tombstone on their slot
+    instead of shifting the rest of the array, and the tombstones are compacted once they are numerous enough,
+    which keeps removals constant time amortized.
+    """
+
+    def __init__(self) -> None:
+        self._slots = array(ROW_INDEX_FORMAT)
+
+        # Sorted positions of the slots of removed rows
+        self._tombstones: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slots) - len(self._tombstones)
+
+    def __iter__(self) -> Iterator[int]:
+        return self.iterate(0, len(self))
+
+    def __getitem__(self, row_id: int) -> int:
+        return self._slots[self._get_slot(row_id)]
+
+    def __setitem__(self, row_id: int, written_row: int) -> None:
+        self._slots[self._get_slot(row_id)] = written_row
+
+    def __delitem__(self, row_id: int) -> None:
+        bisect.insort(self._tombstones, self._get_slot(row_id))
+
+        if len(self._tombstones) >= max(TOMBSTONE_COMPACTION_MIN_COUNT, len(self._slots) // TOMBSTONE_COMPACTION_RATIO):
+            self._compact()
+
+    def append(self, written_row: int) -> None:
+        self._slots.append(written_row)
+
+    def extend(self, written_rows: Iterable[int]) -> None:
+        self._slots.extend(written_rows)
+
+    def iterate(self, start_index: int, end_index: int) -> Iterator[int]:
+        """ Yields the written row numbers of the rows in the given range """
+        if not self._tombstones:
+            yield from self._slots[start_index:end_index]
+            return
+
+        slot = self._get_slot(start_index) if start_index < end_index else 0
+        tombstone_index = bisect.bisect_left(self._tombstones, slot)
+
+        for _ in range(start_index, end_index):
+            while tombstone_index < len(self._tombstones) and self._tombstones[tombstone_index] == slot:
+                tombstone_index += 1
+                slot += 1
+
+            yield self._slots[slot]
+            slot += 1
+
+    def _get_slot(self, row_id: int) -> int:
+        if row_id < 0:
+            row_id += len(self)
+
+        if row_id < 0 or row_id >= len(self):
+            raise IndexError('Row index out of range')
+
+        if not self._tombstones:
+            return row_id
+
+        # The slot is the first one preceded by row_id live slots. The number of live slots up to a slot grows
+        # with the slot, so it is searched by bisection between row_id and row_id plus the number of tombstones
+        low = row_id
+        high = row_id + len(self._tombstones)
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if middle - bisect.bisect_right(self._tombstones, middle) < row_id:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _compact(self) -> None:
+        slots = array(ROW_INDEX_FORMAT)
+        start = 0
+
+        for tombstone in self._tombstones:
+            slots.extend(self._slots[start:tombstone])
+            start = tombstone + 1
+
+        slots.extend(self._slots[start:])
+
+        self._slots = slots
+        self._tombstones = []
@@ -7,35 +7,65 @@ from typing import List
 
 from ossdbtoolsservice.query.contracts import DbColumn
 from ossdbtoolsservice.query.column_info import get_columns_info
+from ossdbtoolsservice.utils.constants import DEFAULT_FETCH_BATCH_SIZE
 
 
 class StorageDataReader:
 
-    def __init__(self, cursor) -> None:
+    def __init__(self, cursor, fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE, fetched_rows: List[tuple] = None,
+                 columns_info: List[DbColumn] = None) -> None:
+        '''
+        :param fetched_rows: rows already fetched from the cursor, read before the ones left in the cursor
+        :param columns_info: description of the columns of the cursor, when it is already known
+        '''
+        if fetch_batch_size <= 0:
+            raise ValueError('Fetch batch size must be greater than zero')
+
         self._cursor = cursor
+        self._fetch_batch_size = fetch_batch_size
         self._current_row: tuple = None
-        self._columns_info = []
+        self._columns_info: List[DbColumn] = columns_info
+
+        # Rows fetched from the cursor that are handed out one at a time by read_row
+        self._fetched_rows: List[tuple] = fetched_rows if fetched_rows is not None else []
+        self._fetched_row_index = 0
+        self._is_cursor_exhausted = False
 
     @property
     def columns_info(self) -> List[DbColumn]:
-        return self._columns_info
+        return self._columns_info if self._columns_info is not None else []
 
     def read_row(self) -> bool:
         '''
-        read_row uses the cursor to iterate over. It iterates over the cursor one at a time
-        and returns True if it finds the row and False if it doesn’t
+        read_row moves to the next row of the cursor. Rows are fetched from the cursor in batches of
+        fetch_batch_size rows. Returns True if it finds the row and False if it doesn’t
         '''
-        row_found = False
-
-        for row in self._cursor:
-            self._current_row = row
-            row_found = True
-            break
+        if self._fetched_row_index >= len(self._fetched_rows) and not self._is_cursor_exhausted:
+            self._fetched_rows = self._cursor.fetchmany(self._fetch_batch_size) or []
+            self._fetched_row_index = 0
+            self._is_cursor_exhausted = len(self._fetched_rows) == 0
 
-        if self._current_row is None or len(self._columns_info) == 0:
+        # The columns are described once the first batch is fetched, as named cursors have no description before
+        if self._columns_info is None:
             self._columns_info = get_columns_info(self._cursor)
 
-        return row_found
+        if self._fetched_row_index >= len(self._fetched_rows):
+            return False
+
+        self._current_row = self._fetched_rows[self._fetched_row_index]
+        self._fetched_row_index += 1
+
+        return True
+
+    def take_unread_rows(self) -> List[tuple]:
+        '''
+        Returns the rows fetched from the cursor that were not read yet. They are no longer returned by read_row,
+        which fetches the next rows from the cursor
+        '''
+        rows = self._fetched_rows[self._fetched_row_index:]
+        self._fetched_rows = []
+        self._fetched_row_index = 0
+        return rows
 
     def get_value(self, column_index: int):
         return self._current_row[column_index]
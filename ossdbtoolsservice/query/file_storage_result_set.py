@@ -3,12 +3,22 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from typing import List
+import bisect
+import time
+from typing import Iterator, List
 
 from ossdbtoolsservice.query.result_set import ResultSet, ResultSetEvents
-from ossdbtoolsservice.query.data_storage import service_buffer_file_stream as file_stream, FileStreamFactory, StorageDataReader
+from ossdbtoolsservice.query.data_storage import (
+    service_buffer_file_stream as file_stream, get_column_codecs, FileStreamFactory, ServiceBufferBlock, ServiceBufferBlockCache,
+    ServiceBufferColumnCodec, ServiceBufferRowIndex, StorageDataReader
+)
+from ossdbtoolsservice.query.data_storage.save_as_writer import SaveAsWriter
+from ossdbtoolsservice.query.data_storage.service_buffer_block import decompress_block
 from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, ResultSetSubset, SaveResultsRequestParams  # noqa
+from ossdbtoolsservice.query.result_set_page_cache import PAGE_CACHE, PAGE_ROW_COUNT, ResultSetPageCache
+from ossdbtoolsservice.query.save_as_progress import SaveAsProgress
 import ossdbtoolsservice.utils as utils
+from ossdbtoolsservice.utils.constants import DEFAULT_FETCH_BATCH_SIZE
 
 
 class FileStorageResultSet(ResultSet):
@@ -17,16 +27,48 @@ class FileStorageResultSet(ResultSet):
     RESULT_SET_START_OUT_OF_RANGE_ERROR = 'Result set start row out of range'
     RESULT_SET_ROW_COUNT_OF_RANGE_ERROR = 'Result set row count out of range'
 
-    def __init__(self, result_set_id: int, batch_id: int, events: ResultSetEvents = None) -> None:
+    # Minimum number of seconds between two partially loaded events while the result set is read
+    RESULT_SET_UPDATE_INTERVAL = 1
+
+    # Number of decompressed blocks kept in memory when the buffer file is compressed
+    BLOCK_CACHE_SIZE = 8
+
+    def __init__(self, result_set_id: int, batch_id: int, events: ResultSetEvents = None, fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+                 is_compressed: bool = False, page_cache: ResultSetPageCache = PAGE_CACHE) -> None:
         ResultSet.__init__(self, result_set_id, batch_id, events)
 
+        self._fetch_batch_size = fetch_batch_size
+        self._is_compressed = is_compressed
         self._total_bytes_written = 0
         self._output_file_name = file_stream.create_file()
-        self._file_offsets: List[int] = []
+
+        # Rows are written to the buffer file in blocks. Rows are numbered in the order they were written,
+        # and each block records its file offset and the number of the first row it holds. The result set
+        # can be read while it is being written, so a block is recorded before its rows are made visible
+        self._block_offsets: List[int] = []
+        self._block_first_rows: List[int] = []
+        self._written_row_count = 0
+
+        # Maps the index of each row of the result set to the number of the written row holding its values
+        self._row_locations = ServiceBufferRowIndex()
+
+        # Reader shared by all the reads of the result set, opened on first use and closed on dispose
+        self._reader = None
+
+        # Blocks of a compressed buffer file are decompressed on read. The ones read last are kept, as
+        # consecutive pages of the result set usually fall in the same blocks
+        self._block_cache = ServiceBufferBlockCache(FileStorageResultSet.BLOCK_CACHE_SIZE) if is_compressed else None
+
+        # Decoded rows of the subsets, cached by page under the name of the buffer file
+        self._page_cache = page_cache
+
+        # Codecs decoding the columns of the rows, resolved once for the columns of the result set
+        self._codecs: List[ServiceBufferColumnCodec] = []
+        self._codecs_columns_info: List[DbColumn] = None
 
     @property
     def row_count(self) -> int:
-        return len(self._file_offsets)
+        return len(self._row_locations)
 
     def get_subset(self, start_index: int, end_index: int):
         if not self._has_been_read:
@@ -38,11 +80,10 @@ class FileStorageResultSet(ResultSet):
         if end_index < 0:
             raise KeyError(FileStorageResultSet.RESULT_SET_ROW_COUNT_OF_RANGE_ERROR)
 
-        rows = []
+        # While the result set is being read only the rows written so far are returned
+        end_index = min(end_index, self.row_count)
 
-        with file_stream.get_reader(self._output_file_name) as reader:
-            rows_offsets = [self._file_offsets[index] for index in range(start_index, end_index)]
-            rows = [reader.read_row(offset, index, self.columns_info) for index, offset in enumerate(rows_offsets)]
+        rows = self._get_rows(start_index, end_index)
 
         subset = ResultSetSubset()
 
@@ -52,18 +93,26 @@ class FileStorageResultSet(ResultSet):
         return subset
 
     def add_row(self, cursor):
-        new_offset = self._append_row_to_buffer(cursor)
-        self._file_offsets.append(new_offset)
+        written_row = self._append_row_to_buffer(cursor)
+        self._row_locations.append(written_row)
+
+        # Only whole pages are cached, but the last one may be whole now
+        self._page_cache.invalidate(self._output_file_name, (self.row_count - 1) // PAGE_ROW_COUNT)
 
     def remove_row(self, row_id: int):
         if not self._has_been_read:
             raise ValueError(FileStorageResultSet.RESULT_SET_NOT_READ_ERROR)
 
-        del self._file_offsets[row_id]
+        del self._row_locations[row_id]
+
+        # The rows after the removed one are shifted to the previous index
+        self._page_cache.invalidate(self._output_file_name, row_id // PAGE_ROW_COUNT)
 
     def update_row(self, row_id: int, cursor):
-        new_offset = self._append_row_to_buffer(cursor)
-        self._file_offsets[row_id] = new_offset
+        written_row = self._append_row_to_buffer(cursor)
+        self._row_locations[row_id] = written_row
+
+        self._page_cache.invalidate(self._output_file_name, row_id // PAGE_ROW_COUNT)
 
     def get_row(self, row_id: int) -> List[DbCellValue]:
 
@@ -73,35 +122,210 @@ class FileStorageResultSet(ResultSet):
         if row_id >= self.row_count:
             raise KeyError(FileStorageResultSet.RESULT_SET_START_OUT_OF_RANGE_ERROR)
 
-        with file_stream.get_reader(self._output_file_name) as reader:
-            return reader.read_row(self._file_offsets[row_id], row_id, self.columns_info)
+        return next(self._iterate_rows(self._get_reader(), row_id, row_id + 1))
 
-    def read_result_to_end(self, cursor):
+    def read_result_to_end(self, cursor, fetched_rows: List[tuple] = None, columns_info: List[DbColumn] = None):
+        '''
+        Reads the rows of the cursor into the buffer file
+        :param fetched_rows: rows already fetched from the cursor, stored before the ones left in the cursor
+        :param columns_info: description of the columns of the cursor, when it is already known
+        '''
         utils.validate.is_not_none('cursor', cursor)
 
         self._has_been_read = True
-        storage_data_reader = StorageDataReader(cursor)
+        storage_data_reader = StorageDataReader(cursor, self._fetch_batch_size, fetched_rows, columns_info)
 
-        with file_stream.get_writer(self._output_file_name) as writer:
+        # When the partially loaded event is handled, the rows read so far are written and reported periodically
+        # so that they can be fetched before the whole cursor is read. The first rows are reported right away
+        on_partially_loaded = self.events._on_result_set_partially_loaded if self.events is not None else None
+        next_update_time = time.monotonic()
+
+        with file_stream.get_writer(self._output_file_name, is_compressed=self._is_compressed) as writer:
 
             while storage_data_reader.read_row():
-                self._file_offsets.append(self._total_bytes_written)
-                self._total_bytes_written += writer.write_row(storage_data_reader)
+                writer.write_row(storage_data_reader)
+
+                is_update_due = on_partially_loaded is not None and time.monotonic() >= next_update_time
+
+                if writer.is_block_full or is_update_due:
+                    self.columns_info = storage_data_reader.columns_info
+                    self._flush_result_rows(writer)
+
+                if is_update_due:
+                    next_update_time = time.monotonic() + FileStorageResultSet.RESULT_SET_UPDATE_INTERVAL
+                    on_partially_loaded(self)
+
+            self._flush_result_rows(writer)
 
             self.columns_info = storage_data_reader.columns_info
 
-    def do_save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure) -> None:
+        self._is_complete = True
+
+    def dispose(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+        if self._block_cache is not None:
+            self._block_cache.clear()
+
+        self._page_cache.remove_owner(self._output_file_name)
+
+        try:
+            file_stream.delete_file(self._output_file_name)
+        except OSError:
+            # The file can still be open by a save as operation on platforms that don't allow deleting open files
+            pass
+
+    def iterate_rows(self, start_index: int, end_index: int) -> Iterator[List[DbCellValue]]:
+        # The scan gets a reader of its own, as the shared one serves the subsets meanwhile
+        with file_stream.get_reader(self._output_file_name) as reader:
+            yield from self._iterate_rows(reader, start_index, end_index)
+
+    def do_save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure,
+                   progress: SaveAsProgress = None) -> None:
 
         with file_factory.get_writer(file_path) as writer:
             with file_factory.get_reader(self._output_file_name) as reader:
-                for row_index in range(row_start_index, row_end_index):
-                    row = reader.read_row(self._file_offsets[row_index], row_index, self.columns_info)
-                    writer.write_row(row, self.columns_info)
+                if isinstance(writer, SaveAsWriter) and writer.writes_display_rows:
+                    column_indexes = range(writer.get_start_index(), writer.get_end_index(self.columns_info))
+
+                    for rows in self._iterate_display_rows(reader, row_start_index, row_end_index, column_indexes):
+                        writer.write_display_rows(rows, self.columns_info)
+
+                        if progress is not None:
+                            progress.add_rows(len(rows))
+                else:
+                    for row in self._iterate_rows(reader, row_start_index, row_end_index):
+                        writer.write_row(row, self.columns_info)
+
+                        if progress is not None:
+                            progress.add_rows(1)
 
                 writer.complete_write()
 
-                if on_success is not None:
-                    on_success()
+        # The file is flushed and closed once the writer exits, only then is it complete for the client
+        if on_success is not None:
+            on_success()
+
+    def _get_rows(self, start_index: int, end_index: int) -> List[List[DbCellValue]]:
+        """ Returns the decoded rows in the given range, from the page cache when they are cached """
+        rows: List[List[DbCellValue]] = []
+
+        for page_index in range(start_index // PAGE_ROW_COUNT, (end_index - 1) // PAGE_ROW_COUNT + 1):
+            page_start = page_index * PAGE_ROW_COUNT
+            page_end = page_start + PAGE_ROW_COUNT
+
+            # The last page gets more rows as the result set is read or edited, so only whole pages are cached
+            if page_end > self.row_count:
+                rows.extend(self._iterate_rows(self._get_reader(), max(start_index, page_start), end_index))
+                continue
+
+            page_rows = self._page_cache.get(self._output_file_name, page_index)
+
+            if page_rows is None:
+                generation = self._page_cache.get_generation(self._output_file_name)
+                page_rows = list(self._iterate_rows(self._get_reader(), page_start, page_end))
+                self._page_cache.put(self._output_file_name, page_index, page_rows, generation)
+
+            rows.extend(page_rows[max(start_index, page_start) - page_start:min(end_index, page_end) - page_start])
+
+        return rows
+
+    def _get_reader(self):
+        if self._reader is None:
+            self._reader = file_stream.get_reader(self._output_file_name)
+
+        return self._reader
+
+    def _iterate_rows(self, reader, start_index: int, end_index: int) -> Iterator[List[DbCellValue]]:
+        """ Decodes the rows in the given range, reading each block only once for consecutive rows """
+        block_index: int = None
+        block: ServiceBufferBlock = None
+        codecs = self._get_codecs()
+
+        for row_id, written_row in zip(range(start_index, end_index), self._row_locations.iterate(start_index, end_index)):
+            row_block_index = bisect.bisect_right(self._block_first_rows, written_row) - 1
+
+            if row_block_index != block_index:
+                block_index = row_block_index
+                block = self._read_block(reader, block_index)
+
+            yield block.get_row(written_row - self._block_first_rows[block_index], row_id, codecs)
+
+    def _iterate_display_rows(self, reader, start_index: int, end_index: int, column_indexes: range) -> Iterator[List[tuple]]:
+        """ Formats the rows in the given range into display values, yielding the rows read from each block together """
+        block_index: int = None
+        block_start = block_end = 0
+        block_rows: List[int] = []
+        codecs = self._get_codecs()
+
+        for written_row in self._row_locations.iterate(start_index, end_index):
+            if not block_start <= written_row < block_end:
+                if block_rows:
+                    yield self._read_block(reader, block_index).get_display_rows(block_rows, column_indexes, codecs)
+                    block_rows = []
+
+                block_index = bisect.bisect_right(self._block_first_rows, written_row) - 1
+                block_start = self._block_first_rows[block_index]
+                block_end = self._block_first_rows[block_index + 1] if block_index + 1 < len(self._block_first_rows) else self._written_row_count
+
+            block_rows.append(written_row - block_start)
+
+        if block_rows:
+            yield self._read_block(reader, block_index).get_display_rows(block_rows, column_indexes, codecs)
+
+    def _read_block(self, reader, block_index: int) -> ServiceBufferBlock:
+        if not self._is_compressed:
+            return reader.read_block(self._block_offsets[block_index], self._get_block_length(block_index))
+
+        # Blocks are never rewritten, rows that are updated are appended in new blocks
+        block = self._block_cache.get(block_index)
+
+        if block is None:
+            buffer = reader.read_block_bytes(self._block_offsets[block_index], self._get_block_length(block_index))
+            block = ServiceBufferBlock(decompress_block(buffer))
+            self._block_cache.put(block_index, block)
+
+        return block
+
+    def _get_codecs(self) -> List[ServiceBufferColumnCodec]:
+        columns_info = self.columns_info
+
+        if columns_info is not self._codecs_columns_info:
+            self._codecs = get_column_codecs(columns_info)
+            self._codecs_columns_info = columns_info
+
+        return self._codecs
+
+    def _get_block_length(self, block_index: int) -> int:
+        block_end = self._block_offsets[block_index + 1] if block_index + 1 < len(self._block_offsets) else self._total_bytes_written
+        return block_end - self._block_offsets[block_index]
+
+    def _flush_block(self, writer) -> int:
+        """ Writes the pending rows of the writer as a block and returns the number of the first row written """
+        first_row = self._written_row_count
+        row_count = writer.pending_row_count
+
+        if row_count == 0:
+            return first_row
+
+        block_offset = self._total_bytes_written
+        block_length = writer.flush_block()
+
+        # The end of the last block is given by the total bytes written, which is updated after the block
+        # is recorded so that a concurrent read never sees a block spanning the one being written
+        self._block_offsets.append(block_offset)
+        self._block_first_rows.append(first_row)
+        self._total_bytes_written += block_length
+        self._written_row_count += row_count
+
+        return first_row
+
+    def _flush_result_rows(self, writer) -> None:
+        """ Writes the pending rows of the writer as a block and appends them to the rows of the result set """
+        first_row = self._flush_block(writer)
+        self._row_locations.extend(range(first_row, self._written_row_count))
 
     def _append_row_to_buffer(self, cursor):
 
@@ -111,9 +335,9 @@ class FileStorageResultSet(ResultSet):
             raise ValueError(FileStorageResultSet.RESULT_SET_NOT_READ_ERROR)
 
         storage_data_reader = StorageDataReader(cursor)
+        storage_data_reader.read_row()
 
-        with file_stream.get_writer(self._output_file_name) as writer:
-            current_file_offset = self._total_bytes_written
-            writer.seek(current_file_offset)
-            self._total_bytes_written += writer.write_row(storage_data_reader)
-            return current_file_offset
+        with file_stream.get_writer(self._output_file_name, append=True, is_compressed=self._is_compressed) as writer:
+            writer.seek(self._total_bytes_written)
+            writer.write_row(storage_data_reader)
+            return self._flush_block(writer)
@@ -0,0 +1,193 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import time
+from typing import Iterator, List
+
+from ossdbtoolsservice.query.result_set import ResultSet, ResultSetEvents
+from ossdbtoolsservice.query.file_storage_result_set import FileStorageResultSet
+from ossdbtoolsservice.query.in_memory_result_set import InMemoryResultSet
+from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, SaveResultsRequestParams  # noqa
+from ossdbtoolsservice.query.data_storage import FileStreamFactory, ServiceBufferColumnCodec, StorageDataReader, get_column_codecs
+from ossdbtoolsservice.query.save_as_progress import SaveAsProgress
+import ossdbtoolsservice.utils as utils
+from ossdbtoolsservice.utils.constants import DEFAULT_FETCH_BATCH_SIZE, DEFAULT_RESULT_SET_MEMORY_BUDGET, DEFAULT_RESULT_SET_MEMORY_ROW_COUNT
+
+# Estimated number of bytes held by a cell whose size is not measured, and by a row besides its cells
+CELL_SIZE_ESTIMATE = 16
+ROW_SIZE_ESTIMATE = 64
+
+
+def estimate_row_size(row: tuple) -> int:
+    """ Cheap estimate of the memory held by a row, counting the length of string and binary cells """
+    size = ROW_SIZE_ESTIMATE
+
+    for cell in row:
+        if isinstance(cell, (str, bytes, bytearray, memoryview)):
+            size += len(cell) + CELL_SIZE_ESTIMATE
+        else:
+            size += CELL_SIZE_ESTIMATE
+
+    return size
+
+
+class _DecodedInMemoryResultSet(InMemoryResultSet):
+    """
+    In-memory storage of a hybrid result set. Its rows are returned as a buffer file returns them, the values of
+    the driver converted by the codecs of their columns and NULL cells displayed as NULL
+    """
+
+    def __init__(self, result_set_id: int, batch_id: int) -> None:
+        InMemoryResultSet.__init__(self, result_set_id, batch_id)
+        self._codecs: List[ServiceBufferColumnCodec] = None
+        self._codecs_columns_info: List[DbColumn] = None
+
+    def get_row(self, row_id: int) -> List[DbCellValue]:
+        row = self.rows[row_id]
+        results = []
+
+        for value, codec in zip(row, self._get_codecs()):
+            if codec.is_null_type:
+                results.append(DbCellValue(display_value=None, is_null=True, raw_object=None, row_id=row_id))
+            elif value is None:
+                results.append(DbCellValue(display_value=str("NULL"), is_null=True, raw_object=None, row_id=row_id))
+            else:
+                result_object = codec.convert(value)
+                results.append(DbCellValue(display_value=result_object, is_null=False, raw_object=result_object, row_id=row_id))
+
+        return results
+
+    def _get_codecs(self) -> List[ServiceBufferColumnCodec]:
+        columns_info = self.columns_info
+
+        if columns_info is not self._codecs_columns_info:
+            self._codecs = get_column_codecs(columns_info)
+            self._codecs_columns_info = columns_info
+
+        return self._codecs
+
+
+class HybridResultSet(ResultSet):
+    """
+    Result set that keeps its rows in memory while they fit in a memory budget, which spares small results
+    the buffer file. When the budget is exceeded the rows read so far and the rest of the cursor are moved
+    to a FileStorageResultSet, which serves the result set once it holds as many rows as the memory
+    """
+
+    # Minimum number of seconds between two partially loaded events while the rows are kept in memory
+    RESULT_SET_UPDATE_INTERVAL = 1
+
+    def __init__(self, result_set_id: int, batch_id: int, events: ResultSetEvents = None, fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+                 memory_budget: int = DEFAULT_RESULT_SET_MEMORY_BUDGET, compress_result_buffers: bool = False,
+                 memory_row_count: int = DEFAULT_RESULT_SET_MEMORY_ROW_COUNT) -> None:
+        # Storage of the rows, replaced by a file storage result set when the rows are spilled to disk
+        self._storage: ResultSet = _DecodedInMemoryResultSet(result_set_id, batch_id)
+
+        ResultSet.__init__(self, result_set_id, batch_id, events)
+
+        self._fetch_batch_size = fetch_batch_size
+        self._memory_budget = memory_budget
+        self._memory_row_count = memory_row_count
+        self._compress_result_buffers = compress_result_buffers
+        self._memory_size = 0
+
+    @property
+    def is_spilled(self) -> bool:
+        return isinstance(self._storage, FileStorageResultSet)
+
+    @property
+    def columns_info(self) -> List[DbColumn]:
+        return self._storage.columns_info
+
+    @columns_info.setter
+    def columns_info(self, columns_info) -> None:
+        self._storage.columns_info = columns_info
+
+    @property
+    def row_count(self) -> int:
+        return self._storage.row_count
+
+    def get_subset(self, start_index: int, end_index: int):
+        return self._storage.get_subset(start_index, end_index)
+
+    def add_row(self, cursor):
+        self._storage.add_row(cursor)
+
+    def remove_row(self, row_id: int):
+        self._storage.remove_row(row_id)
+
+    def update_row(self, row_id: int, cursor):
+        self._storage.update_row(row_id, cursor)
+
+    def get_row(self, row_id: int) -> List[DbCellValue]:
+        return self._storage.get_row(row_id)
+
+    def iterate_rows(self, start_index: int, end_index: int) -> Iterator[List[DbCellValue]]:
+        return self._storage.iterate_rows(start_index, end_index)
+
+    def read_result_to_end(self, cursor):
+        utils.validate.is_not_none('cursor', cursor)
+
+        self._has_been_read = True
+
+        storage_data_reader = StorageDataReader(cursor, self._fetch_batch_size)
+
+        # As for file storage, the rows read so far are reported periodically, the first ones right away
+        on_partially_loaded = self.events._on_result_set_partially_loaded if self.events is not None else None
+        next_update_time = time.monotonic()
+        rows: List[tuple] = self._storage.rows
+
+        while storage_data_reader.read_row():
+            row = storage_data_reader.get_values()
+            self._memory_size += estimate_row_size(row)
+
+            if self._memory_size > self._memory_budget or len(rows) >= self._memory_row_count:
+                self._spill_to_file(cursor, rows + [row] + storage_data_reader.take_unread_rows(), storage_data_reader.columns_info)
+                self._is_complete = True
+                return
+
+            if not rows:
+                self.columns_info = storage_data_reader.columns_info
+
+            rows.append(row)
+
+            if on_partially_loaded is not None and time.monotonic() >= next_update_time:
+                next_update_time = time.monotonic() + HybridResultSet.RESULT_SET_UPDATE_INTERVAL
+                on_partially_loaded(self)
+
+        self.columns_info = storage_data_reader.columns_info
+        self._is_complete = True
+
+    def dispose(self) -> None:
+        self._storage.dispose()
+
+    def do_save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure,
+                   progress: SaveAsProgress = None) -> None:
+        self._storage.do_save_as(file_path, row_start_index, row_end_index, file_factory, on_success, on_failure, progress)
+
+    def _spill_to_file(self, cursor, fetched_rows: List[tuple], columns_info: List[DbColumn]) -> None:
+        """
+        Moves the rows fetched so far and the rest of the cursor to a buffer file. The rows in memory are served
+        until the file holds as many, so that the row count already reported never goes back
+        """
+        on_partially_loaded = self.events._on_result_set_partially_loaded if self.events is not None else None
+        memory_row_count = self._storage.row_count
+
+        def on_file_partially_loaded(file_storage: FileStorageResultSet) -> None:
+            if file_storage.row_count < memory_row_count:
+                return
+
+            self._storage = file_storage
+
+            # Events of the file storage are reported for this result set, which is the one known to the batch
+            if on_partially_loaded is not None:
+                on_partially_loaded(self)
+
+        events = ResultSetEvents(on_result_set_partially_loaded=on_file_partially_loaded)
+        file_storage = FileStorageResultSet(self.id, self.batch_id, events, self._fetch_batch_size, self._compress_result_buffers)
+        file_storage.read_result_to_end(cursor, fetched_rows, columns_info)
+
+        self._storage = file_storage
+        self._memory_size = 0
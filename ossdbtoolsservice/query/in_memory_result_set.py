@@ -9,6 +9,7 @@ from ossdbtoolsservice.query.result_set import ResultSet, ResultSetEvents
 from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, ResultSetSubset, SaveResultsRequestParams  # noqa
 from ossdbtoolsservice.query.column_info import get_columns_info
 from ossdbtoolsservice.query.data_storage import FileStreamFactory
+from ossdbtoolsservice.query.save_as_progress import SaveAsProgress
 
 
 class InMemoryResultSet(ResultSet):
@@ -44,15 +45,21 @@ class InMemoryResultSet(ResultSet):
         self.columns_info = get_columns_info(cursor)
 
         self._has_been_read = True
+        self._is_complete = True
 
-    def do_save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure) -> None:
+    def do_save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure,
+                   progress: SaveAsProgress = None) -> None:
 
         with file_factory.get_writer(file_path) as writer:
             for index in range(row_start_index, row_end_index):
                 row = self.get_row(index)
                 writer.write_row(row, self.columns_info)
 
+                if progress is not None:
+                    progress.add_rows(1)
+
             writer.complete_write()
 
-            if on_success is not None:
-                on_success()
+        # The file is flushed and closed once the writer exits, only then is it complete for the client
+        if on_success is not None:
+            on_success()
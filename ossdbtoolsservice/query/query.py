@@ -8,9 +8,13 @@ from typing import Callable, Dict, List, Optional  # noqa
 
 import sqlparse
 from ossdbtoolsservice.driver import ServerConnection
+from ossdbtoolsservice.hosting.executors import ExecutorPool
 from ossdbtoolsservice.query import Batch, BatchEvents, create_batch, ResultSetStorageType
 from ossdbtoolsservice.query.contracts import SaveResultsRequestParams, SelectionData
 from ossdbtoolsservice.query.data_storage import FileStreamFactory
+from ossdbtoolsservice.query.save_as_fan_out import SaveAsTarget
+from ossdbtoolsservice.query.save_as_progress import SaveAsProgress
+from ossdbtoolsservice.utils.constants import DEFAULT_FETCH_BATCH_SIZE, DEFAULT_RESULT_SET_MEMORY_BUDGET, DEFAULT_RESULT_SET_MEMORY_ROW_COUNT
 
 
 class QueryEvents:
@@ -30,11 +34,19 @@ class QueryExecutionSettings:
 
     def __init__(
             self, execution_plan_options,
-            result_set_storage_type: ResultSetStorageType = ResultSetStorageType.FILE_STORAGE
+            result_set_storage_type: ResultSetStorageType = ResultSetStorageType.FILE_STORAGE,
+            fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE,
+            memory_budget: int = DEFAULT_RESULT_SET_MEMORY_BUDGET,
+            compress_result_buffers: bool = False,
+            memory_row_count: int = DEFAULT_RESULT_SET_MEMORY_ROW_COUNT
     ) -> None:
 
         self._execution_plan_options = execution_plan_options
         self._result_set_storage_type = result_set_storage_type
+        self._fetch_batch_size = fetch_batch_size
+        self._memory_budget = memory_budget
+        self._compress_result_buffers = compress_result_buffers
+        self._memory_row_count = memory_row_count
 
     @property
     def execution_plan_options(self):
@@ -44,6 +56,22 @@ class QueryExecutionSettings:
     def result_set_storage_type(self):
         return self._result_set_storage_type
 
+    @property
+    def fetch_batch_size(self) -> int:
+        return self._fetch_batch_size
+
+    @property
+    def memory_budget(self) -> int:
+        return self._memory_budget
+
+    @property
+    def compress_result_buffers(self) -> bool:
+        return self._compress_result_buffers
+
+    @property
+    def memory_row_count(self) -> int:
+        return self._memory_row_count
+
 
 class Query:
     """Object representing a single query, consisting of one or more batches"""
@@ -87,7 +115,11 @@ class Query:
                 len(self.batches),
                 selection_data[index],
                 query_events.batch_events,
-                query_execution_settings.result_set_storage_type)
+                query_execution_settings.result_set_storage_type,
+                query_execution_settings.fetch_batch_size,
+                query_execution_settings.memory_budget,
+                query_execution_settings.compress_result_buffers,
+                query_execution_settings.memory_row_count)
 
             self._batches.append(batch)
 
@@ -151,11 +183,23 @@ class Query:
 
         return self._batches[batch_index].get_subset(start_index, end_index)
 
-    def save_as(self, params: SaveResultsRequestParams, file_factory: FileStreamFactory, on_success, on_failure):
+    def dispose(self) -> None:
+        """Release the resources held by the results of the batches"""
+        for batch in self._batches:
+            batch.dispose()
+
+    def save_as(self, params: SaveResultsRequestParams, file_factory: FileStreamFactory, on_success, on_failure, progress: SaveAsProgress = None,
+                executor: ExecutorPool = None):
+        if params.batch_index < 0 or params.batch_index >= len(self.batches):
+            raise IndexError('Batch index cannot be less than 0 or greater than the number of batches')
+
+        self.batches[params.batch_index].save_as(params, file_factory, on_success, on_failure, progress, executor)
+
+    def save_as_multi(self, params: SaveResultsRequestParams, targets: List[SaveAsTarget], on_progress, on_complete, executor: ExecutorPool = None):
         if params.batch_index < 0 or params.batch_index >= len(self.batches):
             raise IndexError('Batch index cannot be less than 0 or greater than the number of batches')
 
-        self.batches[params.batch_index].save_as(params, file_factory, on_success, on_failure)
+        self.batches[params.batch_index].save_as_multi(params, targets, on_progress, on_complete, executor)
 
 
 def compute_selection_data_for_batches(batches: List[str], full_text: str) -> List[SelectionData]:
@@ -4,11 +4,15 @@
 # --------------------------------------------------------------------------------------------
 
 from abc import ABCMeta, abstractmethod, abstractproperty
-from typing import List, Dict  # noqa
+import os
+from typing import Iterator, List, Dict, Union  # noqa
 import threading
 
+from ossdbtoolsservice.hosting.executors import ExecutorPool, WorkItem, run_in_background
 from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue, ResultSetSummary, SaveResultsRequestParams  # noqa
 from ossdbtoolsservice.query.data_storage import FileStreamFactory
+from ossdbtoolsservice.query.save_as_fan_out import SaveAsFanOut, SaveAsTarget
+from ossdbtoolsservice.query.save_as_progress import SaveAsProgress
 
 
 class ResultSetEvents:
@@ -26,8 +30,9 @@ class ResultSet(metaclass=ABCMeta):
         self.events = events
 
         self._has_been_read = False
+        self._is_complete = False
         self._columns_info: List[DbColumn] = []
-        self._save_as_threads: Dict[str, threading.Thread] = {}
+        self._save_as_threads: Dict[str, Union[threading.Thread, WorkItem]] = {}
 
     @property
     def columns_info(self) -> List[DbColumn]:
@@ -39,7 +44,7 @@ class ResultSet(metaclass=ABCMeta):
 
     @property
     def result_set_summary(self) -> ResultSetSummary:
-        return ResultSetSummary(self.id, self.batch_id, self.row_count, self._has_been_read, self.columns_info)
+        return ResultSetSummary(self.id, self.batch_id, self.row_count, self._is_complete, self.columns_info)
 
     @abstractproperty
     def row_count(self) -> int:
@@ -69,23 +74,93 @@ class ResultSet(metaclass=ABCMeta):
     def read_result_to_end(self, cursor):
         pass
 
-    @abstractmethod
-    def do_save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure) -> None:
-        pass
+    def dispose(self) -> None:
+        ''' Releases the resources held by the result set. It cannot be read once disposed '''
 
-    def save_as(self, params: SaveResultsRequestParams, file_factory: FileStreamFactory, on_success, on_failure) -> None:
-
-        if self._has_been_read is False:
+    @abstractmethod
+    def do_save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure,
+                   progress: SaveAsProgress = None) -> None:
+        ''' Writes the rows in the given range to the file, counting the rows written in the progress '''
+
+    def iterate_rows(self, start_index: int, end_index: int) -> Iterator[List[DbCellValue]]:
+        ''' Yields the rows in the given range, for a scan of the rows '''
+        for index in range(start_index, end_index):
+            yield self.get_row(index)
+
+    def save_as(self, params: SaveResultsRequestParams, file_factory: FileStreamFactory, on_success, on_failure, progress: SaveAsProgress = None,
+                executor: ExecutorPool = None) -> None:
+        '''
+        Saves the rows selected by the params to a file on a worker of the executor, or in a thread of its own without one
+        :param progress: reports the progress of the save and cancels it, the partial file being deleted
+        '''
+        self._check_can_save(params.file_path)
+        row_start_index, row_end_index = self._get_save_range(params)
+
+        self._save_as_threads[params.file_path] = run_in_background(
+            executor, self._save_as,
+            params.file_path, row_start_index, row_end_index, file_factory, on_success, on_failure, progress or SaveAsProgress())
+
+    def save_as_multi(self, params: SaveResultsRequestParams, targets: List[SaveAsTarget], on_progress, on_complete,
+                      executor: ExecutorPool = None) -> None:
+        '''
+        Saves the rows selected by the params to all the targets from a single scan of the rows
+        :param on_progress: called with the progress of each target, see SaveAsFanOut
+        :param on_complete: called once all the targets are written, with the reason of the failure of each failed target by file path
+        :param executor: pool running the scan of the rows, a thread of its own is started without one
+        '''
+        file_paths = [target.file_path for target in targets]
+
+        if len(set(file_paths)) != len(file_paths):
+            raise ValueError('Each file can be saved only once by a request')
+
+        for file_path in file_paths:
+            self._check_can_save(file_path)
+
+        row_start_index, row_end_index = self._get_save_range(params)
+
+        new_save_as_work = run_in_background(executor, self.do_save_as_multi, row_start_index, row_end_index, targets, on_progress, on_complete)
+        for target in targets:
+            self._save_as_threads[target.file_path] = new_save_as_work
+
+    def _save_as(self, file_path: str, row_start_index: int, row_end_index: int, file_factory: FileStreamFactory, on_success, on_failure,
+                 progress: SaveAsProgress) -> None:
+        progress.start(file_path, row_end_index - row_start_index)
+
+        try:
+            self.do_save_as(file_path, row_start_index, row_end_index, file_factory, on_success, on_failure, progress)
+        except Exception as error:
+            if progress.is_canceled and os.path.exists(file_path):
+                os.remove(file_path)
+
+            progress.complete(str(error))
+
+            if on_failure is not None:
+                on_failure(str(error))
+            return
+
+        progress.complete()
+
+    def do_save_as_multi(self, row_start_index: int, row_end_index: int, targets: List[SaveAsTarget], on_progress, on_complete) -> None:
+        fan_out = SaveAsFanOut(targets, self.columns_info, row_end_index - row_start_index, on_progress)
+        failures = fan_out.run(self.iterate_rows(row_start_index, row_end_index))
+
+        if on_complete is not None:
+            on_complete(failures)
+
+    def _check_can_save(self, file_path: str) -> None:
+
+        if self._is_complete is False:
             raise RuntimeError('Result cannot be saved until query execution has completed')
 
-        save_as_thread = self._save_as_threads.get(params.file_path)
+        save_as_thread = self._save_as_threads.get(file_path)
 
         if save_as_thread is not None:
-            if save_as_thread.isAlive():
+            if save_as_thread.is_alive():
                 raise RuntimeError('A save request to the same path is in progress')
             else:
-                del self._save_as_threads[params.file_path]
+                del self._save_as_threads[file_path]
 
+    def _get_save_range(self, params: SaveResultsRequestParams):
         row_end_index = self.row_count
         row_start_index = 0
 
@@ -93,9 +168,4 @@ class ResultSet(metaclass=ABCMeta):
             row_end_index = params.row_end_index + 1
             row_start_index = params.row_start_index
 
-        new_save_as_thread = threading.Thread(
-            target=self.do_save_as,
-            args=(params.file_path, row_start_index, row_end_index, file_factory, on_success, on_failure),
-            daemon=True)
-        self._save_as_threads[params.file_path] = new_save_as_thread
-        new_save_as_thread.start()
+        return row_start_index, row_end_index
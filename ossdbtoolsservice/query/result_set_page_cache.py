@@ -0,0 +1,142 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from collections import OrderedDict
+import threading
+from typing import Dict, List, Set, Tuple  # noqa
+
+from ossdbtoolsservice.query.contracts import DbCellValue
+
+# Number of consecutive rows of a result set held by a page
+PAGE_ROW_COUNT = 100
+
+# Default memory budget of the page cache shared by all the result sets
+DEFAULT_PAGE_CACHE_SIZE = 64 * 1024 * 1024
+
+# Estimated number of bytes held by a decoded cell besides the length of its string or binary value
+CELL_SIZE_ESTIMATE = 120
+
+
+def estimate_page_size(rows: List[List[DbCellValue]]) -> int:
+    """
+    Cheap estimate of the memory held by decoded rows, counting the length of string and binary values. The display
+    values are not read, so that they are still only converted to strings when the rows are sent
+    """
+    size = 0
+
+    for row in rows:
+        for cell in row:
+            raw_object = cell.raw_object
+
+            if isinstance(raw_object, (str, bytes, bytearray, memoryview)):
+                size += len(raw_object) + CELL_SIZE_ESTIMATE
+            else:
+                size += CELL_SIZE_ESTIMATE
+
+    return size
+
+
+class ResultSetPageCache:
+    """
+    Least recently used cache of decoded rows, shared by result sets to serve the overlapping windows
+    requested by clients scrolling through results. Rows are cached by page of PAGE_ROW_COUNT rows, keyed
+    by the result set owning them, and the least recently used pages are evicted past the memory budget.
+    Result sets invalidate their pages when their rows change.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_PAGE_CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self._pages: OrderedDict = OrderedDict()
+        self._page_sizes: Dict[Tuple[object, int], int] = {}
+        self._owner_pages: Dict[object, Set[int]] = {}
+
+        # Incremented on invalidation, so that pages decoded before it are not cached after it
+        self._owner_generations: Dict[object, int] = {}
+
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @property
+    def size(self) -> int:
+        """ Estimated number of bytes held by the cached pages """
+        return self._size
+
+    def get_generation(self, owner) -> int:
+        """ Returns the generation of the pages of the owner, to be given back when caching a page """
+        with self._lock:
+            return self._owner_generations.get(owner, 0)
+
+    def get(self, owner, page_index: int) -> List[List[DbCellValue]]:
+        """ Returns the rows of a cached page, or None when the page is not cached """
+        key = (owner, page_index)
+
+        with self._lock:
+            rows = self._pages.get(key)
+
+            if rows is None:
+                self.miss_count += 1
+                return None
+
+            self.hit_count += 1
+            self._pages.move_to_end(key)
+            return rows
+
+    def put(self, owner, page_index: int, rows: List[List[DbCellValue]], generation: int) -> None:
+        """ Caches the rows of a page, unless the pages of the owner were invalidated since the generation """
+        key = (owner, page_index)
+        page_size = estimate_page_size(rows)
+
+        with self._lock:
+            if self._owner_generations.get(owner, 0) != generation or page_size > self._max_size:
+                return
+
+            self._remove_page(key)
+
+            self._pages[key] = rows
+            self._page_sizes[key] = page_size
+            self._owner_pages.setdefault(owner, set()).add(page_index)
+            self._size += page_size
+
+            while self._size > self._max_size:
+                oldest_key = next(iter(self._pages))
+                self._remove_page(oldest_key)
+
+    def invalidate(self, owner, first_page_index: int = 0) -> None:
+        """ Removes the pages of the owner starting from the given one """
+        with self._lock:
+            self._owner_generations[owner] = self._owner_generations.get(owner, 0) + 1
+
+            for page_index in [index for index in self._owner_pages.get(owner, ()) if index >= first_page_index]:
+                self._remove_page((owner, page_index))
+
+    def remove_owner(self, owner) -> None:
+        """ Removes all the pages of the owner, which no longer uses the cache """
+        with self._lock:
+            for page_index in list(self._owner_pages.get(owner, ())):
+                self._remove_page((owner, page_index))
+
+            self._owner_pages.pop(owner, None)
+            self._owner_generations.pop(owner, None)
+
+    def _remove_page(self, key: Tuple[object, int]) -> None:
+        if key not in self._pages:
+            return
+
+        del self._pages[key]
+        self._size -= self._page_sizes.pop(key)
+
+        owner, page_index = key
+        owner_pages = self._owner_pages[owner]
+        owner_pages.discard(page_index)
+
+        if not owner_pages:
+            del self._owner_pages[owner]
+
+
+# Page cache of all the result sets, so that the memory budget applies across open queries
+PAGE_CACHE = ResultSetPageCache()
@@ -0,0 +1,135 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List  # noqa
+
+from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue  # noqa
+from ossdbtoolsservice.query.data_storage import FileStreamFactory
+
+# Number of rows handed to the writers at once
+FAN_OUT_BATCH_SIZE = 1000
+
+# Number of batches waiting for a writer before the scan of the rows waits for it
+FAN_OUT_QUEUE_SIZE = 8
+
+# Minimum number of seconds between two progress reports of a writer
+PROGRESS_INTERVAL = 1
+
+
+class SaveAsTarget:
+    """ A file written by a fan-out save, in the format of its file factory """
+
+    def __init__(self, format_name: str, file_path: str, file_factory: FileStreamFactory) -> None:
+        self.format_name = format_name
+        self.file_path = file_path
+        self.file_factory = file_factory
+
+
+class SaveAsFanOut:
+    """
+    Saves the rows of a result set to several files from a single scan of the rows. Each target is written
+    by its own thread from a bounded queue of row batches, so the scan waits for the slowest writer instead of
+    holding the rows it is ahead by. A writer that fails drains its queue, leaving the other targets unaffected
+    """
+
+    def __init__(self, targets: List[SaveAsTarget], columns_info: List[DbColumn], row_count: int, on_progress=None) -> None:
+        '''
+        :param on_progress: called with the target, the number of rows written, the number of rows to write,
+        whether the target is complete and the reason of its failure when it failed
+        '''
+        self._targets = targets
+        self._columns_info = columns_info
+        self._row_count = row_count
+        self._on_progress = on_progress
+
+        self._queues: List[queue.Queue] = [queue.Queue(FAN_OUT_QUEUE_SIZE) for _ in targets]
+        self._failures: Dict[str, str] = {}
+        self._failures_lock = threading.Lock()
+
+    def run(self, rows: Iterable[List[DbCellValue]]) -> Dict[str, str]:
+        """ Writes the rows to all the targets and returns the reason of the failure of each failed target by file path """
+        threads = [
+            threading.Thread(target=self._write_target, args=(target, target_queue), daemon=True)
+            for target, target_queue in zip(self._targets, self._queues)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            batch: List[List[DbCellValue]] = []
+
+            for row in rows:
+                batch.append(row)
+
+                if len(batch) >= FAN_OUT_BATCH_SIZE:
+                    self._put(batch)
+                    batch = []
+
+            if batch:
+                self._put(batch)
+        except Exception as error:
+            for target in self._targets:
+                self._set_failure(target, str(error))
+        finally:
+            # Writers complete their file on None, unless the scan failed
+            self._put(None)
+
+            for thread in threads:
+                thread.join()
+
+        return self._failures
+
+    def _put(self, batch) -> None:
+        for target_queue in self._queues:
+            target_queue.put(batch)
+
+    def _set_failure(self, target: SaveAsTarget, reason: str) -> None:
+        with self._failures_lock:
+            self._failures.setdefault(target.file_path, reason)
+
+    def _get_failure(self, target: SaveAsTarget) -> str:
+        with self._failures_lock:
+            return self._failures.get(target.file_path)
+
+    def _report_progress(self, target: SaveAsTarget, rows_written: int, is_complete: bool) -> None:
+        if self._on_progress is not None:
+            self._on_progress(target, rows_written, self._row_count, is_complete, self._get_failure(target))
+
+    def _write_target(self, target: SaveAsTarget, target_queue: queue.Queue) -> None:
+        rows_written = 0
+        is_queue_drained = False
+
+        try:
+            with target.file_factory.get_writer(target.file_path) as writer:
+                next_update_time = time.monotonic() + PROGRESS_INTERVAL
+
+                for batch in iter(target_queue.get, None):
+                    for row in batch:
+                        writer.write_row(row, self._columns_info)
+
+                    rows_written += len(batch)
+
+                    if time.monotonic() >= next_update_time:
+                        next_update_time = time.monotonic() + PROGRESS_INTERVAL
+                        self._report_progress(target, rows_written, False)
+
+                is_queue_drained = True
+
+                if self._get_failure(target) is None:
+                    writer.complete_write()
+        except Exception as error:
+            self._set_failure(target, str(error))
+
+            # The scan goes on for the other targets, so the batches of this one are dropped until its end, unless
+            # the writer failed to complete or close the file once the end was taken from the queue
+            if not is_queue_drained:
+                for _ in iter(target_queue.get, None):
+                    pass
+
+        self._report_progress(target, rows_written, True)
@@ -0,0 +1,98 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import threading
+import time
+from typing import Callable  # noqa
+
+# Minimum number of seconds between two progress reports of a save
+PROGRESS_INTERVAL = 1
+
+
+class SaveAsCanceledError(Exception):
+    """ Raised in the thread saving the rows once the save is canceled """
+
+
+class SaveAsProgress:
+    """
+    Progress of a save of rows to a file, updated by the result set as it writes the rows and reported periodically.
+    Canceling the save makes the next update raise SaveAsCanceledError, which stops the scan of the rows
+    """
+
+    def __init__(self, on_progress: Callable[['SaveAsProgress'], None] = None) -> None:
+        '''
+        :param on_progress: called with the progress while the rows are written, and once the save is complete
+        '''
+        self.file_path: str = None
+        self.row_count = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.is_canceled = False
+        self.is_complete = False
+        self.error_message: str = None
+
+        self._on_progress = on_progress
+        self._start_time: float = None
+        self._end_time: float = None
+        self._next_update_time: float = None
+        self._completed = threading.Event()
+
+    @property
+    def elapsed_time(self) -> float:
+        """ Number of seconds spent saving the rows so far """
+        if self._start_time is None:
+            return 0
+
+        return (self._end_time if self._end_time is not None else time.monotonic()) - self._start_time
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed_time = self.elapsed_time
+        return self.rows_written / elapsed_time if elapsed_time > 0 else 0
+
+    @property
+    def remaining_time(self) -> float:
+        """ Estimated number of seconds left to save the remaining rows at the current rate, or None before any row is saved """
+        rows_per_second = self.rows_per_second
+        return (self.row_count - self.rows_written) / rows_per_second if rows_per_second > 0 else None
+
+    def start(self, file_path: str, row_count: int) -> None:
+        self.file_path = file_path
+        self.row_count = row_count
+        self._start_time = time.monotonic()
+        self._next_update_time = self._start_time + PROGRESS_INTERVAL
+
+    def add_rows(self, count: int) -> None:
+        """ Counts rows written to the file, reporting the progress when it is due """
+        if self.is_canceled:
+            raise SaveAsCanceledError('The save was canceled')
+
+        self.rows_written += count
+
+        if time.monotonic() >= self._next_update_time:
+            self._next_update_time = time.monotonic() + PROGRESS_INTERVAL
+            self._report()
+
+    def cancel(self) -> None:
+        self.is_canceled = True
+
+    def complete(self, error_message: str = None) -> None:
+        self._end_time = time.monotonic()
+        self.error_message = error_message
+        self.is_complete = True
+        self._report()
+        self._completed.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """ Waits for the save to complete, returning whether it completed within the timeout """
+        return self._completed.wait(timeout)
+
+    def _report(self) -> None:
+        if self.file_path is not None and os.path.exists(self.file_path):
+            self.bytes_written = os.path.getsize(self.file_path)
+
+        if self._on_progress is not None:
+            self._on_progress(self)
@@ -42,9 +42,15 @@ from ossdbtoolsservice.query_execution.contracts.query_execution_plan_request im
     QUERY_EXECUTION_PLAN_REQUEST, QueryExecutionPlanRequest
 )
 from ossdbtoolsservice.query_execution.contracts.save_result_as_request import (
-    SAVE_AS_CSV_REQUEST, SAVE_AS_JSON_REQUEST, SAVE_AS_EXCEL_REQUEST, SERIALIZATION_OPTIONS,
-    SaveResultsAsJsonRequestParams, SaveResultRequestResult,
-    SaveResultsAsCsvRequestParams, SaveResultsAsExcelRequestParams
+    SAVE_AS_CSV_REQUEST, SAVE_AS_JSON_REQUEST, SAVE_AS_NDJSON_REQUEST, SAVE_AS_EXCEL_REQUEST, SAVE_AS_MULTI_REQUEST,
+    SAVE_AS_PROGRESS_NOTIFICATION, SERIALIZATION_OPTIONS,
+    SaveResultsAsJsonRequestParams, SaveResultsAsNdjsonRequestParams, SaveResultRequestResult,
+    SaveResultsAsCsvRequestParams, SaveResultsAsExcelRequestParams, SaveResultsAsMultiRequestParams,
+    SaveResultsAsMultiTarget, SaveResultsProgressParams, SAVE_AS_PARQUET_REQUEST, SAVE_AS_ARROW_REQUEST,
+    SaveResultsAsParquetRequestParams, SaveResultsAsArrowRequestParams
+)
+from ossdbtoolsservice.query_execution.contracts.export_query_request import (
+    EXPORT_QUERY_AS_CSV_REQUEST, ExportQueryAsCsvRequestParams, ExportQueryResult
 )
 
 __all__ = [
@@ -58,7 +64,10 @@ __all__ = [
     'SubsetParams', 'SUBSET_REQUEST', 'CANCEL_REQUEST', 'QueryCancelResult', 'QueryCancelParams',
     'QueryDisposeParams', 'QUERY_EXECUTION_PLAN_REQUEST', 'QueryExecutionPlanRequest', 'DISPOSE_REQUEST',
     'SIMPLE_EXECUTE_REQUEST', 'SimpleExecuteRequest', 'SimpleExecuteResponse', 'EXECUTE_DOCUMENT_STATEMENT_REQUEST',
-    'ExecuteDocumentStatementParams', 'SAVE_AS_CSV_REQUEST', 'SAVE_AS_JSON_REQUEST', 'SERIALIZATION_OPTIONS', 'SAVE_AS_EXCEL_REQUEST',
+    'ExecuteDocumentStatementParams', 'SAVE_AS_CSV_REQUEST', 'SAVE_AS_JSON_REQUEST', 'SAVE_AS_NDJSON_REQUEST', 'SERIALIZATION_OPTIONS', 'SAVE_AS_EXCEL_REQUEST',
     'SaveResultRequestResult', 'SaveResultsAsCsvRequestParams', 'SaveResultsAsExcelRequestParams',
-    'SaveResultsAsJsonRequestParams'
+    'SaveResultsAsJsonRequestParams', 'SaveResultsAsNdjsonRequestParams', 'SAVE_AS_MULTI_REQUEST', 'SAVE_AS_PROGRESS_NOTIFICATION',
+    'SaveResultsAsMultiRequestParams', 'SaveResultsAsMultiTarget', 'SaveResultsProgressParams',
+    'SAVE_AS_PARQUET_REQUEST', 'SAVE_AS_ARROW_REQUEST', 'SaveResultsAsParquetRequestParams', 'SaveResultsAsArrowRequestParams',
+    'EXPORT_QUERY_AS_CSV_REQUEST', 'ExportQueryAsCsvRequestParams', 'ExportQueryResult'
 ]
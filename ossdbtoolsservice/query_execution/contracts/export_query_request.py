@@ -0,0 +1,34 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from ossdbtoolsservice.hosting import IncomingMessageConfiguration
+from ossdbtoolsservice.serialization import Serializable
+
+
+class ExportQueryAsCsvRequestParams(Serializable):
+    """
+    Parameters of the export of the results of a query to a CSV file, without executing it in the editor.
+    Rows end with a newline unless line_seperator says otherwise
+    """
+
+    def __init__(self):
+        self.owner_uri: str = None
+        self.query: str = None
+        self.file_path: str = None
+        self.include_headers: bool = None
+        self.delimiter: str = None
+        self.line_seperator: str = None
+        self.text_identifier: str = None
+        self.quote_all_values: bool = None
+        self.encoding: str = None
+
+
+class ExportQueryResult:
+
+    def __init__(self, row_count: int):
+        self.row_count: int = row_count
+
+
+EXPORT_QUERY_AS_CSV_REQUEST = IncomingMessageConfiguration('query/exportCsv', ExportQueryAsCsvRequestParams)
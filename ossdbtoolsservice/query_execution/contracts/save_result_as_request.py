@@ -3,7 +3,10 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+from typing import List  # noqa
+
 from ossdbtoolsservice.query.contracts import SaveResultsRequestParams
+from ossdbtoolsservice.serialization import Serializable
 from ossdbtoolsservice.hosting import IncomingMessageConfiguration
 from ossdbtoolsservice.capabilities.contracts import FeatureMetadataProvider
 
@@ -19,6 +22,11 @@ class SaveResultsAsCsvRequestParams(SaveResultsRequestParams):
     def __init__(self):
         super().__init__()
         self.include_headers: bool = None
+        self.delimiter: str = None
+        self.line_seperator: str = None
+        self.text_identifier: str = None
+        self.quote_all_values: bool = None
+        self.encoding: str = None
 
 
 class SaveResultsAsJsonRequestParams(SaveResultsRequestParams):
@@ -27,6 +35,26 @@ class SaveResultsAsJsonRequestParams(SaveResultsRequestParams):
         super().__init__()
 
 
+class SaveResultsAsNdjsonRequestParams(SaveResultsRequestParams):
+
+    def __init__(self):
+        super().__init__()
+
+
+class SaveResultsAsParquetRequestParams(SaveResultsRequestParams):
+
+    def __init__(self):
+        super().__init__()
+        self.compression: str = None
+
+
+class SaveResultsAsArrowRequestParams(SaveResultsRequestParams):
+
+    def __init__(self):
+        super().__init__()
+        self.compression: str = None
+
+
 class SaveResultsAsExcelRequestParams(SaveResultsRequestParams):
 
     def __init__(self):
@@ -34,6 +62,67 @@ class SaveResultsAsExcelRequestParams(SaveResultsRequestParams):
         self.include_headers: bool = None
 
 
+class SaveResultsAsMultiTarget(Serializable):
+    """ A file to save the results to, with the options of its format """
+
+    def __init__(self):
+        self.format: str = None
+        self.file_path: str = None
+        self.include_headers: bool = None
+        self.delimiter: str = None
+        self.line_seperator: str = None
+        self.text_identifier: str = None
+        self.quote_all_values: bool = None
+        self.encoding: str = None
+        self.compression: str = None
+
+    @classmethod
+    def ignore_extra_attributes(cls):
+        return True
+
+
+class SaveResultsAsMultiRequestParams(SaveResultsRequestParams):
+
+    def __init__(self):
+        super().__init__()
+        self.targets: List[SaveResultsAsMultiTarget] = None
+
+    @classmethod
+    def get_child_serializable_types(cls):
+        return {'targets': SaveResultsAsMultiTarget}
+
+
+class SaveResultsProgressParams:
+    """
+    Parameters of the progress notifications of the files of a multiple save
+    Attributes:
+        owner_uri:      URI for the editor that owns the query
+        file_path:      path of the file being saved
+        format:         format of the file being saved
+        rows_written:   number of rows written to the file so far
+        row_count:      number of rows to write to the file
+        is_complete:    whether the file is done, successfully unless error_message is set
+        error_message:  reason of the failure of the file, if it failed
+        bytes_written:  size of the file so far
+        rows_per_second: number of rows written per second since the save started
+        remaining_time: estimated number of seconds left to write the remaining rows
+    """
+
+    def __init__(self, owner_uri: str, file_path: str, format_name: str, rows_written: int, row_count: int,
+                 is_complete: bool, error_message: str = None, bytes_written: int = None, rows_per_second: float = None,
+                 remaining_time: float = None):
+        self.owner_uri: str = owner_uri
+        self.file_path: str = file_path
+        self.format: str = format_name
+        self.rows_written: int = rows_written
+        self.row_count: int = row_count
+        self.is_complete: bool = is_complete
+        self.error_message: str = error_message
+        self.bytes_written: int = bytes_written
+        self.rows_per_second: float = rows_per_second
+        self.remaining_time: float = remaining_time
+
+
 SAVE_AS_CSV_REQUEST = IncomingMessageConfiguration(
     'query/saveCsv',
     SaveResultsAsCsvRequestParams
@@ -44,11 +133,33 @@ SAVE_AS_JSON_REQUEST = IncomingMessageConfiguration(
     SaveResultsAsJsonRequestParams
 )
 
+SAVE_AS_NDJSON_REQUEST = IncomingMessageConfiguration(
+    'query/saveNdjson',
+    SaveResultsAsNdjsonRequestParams
+)
+
+SAVE_AS_PARQUET_REQUEST = IncomingMessageConfiguration(
+    'query/saveParquet',
+    SaveResultsAsParquetRequestParams
+)
+
+SAVE_AS_ARROW_REQUEST = IncomingMessageConfiguration(
+    'query/saveArrow',
+    SaveResultsAsArrowRequestParams
+)
+
 SAVE_AS_EXCEL_REQUEST = IncomingMessageConfiguration(
     'query/saveExcel',
     SaveResultsAsExcelRequestParams
 )
 
+SAVE_AS_MULTI_REQUEST = IncomingMessageConfiguration(
+    'query/saveAsMulti',
+    SaveResultsAsMultiRequestParams
+)
+
+SAVE_AS_PROGRESS_NOTIFICATION = 'query/saveAsProgress'
+
 SERIALIZATION_OPTIONS = FeatureMetadataProvider(
     True,
     'serializationService',
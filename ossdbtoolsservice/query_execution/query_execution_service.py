@@ -4,7 +4,7 @@
 # --------------------------------------------------------------------------------------------
 
 from datetime import datetime
-import threading
+import functools
 import uuid
 from typing import Callable, Dict, List, Optional  # noqa
 import sqlparse
@@ -12,8 +12,9 @@ import ntpath
 
 
 from ossdbtoolsservice.hosting import RequestContext, ServiceProvider
+from ossdbtoolsservice.hosting.executors import QUERY_POOL, SAVE_AS_POOL
 from ossdbtoolsservice.query import (
-    Batch, BatchEvents, ExecutionState, QueryExecutionSettings, Query, QueryEvents,
+    Batch, BatchEvents, ExecutionState, QueryExecutionSettings, Query, QueryEvents, ResultSet, SaveAsProgress, SaveAsTarget,
     compute_selection_data_for_batches as compute_batches
 )
 from ossdbtoolsservice.query.contracts import BatchSummary, ResultSetSubset, SelectionData, SaveResultsRequestParams, SubsetResult  # noqa
@@ -24,32 +25,51 @@ from ossdbtoolsservice.query_execution.contracts import (
     DEPLOY_BATCH_COMPLETE_NOTIFICATION, DEPLOY_BATCH_START_NOTIFICATION, EXECUTE_DOCUMENT_STATEMENT_REQUEST,
     ExecuteDocumentStatementParams, ExecutionPlanOptions, ResultSetNotificationParams,
     MESSAGE_NOTIFICATION, DEPLOY_MESSAGE_NOTIFICATION, RESULT_SET_AVAILABLE_NOTIFICATION, RESULT_SET_COMPLETE_NOTIFICATION, MessageNotificationParams,
+    RESULT_SET_UPDATED_NOTIFICATION,
     QUERY_COMPLETE_NOTIFICATION, DEPLOY_COMPLETE_NOTIFICATION, QUERY_EXECUTION_PLAN_REQUEST, QueryCancelResult, QueryExecutionPlanRequest,
     SUBSET_REQUEST, ExecuteDocumentSelectionParams, CANCEL_REQUEST, QueryCancelParams, ResultMessage, SubsetParams,
     BatchNotificationParams, QueryCompleteNotificationParams, QueryDisposeParams,
     DISPOSE_REQUEST, SIMPLE_EXECUTE_REQUEST, SimpleExecuteRequest, ExecuteStringParams,
-    SimpleExecuteResponse, SAVE_AS_CSV_REQUEST, SAVE_AS_JSON_REQUEST, SAVE_AS_EXCEL_REQUEST,
-    SaveResultsAsJsonRequestParams, SaveResultRequestResult,
-    SaveResultsAsCsvRequestParams, SaveResultsAsExcelRequestParams
+    SimpleExecuteResponse, SAVE_AS_CSV_REQUEST, SAVE_AS_JSON_REQUEST, SAVE_AS_NDJSON_REQUEST, SAVE_AS_EXCEL_REQUEST,
+    SaveResultsAsJsonRequestParams, SaveResultsAsNdjsonRequestParams, SaveResultRequestResult,
+    SaveResultsAsCsvRequestParams, SaveResultsAsExcelRequestParams, SAVE_AS_MULTI_REQUEST, SAVE_AS_PROGRESS_NOTIFICATION,
+    SaveResultsAsMultiRequestParams, SaveResultsAsMultiTarget, SaveResultsProgressParams,
+    EXPORT_QUERY_AS_CSV_REQUEST, ExportQueryAsCsvRequestParams, ExportQueryResult, SAVE_AS_PARQUET_REQUEST, SAVE_AS_ARROW_REQUEST,
+    SaveResultsAsParquetRequestParams, SaveResultsAsArrowRequestParams
 )
+from ossdbtoolsservice.query_execution.query_export import export_query_as_csv
 
 from ossdbtoolsservice.driver import ServerConnection
 from ossdbtoolsservice.connection.contracts import ConnectRequestParams
 from ossdbtoolsservice.connection.contracts import ConnectionType
+from ossdbtoolsservice.tasks import Task, TaskResult, TaskStatus
 import ossdbtoolsservice.utils as utils
+from ossdbtoolsservice.workspace.contracts import QueryConfiguration
 from ossdbtoolsservice.query.data_storage import (
-    FileStreamFactory, SaveAsCsvFileStreamFactory, SaveAsJsonFileStreamFactory, SaveAsExcelFileStreamFactory
+    FileStreamFactory, SaveAsCsvFileStreamFactory, SaveAsJsonFileStreamFactory, SaveAsNdjsonFileStreamFactory,
+    SaveAsExcelFileStreamFactory, SaveAsParquetFileStreamFactory, SaveAsArrowFileStreamFactory
 )
 
 
 NO_QUERY_MESSAGE = 'QueryServiceRequestsNoQuery'
 
+# Request params and file factory of each format of a multiple save
+SAVE_AS_FORMATS = {
+    'csv': (SaveResultsAsCsvRequestParams, SaveAsCsvFileStreamFactory),
+    'json': (SaveResultsAsJsonRequestParams, SaveAsJsonFileStreamFactory),
+    'ndjson': (SaveResultsAsNdjsonRequestParams, SaveAsNdjsonFileStreamFactory),
+    'excel': (SaveResultsAsExcelRequestParams, SaveAsExcelFileStreamFactory),
+    'parquet': (SaveResultsAsParquetRequestParams, SaveAsParquetFileStreamFactory),
+    'arrow': (SaveResultsAsArrowRequestParams, SaveAsArrowFileStreamFactory)
+}
+
 
 class ExecuteRequestWorkerArgs():
 
     def __init__(self, owner_uri: str, connection: ServerConnection, request_context: RequestContext, result_set_storage_type,
                  before_query_initialize: Callable = None, on_batch_start: Callable = None, on_message_notification: Callable = None,
-                 on_resultset_complete: Callable = None, on_batch_complete: Callable = None, on_query_complete: Callable = None):
+                 on_resultset_complete: Callable = None, on_batch_complete: Callable = None, on_query_complete: Callable = None,
+                 on_resultset_updated: Callable = None):
 
         self.owner_uri = owner_uri
         self.connection = connection
@@ -61,6 +81,7 @@ class ExecuteRequestWorkerArgs():
         self.on_resultset_complete = on_resultset_complete
         self.on_batch_complete = on_batch_complete
         self.on_query_complete = on_query_complete
+        self.on_resultset_updated = on_resultset_updated
 
 
 class QueryExecutionService(object):
@@ -84,7 +105,12 @@ class QueryExecutionService(object):
             QUERY_EXECUTION_PLAN_REQUEST: self._handle_query_execution_plan_request,
             SAVE_AS_CSV_REQUEST: self._handle_save_as_csv_request,
             SAVE_AS_JSON_REQUEST: self._handle_save_as_json_request,
-            SAVE_AS_EXCEL_REQUEST: self._handle_save_as_excel_request
+            SAVE_AS_NDJSON_REQUEST: self._handle_save_as_ndjson_request,
+            SAVE_AS_EXCEL_REQUEST: self._handle_save_as_excel_request,
+            SAVE_AS_PARQUET_REQUEST: self._handle_save_as_parquet_request,
+            SAVE_AS_ARROW_REQUEST: self._handle_save_as_arrow_request,
+            SAVE_AS_MULTI_REQUEST: self._handle_save_as_multi_request,
+            EXPORT_QUERY_AS_CSV_REQUEST: self._handle_export_query_as_csv_request
         }
 
     def register(self, service_provider: ServiceProvider):
@@ -92,7 +118,12 @@ class QueryExecutionService(object):
         # Register the request handlers with the server
 
         for action in self._service_action_mapping:
-            self._service_provider.server.set_request_handler(action, self._service_action_mapping[action])
+            if action is CANCEL_REQUEST:
+                # Cancellations do not wait for the running query of the owner URI, but cancel it from a worker thread
+                # since it takes a round trip to the server
+                self._service_provider.server.set_request_handler(action, self._service_action_mapping[action], ordered=False)
+            else:
+                self._service_provider.server.set_request_handler(action, self._service_action_mapping[action])
 
         if self._service_provider.logger is not None:
             self._service_provider.logger.info('Query execution service successfully initialized')
@@ -108,9 +139,66 @@ class QueryExecutionService(object):
     def _handle_save_as_json_request(self, request_context: RequestContext, params: SaveResultsAsJsonRequestParams) -> None:
         self._save_result(params, request_context, SaveAsJsonFileStreamFactory(params))
 
+    def _handle_save_as_ndjson_request(self, request_context: RequestContext, params: SaveResultsAsNdjsonRequestParams) -> None:
+        self._save_result(params, request_context, SaveAsNdjsonFileStreamFactory(params))
+
     def _handle_save_as_excel_request(self, request_context: RequestContext, params: SaveResultsAsExcelRequestParams) -> None:
         self._save_result(params, request_context, SaveAsExcelFileStreamFactory(params))
 
+    def _handle_save_as_parquet_request(self, request_context: RequestContext, params: SaveResultsAsParquetRequestParams) -> None:
+        self._save_result(params, request_context, SaveAsParquetFileStreamFactory(params))
+
+    def _handle_save_as_arrow_request(self, request_context: RequestContext, params: SaveResultsAsArrowRequestParams) -> None:
+        self._save_result(params, request_context, SaveAsArrowFileStreamFactory(params))
+
+    def _handle_save_as_multi_request(self, request_context: RequestContext, params: SaveResultsAsMultiRequestParams) -> None:
+
+        def on_progress(target: SaveAsTarget, rows_written: int, row_count: int, is_complete: bool, error_message: str):
+            progress_params = SaveResultsProgressParams(params.owner_uri, target.file_path, target.format_name, rows_written, row_count,
+                                                        is_complete, error_message)
+            request_context.send_notification(SAVE_AS_PROGRESS_NOTIFICATION, progress_params)
+
+        def on_complete(failures: Dict[str, str]):
+            if failures:
+                request_context.send_error('; '.join(
+                    'Failed to save {0}: {1}'.format(ntpath.basename(file_path), reason) for file_path, reason in failures.items()))
+            else:
+                request_context.send_response(SaveResultRequestResult())
+
+        try:
+            query: Query = self.query_results[params.owner_uri]
+            targets = [_create_save_as_target(params, target) for target in params.targets or []]
+
+            if not targets:
+                raise ValueError('No file to save the results to')
+
+            query.save_as_multi(params, targets, on_progress, on_complete, self._service_provider.executors.get_pool(SAVE_AS_POOL))
+
+        except Exception as error:
+            request_context.send_error('Failed to save results: {0}'.format(error))
+
+    def _handle_export_query_as_csv_request(self, request_context: RequestContext, params: ExportQueryAsCsvRequestParams) -> None:
+        self._service_provider.executors.submit(QUERY_POOL, self._export_query_as_csv, request_context, params)
+
+    def _export_query_as_csv(self, request_context: RequestContext, params: ExportQueryAsCsvRequestParams) -> None:
+        """ Exports the results of the query on a connection of its own, so that it doesn't wait for the queries of the editor """
+        new_owner_uri = str(uuid.uuid4())
+        connection_service = self._service_provider[utils.constants.CONNECTION_SERVICE_NAME]
+
+        try:
+            connection_info = connection_service.get_connection_info(params.owner_uri)
+            connection_service.connect(ConnectRequestParams(connection_info.details, new_owner_uri, ConnectionType.QUERY))
+            connection = self._get_connection(new_owner_uri, ConnectionType.QUERY)
+
+            row_count = export_query_as_csv(connection, params.query, params.file_path, params, self._get_query_configuration().fetch_batch_size)
+            request_context.send_response(ExportQueryResult(row_count))
+
+        except Exception as error:
+            request_context.send_error('Failed to export {0}: {1}'.format(ntpath.basename(params.file_path or ''), error))
+
+        finally:
+            connection_service.disconnect(new_owner_uri, ConnectionType.QUERY)
+
     def _handle_query_execution_plan_request(self, request_context: RequestContext, params: QueryExecutionPlanRequest):
         raise NotImplementedError()
 
@@ -143,7 +231,7 @@ class QueryExecutionService(object):
             simple_execute_response = SimpleExecuteResponse(subset.result_subset.rows, subset.result_subset.row_count, resultset_summary.column_info)
             request_context.send_response(simple_execute_response)
 
-        worker_args = ExecuteRequestWorkerArgs(new_owner_uri, new_connection, request_context, ResultSetStorageType.FILE_STORAGE,
+        worker_args = ExecuteRequestWorkerArgs(new_owner_uri, new_connection, request_context, ResultSetStorageType.HYBRID,
                                                on_query_complete=on_query_complete)
 
         self._start_query_execution_thread(request_context, execute_params, worker_args)
@@ -163,8 +251,21 @@ class QueryExecutionService(object):
         def on_message_notification(notice_message_params):
             request_context.send_notification(MESSAGE_NOTIFICATION, notice_message_params)
 
+        # Ids of the batches whose result set was announced while its rows were still being read
+        available_batch_ids = set()
+
+        def on_resultset_updated(result_set_params):
+            batch_id = result_set_params.result_set_summary.batch_id
+            if batch_id in available_batch_ids:
+                request_context.send_notification(RESULT_SET_UPDATED_NOTIFICATION, result_set_params)
+            else:
+                available_batch_ids.add(batch_id)
+                request_context.send_notification(RESULT_SET_AVAILABLE_NOTIFICATION, result_set_params)
+
         def on_resultset_complete(result_set_params):
-            request_context.send_notification(RESULT_SET_AVAILABLE_NOTIFICATION, result_set_params)
+            summary = result_set_params.result_set_summary
+            if summary is None or summary.batch_id not in available_batch_ids:
+                request_context.send_notification(RESULT_SET_AVAILABLE_NOTIFICATION, result_set_params)
             request_context.send_notification(RESULT_SET_COMPLETE_NOTIFICATION, result_set_params)
 
         def on_batch_complete(batch_event_params):
@@ -183,9 +284,9 @@ class QueryExecutionService(object):
             request_context.send_unhandled_error_response(e)
             return
 
-        worker_args = ExecuteRequestWorkerArgs(params.owner_uri, conn, request_context, ResultSetStorageType.FILE_STORAGE, before_query_initialize,
+        worker_args = ExecuteRequestWorkerArgs(params.owner_uri, conn, request_context, ResultSetStorageType.HYBRID, before_query_initialize,
                                                on_batch_start, on_message_notification, on_resultset_complete,
-                                               on_batch_complete, on_query_complete)
+                                               on_batch_complete, on_query_complete, on_resultset_updated)
 
         self._start_query_execution_thread(request_context, params, worker_args)
 
@@ -223,7 +324,7 @@ class QueryExecutionService(object):
             request_context.send_unhandled_error_response(e)
             return
 
-        worker_args = ExecuteRequestWorkerArgs(params.owner_uri, conn, request_context, ResultSetStorageType.FILE_STORAGE, before_query_initialize,
+        worker_args = ExecuteRequestWorkerArgs(params.owner_uri, conn, request_context, ResultSetStorageType.HYBRID, before_query_initialize,
                                                on_batch_start, on_message_notification, on_resultset_complete,
                                                on_batch_complete, on_query_complete)
 
@@ -259,24 +360,36 @@ class QueryExecutionService(object):
             batch_event_params = BatchNotificationParams(batch_summary, worker_args.owner_uri)
             _check_and_fire(worker_args.on_batch_complete, batch_event_params)
 
+        def _result_set_partially_loaded_callback(result_set: ResultSet) -> None:
+            # send query/resultSetAvailable or query/resultSetUpdated with the rows read so far
+            result_set_params = ResultSetNotificationParams(worker_args.owner_uri, result_set.result_set_summary)
+            _check_and_fire(worker_args.on_resultset_updated, result_set_params)
+
         # Create a new query if one does not already exist or we already executed the previous one
         if params.owner_uri not in self.query_results or self.query_results[params.owner_uri].execution_state is ExecutionState.EXECUTED:
+            # Release the results of the previous query before they are replaced
+            if params.owner_uri in self.query_results:
+                self.query_results[params.owner_uri].dispose()
+
             query_text = self._get_query_text_from_execute_params(params)
 
-            execution_settings = QueryExecutionSettings(params.execution_plan_options, worker_args.result_set_storage_type)
-            query_events = QueryEvents(None, None, BatchEvents(_batch_execution_started_callback, _batch_execution_finished_callback))
+            query_configuration = self._get_query_configuration()
+            execution_settings = QueryExecutionSettings(params.execution_plan_options, worker_args.result_set_storage_type,
+                                                        query_configuration.fetch_batch_size, query_configuration.result_set_memory_budget,
+                                                        query_configuration.compress_result_buffers, query_configuration.result_set_memory_row_count)
+            # Result sets are only reported while they are read when the caller handles the updates
+            partially_loaded_callback = _result_set_partially_loaded_callback if worker_args.on_resultset_updated is not None else None
+            batch_events = BatchEvents(_batch_execution_started_callback, _batch_execution_finished_callback,
+                                       on_result_set_partially_loaded=partially_loaded_callback)
+            query_events = QueryEvents(None, None, batch_events)
             self.query_results[params.owner_uri] = Query(params.owner_uri, query_text, execution_settings, query_events)
         elif self.query_results[params.owner_uri].execution_state is ExecutionState.EXECUTING:
             request_context.send_error('Another query is currently executing.')  # TODO: Localize
             return
 
-        thread = threading.Thread(
-            target=self._execute_query_request_worker,
-            args=(worker_args,)
+        self.owner_to_thread_map[params.owner_uri] = self._service_provider.executors.submit(
+            QUERY_POOL, self._execute_query_request_worker, worker_args
         )
-        self.owner_to_thread_map[params.owner_uri] = thread
-        thread.daemon = True
-        thread.start()
 
     def _handle_subset_request(self, request_context: RequestContext, params: SubsetParams):
         """Sends a response back to the query/subset request"""
@@ -329,6 +442,7 @@ class QueryExecutionService(object):
             # that we stop it
             if self.query_results[params.owner_uri].execution_state is not ExecutionState.EXECUTED:
                 self.cancel_query(params.owner_uri)
+            self.query_results[params.owner_uri].dispose()
             del self.query_results[params.owner_uri]
             request_context.send_response({})
         except Exception as e:
@@ -391,6 +505,15 @@ class QueryExecutionService(object):
         result_message = ResultMessage(batch_id, is_error, utils.time.get_time_str(datetime.now()), message)
         return MessageNotificationParams(owner_uri, result_message)
 
+    def _get_query_configuration(self) -> QueryConfiguration:
+        """Get the query execution settings from the workspace configuration, or the default ones without a workspace"""
+        try:
+            workspace_service = self._service_provider[utils.constants.WORKSPACE_SERVICE_NAME]
+        except KeyError:
+            return QueryConfiguration()
+
+        return workspace_service.configuration.sql.query
+
     def _get_query_text_from_execute_params(self, params: ExecuteRequestParamsBase):
         if isinstance(params, ExecuteDocumentSelectionParams):
             workspace_service = self._service_provider[utils.constants.WORKSPACE_SERVICE_NAME]
@@ -451,20 +574,90 @@ class QueryExecutionService(object):
                 self._resolve_query_exception(rollback_exception, rollback_query, worker_args, True)
 
     def _save_result(self, params: SaveResultsRequestParams, request_context: RequestContext, file_factory: FileStreamFactory):
+        """ Saves the results in a task of the task service, which reports the progress of the save and cancels it """
         query: Query = self.query_results[params.owner_uri]
+        file_name = ntpath.basename(params.file_path)
+        format_name = next((name for name, (params_class, _) in SAVE_AS_FORMATS.items() if type(params) is params_class), None)
+        task: Task = None
 
         def on_success():
             request_context.send_response(SaveResultRequestResult())
 
         def on_error(reason: str):
-            message = 'Failed to save {0}: {1}'.format(ntpath.basename(params.file_path), reason)
+            message = 'Failed to save {0}: {1}'.format(file_name, reason)
             request_context.send_error(message)
 
+        def on_progress(progress: SaveAsProgress):
+            progress_params = SaveResultsProgressParams(params.owner_uri, params.file_path, format_name, progress.rows_written, progress.row_count,
+                                                        progress.is_complete, progress.error_message, progress.bytes_written,
+                                                        progress.rows_per_second, progress.remaining_time)
+            request_context.send_notification(SAVE_AS_PROGRESS_NOTIFICATION, progress_params)
+
+            if task is not None and not progress.is_complete:
+                task.report_progress(_get_save_progress_message(progress))
+
+        progress = SaveAsProgress(on_progress)
+
         try:
-            query.save_as(params, file_factory, on_success, on_error)
+            query.save_as(params, file_factory, on_success, on_error, progress, self._service_provider.executors.get_pool(SAVE_AS_POOL))
 
         except Exception as error:
             on_error(str(error))
+            return
+
+        connection_info = self._service_provider[utils.constants.CONNECTION_SERVICE_NAME].get_connection_info(params.owner_uri)
+        options = connection_info.details.options if connection_info is not None else {}
+        task = Task('Save results', f'File: {file_name}', self._service_provider.provider, options.get('host'), options.get('dbname'),  # TODO: Localize
+                    request_context, functools.partial(self._wait_for_save, progress))
+        self._service_provider[utils.constants.TASK_SERVICE_NAME].start_task(task)
+
+    def _wait_for_save(self, progress: SaveAsProgress, task: Task) -> TaskResult:
+        """ Waits for a save to complete, canceling it when the task is canceled """
+        with task.cancellation_lock:
+            task.on_cancel = progress.cancel
+            if task.canceled:
+                progress.cancel()
+
+        progress.wait()
+
+        if progress.is_canceled:
+            return TaskResult(TaskStatus.CANCELED)
+
+        if progress.error_message is not None:
+            return TaskResult(TaskStatus.FAILED, progress.error_message)
+
+        if self._service_provider.logger is not None:
+            self._service_provider.logger.info('Saved {0} rows to {1} in {2:.2f}s, {3:.0f} rows/s, {4} bytes'.format(
+                progress.rows_written, progress.file_path, progress.elapsed_time, progress.rows_per_second, progress.bytes_written))
+
+        return TaskResult(TaskStatus.SUCCEEDED)
+
+
+def _create_save_as_target(params: SaveResultsAsMultiRequestParams, target: SaveResultsAsMultiTarget) -> SaveAsTarget:
+    """ Creates the target of a multiple save, with the request params of a single save in its format """
+    if target.format not in SAVE_AS_FORMATS:
+        raise ValueError('Unsupported save format: {0}'.format(target.format))
+
+    params_class, file_factory_class = SAVE_AS_FORMATS[target.format]
+    target_params = params_class()
+
+    # The rows and columns to save are the ones of the request, the other options are the ones of the target
+    for attribute in vars(target_params):
+        if attribute in vars(params) and attribute != 'file_path':
+            setattr(target_params, attribute, getattr(params, attribute))
+        elif attribute in vars(target):
+            setattr(target_params, attribute, getattr(target, attribute))
+
+    return SaveAsTarget(target.format, target.file_path, file_factory_class(target_params))
+
+
+def _get_save_progress_message(progress: SaveAsProgress) -> str:
+    message = '{0} of {1} rows saved, {2:.0f} rows/s'.format(progress.rows_written, progress.row_count, progress.rows_per_second)  # TODO: Localize
+
+    if progress.remaining_time is not None:
+        message += ', {0:.0f}s left'.format(progress.remaining_time)  # TODO: Localize
+
+    return message
 
 
 def _create_rows_affected_message(batch: Batch) -> str:
@@ -0,0 +1,81 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+from typing import List  # noqa
+
+from ossdbtoolsservice.driver import ServerConnection
+from ossdbtoolsservice.query.data_storage import SaveAsCsvFileStreamFactory, StorageDataReader
+from ossdbtoolsservice.query.data_storage.save_as_csv_file_stream_factory import CSV_BUFFER_SIZE, DEFAULT_ENCODING
+from ossdbtoolsservice.query.data_storage.save_as_csv_writer import (
+    CSV_WRITE_BATCH_SIZE, DEFAULT_DELIMITER, DEFAULT_TEXT_IDENTIFIER
+)
+from ossdbtoolsservice.query_execution.contracts import ExportQueryAsCsvRequestParams, SaveResultsAsCsvRequestParams
+from ossdbtoolsservice.utils.constants import DEFAULT_FETCH_BATCH_SIZE
+
+# Rows written by COPY always end with a newline
+COPY_LINE_SEPARATOR = '\n'
+
+# Text of NULL values, as in the display values of the results
+NULL_TEXT = 'NULL'
+
+
+def export_query_as_csv(connection: ServerConnection, query: str, file_path: str, params: ExportQueryAsCsvRequestParams,
+                        fetch_batch_size: int = DEFAULT_FETCH_BATCH_SIZE) -> int:
+    """
+    Exports the results of a query to a CSV file and returns the number of rows exported. Servers that support it
+    stream the CSV text straight into the file with COPY TO STDOUT. Otherwise, and for line separators COPY does
+    not write, the rows are fetched from a cursor and written by the CSV writer of save as
+    :param params: the format of the file
+    """
+    line_separator = params.line_seperator or COPY_LINE_SEPARATOR
+
+    if connection.supports_copy_to and line_separator == COPY_LINE_SEPARATOR:
+        encoding = params.encoding or DEFAULT_ENCODING
+
+        # The file must not translate the line endings written by the server
+        with io.open(file_path, 'w', buffering=CSV_BUFFER_SIZE, encoding=encoding, newline='') as stream:
+            return connection.copy_query_to(
+                query, stream, params.delimiter or DEFAULT_DELIMITER, params.text_identifier or DEFAULT_TEXT_IDENTIFIER,
+                NULL_TEXT, bool(params.quote_all_values), bool(params.include_headers))
+
+    return _export_cursor_rows(connection, query, file_path, params, line_separator, fetch_batch_size)
+
+
+def _export_cursor_rows(connection: ServerConnection, query: str, file_path: str, params: ExportQueryAsCsvRequestParams, line_separator: str,
+                        fetch_batch_size: int) -> int:
+    csv_params = SaveResultsAsCsvRequestParams()
+    csv_params.file_path = file_path
+    csv_params.include_headers = params.include_headers
+    csv_params.delimiter = params.delimiter
+    csv_params.line_seperator = line_separator
+    csv_params.text_identifier = params.text_identifier
+    csv_params.quote_all_values = params.quote_all_values
+    csv_params.encoding = params.encoding
+
+    cursor = connection.cursor()
+
+    try:
+        cursor.execute(query)
+        reader = StorageDataReader(cursor, fetch_batch_size)
+        row_count = 0
+
+        with SaveAsCsvFileStreamFactory(csv_params).get_writer(file_path) as writer:
+            rows: List[tuple] = []
+
+            while reader.read_row():
+                rows.append(tuple(NULL_TEXT if value is None else str(value) for value in reader.get_values()))
+
+                if len(rows) >= CSV_WRITE_BATCH_SIZE:
+                    writer.write_display_rows(rows, reader.columns_info)
+                    row_count += len(rows)
+                    rows = []
+
+            writer.write_display_rows(rows, reader.columns_info)
+            writer.complete_write()
+
+            return row_count + len(rows)
+    finally:
+        cursor.close()
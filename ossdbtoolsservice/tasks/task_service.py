@@ -23,7 +23,7 @@ class TaskService:
         self._service_provider = service_provider
 
         # Register the handlers for the service
-        self._service_provider.server.set_request_handler(CANCEL_TASK_REQUEST, self.handle_cancel_request)
+        self._service_provider.server.set_request_handler(CANCEL_TASK_REQUEST, self.handle_cancel_request, inline=True)
         self._service_provider.server.set_request_handler(LIST_TASKS_REQUEST, self.handle_list_request)
 
     def handle_cancel_request(self, request_context: RequestContext, params: CancelTaskParameters) -> None:
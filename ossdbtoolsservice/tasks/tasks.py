@@ -62,7 +62,7 @@ class Task:
 
     def start(self) -> None:
         """Start the task by running it in a new thread"""
-        self._start_time = time.clock()
+        self._start_time = time.perf_counter()
         self._thread = threading.Thread(target=self._run)
         self._thread.daemon = True
         self._thread.start()
@@ -79,6 +79,12 @@ class Task:
         self.canceled = True
         return True
 
+    def report_progress(self, message: str) -> None:
+        """Notify the progress of the running task as a status message, keeping its status"""
+        if self.status is not TaskStatus.IN_PROGRESS:
+            return
+        self._set_status(TaskStatus.IN_PROGRESS, message)
+
     def _run(self) -> None:
         """Run the given action, updating the task's status as needed"""
         self._set_status(TaskStatus.IN_PROGRESS)
@@ -106,7 +112,7 @@ class Task:
             'taskId': self.id,
             'status': self.status,
             'message': self.status_message or '',
-            'duration': int((time.clock() - self._start_time) * 1000) if self._is_completed else 0
+            'duration': int((time.perf_counter() - self._start_time) * 1000) if self._is_completed else 0
         })
 
     @property
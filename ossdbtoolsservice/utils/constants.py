@@ -24,6 +24,15 @@ DEFAULT_PORT = {
     MARIADB_PROVIDER_NAME: 3306
 }
 
+# Number of rows fetched from a cursor at once when reading query results
+DEFAULT_FETCH_BATCH_SIZE = 1000
+
+# Approximate number of bytes of rows a result set keeps in memory before moving them to a buffer file
+DEFAULT_RESULT_SET_MEMORY_BUDGET = 8 * 1024 * 1024
+
+# Maximum number of rows a result set keeps in memory before moving them to a buffer file, whatever their size
+DEFAULT_RESULT_SET_MEMORY_ROW_COUNT = 10000
+
 # Service names
 ADMIN_SERVICE_NAME = 'admin'
 CAPABILITIES_SERVICE_NAME = 'capabilities'
@@ -37,3 +46,4 @@ SCRIPTING_SERVICE_NAME = 'scripting'
 WORKSPACE_SERVICE_NAME = 'workspace'
 EDIT_DATA_SERVICE_NAME = 'edit_data'
 TASK_SERVICE_NAME = 'tasks'
+DATA_IMPORT_SERVICE_NAME = 'data_import'
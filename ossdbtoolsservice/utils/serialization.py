@@ -5,11 +5,41 @@
 
 """Utility function for serialization"""
 
+import codecs
 import enum
 import json
+from typing import Any, Callable, Dict  # noqa
 
 import inflection
 
+try:
+    import orjson
+except ImportError:
+    # orjson is an optional, faster backend of encode_json
+    orjson = None
+
+# Types that json encodes as they are
+_JSON_TYPES = (str, int, float, bool, type(None))
+_JSON_TYPE_SET = frozenset(_JSON_TYPES)
+
+# Functions returning the json-ready representation of instances of a type, looked up by exact type
+_SERIALIZERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def register_serializer(class_: type, serializer: Callable[[Any], Any]):
+    """
+    Registers a function that converts instances of a class straight to their json-ready representation,
+    bypassing the attribute name normalization. Meant for objects sent in large numbers, such as cells of
+    result sets. Subclasses are not covered and have to be registered on their own
+    :param class_: Class whose instances are converted by the serializer
+    :param serializer: Function returning the json-ready representation of an instance
+    """
+    _SERIALIZERS[class_] = serializer
+
+
+# camelCase names of the attributes of objects, by class and attribute name
+_CAMEL_CASE_NAMES: Dict[type, Dict[str, str]] = {}
+
 
 def convert_to_dict(obj):
     """
@@ -18,22 +48,91 @@ def convert_to_dict(obj):
     :param obj: The object to convert to a jsonic dictionary
     :return: A json-ready dictionary representation of the object
     """
-    return json.loads(json.dumps(obj, default=_get_serializable_value))
+    return _to_json_ready(obj)
+
+
+def encode_json(obj) -> bytes:
+    """
+    Encodes a json-ready object, such as the result of convert_to_dict, to compact UTF-8 JSON. Uses orjson
+    when it is installed, unless the object holds values it does not support, such as integers over 64 bits
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def decode_json(data, encoding: str = 'utf-8'):
+    """
+    Decodes JSON from a bytes-like object, such as a memoryview of a buffer, without copying the bytes first.
+    Uses orjson for UTF-8 when it is installed, unless the JSON holds values it does not support
+    :raises ValueError: The data is not valid JSON
+    """
+    if orjson is not None and codecs.lookup(encoding).name == 'utf-8':
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(str(data, encoding))
+
 
+def _to_json_ready(obj):
+    """
+    Converts an object to the built-in types json encodes, in a single pass over the object. Values that are
+    already json types are taken as they are without a call
+    """
+    # Exact types first, since they are by far the most common
+    obj_type = type(obj)
+    if obj_type in _JSON_TYPE_SET:
+        return obj
+    if obj_type is dict:
+        return {_to_json_key(key): value if type(value) in _JSON_TYPE_SET else _to_json_ready(value) for key, value in obj.items()}
+    if obj_type is list or obj_type is tuple:
+        return [item if type(item) in _JSON_TYPE_SET else _to_json_ready(item) for item in obj]
 
-def _get_serializable_value(obj):
-    """Gets a serializable representation of an object, for use as the default argument to json.dumps"""
+    serializer = _SERIALIZERS.get(obj_type)
+    if serializer is not None:
+        return _to_json_ready(serializer(obj))
     # If the object is an Enum, use its value
     if isinstance(obj, enum.Enum):
-        return _get_serializable_value(obj.value)
+        return _to_json_ready(obj.value)
+    # Subclasses of the types json encodes
+    if isinstance(obj, _JSON_TYPES):
+        return obj
+    if isinstance(obj, dict):
+        return {_to_json_key(key): _to_json_ready(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_to_json_ready(item) for item in obj]
     # Try to use the object's dictionary representation if available
     try:
-        return {inflection.camelize(key, False): value for key, value in obj.__dict__.items()}
+        attributes = obj.__dict__
     except AttributeError:
-        pass
-    # Assume the object can be serialized normally
-    try:
-        json.dumps(obj)
-        return obj
-    except BaseException:
+        # The object cannot be serialized
         return None
+
+    names = _CAMEL_CASE_NAMES.get(obj_type)
+    if names is None:
+        names = _CAMEL_CASE_NAMES[obj_type] = {}
+
+    result = {}
+    for key, value in attributes.items():
+        name = names.get(key)
+        if name is None:
+            name = names[key] = inflection.camelize(key, False)
+        result[name] = value if type(value) in _JSON_TYPE_SET else _to_json_ready(value)
+    return result
+
+
+def _to_json_key(key):
+    """Converts a dictionary key the way json does, which turns keys of basic types to strings"""
+    if type(key) is str:
+        return key
+    if key is None:
+        return 'null'
+    if isinstance(key, bool):
+        return 'true' if key else 'false'
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    return key
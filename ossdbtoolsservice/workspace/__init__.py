@@ -8,6 +8,7 @@ from ossdbtoolsservice.workspace.contracts import (Configuration,
                                                    IntellisenseConfiguration,
                                                    MySQLConfiguration,
                                                    PGSQLConfiguration,
+                                                   QueryConfiguration,
                                                    SQLConfiguration,
                                                    TextDocumentIdentifier)
 from ossdbtoolsservice.workspace.script_file import ScriptFile
@@ -16,5 +17,5 @@ from ossdbtoolsservice.workspace.workspace_service import WorkspaceService
 
 __all__ = [
     'Configuration', 'MySQLConfiguration', 'PGSQLConfiguration', 'SQLConfiguration', 'IntellisenseConfiguration',
-    'FormatterConfiguration', 'ScriptFile', 'WorkspaceService', 'Workspace', 'TextDocumentIdentifier'
+    'FormatterConfiguration', 'QueryConfiguration', 'ScriptFile', 'WorkspaceService', 'Workspace', 'TextDocumentIdentifier'
 ]
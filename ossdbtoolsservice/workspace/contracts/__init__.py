@@ -10,7 +10,7 @@ from ossdbtoolsservice.workspace.contracts.did_change_config_notification import
     DID_CHANGE_CONFIG_NOTIFICATION, Configuration,
     DidChangeConfigurationParams, FormatterConfiguration,
     IntellisenseConfiguration, MySQLConfiguration, PGSQLConfiguration,
-    SQLConfiguration)
+    QueryConfiguration, SQLConfiguration)
 from ossdbtoolsservice.workspace.contracts.did_change_text_doc_notification import (
     DID_CHANGE_TEXT_DOCUMENT_NOTIFICATION, DidChangeTextDocumentParams,
     TextDocumentChangeEvent)
@@ -22,7 +22,7 @@ from ossdbtoolsservice.workspace.contracts.did_open_text_doc_notification import
 __all__ = [
     'DID_CHANGE_CONFIG_NOTIFICATION', 'DidChangeConfigurationParams',
     'Configuration', 'MySQLConfiguration', 'PGSQLConfiguration', 'SQLConfiguration', 'IntellisenseConfiguration',
-    'FormatterConfiguration', 'DID_CHANGE_TEXT_DOCUMENT_NOTIFICATION', 'DidChangeTextDocumentParams', 'TextDocumentChangeEvent',
+    'FormatterConfiguration', 'QueryConfiguration', 'DID_CHANGE_TEXT_DOCUMENT_NOTIFICATION', 'DidChangeTextDocumentParams', 'TextDocumentChangeEvent',
     'DID_OPEN_TEXT_DOCUMENT_NOTIFICATION', 'DidOpenTextDocumentParams',
     'DID_CLOSE_TEXT_DOCUMENT_NOTIFICATION', 'DidCloseTextDocumentParams',
     'Location', 'Position', 'Range', 'TextDocumentItem', 'TextDocumentIdentifier', 'TextDocumentPosition'
@@ -16,7 +16,7 @@ class SQLConfiguration(Serializable):
     """
     @classmethod
     def get_child_serializable_types(cls):
-        return {'intellisense': IntellisenseConfiguration}
+        return {'intellisense': IntellisenseConfiguration, 'query': QueryConfiguration}
 
     @classmethod
     def ignore_extra_attributes(cls):
@@ -24,6 +24,7 @@ class SQLConfiguration(Serializable):
 
     def __init__(self):
         self.intellisense: IntellisenseConfiguration = IntellisenseConfiguration()
+        self.query: QueryConfiguration = QueryConfiguration()
 
 
 class PGSQLConfiguration(Serializable):
@@ -98,6 +99,21 @@ class IntellisenseConfiguration(Serializable):
         self.enable_quick_info = True
 
 
+class QueryConfiguration(Serializable):
+    """
+    Configuration for query execution settings
+    """
+    @classmethod
+    def ignore_extra_attributes(cls):
+        return True
+
+    def __init__(self):
+        self.fetch_batch_size: int = constants.DEFAULT_FETCH_BATCH_SIZE
+        self.result_set_memory_budget: int = constants.DEFAULT_RESULT_SET_MEMORY_BUDGET
+        self.result_set_memory_row_count: int = constants.DEFAULT_RESULT_SET_MEMORY_ROW_COUNT
+        self.compress_result_buffers: bool = False
+
+
 class Configuration(Serializable):
     """
     Configuration of the tools service
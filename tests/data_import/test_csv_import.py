@@ -0,0 +1,103 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.data_import.contracts import ImportCsvParams
+from ossdbtoolsservice.data_import.csv_import import ImportCanceledError, ImportFileReader, import_csv
+
+
+class TestCsvImport(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(tempfile.mkdtemp(), 'import.csv')
+
+        with io.open(self.file_path, 'w', encoding='utf-8', newline='') as file:
+            file.write('id,name\r\n1,"Text, 1"\r\n2,\r\n')
+
+        self.params = ImportCsvParams()
+        self.params.schema_name = 'public'
+        self.params.table_name = 'table'
+        self.params.has_headers = True
+
+        self.connection = mock.MagicMock()
+        self.inserted_rows = []
+
+        def insert_rows(schema_name, table_name, column_names, rows):
+            self.inserted_rows.append(rows)
+            return len(rows)
+
+        self.connection.insert_rows = mock.Mock(side_effect=insert_rows)
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test_import_with_copy(self):
+        self.connection.supports_copy_from = True
+        self.connection.copy_table_from = mock.Mock(return_value=2)
+
+        with io.open(self.file_path, encoding='utf-8', newline='') as file:
+            reader = ImportFileReader(file, os.path.getsize(self.file_path))
+            row_count = import_csv(self.connection, self.params, reader)
+
+        # The server reads the file, with the defaults of the CSV format of COPY
+        self.assertEqual(row_count, 2)
+        self.connection.copy_table_from.assert_called_once_with('public', 'table', None, reader, ',', '"', '', True)
+        self.connection.insert_rows.assert_not_called()
+
+    def test_import_without_copy_support(self):
+        self.connection.supports_copy_from = False
+
+        with io.open(self.file_path, encoding='utf-8', newline='') as file:
+            row_count = import_csv(self.connection, self.params, ImportFileReader(file, os.path.getsize(self.file_path)))
+
+        # The header is skipped and empty fields are inserted as NULL
+        self.assertEqual(row_count, 2)
+        self.assertEqual(self.inserted_rows, [[['1', 'Text, 1'], ['2', None]]])
+
+    def test_import_without_copy_support_in_batches(self):
+        self.connection.supports_copy_from = False
+        self.params.has_headers = False
+
+        with mock.patch('ossdbtoolsservice.data_import.csv_import.IMPORT_BATCH_SIZE', new=2):
+            with io.open(self.file_path, encoding='utf-8', newline='') as file:
+                row_count = import_csv(self.connection, self.params, ImportFileReader(file, os.path.getsize(self.file_path)))
+
+        self.assertEqual(row_count, 3)
+        self.assertEqual([len(rows) for rows in self.inserted_rows], [2, 1])
+
+    def test_canceled_import_stops_reading(self):
+        self.connection.supports_copy_from = False
+
+        with io.open(self.file_path, encoding='utf-8', newline='') as file:
+            reader = ImportFileReader(file, os.path.getsize(self.file_path))
+            reader.cancel()
+
+            with self.assertRaises(ImportCanceledError):
+                import_csv(self.connection, self.params, reader)
+
+        self.assertEqual(self.inserted_rows, [])
+
+    def test_reader_reports_progress(self):
+        on_progress = mock.Mock()
+
+        with mock.patch('ossdbtoolsservice.data_import.csv_import.PROGRESS_INTERVAL', new=0):
+            with io.open(self.file_path, encoding='utf-8', newline='') as file:
+                reader = ImportFileReader(file, os.path.getsize(self.file_path), on_progress)
+                content = reader.read()
+                reader.read()
+
+        self.assertEqual(content, 'id,name\r\n1,"Text, 1"\r\n2,\r\n')
+
+        # Progress is measured in bytes of the file read before each read
+        on_progress.assert_called_with(os.path.getsize(self.file_path), os.path.getsize(self.file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
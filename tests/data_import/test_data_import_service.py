@@ -0,0 +1,133 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Test the data import service"""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.connection import ConnectionInfo, ConnectionService
+from ossdbtoolsservice.connection.contracts import ConnectionDetails, ConnectionType
+from ossdbtoolsservice.data_import import DataImportService, data_import_service
+from ossdbtoolsservice.data_import.contracts import ImportCsvParams
+from ossdbtoolsservice.tasks import Task, TaskService, TaskStatus
+from ossdbtoolsservice.utils import constants
+from tests import utils
+
+
+class TestDataImportService(unittest.TestCase):
+    """Methods for testing the data import service"""
+
+    def setUp(self):
+        """Set up the tests with a data import service and connection service with mock connection info"""
+        self.data_import_service = DataImportService()
+        self.connection_service = ConnectionService()
+        self.task_service = TaskService()
+        self.data_import_service._service_provider = utils.get_mock_service_provider({
+            constants.CONNECTION_SERVICE_NAME: self.connection_service,
+            constants.TASK_SERVICE_NAME: self.task_service})
+
+        self.connection_details = ConnectionDetails()
+        self.connection_details.options = {'host': 'test_host', 'dbname': 'test_db', 'user': 'user'}
+        self.connection_info = ConnectionInfo('test_uri', self.connection_details)
+
+        self.file_path = os.path.join(tempfile.mkdtemp(), 'import.csv')
+        with io.open(self.file_path, 'w', encoding='utf-8', newline='') as file:
+            file.write('1,Text 1\n')
+
+        self.params = ImportCsvParams.from_dict({
+            'ownerUri': 'test_uri',
+            'filePath': self.file_path,
+            'schemaName': 'public',
+            'tableName': 'table'
+        })
+
+        self.request_context = utils.MockRequestContext()
+        self.connection = mock.MagicMock()
+        self.connection_service.connect = mock.Mock()
+        self.connection_service.disconnect = mock.Mock()
+        self.connection_service.get_connection = mock.Mock(return_value=self.connection)
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def create_task(self) -> Task:
+        task = Task('Import', '', constants.PG_PROVIDER_NAME, 'test_host', 'test_db', self.request_context, None)
+        task.status = TaskStatus.IN_PROGRESS
+        return task
+
+    def test_handle_import_csv_request(self):
+        """Test that the import request starts an import task and responds right away"""
+        self.connection_service.get_connection_info = mock.Mock(return_value=self.connection_info)
+        self.task_service.start_task = mock.Mock()
+
+        self.data_import_service.handle_import_csv_request(self.request_context, self.params)
+
+        task: Task = self.task_service.start_task.call_args[0][0]
+        self.assertEqual(task.name, 'Import')
+        self.assertEqual(task.description, 'File: import.csv, Table: table')
+        self.assertEqual(task.database_name, 'test_db')
+        self.assertEqual(self.request_context.last_response_params, {})
+
+    def test_handle_import_csv_request_without_connection(self):
+        """Test that the import request fails for an unknown owner URI"""
+        self.connection_service.get_connection_info = mock.Mock(return_value=None)
+        self.task_service.start_task = mock.Mock()
+
+        self.data_import_service.handle_import_csv_request(self.request_context, self.params)
+
+        self.task_service.start_task.assert_not_called()
+        self.assertIsNotNone(self.request_context.last_error_message)
+
+    def test_perform_import(self):
+        """Test that the import runs on a connection of its own, commits and reports the rows imported"""
+        task = self.create_task()
+
+        with mock.patch('ossdbtoolsservice.data_import.data_import_service.import_csv', new=mock.Mock(return_value=1)) as mock_import:
+            result = data_import_service._perform_import(self.connection_service, self.connection_info, self.params, task)
+
+        self.assertIs(result.status, TaskStatus.SUCCEEDED)
+        self.assertIs(mock_import.call_args[0][0], self.connection)
+        self.assertIs(mock_import.call_args[0][1], self.params)
+        self.connection.commit.assert_called_once()
+        self.assertEqual(task.status_message, '1 rows imported')
+
+        connect_params = self.connection_service.connect.call_args[0][0]
+        self.assertNotEqual(connect_params.owner_uri, 'test_uri')
+        self.connection_service.disconnect.assert_called_once_with(connect_params.owner_uri, ConnectionType.QUERY)
+
+    def test_perform_import_canceled(self):
+        """Test that canceling the task cancels the reads of the file and leaves the rows uncommitted"""
+        task = self.create_task()
+
+        def import_csv(connection, params, reader):
+            task.cancel()
+            reader.read()
+
+        with mock.patch('ossdbtoolsservice.data_import.data_import_service.import_csv', new=mock.Mock(side_effect=import_csv)):
+            result = data_import_service._perform_import(self.connection_service, self.connection_info, self.params, task)
+
+        self.assertIs(result.status, TaskStatus.CANCELED)
+        self.connection.commit.assert_not_called()
+        self.connection_service.disconnect.assert_called_once()
+
+    def test_perform_import_fails(self):
+        """Test that a failed import fails the task with the error"""
+        task = self.create_task()
+
+        with mock.patch('ossdbtoolsservice.data_import.data_import_service.import_csv', new=mock.Mock(side_effect=ValueError('Bad row'))):
+            result = data_import_service._perform_import(self.connection_service, self.connection_info, self.params, task)
+
+        self.assertIs(result.status, TaskStatus.FAILED)
+        self.assertEqual(result.error_message, 'Bad row')
+        self.connection.commit.assert_not_called()
+        self.connection_service.disconnect.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
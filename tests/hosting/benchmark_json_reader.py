@@ -0,0 +1,128 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Benchmark of reading JSON RPC messages of 1 KB to 10 MB, comparing the former reader, which scanned for the
+end of the headers byte by byte and reallocated its buffer after every message, with the current one. The
+stream hands out at most a pipe's worth of bytes per read. It is not part of the unit test run; execute it with:
+
+    python -m unittest tests.hosting.benchmark_json_reader
+"""
+
+import io
+import json
+import time
+import unittest
+
+from ossdbtoolsservice.hosting.json_reader import JSONRPCReader
+
+# Number of bytes a read of the stream returns at most, as for a pipe
+PIPE_READ_SIZE = 65536
+
+# Message sizes and the number of messages read of each size
+MESSAGE_SIZES = [(1024, 20000), (64 * 1024, 1000), (1024 * 1024, 50), (10 * 1024 * 1024, 5)]
+
+
+class PipeStream(io.BytesIO):
+    """ Stream returning at most PIPE_READ_SIZE bytes per read """
+
+    def readinto(self, buffer):
+        with memoryview(buffer) as view:
+            return io.BytesIO.readinto(self, view[:PIPE_READ_SIZE])
+
+
+class LegacyJSONRPCReader(JSONRPCReader):
+    """ The reader as it was before: byte by byte header scan, buffer reallocated after every message """
+
+    CR = 13
+    LF = 10
+
+    def _read_next_chunk(self):
+        current_buffer_size = len(self._buffer)
+        if (current_buffer_size - self._buffer_end_offset) / current_buffer_size < self.BUFFER_RESIZE_TRIGGER:
+            resized_buffer = bytearray(current_buffer_size * 2)
+            resized_buffer[0:current_buffer_size] = self._buffer
+            self._buffer = resized_buffer
+
+        length_read = self.stream.readinto(memoryview(self._buffer)[self._buffer_end_offset:])
+        if not length_read:
+            raise EOFError('End of stream reached, no output.')
+        self._buffer_end_offset += length_read
+        return True
+
+    def _try_read_headers(self):
+        scan_offset = self._read_offset
+        while scan_offset + 3 < self._buffer_end_offset and (
+            self._buffer[scan_offset] != self.CR or
+            self._buffer[scan_offset + 1] != self.LF or
+            self._buffer[scan_offset + 2] != self.CR or
+            self._buffer[scan_offset + 3] != self.LF
+        ):
+            scan_offset += 1
+
+        if scan_offset + 3 >= self._buffer_end_offset:
+            return False
+
+        for header in self._buffer[self._read_offset:scan_offset].decode('ascii').split('\n'):
+            colon_index = header.find(':')
+            self._headers[header[:colon_index].strip().lower()] = header[colon_index + 1:].strip()
+
+        self._expected_content_length = int(self._headers['content-length'])
+        self._read_offset = scan_offset + 4
+        self._read_state = self.ReadState.Content
+        return True
+
+    def _try_read_content(self, content):
+        if self._buffer_end_offset - self._read_offset < self._expected_content_length:
+            return False
+
+        content[0] = memoryview(self._buffer[self._read_offset:self._read_offset + self._expected_content_length].decode(self.encoding)
+                                .encode(self.encoding))
+        self._read_offset += self._expected_content_length
+        self._read_state = self.ReadState.Header
+        return True
+
+    def _trim_buffer_and_resize(self, bytes_to_remove):
+        current_buffer_size = len(self._buffer)
+        new_buffer = bytearray(max(current_buffer_size - bytes_to_remove, self.DEFAULT_BUFFER_SIZE))
+        if bytes_to_remove <= current_buffer_size:
+            new_buffer[:self._buffer_end_offset - bytes_to_remove] = self._buffer[bytes_to_remove:self._buffer_end_offset]
+        self._buffer = new_buffer
+        self._read_offset = 0
+        self._buffer_end_offset -= bytes_to_remove
+        self._headers = {}
+
+
+def create_messages(message_size: int, message_count: int) -> bytes:
+    """ Creates didChange notifications whose content is message_size bytes long """
+    message = {'jsonrpc': '2.0', 'method': 'textDocument/didChange', 'params': {'text': ''}}
+    padding = message_size - len(json.dumps(message))
+    message['params']['text'] = 'SELECT 1;\n' * (padding // 10) + 'x' * (padding % 10)
+    content = json.dumps(message).encode('utf-8')
+    return ('Content-Length: {}\r\n\r\n'.format(len(content)).encode('ascii') + content) * message_count
+
+
+class JSONRPCReaderBenchmark(unittest.TestCase):
+
+    def _read(self, name: str, reader_class, message_size: int, message_count: int, stream_bytes: bytes) -> None:
+        reader = reader_class(PipeStream(stream_bytes))
+
+        start = time.perf_counter()
+        for _ in range(message_count):
+            reader.read_message()
+        seconds = time.perf_counter() - start
+
+        print(f'\n{name}, {message_size // 1024:,} KB messages: {message_count / seconds:,.0f} messages/s, '
+              f'{len(stream_bytes) / seconds / 1024 / 1024:,.0f} MB/s')
+
+    def test_read_messages(self):
+        for message_size, message_count in MESSAGE_SIZES:
+            stream_bytes = create_messages(message_size, message_count)
+            self._read('Legacy reader', LegacyJSONRPCReader, message_size, message_count, stream_bytes)
+            self._read('Reader', JSONRPCReader, message_size, message_count, stream_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
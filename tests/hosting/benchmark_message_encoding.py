@@ -0,0 +1,115 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Benchmark of encoding outgoing JSON RPC messages, comparing the former encoding, which serialized every message
+twice and parsed it once, with the single pass conversion encoded by json or orjson. Payloads are a page of
+a result set subset and a list of completions. It is not part of the unit test run; execute it with:
+
+    python -m unittest tests.hosting.benchmark_message_encoding
+"""
+
+import datetime
+import enum
+import json
+import time
+import unittest
+from unittest import mock
+
+import inflection
+
+from ossdbtoolsservice.hosting.json_message import JSONRPCMessage
+from ossdbtoolsservice.hosting.json_writer import JSONRPCWriter
+from ossdbtoolsservice.language.contracts import CompletionItem, CompletionItemKind, TextEdit
+from ossdbtoolsservice.query.contracts import DbCellValue, ResultSetSubset, SubsetResult
+from ossdbtoolsservice.utils import serialization
+from ossdbtoolsservice.workspace.contracts import Range
+
+ITERATIONS = 200
+SUBSET_ROW_COUNT = 500
+SUBSET_COLUMN_COUNT = 8
+COMPLETION_COUNT = 500
+
+
+def create_subset_message() -> JSONRPCMessage:
+    subset = ResultSetSubset()
+    subset.rows = [
+        [DbCellValue(f'value {row} {column}', False, row * column, row) for column in range(SUBSET_COLUMN_COUNT)]
+        for row in range(SUBSET_ROW_COUNT)
+    ]
+    subset.row_count = SUBSET_ROW_COUNT
+    return JSONRPCMessage.create_response('1', SubsetResult(subset))
+
+
+def create_completion_message() -> JSONRPCMessage:
+    completions = []
+    for index in range(COMPLETION_COUNT):
+        completion = CompletionItem()
+        completion.label = f'column_{index}'
+        completion.kind = CompletionItemKind.Field
+        completion.detail = 'column'
+        completion.sort_text = f'{index:05}'
+        completion.insert_text = f'column_{index}'
+        completion.text_edit = TextEdit.from_data(Range.from_data(10, 4, 10, 8), f'column_{index}')
+        completion.data = {'modified': datetime.datetime(2020, 1, 1)}
+        completions.append(completion)
+    return JSONRPCMessage.create_response('2', completions)
+
+
+def _get_legacy_serializable_value(obj):
+    """ The default argument of json.dumps used by the former conversion """
+    serializer = serialization._SERIALIZERS.get(type(obj))
+    if serializer is not None:
+        return serializer(obj)
+    if isinstance(obj, enum.Enum):
+        return _get_legacy_serializable_value(obj.value)
+    try:
+        return {inflection.camelize(key, False): value for key, value in obj.__dict__.items()}
+    except AttributeError:
+        pass
+    try:
+        json.dumps(obj)
+        return obj
+    except BaseException:
+        return None
+
+
+def encode_legacy_message(message: JSONRPCMessage) -> bytes:
+    """ The former encoding: the payload converted by a dumps, loads round trip, then dumped again with sorted keys """
+    with mock.patch('ossdbtoolsservice.utils.serialization.convert_to_dict',
+                    new=lambda obj: json.loads(json.dumps(obj, default=_get_legacy_serializable_value))):
+        json_content = json.dumps(message.dictionary, sort_keys=True).encode('UTF-8')
+    return JSONRPCWriter.HEADER.format(str(len(json_content))).encode('ascii') + json_content
+
+
+class MessageEncodingBenchmark(unittest.TestCase):
+
+    def _encode(self, name: str, message: JSONRPCMessage, encode) -> None:
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            encoded = encode(message)
+        seconds = time.perf_counter() - start
+
+        print(f'\n{name}: {ITERATIONS / seconds:,.0f} messages/s, {len(encoded):,} bytes')
+
+    def _encode_all(self, name: str, message: JSONRPCMessage) -> None:
+        writer = JSONRPCWriter(None)
+        self._encode(f'{name}, legacy round trip', message, encode_legacy_message)
+
+        with mock.patch('ossdbtoolsservice.utils.serialization.orjson', new=None):
+            self._encode(f'{name}, single pass with json', message, writer.encode_message)
+
+        if serialization.orjson is not None:
+            self._encode(f'{name}, single pass with orjson', message, writer.encode_message)
+
+    def test_subset_result(self):
+        self._encode_all('Subset result', create_subset_message())
+
+    def test_completions(self):
+        self._encode_all('Completions', create_completion_message())
+
+
+if __name__ == '__main__':
+    unittest.main()
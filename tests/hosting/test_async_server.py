@@ -0,0 +1,304 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import asyncio
+import io
+import json
+import os
+import threading
+import unittest
+import unittest.mock as mock
+
+from ossdbtoolsservice.hosting.async_json_rpc_server import AsyncJSONRPCServer
+from ossdbtoolsservice.hosting.json_reader import JSONRPCReader
+from ossdbtoolsservice.hosting.json_rpc_server import IncomingMessageConfiguration, REQUEST_CANCELLED_ERROR_CODE
+import tests.utils as utils
+
+
+def _encode(message: dict) -> bytes:
+    content = json.dumps(message).encode('utf-8')
+    return 'Content-Length: {}\r\n\r\n'.format(len(content)).encode('ascii') + content
+
+
+class NonClosingBytesIO(io.BytesIO):
+    """ BytesIO whose value can be read after the server closes it """
+
+    def close(self):
+        pass
+
+
+class AsyncJSONRPCServerTests(unittest.TestCase):
+
+    def setUp(self):
+        # Connect the server to pipes, as the client does with the standard streams
+        input_read, self._input_write = os.pipe()
+        output_read, output_write = os.pipe()
+        self.logger = utils.get_mock_logger()
+        self.server = AsyncJSONRPCServer(os.fdopen(input_read, 'rb', buffering=0), os.fdopen(output_write, 'wb', buffering=0), self.logger)
+        self.client_reader = JSONRPCReader(os.fdopen(output_read, 'rb', buffering=0))
+        self._is_started = False
+
+    def tearDown(self):
+        if self._is_started:
+            self._send({'jsonrpc': '2.0', 'id': 'shutdown', 'method': 'shutdown', 'params': {}})
+            self.server.wait_for_exit()
+        os.close(self._input_write)
+        self.client_reader.close()
+
+    def _start(self):
+        self.server.start()
+        self._is_started = True
+
+    def _send(self, message: dict) -> None:
+        os.write(self._input_write, _encode(message))
+
+    def _read(self) -> dict:
+        return self.client_reader.read_message().dictionary
+
+    def test_echo_request(self):
+        # If: I send an echo request
+        self._start()
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'echo', 'params': {'value': 1}})
+
+        # Then: I should get the params back
+        self.assertEqual(self._read(), {'jsonrpc': '2.0', 'id': '1', 'result': {'value': 1}})
+
+    def test_sync_handler_runs_on_worker_thread(self):
+        # If: I send a request to a handler that is not async
+        thread_names = []
+
+        def handler(request_context, params):
+            thread_names.append(threading.current_thread().name)
+            request_context.send_response(params['value'] * 2)
+
+        self.server.set_request_handler(IncomingMessageConfiguration('double', None), handler)
+        self._start()
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'double', 'params': {'value': 21}})
+
+        # Then: It should respond from a worker thread, not from the event loop
+        self.assertEqual(self._read()['result'], 42)
+        self.assertNotEqual(thread_names[0], AsyncJSONRPCServer.EVENT_LOOP_THREAD_NAME)
+
+    def test_async_handler_and_notification(self):
+        # If: I send a request and a notification to async handlers
+        notification_params = []
+        notified = threading.Event()
+
+        async def request_handler(request_context, params):
+            await asyncio.sleep(0)
+            request_context.send_response('done')
+
+        async def notification_handler(notification_context, params):
+            notification_params.append(params)
+            notified.set()
+
+        self.server.set_request_handler(IncomingMessageConfiguration('async', None), request_handler)
+        self.server.set_notification_handler(IncomingMessageConfiguration('notify', None), notification_handler)
+        self._start()
+        self._send({'jsonrpc': '2.0', 'method': 'notify', 'params': {'value': 1}})
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'async', 'params': {}})
+
+        # Then: Both should have been awaited
+        self.assertEqual(self._read(), {'jsonrpc': '2.0', 'id': '1', 'result': 'done'})
+        self.assertTrue(notified.wait(5))
+        self.assertEqual(notification_params, [{'value': 1}])
+
+    def test_failed_async_handler_sends_error(self):
+        # If: An async handler raises an exception
+        async def handler(request_context, params):
+            raise ValueError('Boom!')
+
+        self.server.set_request_handler(IncomingMessageConfiguration('fail', None), handler)
+        self._start()
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'fail', 'params': {}})
+
+        # Then: An internal error should be sent back
+        self.assertEqual(self._read()['error']['code'], -32603)
+
+    def test_same_owner_uri_is_handled_in_order(self):
+        # If: I send requests for the same owner URI, the first one blocking
+        release_event = threading.Event()
+        order = []
+
+        def handler(request_context, params):
+            if params['index'] == 0:
+                release_event.wait()
+            order.append(params['index'])
+            request_context.send_response(params['index'])
+
+        self.server.set_request_handler(IncomingMessageConfiguration('ordered', None), handler)
+        self._start()
+        for index in range(3):
+            self._send({'jsonrpc': '2.0', 'id': str(index), 'method': 'ordered', 'params': {'ownerUri': 'uri', 'index': index}})
+
+        # ... And a request for another owner URI
+        self._send({'jsonrpc': '2.0', 'id': 'other', 'method': 'echo', 'params': {}})
+
+        # Then: The request for the other owner URI should not wait
+        self.assertEqual(self._read()['id'], 'other')
+
+        # ... And the requests for the owner URI should be handled in order
+        release_event.set()
+        self.assertEqual([self._read()['result'] for _ in range(3)], [0, 1, 2])
+        self.assertEqual(order, [0, 1, 2])
+
+    def test_cancel_queued_request(self):
+        # If: I cancel a request waiting behind a running one for the same owner URI
+        release_event = threading.Event()
+        handled = []
+
+        def handler(request_context, params):
+            release_event.wait()
+            handled.append(request_context._message.message_id)
+            request_context.send_response(True)
+
+        self.server.set_request_handler(IncomingMessageConfiguration('slow', None), handler)
+        self._start()
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'slow', 'params': {'ownerUri': 'uri'}})
+        self._send({'jsonrpc': '2.0', 'id': '2', 'method': 'slow', 'params': {'ownerUri': 'uri'}})
+        self._send({'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': {'id': '2'}})
+
+        # Then: The canceled request should get an error right away
+        response = self._read()
+        self.assertEqual(response['id'], '2')
+        self.assertEqual(response['error']['code'], REQUEST_CANCELLED_ERROR_CODE)
+
+        # ... And only the running request should be handled
+        release_event.set()
+        self.assertEqual(self._read(), {'jsonrpc': '2.0', 'id': '1', 'result': True})
+        self.assertEqual(handled, ['1'])
+
+    def test_cancel_middle_queued_request_keeps_order(self):
+        # If: I cancel the middle one of three requests for the same owner URI, the first one blocking
+        release_event = threading.Event()
+        self.addCleanup(release_event.set)
+        handled = []
+
+        def handler(request_context, params):
+            if params['index'] == 0:
+                release_event.wait()
+            handled.append(params['index'])
+            request_context.send_response(params['index'])
+
+        self.server.set_request_handler(IncomingMessageConfiguration('ordered', None), handler)
+        self._start()
+        for index in range(3):
+            self._send({'jsonrpc': '2.0', 'id': str(index), 'method': 'ordered', 'params': {'ownerUri': 'uri', 'index': index}})
+        self._send({'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': {'id': '1'}})
+
+        # Then: The canceled request should be answered right away
+        response = self._read()
+        self.assertEqual(response['id'], '1')
+        self.assertEqual(response['error']['code'], REQUEST_CANCELLED_ERROR_CODE)
+
+        # ... And the last request should still wait for the first one
+        self._send({'jsonrpc': '2.0', 'id': 'other', 'method': 'echo', 'params': {}})
+        self.assertEqual(self._read()['id'], 'other')
+        self.assertEqual(handled, [])
+
+        release_event.set()
+        self.assertEqual([self._read()['result'] for _ in range(2)], [0, 2])
+        self.assertEqual(handled, [0, 2])
+
+    def test_unordered_handler_does_not_wait_for_owner_uri(self):
+        # If: I send an unordered request for the owner URI of a blocked one
+        release_event = threading.Event()
+        self.addCleanup(release_event.set)
+
+        def handler(request_context, params):
+            release_event.wait()
+            request_context.send_response('blocked')
+
+        self.server.set_request_handler(IncomingMessageConfiguration('ordered', None), handler)
+        self.server.set_request_handler(IncomingMessageConfiguration('unordered', None),
+                                        lambda request_context, params: request_context.send_response('unordered'), ordered=False)
+        self._start()
+        self._send({'jsonrpc': '2.0', 'id': '0', 'method': 'ordered', 'params': {'ownerUri': 'uri'}})
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'unordered', 'params': {'ownerUri': 'uri'}})
+
+        # Then: It should be answered while the other one is still blocked
+        self.assertEqual(self._read()['result'], 'unordered')
+
+        release_event.set()
+        self.assertEqual(self._read()['result'], 'blocked')
+
+    def test_cancel_running_async_handler(self):
+        # If: I cancel a request handled by an async handler
+        started = threading.Event()
+
+        async def handler(request_context, params):
+            started.set()
+            await asyncio.sleep(60)
+            request_context.send_response('late')
+
+        self.server.set_request_handler(IncomingMessageConfiguration('async', None), handler)
+        self._start()
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'async', 'params': {}})
+        self.assertTrue(started.wait(5))
+        self._send({'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': {'id': '1'}})
+
+        # Then: The handler should be interrupted and the request canceled
+        response = self._read()
+        self.assertEqual(response['id'], '1')
+        self.assertEqual(response['error']['code'], REQUEST_CANCELLED_ERROR_CODE)
+
+    def test_cancel_unknown_request(self):
+        # If: I cancel a request that has already been handled
+        self._start()
+        self._send({'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': {'id': 'unknown'}})
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'echo', 'params': {}})
+
+        # Then: Nothing should be sent back for the cancellation
+        self.assertEqual(self._read()['id'], '1')
+
+    def test_shutdown(self):
+        # If: I send a shutdown request
+        shutdown_handler = mock.MagicMock()
+        self.server.add_shutdown_handler(shutdown_handler)
+        self.server.start()
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'shutdown', 'params': {}})
+
+        # Then: The server should stop after calling the shutdown handlers
+        self.server.wait_for_exit()
+        shutdown_handler.assert_called_once()
+        self.assertFalse(self.server._loop_thread.is_alive())
+
+    def test_shutdown_lets_running_handlers_respond(self):
+        # If: I send a shutdown request while a handler is running
+        started = threading.Event()
+        release_event = threading.Event()
+
+        def handler(request_context, params):
+            started.set()
+            release_event.wait()
+            request_context.send_response('done')
+
+        self.server.set_request_handler(IncomingMessageConfiguration('slow', None), handler)
+        self.server.start()
+        self._send({'jsonrpc': '2.0', 'id': '1', 'method': 'slow', 'params': {}})
+        self.assertTrue(started.wait(5))
+        self._send({'jsonrpc': '2.0', 'id': '2', 'method': 'shutdown', 'params': {}})
+        release_event.set()
+
+        # Then: The response of the handler should be sent before the server stops
+        self.server.wait_for_exit()
+        self.assertEqual(self._read(), {'jsonrpc': '2.0', 'id': '1', 'result': 'done'})
+
+    def test_streams_that_are_not_pipes(self):
+        # If: I run a server on streams that are not pipes, the input ending after an echo request
+        input_stream = io.BytesIO(_encode({'jsonrpc': '2.0', 'id': '1', 'method': 'echo', 'params': 'hello'}))
+        output_stream = NonClosingBytesIO()
+        server = AsyncJSONRPCServer(input_stream, output_stream)
+        server.start()
+
+        # Then: The server should respond, then stop at the end of the input
+        server.wait_for_exit()
+        response = JSONRPCReader(io.BytesIO(output_stream.getvalue())).read_message()
+        self.assertEqual(response.message_id, '1')
+        self.assertEqual(response.message_result, 'hello')
+
+
+if __name__ == '__main__':
+    unittest.main()
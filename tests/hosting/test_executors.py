@@ -0,0 +1,164 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+from ossdbtoolsservice.hosting.executors import (
+    DEFAULT_POOL_SIZE, DEFAULT_POOL_SIZES, ExecutorPool, Executors, QUERY_POOL, SAVE_AS_POOL, WorkItem, run_in_background
+)
+import tests.utils as utils
+
+
+class ExecutorPoolTests(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = utils.get_mock_logger()
+        self.pool = ExecutorPool('test', 2, self.logger)
+
+    def tearDown(self):
+        self.pool.shutdown(wait=True)
+
+    def test_submit_runs_function(self):
+        # If: I submit a function with arguments
+        work_item = self.pool.submit(lambda x, y: x + y, 1, 2)
+        work_item.join(5)
+
+        # Then: It should have run on a worker of the pool and be done
+        self.assertFalse(work_item.is_alive())
+        self.assertEqual(work_item.future.result(), 3)
+        self.assertEqual(self.pool.metrics.completed_count, 1)
+
+    def test_concurrency_is_bounded(self):
+        # If: I submit more blocking work items than the pool has workers
+        release_event = threading.Event()
+        work_items = [self.pool.submit(release_event.wait) for _ in range(5)]
+
+        # Then: Only as many as the workers should be running, the others queued
+        self.assertLessEqual(len(self.pool._threads), 2)
+        metrics = self.pool.metrics
+        self.assertEqual(metrics.active_count + metrics.queued_count, 5)
+        self.assertGreaterEqual(metrics.queued_count, 3)
+        self.assertTrue(all(work_item.is_alive() for work_item in work_items))
+
+        # If: The work items are released
+        release_event.set()
+        for work_item in work_items:
+            work_item.join(5)
+
+        # Then: All of them should have completed on the same workers
+        metrics = self.pool.metrics
+        self.assertEqual(metrics.active_count, 0)
+        self.assertEqual(metrics.queued_count, 0)
+        self.assertEqual(metrics.completed_count, 5)
+        self.assertLessEqual(len(self.pool._threads), 2)
+
+    def test_idle_worker_is_reused(self):
+        # If: I submit work items one after the other
+        for _ in range(3):
+            self.pool.submit(lambda: None).join(5)
+
+        # Then: A single worker should have run them
+        self.assertEqual(len(self.pool._threads), 1)
+
+    def test_failed_work_is_logged_and_counted(self):
+        # If: I submit a function that raises an exception
+        def fail():
+            raise ValueError('failed')
+
+        work_item = self.pool.submit(fail)
+        work_item.join(5)
+
+        # Then: The exception should be kept in the future, logged and counted
+        self.assertIsInstance(work_item.future.exception(), ValueError)
+        self.logger.exception.assert_called_once()
+        self.assertEqual(self.pool.metrics.failed_count, 1)
+        self.assertEqual(self.pool.metrics.completed_count, 1)
+
+        # ... And the worker should keep running work items
+        self.assertEqual(self.pool.submit(lambda: 1).future.result(5), 1)
+
+    def test_shutdown_runs_queued_work_and_refuses_more(self):
+        # If: I shut down the pool with work queued behind a blocked worker
+        pool = ExecutorPool('test', 1)
+        release_event = threading.Event()
+        pool.submit(release_event.wait)
+        queued_item = pool.submit(lambda: None)
+        pool.shutdown()
+
+        # Then: Work cannot be submitted anymore
+        with self.assertRaises(RuntimeError):
+            pool.submit(lambda: None)
+
+        # ... And the queued work item should still run
+        release_event.set()
+        queued_item.join(5)
+        self.assertFalse(queued_item.is_alive())
+        pool.shutdown(wait=True)
+        self.assertFalse(any(thread.is_alive() for thread in pool._threads))
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            ExecutorPool('test', 0)
+
+
+class ExecutorsTests(unittest.TestCase):
+
+    def test_pools_are_created_on_first_use(self):
+        # If: I create the executors with a size of my own for a pool
+        executors = Executors({QUERY_POOL: 2})
+
+        # Then: No pool should exist until used
+        self.assertEqual(executors.metrics, {})
+
+        # ... And the pools should get their size once used
+        self.assertEqual(executors.get_pool(QUERY_POOL).max_workers, 2)
+        self.assertEqual(executors.get_pool(SAVE_AS_POOL).max_workers, DEFAULT_POOL_SIZES[SAVE_AS_POOL])
+        self.assertEqual(executors.get_pool('other').max_workers, DEFAULT_POOL_SIZE)
+        self.assertIs(executors.get_pool(QUERY_POOL), executors.get_pool(QUERY_POOL))
+
+        executors.shutdown(wait=True)
+
+    def test_submit_and_metrics(self):
+        # If: I submit work items to a couple pools
+        executors = Executors()
+        executors.submit(QUERY_POOL, lambda: None).join(5)
+        executors.submit(SAVE_AS_POOL, lambda: None).join(5)
+        executors.submit(SAVE_AS_POOL, lambda: None).join(5)
+
+        # Then: The metrics should be reported by pool
+        metrics = executors.metrics
+        self.assertEqual(set(metrics.keys()), {QUERY_POOL, SAVE_AS_POOL})
+        self.assertEqual(metrics[QUERY_POOL].completed_count, 1)
+        self.assertEqual(metrics[SAVE_AS_POOL].completed_count, 2)
+
+        # If: I shut down the executors
+        executors.shutdown(wait=True)
+
+        # Then: The pools should refuse work
+        with self.assertRaises(RuntimeError):
+            executors.submit(QUERY_POOL, lambda: None)
+
+
+class RunInBackgroundTests(unittest.TestCase):
+
+    def test_runs_on_executor(self):
+        pool = ExecutorPool('test', 1)
+        work = run_in_background(pool, lambda: None)
+        self.assertIsInstance(work, WorkItem)
+        work.join(5)
+        self.assertEqual(pool.metrics.completed_count, 1)
+        pool.shutdown(wait=True)
+
+    def test_runs_in_thread_without_executor(self):
+        done_event = threading.Event()
+        work = run_in_background(None, done_event.set)
+        self.assertIsInstance(work, threading.Thread)
+        work.join(5)
+        self.assertTrue(done_event.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
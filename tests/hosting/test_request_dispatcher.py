@@ -0,0 +1,105 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+
+from ossdbtoolsservice.hosting.request_dispatcher import RequestDispatcher
+import tests.utils as utils
+
+
+class RequestDispatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = utils.get_mock_logger()
+        self.dispatcher = RequestDispatcher(4, self.logger)
+
+    def tearDown(self):
+        self.dispatcher.shutdown()
+
+    def test_same_key_runs_in_order(self):
+        # If: I dispatch work items for the same key, the first one blocking
+        release_event = threading.Event()
+        order = []
+
+        def first():
+            release_event.wait()
+            order.append(1)
+
+        self.dispatcher.dispatch(first, 'uri')
+        for index in range(2, 6):
+            self.dispatcher.dispatch(lambda index=index: order.append(index), 'uri')
+
+        # Then: The items should wait behind the running one
+        metrics = self.dispatcher.metrics
+        self.assertEqual(metrics.queued_by_key, {'uri': 4})
+        self.assertEqual(order, [])
+
+        # If: The first item completes
+        release_event.set()
+        self.assertTrue(self.dispatcher.wait_for_idle(5))
+
+        # Then: The items should have run one at a time, in order
+        self.assertEqual(order, [1, 2, 3, 4, 5])
+        self.assertEqual(self.dispatcher._lanes, {})
+
+    def test_other_keys_are_not_blocked(self):
+        # If: A work item of a key is blocked
+        release_event = threading.Event()
+        other_done = threading.Event()
+        self.dispatcher.dispatch(release_event.wait, 'slow')
+
+        # ... and I dispatch items for another key and without a key
+        self.dispatcher.dispatch(lambda: None, 'fast')
+        self.dispatcher.dispatch(other_done.set)
+
+        # Then: They should run while the first item is blocked
+        self.assertTrue(other_done.wait(5))
+
+        release_event.set()
+        self.assertTrue(self.dispatcher.wait_for_idle(5))
+
+    def test_metrics(self):
+        # If: I dispatch items while the workers are blocked
+        release_event = threading.Event()
+        dispatcher = RequestDispatcher(1)
+        dispatcher.dispatch(release_event.wait)
+        dispatcher.dispatch(lambda: None)
+        dispatcher.dispatch(lambda: None, 'uri')
+
+        # Then: The waiting items should be counted
+        metrics = dispatcher.metrics
+        self.assertEqual(metrics.queued_count + metrics.running_count, 3)
+        self.assertGreaterEqual(metrics.queued_count, 2)
+        self.assertEqual(metrics.completed_count, 0)
+
+        release_event.set()
+        dispatcher.shutdown()
+
+        # ... and the completed items once they are run
+        metrics = dispatcher.metrics
+        self.assertEqual(metrics.queued_count, 0)
+        self.assertEqual(metrics.running_count, 0)
+        self.assertEqual(metrics.completed_count, 3)
+        self.assertGreaterEqual(metrics.max_queued_count, 2)
+
+    def test_failed_work_is_logged_and_does_not_block_key(self):
+        # If: A work item of a key raises an exception
+        done_event = threading.Event()
+
+        def fail():
+            raise ValueError('failed')
+
+        self.dispatcher.dispatch(fail, 'uri')
+        self.dispatcher.dispatch(done_event.set, 'uri')
+
+        # Then: The exception should be logged and the next item of the key should run
+        self.assertTrue(done_event.wait(5))
+        self.assertTrue(self.dispatcher.wait_for_idle(5))
+        self.logger.exception.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
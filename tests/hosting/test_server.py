@@ -5,14 +5,16 @@
 
 import io
 from queue import Queue
+import threading
 import time
 import unittest
 import unittest.mock as mock
 
 from ossdbtoolsservice.hosting.json_rpc_server import (
+    CANCEL_REQUEST_METHOD,
     JSONRPCServer,
     IncomingMessageConfiguration,
-    NotificationContext, RequestContext
+    NotificationContext, RequestContext, REQUEST_CANCELLED_ERROR_CODE
 )
 from ossdbtoolsservice.hosting.json_message import JSONRPCMessage, JSONRPCMessageType
 from ossdbtoolsservice.hosting.json_reader import JSONRPCReader
@@ -49,7 +51,7 @@ class JSONRPCServerTests(unittest.TestCase):
         # ... The output queue should be empty
         self.assertIsInstance(server._output_queue, Queue)
         self.assertTrue(server._output_queue.all_tasks_done)
-        self.assertDictEqual(server._notification_handlers, {})
+        self.assertListEqual(list(server._notification_handlers.keys()), [CANCEL_REQUEST_METHOD])
         self.assertListEqual(server._shutdown_handlers, [])
 
         # ... The threads shouldn't be assigned yet
@@ -219,6 +221,39 @@ class JSONRPCServerTests(unittest.TestCase):
         self.assertIsInstance(out_message.message_error, dict)
         self.assertIs(out_message.message_error['message'], params)
 
+    def test_request_context_cancel(self):
+        # Setup: Create a request context
+        queue = Queue()
+        in_message = JSONRPCMessage.from_dictionary({'id': '123', 'method': 'test/text/', 'params': {}})
+        rc = RequestContext(in_message, queue)
+
+        # If: I cancel the request, then send a response
+        rc.cancel()
+        rc.send_response({})
+
+        # Then: The token should be canceled and the request answered with a single request canceled error
+        self.assertTrue(rc.cancellation_token.canceled)
+        out_message = queue.get_nowait()
+        self.assertEqual(out_message.message_type, JSONRPCMessageType.ResponseError)
+        self.assertEqual(out_message.message_id, '123')
+        self.assertEqual(out_message.message_error['code'], REQUEST_CANCELLED_ERROR_CODE)
+        self.assertTrue(queue.empty())
+
+    def test_request_context_cancel_after_response(self):
+        # Setup: Create a request context that has been answered
+        queue = Queue()
+        in_message = JSONRPCMessage.from_dictionary({'id': '123', 'method': 'test/text/', 'params': {}})
+        rc = RequestContext(in_message, queue)
+        rc.send_response({})
+
+        # If: I cancel the request
+        rc.cancel()
+
+        # Then: The token should be canceled for the work still done for the request, without answering it again
+        self.assertTrue(rc.cancellation_token.canceled)
+        self.assertEqual(queue.get_nowait().message_type, JSONRPCMessageType.ResponseSuccess)
+        self.assertTrue(queue.empty())
+
     # DISPATCHER TESTS #####################################################
 
     @staticmethod
@@ -275,6 +310,7 @@ class JSONRPCServerTests(unittest.TestCase):
         params = {}
         message = JSONRPCMessage.create_request('123', 'test/test', params)
         server._dispatch_message(message)
+        server._dispatcher.wait_for_idle()
 
         # Then:
         # ... The handler should have been called
@@ -297,6 +333,7 @@ class JSONRPCServerTests(unittest.TestCase):
         params = {}
         message = JSONRPCMessage.create_request('123', 'test/test', params)
         server._dispatch_message(message)
+        server._dispatcher.wait_for_idle()
 
         # Then:
         # ... The handler should have been called
@@ -333,6 +370,7 @@ class JSONRPCServerTests(unittest.TestCase):
         params = {}
         message = JSONRPCMessage.create_notification('test/test', params)
         server._dispatch_message(message)
+        server._dispatcher.wait_for_idle()
 
         # Then:
         # ... The handler should have been called
@@ -354,6 +392,7 @@ class JSONRPCServerTests(unittest.TestCase):
         params = {}
         message = JSONRPCMessage.create_notification('test/test', params)
         server._dispatch_message(message)
+        server._dispatcher.wait_for_idle()
 
         # Then:
         # ... The handler should have been called
@@ -396,6 +435,228 @@ class JSONRPCServerTests(unittest.TestCase):
         self.assertEqual(out_message.message_params, params)
         self.assertEqual(out_message.message_method, method)
 
+    def test_get_output_messages_drains_queue(self):
+        # If: Several messages are queued
+        server = JSONRPCServer(io.BytesIO(), io.BytesIO())
+        for index in range(3):
+            server.send_notification('test/test', {'index': index})
+
+        # Then: They should all be taken at once, in order
+        messages = server._get_output_messages()
+        self.assertEqual([message.message_params['index'] for message in messages], [0, 1, 2])
+        self.assertTrue(server._output_queue.empty())
+
+    def test_get_output_messages_stops_at_none(self):
+        # If: The server is stopped after a message is queued
+        server = JSONRPCServer(io.BytesIO(), io.BytesIO())
+        server.send_notification('test/first', {})
+        server.stop()
+        server.send_notification('test/last', {})
+
+        # Then: The messages queued before the stop should be taken
+        messages = server._get_output_messages()
+        self.assertEqual([message.message_method for message in messages], ['test/first'])
+
+    def test_get_output_messages_max_count(self):
+        # If: More messages are queued than can be coalesced
+        server = JSONRPCServer(io.BytesIO(), io.BytesIO())
+        for index in range(JSONRPCServer.MAX_COALESCED_MESSAGES + 1):
+            server.send_notification('test/test', {'index': index})
+
+        # Then: The remaining message should be left for the next write
+        self.assertEqual(len(server._get_output_messages()), JSONRPCServer.MAX_COALESCED_MESSAGES)
+        self.assertEqual(server._get_output_messages()[0].message_params['index'], JSONRPCServer.MAX_COALESCED_MESSAGES)
+
+    def test_get_output_messages_waits_coalesce_latency(self):
+        # If: A message is queued shortly after the first one, within the coalesce latency
+        server = JSONRPCServer(io.BytesIO(), io.BytesIO(), max_coalesce_latency=5)
+        server.send_notification('test/first', {})
+
+        def send_later():
+            time.sleep(0.1)
+            server.send_notification('test/last', {})
+            server.stop()
+
+        thread = threading.Thread(target=send_later)
+        thread.start()
+        messages = server._get_output_messages()
+        thread.join()
+
+        # Then: Both messages should be sent together
+        self.assertEqual([message.message_method for message in messages], ['test/first', 'test/last'])
+
+    def test_consume_output_single_write(self):
+        # If: I queue several messages, stopping the server once they are sent
+        server = JSONRPCServer(io.BytesIO(), io.BytesIO())
+        server.writer.send_messages = mock.Mock(side_effect=lambda messages: server.stop())
+        server.send_notification('test/first', {})
+        server.send_request('test/last', {})
+
+        server._consume_output()
+
+        # Then: The messages should be sent with a single call to the writer
+        server.writer.send_messages.assert_called_once()
+        sent = server.writer.send_messages.call_args[0][0]
+        self.assertEqual([message.message_method for message in sent], ['test/first', 'test/last'])
+
+    def test_dispatch_inline_handler_on_input_thread(self):
+        # Setup: Create a server with an inline handler and a queued one
+        server = JSONRPCServer(None, None, logger=utils.get_mock_logger())
+        handler_threads = {}
+        server.set_request_handler(IncomingMessageConfiguration('test/inline', None),
+                                   lambda context, params: handler_threads.update(inline=threading.current_thread()), inline=True)
+        server.set_request_handler(IncomingMessageConfiguration('test/queued', None),
+                                   lambda context, params: handler_threads.update(queued=threading.current_thread()))
+
+        # If: I dispatch a request for each handler
+        server._dispatch_message(JSONRPCMessage.create_request('1', 'test/inline', {}))
+        server._dispatch_message(JSONRPCMessage.create_request('2', 'test/queued', {}))
+        server._dispatcher.wait_for_idle()
+
+        # Then: Only the inline handler should have run on the dispatching thread
+        self.assertIs(handler_threads['inline'], threading.current_thread())
+        self.assertIsNot(handler_threads['queued'], threading.current_thread())
+
+    def test_dispatch_unordered_handler_on_worker(self):
+        # Setup: Create a server whose handler blocks for the first request, and an unordered handler
+        server = JSONRPCServer(None, None, logger=utils.get_mock_logger())
+        release_event = threading.Event()
+        self.addCleanup(release_event.set)
+        unordered_event = threading.Event()
+        unordered_threads = []
+
+        def unordered_handler(context, params):
+            unordered_threads.append(threading.current_thread())
+            unordered_event.set()
+
+        server.set_request_handler(IncomingMessageConfiguration('test/test', None), lambda context, params: release_event.wait())
+        server.set_request_handler(IncomingMessageConfiguration('test/unordered', None), unordered_handler, ordered=False)
+
+        # If: I dispatch an unordered request for the owner URI of the blocked one
+        server._dispatch_message(JSONRPCMessage.create_request('1', 'test/test', {'ownerUri': 'uri'}))
+        server._dispatch_message(JSONRPCMessage.create_request('2', 'test/unordered', {'ownerUri': 'uri'}))
+
+        # Then: It should be handled on a worker thread without waiting for the blocked request
+        self.assertTrue(unordered_event.wait(5))
+        self.assertIsNot(unordered_threads[0], threading.current_thread())
+
+        release_event.set()
+        server._dispatcher.wait_for_idle()
+
+    def test_dispatch_without_workers(self):
+        # Setup: Create a server without worker threads
+        handler = mock.MagicMock()
+        server = JSONRPCServer(None, None, logger=utils.get_mock_logger(), max_workers=0)
+        server.set_request_handler(IncomingMessageConfiguration('test/test', None), handler)
+
+        # If: I dispatch a request
+        server._dispatch_message(JSONRPCMessage.create_request('123', 'test/test', {}))
+
+        # Then: The handler should have been called right away
+        handler.assert_called_once()
+        self.assertIsNone(server.dispatch_metrics)
+
+    def test_dispatch_same_owner_uri_in_order(self):
+        # Setup: Create a server whose handler blocks for the first request
+        server = JSONRPCServer(None, None, logger=utils.get_mock_logger())
+        release_event = threading.Event()
+        handled = []
+
+        def handler(context, params):
+            if params['index'] == 0:
+                release_event.wait()
+            handled.append(params['index'])
+
+        server.set_request_handler(IncomingMessageConfiguration('test/test', None), handler)
+        server.set_notification_handler(IncomingMessageConfiguration('test/notify', None), handler)
+
+        # If: I dispatch requests and notifications for the same owner URI
+        server._dispatch_message(JSONRPCMessage.create_request('1', 'test/test', {'ownerUri': 'uri', 'index': 0}))
+        server._dispatch_message(JSONRPCMessage.create_notification('test/notify', {'textDocument': {'uri': 'uri'}, 'index': 1}))
+        server._dispatch_message(JSONRPCMessage.create_request('2', 'test/test', {'ownerUri': 'uri', 'index': 2}))
+
+        # Then: They should be queued behind the first one
+        self.assertEqual(server.dispatch_metrics.queued_by_key, {'uri': 2})
+
+        # ... and handled in order once it completes
+        release_event.set()
+        server._dispatcher.wait_for_idle()
+        self.assertEqual(handled, [0, 1, 2])
+
+    def test_cancel_queued_request(self):
+        # Setup: Create a server whose handler blocks for the first request
+        server = JSONRPCServer(None, None, logger=utils.get_mock_logger())
+        release_event = threading.Event()
+        handled = []
+
+        def handler(context, params):
+            if params['index'] == 0:
+                release_event.wait()
+            handled.append(params['index'])
+            context.send_response(params['index'])
+
+        server.set_request_handler(IncomingMessageConfiguration('test/test', None), handler)
+
+        # If: I cancel a request queued behind the first one for the same owner URI
+        server._dispatch_message(JSONRPCMessage.create_request('1', 'test/test', {'ownerUri': 'uri', 'index': 0}))
+        server._dispatch_message(JSONRPCMessage.create_request('2', 'test/test', {'ownerUri': 'uri', 'index': 1}))
+        server._dispatch_message(JSONRPCMessage.create_notification(CANCEL_REQUEST_METHOD, {'id': '2'}))
+
+        # Then: The canceled request should be answered right away
+        out_message = server._output_queue.get_nowait()
+        self.assertEqual(out_message.message_id, '2')
+        self.assertEqual(out_message.message_error['code'], REQUEST_CANCELLED_ERROR_CODE)
+
+        # ... And its handler should be skipped
+        release_event.set()
+        server._dispatcher.wait_for_idle()
+        self.assertEqual(handled, [0])
+        self.assertEqual(server._output_queue.get_nowait().message_id, '1')
+        self.assertTrue(server._output_queue.empty())
+
+    def test_cancel_running_request(self):
+        # Setup: Create a server whose handler works until its request is canceled
+        server = JSONRPCServer(None, None, logger=utils.get_mock_logger())
+        started_event = threading.Event()
+        tokens = []
+
+        def handler(context, params):
+            tokens.append(context.cancellation_token)
+            started_event.set()
+            while not context.cancellation_token.canceled:
+                time.sleep(0.01)
+            context.send_response('late')
+
+        server.set_request_handler(IncomingMessageConfiguration('test/test', None), handler)
+
+        # If: I cancel the request while its handler runs
+        server._dispatch_message(JSONRPCMessage.create_request('1', 'test/test', {}))
+        self.assertTrue(started_event.wait(5))
+        server._dispatch_message(JSONRPCMessage.create_notification(CANCEL_REQUEST_METHOD, {'id': '1'}))
+        server._dispatcher.wait_for_idle()
+
+        # Then: The handler should have seen the cancellation, and only the request canceled error be sent
+        self.assertTrue(tokens[0].canceled)
+        self.assertEqual(server._output_queue.get_nowait().message_error['code'], REQUEST_CANCELLED_ERROR_CODE)
+        self.assertTrue(server._output_queue.empty())
+
+        # ... And the request should not be cancelable anymore
+        self.assertEqual(len(server._cancellation_registry), 0)
+
+    def test_cancel_unknown_request(self):
+        # If: I cancel a request that is not known
+        server = JSONRPCServer(None, None, logger=utils.get_mock_logger())
+        server._dispatch_message(JSONRPCMessage.create_notification(CANCEL_REQUEST_METHOD, {'id': 'unknown'}))
+
+        # Then: Nothing should be sent
+        self.assertTrue(server._output_queue.empty())
+
+    def test_get_dispatch_key(self):
+        self.assertEqual(JSONRPCServer._get_dispatch_key(JSONRPCMessage.create_request('1', 'test', {'ownerUri': 'owner'})), 'owner')
+        self.assertEqual(JSONRPCServer._get_dispatch_key(JSONRPCMessage.create_request('1', 'test', {'textDocument': {'uri': 'doc'}})), 'doc')
+        self.assertIsNone(JSONRPCServer._get_dispatch_key(JSONRPCMessage.create_request('1', 'test', {})))
+        self.assertIsNone(JSONRPCServer._get_dispatch_key(JSONRPCMessage.create_request('1', 'test', None)))
+
     # END-TO-END TESTS #####################################################
 
     def test_request_enqueued(self):
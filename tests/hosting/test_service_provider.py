@@ -6,6 +6,7 @@
 import unittest
 import unittest.mock as mock
 
+from ossdbtoolsservice.hosting.executors import Executors
 from ossdbtoolsservice.hosting.json_rpc_server import JSONRPCServer
 from ossdbtoolsservice.hosting.service_provider import ServiceProvider
 from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
@@ -56,6 +57,18 @@ class TestServiceProvider(unittest.TestCase):
             self.assertTrue(service_instance.has_initialized)
             self.assertIs(service_instance.service_provider, sp)
 
+    def test_initialize_registers_executors_shutdown(self):
+        # Setup: Create a service provider
+        sp = self._get_service_provider()
+        self.assertIsInstance(sp.executors, Executors)
+
+        # If: I initialize it
+        sp.initialize()
+
+        # Then: The executors should be shut down with the server
+        self.assertEqual(sp.server.count_shutdown_handlers(), 1)
+        self.assertEqual(sp.server._shutdown_handlers[0], sp.executors.shutdown)
+
     def test_get_service_not_initialized(self):
         # Setup: Create a service provider that hasn't been initialized
         sp = self._get_service_provider()
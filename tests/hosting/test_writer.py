@@ -92,3 +92,58 @@ class JSONRPCWriterTests(unittest.TestCase):
             message_str = str.join(os.linesep, [x.decode('UTF-8') for x in stream.readlines()])
             message_dict = json.loads(message_str)
             self.assertDictEqual(message_dict, message.dictionary)
+
+    def test_send_messages_single_write(self):
+        stream = mock.MagicMock()
+        stream.write = mock.Mock(side_effect=len)
+
+        # If: I send several messages at once
+        writer = JSONRPCWriter(stream, logger=utils.get_mock_logger())
+        messages = [JSONRPCMessage.create_notification('test/test', {'index': index}) for index in range(3)]
+        writer.send_messages(messages)
+
+        # Then: The messages should be written in order with a single write and flush
+        stream.write.assert_called_once()
+        stream.flush.assert_called_once()
+        self.assertEqual(bytes(stream.write.call_args[0][0]), b''.join(writer.encode_message(message) for message in messages))
+
+    def test_send_messages_partial_writes(self):
+        with io.BytesIO() as stream:
+            # If: The stream writes only part of the buffer at once
+            writer = JSONRPCWriter(stream)
+            write_orig = stream.write
+            stream.write = mock.Mock(side_effect=lambda buffer: write_orig(buffer[:10]))
+
+            message = JSONRPCMessage.create_request('123', 'test/test', {})
+            writer.send_messages([message])
+
+            # Then: The rest of the buffer should be written until the whole message is sent
+            self.assertGreater(stream.write.call_count, 1)
+            self.assertEqual(stream.getvalue(), writer.encode_message(message))
+
+    def test_send_messages_skips_unencodable_message(self):
+        with io.BytesIO() as stream:
+            # If: One of the messages cannot be encoded
+            logger = utils.get_mock_logger()
+            writer = JSONRPCWriter(stream, logger=logger)
+            unencodable_message = mock.MagicMock()
+            unencodable_message.dictionary = {'value': b'bytes'}
+            messages = [
+                JSONRPCMessage.create_notification('test/first', {}),
+                unencodable_message,
+                JSONRPCMessage.create_notification('test/last', {})
+            ]
+            writer.send_messages(messages)
+
+            # Then: The other messages should be sent and the failure logged
+            self.assertEqual(stream.getvalue(), writer.encode_message(messages[0]) + writer.encode_message(messages[2]))
+            logger.exception.assert_called_once()
+
+    def test_encode_message_content_length_counts_bytes(self):
+        # If: I encode a message whose content is not ASCII
+        writer = JSONRPCWriter(io.BytesIO(), 'UTF-16-LE')
+        encoded = writer.encode_message(JSONRPCMessage.create_notification('test/test', {}))
+
+        # Then: The content length should be the length of the encoded content
+        header, content = encoded.split(b'\r\n\r\n')
+        self.assertEqual(header, 'Content-Length: {}'.format(len(content)).encode('ascii'))
@@ -5,7 +5,7 @@
 
 """Test the language service"""
 
-import threading  # noqa
+import threading
 import unittest
 from typing import List, Optional, Tuple
 from unittest import mock
@@ -19,6 +19,7 @@ from ossdbtoolsservice.connection.contracts import ConnectionDetails
 from ossdbtoolsservice.hosting import (JSONRPCServer,  # noqa
                                        NotificationContext, RequestContext,
                                        ServiceProvider)
+from ossdbtoolsservice.hosting.executors import WorkItem
 from ossdbtoolsservice.language import LanguageService
 from ossdbtoolsservice.language.contracts import (  # noqa
     INTELLISENSE_READY_NOTIFICATION, CompletionItem, CompletionItemKind,
@@ -290,13 +291,15 @@ class TestLanguageService(unittest.TestCase):
         self.flow_validator.add_expected_notification(IntelliSenseReadyParams, INTELLISENSE_READY_NOTIFICATION, validate_success_notification)
 
         refresher_mock = mock.MagicMock()
-        refresh_method_mock = mock.MagicMock()
+        refresh_called = threading.Event()
+        refresh_method_mock = mock.MagicMock(side_effect=lambda callback: refresh_called.set())
         refresher_mock.refresh = refresh_method_mock
         patch_path = 'ossdbtoolsservice.language.operations_queue.CompletionRefresher'
         with mock.patch(patch_path) as refresher_patch:
             refresher_patch.return_value = refresher_mock
-            task: threading.Thread = service.on_connect(conn_info)
-            # And when refresh is "complete"
+            task: WorkItem = service.on_connect(conn_info)
+            # And when refresh is "complete", once the task running on the language pool has started it
+            self.assertTrue(refresh_called.wait(5))
             refresh_method_mock.assert_called_once()
             callback = refresh_method_mock.call_args[0][0]
             self.assertIsNotNone(callback)
@@ -16,6 +16,7 @@ from ossdbtoolsservice.connection import ConnectionService, ConnectionInfo
 from ossdbtoolsservice.language.operations_queue import (
     ConnectionContext, OperationsQueue, QueuedOperation, INTELLISENSE_URI
 )
+from ossdbtoolsservice.utils.cancellation import CancellationToken
 from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
 
 COMPLETIONREFRESHER_PATH_PATH = 'ossdbtoolsservice.language.operations_queue.CompletionRefresher'
@@ -197,6 +198,24 @@ class TestOperationsQueue(unittest.TestCase):
         # ... and I also expect the timeout task to be called
         timeout_task.assert_called_once()
 
+    def test_execute_operation_skips_canceled_operation(self):
+        # Given a connected operation whose request has been canceled
+        context = ConnectionContext(self.expected_context_key)
+        context.is_connected = True
+        context.completer = mock.Mock()
+        task = mock.MagicMock(return_value=True)
+        timeout_task = mock.Mock()
+        cancellation_token = CancellationToken()
+        cancellation_token.cancel()
+        operations_queue = OperationsQueue(self.mock_service_provider)
+        operation = QueuedOperation(self.expected_context_key, task, timeout_task, cancellation_token)
+        operation.context = context
+        # When I execute the operation
+        operations_queue.execute_operation(operation)
+        # Then I expect neither task to be called
+        task.assert_not_called()
+        timeout_task.assert_not_called()
+
     # HELPER METHODS ###############################################
     def _run_with_mock_connection(self, test: Callable[[None], None]):
         connect_result = mock.MagicMock()
@@ -8,6 +8,7 @@ import unittest.mock as mock
 
 from ossdbtoolsservice.connection import ConnectionService
 from ossdbtoolsservice.connection.contracts import ConnectionType
+from ossdbtoolsservice.hosting.executors import METADATA_POOL
 from ossdbtoolsservice.metadata import MetadataService
 from ossdbtoolsservice.metadata.contracts import (METADATA_LIST_REQUEST,
                                                   MetadataListParameters,
@@ -17,7 +18,12 @@ from ossdbtoolsservice.utils import constants
 from tests.mocks.service_provider_mock import ServiceProviderMock
 from tests.pgsmo_tests.utils import MockPGServerConnection
 from tests.utils import (
-    MockCursor, MockRequestContext, MockThread)
+    MockCursor, MockRequestContext)
+
+
+def _run_now(pool_name, function, *args):
+    """Runs a function submitted to the executors on the calling thread"""
+    function(*args)
 
 
 class TestMetadataService(unittest.TestCase):
@@ -64,13 +70,11 @@ class TestMetadataService(unittest.TestCase):
         request_context = MockRequestContext()
         params = MetadataListParameters()
         params.owner_uri = self.test_uri
-        mock_thread = MockThread()
-        with mock.patch('threading.Thread', new=mock.Mock(side_effect=mock_thread.initialize_target)):
+        with mock.patch.object(self.service_provider.executors, 'submit', new=mock.Mock(side_effect=_run_now)) as mock_submit:
             # If I call the metadata list request handler
             self.metadata_service._handle_metadata_list_request(request_context, params)
-            # Then the worker thread was kicked off
-            self.assertEqual(mock_thread.target, self.metadata_service._metadata_list_worker)
-            mock_thread.start.assert_called_once()
+            # Then the worker was submitted to the metadata pool
+            mock_submit.assert_called_once_with(METADATA_POOL, self.metadata_service._metadata_list_worker, request_context, params)
         # And the worker retrieved the correct connection and executed a query on it
         self.connection_service.get_connection.assert_called_once_with(self.test_uri, ConnectionType.DEFAULT)
         mock_cursor.execute.assert_called_once()
@@ -91,8 +95,7 @@ class TestMetadataService(unittest.TestCase):
         params = MetadataListParameters()
         params.owner_uri = self.test_uri
         self.metadata_service._list_metadata = mock.Mock(side_effect=Exception)
-        mock_thread = MockThread()
-        with mock.patch('threading.Thread', new=mock.Mock(side_effect=mock_thread.initialize_target)):
+        with mock.patch.object(self.service_provider.executors, 'submit', new=mock.Mock(side_effect=_run_now)):
             # If I call the metadata list request handler and its execution raises an error
             self.metadata_service._handle_metadata_list_request(request_context, params)
         # Then an error response is sent
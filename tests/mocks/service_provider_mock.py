@@ -3,6 +3,7 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+from ossdbtoolsservice.hosting.executors import Executors
 from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
 from tests.mocks.server_mock import ServerMock
 from tests.utils import get_mock_logger
@@ -20,6 +21,7 @@ class ServiceProviderMock:
         self.logger = logger
         self.server = server
         self.provider = provider
+        self.executors = Executors(logger=logger)
 
         if services is not None:
             self._services = services
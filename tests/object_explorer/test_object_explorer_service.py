@@ -185,10 +185,9 @@ class TestObjectExplorer(unittest.TestCase):
         oe._service_provider = utils.get_mock_service_provider({})
         oe._provider = constants.PG_PROVIDER_NAME
 
-        # ... Patch the threading to throw
+        # ... Patch the executors to throw
         patch_mock = mock.MagicMock(side_effect=Exception('Boom!'))
-        patch_path = 'ossdbtoolsservice.object_explorer.object_explorer_service.threading.Thread'
-        with mock.patch(patch_path, patch_mock):
+        with mock.patch.object(oe._service_provider.executors, 'submit', patch_mock):
             # If: I create a new session
             params, session_uri = _connection_details()
 
@@ -382,6 +381,35 @@ class TestObjectExplorer(unittest.TestCase):
     def test_handle_expand_node_alivetasksuccessful(self):
         self._handle_er_node_alivetasksuccessful(TestObjectExplorer.expand_method, TestObjectExplorer.expand_tasks)
 
+    def test_handle_expand_canceled(self):
+        # Setup: Create an OE service with a session preloaded
+        oe, session, session_uri = self._preloaded_oe_service()
+
+        def validate_canceled_notification(response: ExpandCompletedParameters):
+            self.assertEqual(response.session_id, session_uri)
+            self.assertEqual(response.node_path, '/')
+            self.assertIsNotNone(response.error_message)
+            self.assertIsNone(response.nodes)
+
+        patch_mock = mock.MagicMock(return_value=[])
+        patch_path = 'ossdbtoolsservice.object_explorer.object_explorer_service.ObjectExplorerService._route_request'
+        with mock.patch(patch_path, patch_mock):
+            # If: I expand a node for a request the client has canceled
+            rc = RequestFlowValidator()
+            rc.add_expected_response(bool, self.assertTrue)
+            rc.add_expected_notification(ExpandCompletedParameters, EXPAND_COMPLETED_METHOD, validate_canceled_notification)
+            rc.request_context.cancellation_token.cancel()
+            params = ExpandParameters.from_dict({'session_id': session_uri, 'node_path': '/'})
+            TestObjectExplorer.expand_method(oe, rc.request_context, params)
+
+            for task in session.expand_tasks.values():
+                task.join()
+
+        # Then:
+        # ... The catalog should not have been queried, but the node should still be completed with an error
+        patch_mock.assert_not_called()
+        rc.validate()
+
     # REFRESH NODE #########################################################
     @staticmethod
     def refresh_method(oe: ObjectExplorerService, rc: RequestContext, p: ExpandParameters):
@@ -469,11 +497,10 @@ class TestObjectExplorer(unittest.TestCase):
         # Setup: Create an OE service with a session preloaded
         oe, session, session_uri = self._preloaded_oe_service()
 
-        # ... Patch the threading to throw
+        # ... Patch the executors to throw
         patch_mock = mock.MagicMock(side_effect=Exception('Boom!'))
-        patch_path = 'ossdbtoolsservice.object_explorer.object_explorer_service.threading.Thread'
-        with mock.patch(patch_path, patch_mock):
-            # If: I expand a node (with threading that throws)
+        with mock.patch.object(oe._service_provider.executors, 'submit', patch_mock):
+            # If: I expand a node (with an executor that throws)
             rc = RequestFlowValidator()
             rc.add_expected_response(bool, self.assertTrue)
             rc.add_expected_notification(
@@ -510,11 +537,12 @@ class TestObjectExplorer(unittest.TestCase):
             params = ExpandParameters.from_dict({'session_id': session_uri, 'node_path': '/'})
             method(oe, rc.request_context, params)
 
-        # Joining the threads to avoid rc.validate failure
-        for task in session.expand_tasks.values():
-            task.join()
-        for task in session.refresh_tasks.values():
-            task.join()
+            # Joining the work items while route_request is patched, to avoid rc.validate failure
+            for task in session.expand_tasks.values():
+                task.join()
+            for task in session.refresh_tasks.values():
+                task.join()
+
         # Then:
         # ... An error notification should have been sent
         rc.validate()
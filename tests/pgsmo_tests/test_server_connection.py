@@ -76,3 +76,55 @@ class TestServerConnection(unittest.TestCase):
 
         # ... The cursor should be closed
         mock_cursor.close.assert_called_once()
+
+    def test_copy_query_to(self):
+        # Setup: Create a mock server connection whose cursor copies 3 rows
+        mock_cursor = mock.MagicMock()
+        mock_cursor.rowcount = 3
+        mock_conn = MockPsycopgConnection(cursor=mock_cursor)
+
+        # noinspection PyTypeChecker
+        with mock.patch('psycopg2.connect', new=mock.Mock(return_value=mock_conn)):
+            server_conn = PostgreSQLConnection({})
+
+        stream = mock.Mock()
+
+        # If: I copy the results of a query with a terminator to a stream
+        row_count = server_conn.copy_query_to(' SELECT 1; ', stream, ',', '"', r"N\'", True, True)
+
+        # Then:
+        # ... The query should be wrapped in a COPY TO STDOUT with the CSV options quoted as escape strings
+        self.assertTrue(server_conn.supports_copy_to)
+        mock_cursor.copy_expert.assert_called_once_with(
+            'COPY (\nSELECT 1\n) TO STDOUT WITH (FORMAT csv, HEADER true, DELIMITER E\',\', QUOTE E\'"\', NULL E\'N\\\\\'\'\', FORCE_QUOTE *)',
+            stream)
+
+        # ... The number of rows copied should be returned and the cursor should be closed
+        self.assertEqual(row_count, 3)
+        mock_cursor.close.assert_called_once()
+
+    def test_copy_table_from(self):
+        # Setup: Create a mock server connection whose cursor copies 2 rows
+        mock_cursor = mock.MagicMock()
+        mock_cursor.rowcount = 2
+        mock_conn = MockPsycopgConnection(cursor=mock_cursor)
+
+        # noinspection PyTypeChecker
+        with mock.patch('psycopg2.connect', new=mock.Mock(return_value=mock_conn)):
+            server_conn = PostgreSQLConnection({})
+
+        stream = mock.Mock()
+
+        # If: I copy a stream to some columns of a table
+        row_count = server_conn.copy_table_from('public', 'my"table', ['id', 'name'], stream, ';', '"', '', True)
+
+        # Then:
+        # ... The table and columns should be quoted in a COPY FROM STDIN with the CSV options
+        self.assertTrue(server_conn.supports_copy_from)
+        mock_cursor.copy_expert.assert_called_once_with(
+            'COPY "public"."my""table" ("id", "name") FROM STDIN WITH (FORMAT csv, HEADER true, DELIMITER E\';\', QUOTE E\'"\', NULL E\'\')',
+            stream)
+
+        # ... The number of rows copied should be returned and the cursor should be closed
+        self.assertEqual(row_count, 2)
+        mock_cursor.close.assert_called_once()
@@ -0,0 +1,73 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import unittest
+
+from ossdbtoolsservice.edit_data.contracts import EditCell
+from ossdbtoolsservice.query.contracts import DbCellValue, ResultSetSubset, SubsetResult
+from ossdbtoolsservice.utils.serialization import convert_to_dict
+
+
+class TestDbCellValue(unittest.TestCase):
+
+    def test_no_instance_dictionary(self):
+        cell = DbCellValue(1, False, 1, 0)
+
+        with self.assertRaises(AttributeError):
+            cell.__dict__
+
+    def test_display_value_converted_on_read(self):
+        cell = DbCellValue(1.5, False, 1.5, 0)
+
+        self.assertEqual(cell.display_value, '1.5')
+        self.assertIs(cell.display_value, cell.display_value)
+
+    def test_display_value_none(self):
+        cell = DbCellValue(None, True, None, 0)
+
+        self.assertEqual(cell.display_value, '')
+
+    def test_display_value_set(self):
+        cell = DbCellValue(1, False, 1, 0)
+
+        cell.display_value = '<TBD>'
+
+        self.assertEqual(cell.display_value, '<TBD>')
+
+    def test_convert_to_dict(self):
+        cell = DbCellValue(3, False, 3, 7)
+
+        self.assertEqual(convert_to_dict(cell), {'displayValue': '3', 'isNull': False, 'rowId': 7, 'rawObject': 3})
+
+    def test_convert_to_dict_raw_object_not_serializable(self):
+        value = datetime.date(2020, 1, 2)
+        cell = DbCellValue(value, False, value, 0)
+
+        self.assertEqual(convert_to_dict(cell), {'displayValue': '2020-01-02', 'isNull': False, 'rowId': 0, 'rawObject': None})
+
+    def test_convert_to_dict_subset(self):
+        subset = ResultSetSubset()
+        subset.rows = [[DbCellValue(1, False, 1, 0), DbCellValue(None, True, None, 0)]]
+        subset.row_count = 1
+
+        self.assertEqual(convert_to_dict(SubsetResult(subset)), {
+            'resultSubset': {
+                'rows': [[
+                    {'displayValue': '1', 'isNull': False, 'rowId': 0, 'rawObject': 1},
+                    {'displayValue': '', 'isNull': True, 'rowId': 0, 'rawObject': None}
+                ]],
+                'rowCount': 1
+            }
+        })
+
+    def test_convert_to_dict_edit_cell(self):
+        cell = EditCell(DbCellValue('a', False, 'a', 2), True, 2)
+
+        self.assertEqual(convert_to_dict(cell), {'displayValue': 'a', 'isNull': False, 'rowId': 2, 'rawObject': 'a', 'isDirty': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
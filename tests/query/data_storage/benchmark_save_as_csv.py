@@ -0,0 +1,85 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Benchmark of saving a file storage result set as CSV, comparing the former row by row export, which decodes
+every cell and builds a csv writer per row, with the batched export from the blocks of the buffer file.
+It is not part of the unit test run; execute it with:
+
+    python -m unittest tests.query.data_storage.benchmark_save_as_csv
+"""
+
+import csv
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.file_storage_result_set import FileStorageResultSet
+from ossdbtoolsservice.query.data_storage import SaveAsCsvFileStreamFactory
+from ossdbtoolsservice.query.data_storage.save_as_writer import SaveAsWriter
+from ossdbtoolsservice.query_execution.contracts import SaveResultsAsCsvRequestParams
+from tests.query.data_storage.benchmark_service_buffer import ROW_COUNT, ListCursor, create_rows, get_columns_info
+
+
+class RowByRowCsvWriter(SaveAsWriter):
+    """ The CSV writer as it was before batching: a csv writer per row, over decoded cells """
+
+    def __init__(self, stream, params) -> None:
+        SaveAsWriter.__init__(self, stream, params)
+        self._header_written = False
+
+    def write_row(self, row, columns):
+        writer = csv.writer(self._file_stream, delimiter=',', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+
+        if self._params.include_headers and not self._header_written:
+            writer.writerow([column.column_name for column in columns[self.get_start_index(): self.get_end_index(columns)]])
+            self._header_written = True
+
+        writer.writerow([cell.display_value for cell in row[self.get_start_index(): self.get_end_index(columns)]])
+
+    def complete_write(self):
+        pass
+
+
+class RowByRowCsvFileStreamFactory(SaveAsCsvFileStreamFactory):
+
+    def get_writer(self, file_name: str):
+        return RowByRowCsvWriter(io.open(file_name, 'w', newline=''), self._params)
+
+
+class SaveAsCsvBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self._params = SaveResultsAsCsvRequestParams()
+        self._params.include_headers = True
+        self._file_name = tempfile.mkstemp()[1]
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=get_columns_info):
+            self._result_set = FileStorageResultSet(1, 1)
+            self._result_set.read_result_to_end(ListCursor(create_rows()))
+
+    def tearDown(self):
+        self._result_set.dispose()
+        os.remove(self._file_name)
+
+    def _save_as(self, name: str, file_factory) -> None:
+        start = time.perf_counter()
+        self._result_set.do_save_as(self._file_name, 0, ROW_COUNT, file_factory, None, None)
+        seconds = time.perf_counter() - start
+
+        print(f'\n{name}: {ROW_COUNT / seconds:,.0f} rows/s, file size {os.path.getsize(self._file_name):,} bytes')
+
+    def test_row_by_row_export(self):
+        self._save_as('Row by row export', RowByRowCsvFileStreamFactory(self._params))
+
+    def test_batched_export(self):
+        self._save_as('Batched export', SaveAsCsvFileStreamFactory(self._params))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Benchmark comparing the per-cell service buffer format with the block format used by FileStorageResultSet.
+It is not part of the unit test run; execute it with:
+
+    python -m unittest tests.query.data_storage.benchmark_service_buffer
+"""
+
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.data_storage import (
+    ServiceBufferBlockReader, ServiceBufferBlockWriter, ServiceBufferFileStreamReader, ServiceBufferFileStreamWriter,
+    StorageDataReader, get_column_codecs
+)
+from ossdbtoolsservice.query.contracts import DbColumn
+from ossdbtoolsservice.parsers import datatypes
+from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
+
+ROW_COUNT = 200000
+PAGE_SIZE = 200
+COLUMN_TYPES = [
+    datatypes.DATATYPE_INTEGER, datatypes.DATATYPE_BIGINT, datatypes.DATATYPE_DOUBLE,
+    datatypes.DATATYPE_TEXT, datatypes.DATATYPE_BOOL, datatypes.DATATYPE_TEXT
+]
+
+
+class ListCursor:
+    """ Minimal cursor over a list of rows """
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._position = 0
+        self.description = [(f'column{index}', data_type, None, None, None, None, None) for index, data_type in enumerate(COLUMN_TYPES)]
+        self.connection = None
+
+    def fetchmany(self, size):
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+
+def get_columns_info(cursor):
+    columns_info = []
+    for data_type in COLUMN_TYPES:
+        column = DbColumn()
+        column.data_type = data_type
+        column.provider = PG_PROVIDER_NAME
+        columns_info.append(column)
+    return columns_info
+
+
+def create_rows():
+    return [(index, index * 1000, index / 7, f'row number {index}', index % 2 == 0, None if index % 5 else 'sometimes') for index in range(ROW_COUNT)]
+
+
+class ServiceBufferFormatBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self._rows = create_rows()
+        self._file_name = tempfile.mkstemp()[1]
+        self._patch = mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=get_columns_info)
+        self._patch.start()
+
+    def tearDown(self):
+        self._patch.stop()
+        os.remove(self._file_name)
+
+    def _report(self, name: str, write_seconds: float, read_seconds: float):
+        print(f'\n{name}: write {ROW_COUNT / write_seconds:,.0f} rows/s, '
+              f'paged read {ROW_COUNT / read_seconds:,.0f} rows/s, file size {os.path.getsize(self._file_name):,} bytes')
+
+    def test_per_cell_format(self):
+        reader = StorageDataReader(ListCursor(self._rows))
+        offsets = []
+        total_bytes = 0
+
+        start = time.perf_counter()
+        with ServiceBufferFileStreamWriter(io.open(self._file_name, 'wb')) as writer:
+            while reader.read_row():
+                offsets.append(total_bytes)
+                total_bytes += writer.write_row(reader)
+        write_seconds = time.perf_counter() - start
+
+        columns_info = reader.columns_info
+        start = time.perf_counter()
+        for page_start in range(0, ROW_COUNT, PAGE_SIZE):
+            with ServiceBufferFileStreamReader(io.open(self._file_name, 'rb')) as file_reader:
+                rows = [file_reader.read_row(offsets[index], index, columns_info) for index in range(page_start, page_start + PAGE_SIZE)]
+        read_seconds = time.perf_counter() - start
+
+        self.assertEqual(rows[-1][0].raw_object, ROW_COUNT - 1)
+        self._report('Per-cell format', write_seconds, read_seconds)
+
+    def test_block_format(self):
+        reader = StorageDataReader(ListCursor(self._rows))
+        blocks = []
+        total_bytes = 0
+
+        start = time.perf_counter()
+        with ServiceBufferBlockWriter(io.open(self._file_name, 'wb')) as writer:
+            while reader.read_row():
+                writer.write_row(reader)
+                if writer.is_block_full:
+                    blocks.append((total_bytes, writer.pending_row_count))
+                    total_bytes += writer.flush_block()
+            blocks.append((total_bytes, writer.pending_row_count))
+            total_bytes += writer.flush_block()
+        write_seconds = time.perf_counter() - start
+
+        codecs = get_column_codecs(reader.columns_info)
+        block_row_count = blocks[0][1]
+        block_ends = [offset for offset, _ in blocks[1:]] + [total_bytes]
+
+        start = time.perf_counter()
+        for page_start in range(0, ROW_COUNT, PAGE_SIZE):
+            with ServiceBufferBlockReader(io.open(self._file_name, 'rb')) as file_reader:
+                block_index = page_start // block_row_count
+                block = file_reader.read_block(blocks[block_index][0], block_ends[block_index] - blocks[block_index][0])
+                first_row = block_index * block_row_count
+                rows = [block.get_row(index - first_row, index, codecs) for index in range(page_start, page_start + PAGE_SIZE)]
+        read_seconds = time.perf_counter() - start
+
+        self.assertEqual(rows[-1][0].raw_object, ROW_COUNT - 1)
+        self._report('Block format', write_seconds, read_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
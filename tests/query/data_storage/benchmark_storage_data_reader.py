@@ -0,0 +1,67 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Benchmark of StorageDataReader throughput across fetch batch sizes. Every fetch from the cursor pays a
+simulated round trip to the server. It is not part of the unit test run; execute it with:
+
+    python -m unittest tests.query.data_storage.benchmark_storage_data_reader
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.data_storage import StorageDataReader
+
+ROW_COUNT = 50000
+FETCH_LATENCY = 0.0001
+FETCH_BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+class RoundTripCursor:
+    """ Cursor over a list of rows that waits for FETCH_LATENCY seconds on every fetch """
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._position = 0
+        self.fetch_count = 0
+
+    def fetchmany(self, size):
+        time.sleep(FETCH_LATENCY)
+        self.fetch_count += 1
+
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+
+class StorageDataReaderBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self._rows = [(index, f'row number {index}', index / 7) for index in range(ROW_COUNT)]
+        self._patch = mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=[]))
+        self._patch.start()
+
+    def tearDown(self):
+        self._patch.stop()
+
+    def test_fetch_batch_sizes(self):
+        for fetch_batch_size in FETCH_BATCH_SIZES:
+            cursor = RoundTripCursor(self._rows)
+            reader = StorageDataReader(cursor, fetch_batch_size)
+            row_count = 0
+
+            start = time.perf_counter()
+            while reader.read_row():
+                row_count += 1
+            seconds = time.perf_counter() - start
+
+            self.assertEqual(row_count, ROW_COUNT)
+            print(f'\nFetch batch size {fetch_batch_size}: {ROW_COUNT / seconds:,.0f} rows/s, {cursor.fetch_count:,} fetches')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,6 +41,53 @@ class TestDataStorageReader(unittest.TestCase):
 
         self.assertEqual(read_row_count, total_rows)
 
+    def test_read_row_fetches_rows_in_batches(self):
+        self._reader = StorageDataReader(self._cursor, fetch_batch_size=1)
+
+        while self.execute_read_row_with_patch():
+            pass
+
+        # One fetch for each row and a last one finding no more rows
+        self.assertEqual(self._cursor.fetchmany.call_count, len(self._rows) + 1)
+        self._cursor.fetchmany.assert_called_with(1)
+
+    def test_read_row_stops_fetching_when_cursor_exhausted(self):
+        while self.execute_read_row_with_patch():
+            pass
+
+        self.assertFalse(self.execute_read_row_with_patch())
+        self.assertEqual(self._cursor.fetchmany.call_count, 2)
+        self.assertEqual(self._reader.get_values(), self._rows[-1])
+
+    def test_read_row_with_fetched_rows(self):
+        self._reader = StorageDataReader(self._cursor, fetched_rows=[(0, 'fetched', None, None)], columns_info=self._columns_info)
+
+        self.assertTrue(self._reader.read_row())
+        self.assertEqual(self._reader.get_value(1), 'fetched')
+        self._cursor.fetchmany.assert_not_called()
+
+        self.assertTrue(self._reader.read_row())
+        self.assertEqual(self._reader.get_values(), self._rows[0])
+
+    def test_take_unread_rows(self):
+        self.execute_read_row_with_patch()
+
+        self.assertEqual(self._reader.take_unread_rows(), self._rows[1:])
+        self.assertEqual(self._reader.take_unread_rows(), [])
+        self.assertFalse(self.execute_read_row_with_patch())
+
+    def test_read_row_without_rows(self):
+        self._reader = StorageDataReader(utils.MockCursor([]))
+
+        self.assertFalse(self.execute_read_row_with_patch())
+        self.assertFalse(self.execute_read_row_with_patch())
+
+        self._get_columns_info_mock.assert_called_once()
+
+    def test_invalid_fetch_batch_size(self):
+        with self.assertRaises(ValueError):
+            StorageDataReader(self._cursor, fetch_batch_size=0)
+
     def test_is_none(self):
 
         self.execute_read_row_with_patch()
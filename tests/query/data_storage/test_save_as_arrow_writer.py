@@ -0,0 +1,195 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import decimal
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pyarrow
+from pymysql.constants import FIELD_TYPE
+
+import tests.utils as utils
+from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue
+from ossdbtoolsservice.query.data_storage import SaveAsArrowWriter
+from ossdbtoolsservice.query.data_storage.save_as_arrow_writer import get_arrow_type
+from ossdbtoolsservice.query_execution.contracts import SaveResultsAsArrowRequestParams
+from ossdbtoolsservice.utils import constants
+
+
+def create_column(name: str, data_type, provider: str = constants.PG_PROVIDER_NAME, precision: int = None, scale: int = None) -> DbColumn:
+    column = DbColumn()
+    column.column_name = name
+    column.data_type = data_type
+    column.provider = provider
+    column.numeric_precision = precision
+    column.numeric_scale = scale
+    return column
+
+
+def create_cell(value, display_value: str = None) -> DbCellValue:
+    if value is None:
+        return DbCellValue('NULL', True, None, 0)
+    return DbCellValue(display_value if display_value is not None else str(value), False, value, 0)
+
+
+class TestGetArrowType(unittest.TestCase):
+
+    def test_pg_types(self):
+        self.assertEqual(get_arrow_type(create_column('a', 'int4')), pyarrow.int32())
+        self.assertEqual(get_arrow_type(create_column('a', 'int8')), pyarrow.int64())
+        self.assertEqual(get_arrow_type(create_column('a', 'float8')), pyarrow.float64())
+        self.assertEqual(get_arrow_type(create_column('a', 'bool')), pyarrow.bool_())
+        self.assertEqual(get_arrow_type(create_column('a', 'timestamptz')), pyarrow.timestamp('us', tz='UTC'))
+        self.assertEqual(get_arrow_type(create_column('a', 'bytea')), pyarrow.binary())
+
+        # Types without an Arrow equivalent are written as their display value
+        self.assertEqual(get_arrow_type(create_column('a', 'jsonb')), pyarrow.string())
+        self.assertEqual(get_arrow_type(create_column('a', 'tstzrange')), pyarrow.string())
+
+    def test_pg_numeric(self):
+        self.assertEqual(get_arrow_type(create_column('a', 'numeric', precision=10, scale=2)), pyarrow.decimal128(10, 2))
+
+        # Unconstrained numerics have no precision and are written as text to keep all their digits
+        self.assertEqual(get_arrow_type(create_column('a', 'numeric')), pyarrow.string())
+        self.assertEqual(get_arrow_type(create_column('a', 'numeric', precision=50, scale=2)), pyarrow.string())
+
+    def test_mysql_types(self):
+        self.assertEqual(get_arrow_type(create_column('a', FIELD_TYPE.LONG, constants.MYSQL_PROVIDER_NAME)), pyarrow.int64())
+        self.assertEqual(get_arrow_type(create_column('a', FIELD_TYPE.DATETIME, constants.MARIADB_PROVIDER_NAME)), pyarrow.timestamp('us'))
+        self.assertEqual(get_arrow_type(create_column('a', FIELD_TYPE.NEWDECIMAL, constants.MYSQL_PROVIDER_NAME, 12, 4)), pyarrow.decimal128(12, 4))
+        self.assertEqual(get_arrow_type(create_column('a', FIELD_TYPE.BLOB, constants.MYSQL_PROVIDER_NAME)), pyarrow.string())
+
+
+class TestSaveAsArrowWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(tempfile.mkdtemp(), 'results.arrow')
+
+        self.request = SaveResultsAsArrowRequestParams()
+        self.request.file_path = self.file_path
+
+        self.columns = [
+            create_column('id', 'int4'),
+            create_column('price', 'numeric', precision=10, scale=2),
+            create_column('created', 'timestamp'),
+            create_column('data', 'jsonb')
+        ]
+
+        self.rows = [
+            [create_cell(1), create_cell(decimal.Decimal('1.50')), create_cell(datetime.datetime(2020, 1, 2, 3, 4, 5)),
+             create_cell({'a': 1}, '{"a": 1}')],
+            [create_cell(2), create_cell(None), create_cell(None), create_cell(None)]
+        ]
+
+    def tearDown(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def write_rows(self, rows) -> None:
+        with SaveAsArrowWriter(io.open(self.file_path, 'wb'), self.request) as writer:
+            for row in rows:
+                writer.write_row(row, self.columns)
+
+            writer.complete_write()
+
+    def read_table(self) -> pyarrow.Table:
+        with pyarrow.memory_map(self.file_path) as source:
+            return pyarrow.ipc.open_file(source).read_all()
+
+    def test_write_rows(self):
+        self.write_rows(self.rows)
+
+        table = self.read_table()
+
+        self.assertEqual(table.schema.types, [pyarrow.int32(), pyarrow.decimal128(10, 2), pyarrow.timestamp('us'), pyarrow.string()])
+        self.assertEqual(table.column_names, ['id', 'price', 'created', 'data'])
+        self.assertEqual(table.to_pylist(), [
+            {'id': 1, 'price': decimal.Decimal('1.50'), 'created': datetime.datetime(2020, 1, 2, 3, 4, 5), 'data': '{"a": 1}'},
+            {'id': 2, 'price': None, 'created': None, 'data': None}
+        ])
+
+    def test_write_rows_in_batches(self):
+        with mock.patch('ossdbtoolsservice.query.data_storage.save_as_arrow_writer.ARROW_BATCH_ROW_COUNT', new=2):
+            self.write_rows(self.rows * 3)
+
+        with pyarrow.memory_map(self.file_path) as source:
+            reader = pyarrow.ipc.open_file(source)
+            self.assertEqual(reader.num_record_batches, 3)
+            self.assertEqual(reader.read_all().num_rows, 6)
+
+    def test_write_no_rows(self):
+        self.write_rows([])
+
+        self.assertEqual(self.read_table().num_rows, 0)
+
+    def test_write_selection(self):
+        self.request.column_start_index = 0
+        self.request.column_end_index = 1
+        self.request.row_start_index = 0
+        self.request.row_end_index = 1
+
+        self.write_rows(self.rows)
+
+        self.assertEqual(self.read_table().column_names, ['id', 'price'])
+
+    def test_write_value_not_fitting_column_type(self):
+        rows = [[create_cell('text'), create_cell(None), create_cell(None), create_cell(None)]]
+
+        with self.assertRaises(ValueError) as context:
+            self.write_rows(rows)
+
+        self.assertIn('Column id cannot be written as int32', str(context.exception))
+
+    def test_write_rows_read_from_buffer_file(self):
+        # Values of these types are read back from the buffer file as text, they are written with their Arrow type
+        self.columns = [
+            create_column('price', 'numeric', precision=10, scale=2),
+            create_column('created', 'timestamp'),
+            create_column('updated', 'timestamptz'),
+            create_column('day', 'date'),
+            create_column('hour', 'time'),
+            create_column('duration', 'interval'),
+            create_column('data', 'bytea')
+        ]
+        created = datetime.datetime(2020, 1, 2, 3, 4, 5, 6)
+        updated = datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+        duration = datetime.timedelta(days=-1, seconds=5, microseconds=7)
+        driver_rows = [
+            (decimal.Decimal('1.50'), created, updated, datetime.date(2020, 1, 2), datetime.time(3, 4, 5), duration, memoryview(b"\x00'a")),
+            (None, None, None, None, None, None, None)
+        ]
+        expected_rows = [
+            {'price': decimal.Decimal('1.50'), 'created': created, 'updated': updated, 'day': datetime.date(2020, 1, 2),
+             'hour': datetime.time(3, 4, 5), 'duration': duration, 'data': b"\x00'a"},
+            {'price': None, 'created': None, 'updated': None, 'day': None, 'hour': None, 'duration': None, 'data': None}
+        ]
+
+        for hybrid in [False, True]:
+            with self.subTest(hybrid=hybrid):
+                self.write_rows(utils.read_rows_from_buffer_file(self, self.columns, driver_rows, hybrid))
+
+                table = self.read_table()
+                self.assertEqual(table.schema.types[1], pyarrow.timestamp('us'))
+                self.assertEqual(table.to_pylist(), expected_rows)
+
+    def test_failed_write_closes_writer(self):
+        rows = [[create_cell('text'), create_cell(None), create_cell(None), create_cell(None)]]
+        writer = SaveAsArrowWriter(io.open(self.file_path, 'wb'), self.request)
+
+        with self.assertRaises(ValueError):
+            with writer:
+                writer.write_row(rows[0], self.columns)
+                writer.complete_write()
+
+        self.assertIsNone(writer._writer)
+        self.assertTrue(writer._file_stream.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,8 @@ from unittest import mock
 
 from ossdbtoolsservice.query.data_storage import SaveAsCsvFileStreamFactory
 from ossdbtoolsservice.query.contracts import SaveResultsRequestParams
-from ossdbtoolsservice.query.data_storage import SaveAsCsvWriter, ServiceBufferFileStreamReader
+from ossdbtoolsservice.query.data_storage import SaveAsCsvWriter, ServiceBufferBlockReader
+from ossdbtoolsservice.query.data_storage.save_as_csv_file_stream_factory import CSV_BUFFER_SIZE
 
 
 class TestSaveAsCsvFileStreamFactory(unittest.TestCase):
@@ -25,7 +26,7 @@ class TestSaveAsCsvFileStreamFactory(unittest.TestCase):
         with mock.patch('io.open', new=file_open_mock):
             reader = self.factory.get_reader(self.request.file_path)
 
-            self.assertIsInstance(reader, ServiceBufferFileStreamReader)
+            self.assertIsInstance(reader, ServiceBufferBlockReader)
 
             file_open_mock.assert_called_once_with(self.request.file_path, 'rb')
 
@@ -37,4 +38,13 @@ class TestSaveAsCsvFileStreamFactory(unittest.TestCase):
 
             self.assertIsInstance(writer, SaveAsCsvWriter)
 
-            file_open_mock.assert_called_once_with(self.request.file_path, 'w')
+            file_open_mock.assert_called_once_with(self.request.file_path, 'w', buffering=CSV_BUFFER_SIZE, encoding='utf-8', newline='')
+
+    def test_get_writer_with_encoding(self):
+        self.request.encoding = 'utf-16'
+
+        file_open_mock = mock.MagicMock()
+        with mock.patch('io.open', new=file_open_mock):
+            self.factory.get_writer(self.request.file_path)
+
+            file_open_mock.assert_called_once_with(self.request.file_path, 'w', buffering=CSV_BUFFER_SIZE, encoding='utf-16', newline='')
@@ -3,6 +3,8 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import csv
+import io
 import unittest
 from unittest import mock
 
@@ -48,30 +50,64 @@ class TestSaveAsCsvWriter(unittest.TestCase):
         writer_mock = mock.MagicMock()
         csv_writer_mock = mock.Mock(return_value=writer_mock)
         with mock.patch('csv.writer', new=csv_writer_mock):
+            self.writer = SaveAsCsvWriter(self.mock_io, self.request)
             self.writer.write_row(self.row, self.columns)
+            self.writer.complete_write()
 
-            csv_writer_mock.assert_called_once_with(self.mock_io, delimiter=',', quotechar='"', quoting=0)
+            csv_writer_mock.assert_called_once_with(self.mock_io, delimiter=',', quotechar='"', quoting=0, lineterminator='\r\n')
 
-            self.assertEqual(writer_mock.writerow.call_count, 2)
-            write_row_args = writer_mock.writerow.call_args_list
-
-            self.assertEqual(['Name', 'Id', 'Valid'], write_row_args[0][0][0])
-            self.assertEqual(['Test', '1023', 'False'], write_row_args[1][0][0])
+            writer_mock.writerow.assert_called_once_with(['Name', 'Id', 'Valid'])
+            writer_mock.writerows.assert_called_once_with([['Test', '1023', 'False']])
 
     def test_write_row_for_few_columns(self):
 
         self.writer._column_start_index = 1
         self.writer._column_end_index = 2
 
+        stream = io.StringIO()
+        self.writer._writer = csv.writer(stream)
+        self.writer.write_row(self.row, self.columns)
+        self.writer.complete_write()
+
+        self.assertEqual('Id,Valid\r\n1023,False\r\n', stream.getvalue())
+
+    def test_write_rows_by_batch(self):
         writer_mock = mock.MagicMock()
-        csv_writer_mock = mock.Mock(return_value=writer_mock)
-        with mock.patch('csv.writer', new=csv_writer_mock):
-            self.writer.write_row(self.row, self.columns)
+        self.writer._writer = writer_mock
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.save_as_csv_writer.CSV_WRITE_BATCH_SIZE', new=2):
+            for _ in range(3):
+                self.writer.write_row(self.row, self.columns)
+
+            self.assertEqual(writer_mock.writerows.call_count, 1)
+
+            self.writer.complete_write()
+
+        self.assertEqual(writer_mock.writerows.call_count, 2)
+        self.assertEqual(2, len(writer_mock.writerows.call_args_list[0][0][0]))
+        self.assertEqual(1, len(writer_mock.writerows.call_args_list[1][0][0]))
+
+    def test_write_display_rows(self):
+        stream = io.StringIO()
+        writer = SaveAsCsvWriter(stream, self.request)
+
+        writer.write_row(self.row, self.columns)
+        writer.write_display_rows([('a', '1', 'True'), ('b', 'NULL', 'False')], self.columns)
+        writer.complete_write()
+
+        self.assertEqual('Name,Id,Valid\r\nTest,1023,False\r\na,1,True\r\nb,NULL,False\r\n', stream.getvalue())
+
+    def test_write_with_format_options(self):
+        self.request.include_headers = False
+        self.request.delimiter = ';'
+        self.request.text_identifier = "'"
+        self.request.quote_all_values = True
+        self.request.line_seperator = '\n'
 
-            csv_writer_mock.assert_called_once_with(self.mock_io, delimiter=',', quotechar='"', quoting=0)
+        stream = io.StringIO()
+        writer = SaveAsCsvWriter(stream, self.request)
 
-            self.assertEqual(writer_mock.writerow.call_count, 2)
-            write_row_args = writer_mock.writerow.call_args_list
+        writer.write_display_rows([("it's", '1')], self.columns[:2])
+        writer.complete_write()
 
-            self.assertEqual(['Id', 'Valid'], write_row_args[0][0][0])
-            self.assertEqual(['1023', 'False'], write_row_args[1][0][0])
+        self.assertEqual("'it''s';'1'\n", stream.getvalue())
@@ -3,12 +3,20 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import datetime
+import decimal
+import io
+import os
+import tempfile
 import unittest
+import zipfile
 from unittest import mock
 
+import tests.utils as utils
 from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue
 from ossdbtoolsservice.query.data_storage import SaveAsExcelWriter
 from ossdbtoolsservice.query_execution.contracts import SaveResultsAsExcelRequestParams
+from ossdbtoolsservice.utils import constants
 
 
 class TestSaveAsExcelWriter(unittest.TestCase):
@@ -21,9 +29,9 @@ class TestSaveAsExcelWriter(unittest.TestCase):
         self.mock_io = mock.MagicMock()
 
         self.row = [
-            DbCellValue('Test', False, None, 0),
-            DbCellValue(1023, False, None, 0),
-            DbCellValue(False, False, None, 0)
+            DbCellValue('Test', False, 'Test', 0),
+            DbCellValue(1023, False, 1023, 0),
+            DbCellValue(False, False, False, 0)
         ]
 
         name_column = DbColumn()
@@ -51,45 +59,110 @@ class TestSaveAsExcelWriter(unittest.TestCase):
             self.writer = SaveAsExcelWriter(self.mock_io, self.request)
 
     def test_construction(self):
-        self.xlsxwriter_mock.assert_called_once_with(self.mock_io.name)
+        self.xlsxwriter_mock.assert_called_once_with(self.mock_io.name, {'constant_memory': True, 'remove_timezone': True})
         self.workbook_mock.add_worksheet.assert_called_once()
 
     def test_write_row_column_headers(self):
-        bold = {}
-        self.workbook_mock.add_format = mock.Mock(return_value=bold)
         self.writer.write_row(self.row, self.columns)
-        self.workbook_mock.add_format.assert_called_once_with({'bold': 1})
+        self.workbook_mock.add_format.assert_any_call({'bold': 1})
 
-        write_column_header_args = self.worksheet_mock.write.call_args_list
+        self.worksheet_mock.write_string.assert_any_call(0, 0, 'Name', self.writer._header_format)
+        self.worksheet_mock.write_string.assert_any_call(0, 1, 'Id', self.writer._header_format)
+        self.worksheet_mock.write_string.assert_any_call(0, 2, 'Valid', self.writer._header_format)
 
-        self.assertEqual('A1', write_column_header_args[0][0][0])
-        self.assertEqual('Name', write_column_header_args[0][0][1])
-        self.assertEqual(bold, write_column_header_args[0][0][2])
+    def test_write_row_column_headers_past_26_columns(self):
+        columns = []
+        for index in range(30):
+            column = DbColumn()
+            column.column_name = f'Column{index}'
+            columns.append(column)
 
-        self.assertEqual('B1', write_column_header_args[1][0][0])
-        self.assertEqual('Id', write_column_header_args[1][0][1])
-        self.assertEqual(bold, write_column_header_args[1][0][2])
+        self.writer.write_row([DbCellValue(index, False, index, 0) for index in range(30)], columns)
 
-        self.assertEqual('C1', write_column_header_args[2][0][0])
-        self.assertEqual('Valid', write_column_header_args[2][0][1])
-        self.assertEqual(bold, write_column_header_args[2][0][2])
+        self.worksheet_mock.write_string.assert_any_call(0, 29, 'Column29', self.writer._header_format)
 
     def test_write_row(self):
         self.writer.write_row(self.row, self.columns)
 
-        write_column_value_args = self.worksheet_mock.write.call_args_list
+        self.worksheet_mock.write_string.assert_any_call(1, 0, 'Test')
+        self.worksheet_mock.write_number.assert_called_once_with(1, 1, 1023)
+        self.worksheet_mock.write_boolean.assert_called_once_with(1, 2, False)
+
+    def test_write_typed_cells(self):
+        timestamp = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        row = [
+            DbCellValue(None, True, None, 0),
+            DbCellValue(decimal.Decimal('1.5'), False, decimal.Decimal('1.5'), 0),
+            DbCellValue(2 ** 60, False, 2 ** 60, 0),
+            DbCellValue(float('nan'), False, float('nan'), 0),
+            DbCellValue(timestamp, False, timestamp, 0),
+            DbCellValue(timestamp.date(), False, timestamp.date(), 0),
+            DbCellValue(timestamp.time(), False, timestamp.time(), 0),
+            DbCellValue(datetime.date(1800, 1, 1), False, datetime.date(1800, 1, 1), 0)
+        ]
+        columns = [DbColumn() for _ in row]
+
+        self.writer.write_row(row, columns)
+
+        self.worksheet_mock.write_string.assert_any_call(1, 0, '')
+        self.worksheet_mock.write_number.assert_called_once_with(1, 1, decimal.Decimal('1.5'))
+        self.worksheet_mock.write_string.assert_any_call(1, 2, str(2 ** 60))
+        self.worksheet_mock.write_string.assert_any_call(1, 3, 'nan')
+        self.worksheet_mock.write_datetime.assert_any_call(1, 4, timestamp, self.writer._datetime_format)
+        self.worksheet_mock.write_datetime.assert_any_call(1, 5, timestamp.date(), self.writer._date_format)
+        self.worksheet_mock.write_datetime.assert_any_call(1, 6, timestamp.time(), self.writer._time_format)
+        self.worksheet_mock.write_string.assert_any_call(1, 7, '1800-01-01')
+
+    def test_write_typed_cells_read_from_buffer_file(self):
+        columns = []
+        for data_type in ['timestamp', 'date', 'time', 'numeric', 'interval']:
+            column = DbColumn()
+            column.column_name = data_type
+            column.data_type = data_type
+            column.provider = constants.PG_PROVIDER_NAME
+            columns.append(column)
+
+        timestamp = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        driver_rows = [(timestamp, timestamp.date(), timestamp.time(), decimal.Decimal('1.5'), datetime.timedelta(days=1))]
+
+        for hybrid in [False, True]:
+            with self.subTest(hybrid=hybrid):
+                self.worksheet_mock.reset_mock()
+                self.writer._header_columns = None
+                self.writer._current_row = 1
+
+                self.writer.write_row(utils.read_rows_from_buffer_file(self, columns, driver_rows, hybrid)[0], columns)
+
+                self.worksheet_mock.write_datetime.assert_any_call(1, 0, timestamp, self.writer._datetime_format)
+                self.worksheet_mock.write_datetime.assert_any_call(1, 1, timestamp.date(), self.writer._date_format)
+                self.worksheet_mock.write_datetime.assert_any_call(1, 2, timestamp.time(), self.writer._time_format)
+                self.worksheet_mock.write_number.assert_called_once_with(1, 3, decimal.Decimal('1.5'))
+                self.worksheet_mock.write_string.assert_any_call(1, 4, '1 day, 0:00:00')
+
+    def test_write_rows_past_sheet_limit(self):
+        second_worksheet_mock = mock.MagicMock()
+        self.workbook_mock.add_worksheet = mock.Mock(return_value=second_worksheet_mock)
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.save_as_excel_writer.MAX_SHEET_ROW_COUNT', new=3):
+            for _ in range(3):
+                self.writer.write_row(self.row, self.columns)
+
+        # Two rows fit the first worksheet below its header, the third one starts a new worksheet with its own header
+        self.workbook_mock.add_worksheet.assert_called_once()
+        self.assertEqual(self.worksheet_mock.write_number.call_count, 2)
+        second_worksheet_mock.write_string.assert_any_call(0, 0, 'Name', self.writer._header_format)
+        second_worksheet_mock.write_number.assert_called_once_with(1, 1, 1023)
 
-        self.assertEqual(1, write_column_value_args[3][0][0])
-        self.assertEqual(0, write_column_value_args[3][0][1])
-        self.assertEqual('Test', write_column_value_args[3][0][2])
+    def test_write_workbook(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'results.xlsx')
 
-        self.assertEqual(1, write_column_value_args[4][0][0])
-        self.assertEqual(1, write_column_value_args[4][0][1])
-        self.assertEqual('1023', write_column_value_args[4][0][2])
+            with io.open(file_name, 'w') as stream:
+                writer = SaveAsExcelWriter(stream, self.request)
+                writer.write_row(self.row, self.columns)
+                writer.complete_write()
 
-        self.assertEqual(1, write_column_value_args[5][0][0])
-        self.assertEqual(2, write_column_value_args[5][0][1])
-        self.assertEqual('False', write_column_value_args[5][0][2])
+            self.assertTrue(zipfile.is_zipfile(file_name))
 
     def test_complete_write(self):
         self.writer.complete_write()
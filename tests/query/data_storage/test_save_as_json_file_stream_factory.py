@@ -8,7 +8,7 @@ from unittest import mock
 
 from ossdbtoolsservice.query.data_storage import SaveAsJsonFileStreamFactory
 from ossdbtoolsservice.query.contracts import SaveResultsRequestParams
-from ossdbtoolsservice.query.data_storage import SaveAsJsonWriter, ServiceBufferFileStreamReader
+from ossdbtoolsservice.query.data_storage import SaveAsJsonWriter, ServiceBufferBlockReader
 
 
 class TestSaveAsJsonFileStreamFactory(unittest.TestCase):
@@ -25,7 +25,7 @@ class TestSaveAsJsonFileStreamFactory(unittest.TestCase):
         with mock.patch('io.open', new=file_open_mock):
             reader = self.factory.get_reader(self.request.file_path)
 
-            self.assertIsInstance(reader, ServiceBufferFileStreamReader)
+            self.assertIsInstance(reader, ServiceBufferBlockReader)
 
             file_open_mock.assert_called_once_with(self.request.file_path, 'rb')
 
@@ -3,6 +3,8 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import io
+import json
 import unittest
 from unittest import mock
 
@@ -53,15 +55,28 @@ class TestSaveAsJsonWriter(unittest.TestCase):
     def test_write_row(self):
         self.writer.write_row(self.row, self.columns)
 
-        self.assertEqual(1, len(self.writer._data))
+        self.assertEqual(1, self.writer._row_count)
+        self.assertEqual('[\n ', self.mock_io.write.call_args_list[0][0][0])
+        self.assertEqual({'Name': 'Test', 'Id': '1023', 'Valid': 'False'}, json.loads(self.mock_io.write.call_args_list[1][0][0]))
 
-        self.assertEqual('Test', self.writer._data[0]['Name'])
-        self.assertEqual('1023', self.writer._data[0]['Id'])
-        self.assertEqual('False', self.writer._data[0]['Valid'])
+    def test_write_rows_to_json_array(self):
+        stream = io.StringIO()
+        writer = SaveAsJsonWriter(stream, self.request)
 
-    def test_complete_write(self):
-        json_dump_mock = mock.MagicMock()
+        writer.write_row(self.row, self.columns)
+        writer.write_row(self.row, self.columns)
+        writer.complete_write()
 
-        with mock.patch('json.dump', new=json_dump_mock):
-            self.writer.complete_write()
-            json_dump_mock.assert_called_once_with(self.writer._data, self.mock_io, indent=True)
+        expected_row = {'Name': 'Test', 'Id': '1023', 'Valid': 'False'}
+        self.assertEqual([expected_row, expected_row], json.loads(stream.getvalue()))
+
+        # The file is indented as when the whole array was dumped at once
+        self.assertEqual(json.dumps([expected_row, expected_row], indent=True), stream.getvalue())
+
+    def test_complete_write_without_rows(self):
+        stream = io.StringIO()
+        writer = SaveAsJsonWriter(stream, self.request)
+
+        writer.complete_write()
+
+        self.assertEqual([], json.loads(stream.getvalue()))
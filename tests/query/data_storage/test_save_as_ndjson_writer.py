@@ -0,0 +1,76 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import json
+import unittest
+
+from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue
+from ossdbtoolsservice.query.data_storage import SaveAsNdjsonWriter
+from ossdbtoolsservice.query_execution.contracts import SaveResultsAsNdjsonRequestParams
+
+
+class TestSaveAsNdjsonWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.request = SaveResultsAsNdjsonRequestParams()
+        self.request.file_path = 'TestPath'
+
+        self.row = [
+            DbCellValue('Test', False, None, 0),
+            DbCellValue(1023, False, None, 0),
+            DbCellValue(False, False, None, 0)
+        ]
+
+        name_column = DbColumn()
+        name_column.column_name = 'Name'
+
+        id_column = DbColumn()
+        id_column.column_name = 'Id'
+
+        is_valid_column = DbColumn()
+        is_valid_column.column_name = 'Valid'
+
+        self.columns = [
+            name_column,
+            id_column,
+            is_valid_column
+        ]
+
+        self.stream = io.StringIO()
+        self.writer = SaveAsNdjsonWriter(self.stream, self.request)
+
+    def test_write_rows(self):
+        self.writer.write_row(self.row, self.columns)
+        self.writer.write_row(self.row, self.columns)
+        self.writer.complete_write()
+
+        lines = self.stream.getvalue().split('\n')
+
+        self.assertEqual(3, len(lines))
+        self.assertEqual('', lines[2])
+
+        for line in lines[:2]:
+            self.assertEqual({'Name': 'Test', 'Id': '1023', 'Valid': 'False'}, json.loads(line))
+
+    def test_write_selected_columns(self):
+        self.request.row_start_index = 0
+        self.request.row_end_index = 0
+        self.request.column_start_index = 0
+        self.request.column_end_index = 1
+        writer = SaveAsNdjsonWriter(self.stream, self.request)
+
+        writer.write_row(self.row, self.columns)
+
+        self.assertEqual({'Name': 'Test', 'Id': '1023'}, json.loads(self.stream.getvalue()))
+
+    def test_complete_write_without_rows(self):
+        self.writer.complete_write()
+
+        self.assertEqual('', self.stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pyarrow
+import pyarrow.parquet
+
+import tests.utils as utils
+from ossdbtoolsservice.query.contracts import DbColumn, DbCellValue
+from ossdbtoolsservice.query.data_storage import SaveAsParquetWriter
+from ossdbtoolsservice.query_execution.contracts import SaveResultsAsParquetRequestParams
+from ossdbtoolsservice.utils import constants
+
+
+class TestSaveAsParquetWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(tempfile.mkdtemp(), 'results.parquet')
+
+        self.request = SaveResultsAsParquetRequestParams()
+        self.request.file_path = self.file_path
+
+        self.columns = []
+        for name, data_type in [('id', 'int8'), ('name', 'text'), ('day', 'date')]:
+            column = DbColumn()
+            column.column_name = name
+            column.data_type = data_type
+            column.provider = constants.PG_PROVIDER_NAME
+            self.columns.append(column)
+
+        self.rows = [
+            [DbCellValue('1', False, 1, 0), DbCellValue('One', False, 'One', 0), DbCellValue('2020-01-02', False, datetime.date(2020, 1, 2), 0)],
+            [DbCellValue('2', False, 2, 1), DbCellValue('NULL', True, None, 1), DbCellValue('NULL', True, None, 1)]
+        ]
+
+    def tearDown(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def write_rows(self, rows) -> None:
+        with SaveAsParquetWriter(io.open(self.file_path, 'wb'), self.request) as writer:
+            for row in rows:
+                writer.write_row(row, self.columns)
+
+            writer.complete_write()
+
+    def test_write_rows(self):
+        self.write_rows(self.rows)
+
+        table = pyarrow.parquet.read_table(self.file_path)
+
+        self.assertEqual(table.schema.types, [pyarrow.int64(), pyarrow.string(), pyarrow.date32()])
+        self.assertEqual(table.to_pylist(), [
+            {'id': 1, 'name': 'One', 'day': datetime.date(2020, 1, 2)},
+            {'id': 2, 'name': None, 'day': None}
+        ])
+
+        # Row groups are compressed with snappy unless the request sets a compression
+        metadata = pyarrow.parquet.ParquetFile(self.file_path).metadata
+        self.assertEqual(metadata.row_group(0).column(0).compression, 'SNAPPY')
+
+    def test_write_row_groups(self):
+        self.request.compression = 'zstd'
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.save_as_arrow_writer.ARROW_BATCH_ROW_COUNT', new=2):
+            self.write_rows(self.rows * 3)
+
+        metadata = pyarrow.parquet.ParquetFile(self.file_path).metadata
+        self.assertEqual(metadata.num_row_groups, 3)
+        self.assertEqual(metadata.num_rows, 6)
+        self.assertEqual(metadata.row_group(0).column(0).compression, 'ZSTD')
+
+    def test_write_no_rows(self):
+        self.write_rows([])
+
+        self.assertEqual(pyarrow.parquet.read_table(self.file_path).num_rows, 0)
+
+    def test_write_rows_read_from_buffer_file(self):
+        self.columns[1].data_type = 'timestamp'
+        rows = utils.read_rows_from_buffer_file(self, self.columns, [(1, datetime.datetime(2020, 1, 2, 3, 4, 5), datetime.date(2020, 1, 2))])
+
+        self.write_rows(rows)
+
+        table = pyarrow.parquet.read_table(self.file_path)
+        self.assertEqual(table.schema.types, [pyarrow.int64(), pyarrow.timestamp('us'), pyarrow.date32()])
+        self.assertEqual(table.to_pylist(), [{'id': 1, 'name': datetime.datetime(2020, 1, 2, 3, 4, 5), 'day': datetime.date(2020, 1, 2)}])
+
+    def test_failed_write_closes_writer(self):
+        rows = [[DbCellValue('One', False, 'One', 0), DbCellValue('One', False, 'One', 0), DbCellValue('NULL', True, None, 0)]]
+        writer = SaveAsParquetWriter(io.open(self.file_path, 'wb'), self.request)
+
+        with self.assertRaises(ValueError):
+            with writer:
+                writer.write_row(rows[0], self.columns)
+                writer.complete_write()
+
+        # The Parquet writer is closed before the file, it does not write to the closed file afterwards
+        self.assertIsNone(writer._writer)
+        self.assertTrue(writer._file_stream.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
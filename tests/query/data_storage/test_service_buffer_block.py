@@ -0,0 +1,150 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+import struct
+
+from ossdbtoolsservice.query.data_storage import get_column_codecs
+from ossdbtoolsservice.query.data_storage.service_buffer_block import BLOCK_HEADER, ServiceBufferBlock, compress_block, decompress_block, encode_block
+from ossdbtoolsservice.query.contracts import DbColumn
+from ossdbtoolsservice.parsers import datatypes
+from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
+
+
+class TestServiceBufferBlock(unittest.TestCase):
+
+    def setUp(self):
+        self._codecs = get_column_codecs([
+            self._create_column(datatypes.DATATYPE_INTEGER),
+            self._create_column(datatypes.DATATYPE_TEXT),
+            self._create_column(datatypes.DATATYPE_DOUBLE)
+        ])
+
+        self._columns = [
+            [struct.pack('i', 1), struct.pack('i', 2), struct.pack('i', 3)],
+            ['one'.encode(), None, b''],
+            [struct.pack('d', 1.5), struct.pack('d', 2.5), None]
+        ]
+
+        self._block = ServiceBufferBlock(encode_block(3, self._columns))
+
+    def _create_column(self, data_type: str) -> DbColumn:
+        column = DbColumn()
+        column.data_type = data_type
+        column.provider = PG_PROVIDER_NAME
+        return column
+
+    def test_encode_block_header(self):
+        buffer = encode_block(3, self._columns)
+        row_count, column_count, data_length = BLOCK_HEADER.unpack_from(buffer)
+
+        self.assertEqual(row_count, 3)
+        self.assertEqual(column_count, 3)
+        self.assertEqual(data_length, 4 * 3 + 3 + 8 * 2)
+
+    def test_block_properties(self):
+        self.assertEqual(self._block.row_count, 3)
+        self.assertEqual(self._block.column_count, 3)
+
+    def test_get_bytes(self):
+        self.assertEqual(self._block.get_bytes(1, 0), struct.pack('i', 2))
+        self.assertEqual(self._block.get_bytes(0, 1), b'one')
+        self.assertEqual(self._block.get_bytes(2, 1), b'')
+        self.assertEqual(self._block.get_bytes(1, 2), struct.pack('d', 2.5))
+
+    def test_is_null(self):
+        self.assertFalse(self._block.is_null(0, 1))
+        self.assertTrue(self._block.is_null(1, 1))
+        self.assertFalse(self._block.is_null(2, 1))
+        self.assertTrue(self._block.is_null(2, 2))
+
+    def test_get_row(self):
+        row = self._block.get_row(0, 10, self._codecs)
+
+        self.assertEqual([cell.raw_object for cell in row], [1, 'one', 1.5])
+        self.assertEqual([cell.row_id for cell in row], [10, 10, 10])
+        self.assertFalse(any(cell.is_null for cell in row))
+
+    def test_get_row_with_nulls(self):
+        row = self._block.get_row(2, 12, self._codecs)
+
+        # An empty string is a value and should not be confused with NULL
+        self.assertEqual(row[1].raw_object, '')
+        self.assertFalse(row[1].is_null)
+
+        self.assertTrue(row[2].is_null)
+        self.assertEqual(row[2].display_value, 'NULL')
+        self.assertIsNone(row[2].raw_object)
+
+    def test_get_row_unpacks_fixed_width_columns(self):
+        self._block.get_row(1, 11, self._codecs)
+
+        # The integer column is unpacked at once, the double one has a NULL cell without data so it is decoded by cell
+        self.assertEqual(self._block._column_values[0], (1, 2, 3))
+        self.assertIsNone(self._block._column_values[2])
+
+        row = self._block.get_row(2, 12, self._codecs)
+        self.assertEqual(row[0].raw_object, 3)
+
+    def test_get_row_with_null_type(self):
+        column = self._create_column(datatypes.DATATYPE_NULL)
+        block = ServiceBufferBlock(encode_block(1, [[None]]))
+
+        row = block.get_row(0, 0, get_column_codecs([column]))
+
+        self.assertTrue(row[0].is_null)
+        self.assertIsNone(row[0].raw_object)
+
+    def test_get_display_rows(self):
+        rows = self._block.get_display_rows(range(3), range(3), self._codecs)
+
+        self.assertEqual(rows, [('1', 'one', '1.5'), ('2', 'NULL', '2.5'), ('3', '', 'NULL')])
+
+        # The display values match the ones of the decoded rows
+        for row_index, row in enumerate(rows):
+            self.assertEqual(row, tuple(cell.display_value for cell in self._block.get_row(row_index, row_index, self._codecs)))
+
+    def test_get_display_rows_of_selected_rows_and_columns(self):
+        rows = self._block.get_display_rows([2, 0], range(1, 3), self._codecs)
+
+        self.assertEqual(rows, [('', 'NULL'), ('one', '1.5')])
+
+    def test_get_display_rows_with_null_type(self):
+        column = self._create_column(datatypes.DATATYPE_NULL)
+        block = ServiceBufferBlock(encode_block(2, [[None, None]]))
+
+        self.assertEqual(block.get_display_rows(range(2), range(1), get_column_codecs([column])), [('',), ('',)])
+
+    def test_get_row_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self._block.get_row(3, 0, self._codecs)
+
+    def test_truncated_block(self):
+        buffer = encode_block(3, self._columns)
+
+        with self.assertRaises(IOError):
+            ServiceBufferBlock(buffer[:-1])
+
+        with self.assertRaises(IOError):
+            ServiceBufferBlock(buffer[:BLOCK_HEADER.size - 1])
+
+    def test_empty_block(self):
+        block = ServiceBufferBlock(encode_block(0, []))
+
+        self.assertEqual(block.row_count, 0)
+        self.assertEqual(block.column_count, 0)
+
+    def test_compress_block(self):
+        data = encode_block(3, [[b'text' * 50] * 3])
+
+        self.assertEqual(decompress_block(compress_block(data)), data)
+
+    def test_decompress_corrupted_block(self):
+        with self.assertRaises(IOError):
+            decompress_block(b'not compressed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.data_storage import ServiceBufferBlockCache
+
+
+class TestServiceBufferBlockCache(unittest.TestCase):
+
+    def setUp(self):
+        self._cache = ServiceBufferBlockCache(2)
+        self._blocks = [mock.Mock() for _ in range(3)]
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ServiceBufferBlockCache(0)
+
+    def test_get_missing_block(self):
+        self.assertIsNone(self._cache.get(0))
+
+    def test_put_get(self):
+        self._cache.put(0, self._blocks[0])
+
+        self.assertIs(self._cache.get(0), self._blocks[0])
+
+    def test_least_recently_used_block_evicted(self):
+        self._cache.put(0, self._blocks[0])
+        self._cache.put(1, self._blocks[1])
+
+        # Reading the first block makes the second one the least recently used
+        self._cache.get(0)
+        self._cache.put(2, self._blocks[2])
+
+        self.assertEqual(len(self._cache), 2)
+        self.assertIs(self._cache.get(0), self._blocks[0])
+        self.assertIsNone(self._cache.get(1))
+        self.assertIs(self._cache.get(2), self._blocks[2])
+
+    def test_clear(self):
+        self._cache.put(0, self._blocks[0])
+
+        self._cache.clear()
+
+        self.assertEqual(len(self._cache), 0)
+        self.assertIsNone(self._cache.get(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
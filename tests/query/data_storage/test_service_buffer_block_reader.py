@@ -0,0 +1,75 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+from unittest import mock
+import io
+import struct
+
+from ossdbtoolsservice.query.data_storage import ServiceBufferBlockReader
+from ossdbtoolsservice.query.data_storage.service_buffer_block import encode_block
+
+
+class TestServiceBufferBlockReader(unittest.TestCase):
+
+    def setUp(self):
+        self._first_block = encode_block(2, [[struct.pack('i', 1), struct.pack('i', 2)]])
+        self._second_block = encode_block(1, [[b'text']])
+
+        self._file_stream = io.BytesIO(self._first_block + self._second_block)
+        self._reader = ServiceBufferBlockReader(self._file_stream)
+
+    def test_stream_none(self):
+        with self.assertRaises(ValueError):
+            ServiceBufferBlockReader(None)
+
+    def test_stream_not_readable(self):
+        stream = mock.MagicMock()
+        stream.readable = mock.Mock(return_value=False)
+
+        with self.assertRaises(ValueError):
+            ServiceBufferBlockReader(stream)
+
+    def test_read_block(self):
+        block = self._reader.read_block(len(self._first_block), len(self._second_block))
+
+        self.assertEqual(block.row_count, 1)
+        self.assertEqual(block.get_bytes(0, 0), b'text')
+
+        block = self._reader.read_block(0, len(self._first_block))
+
+        self.assertEqual(block.row_count, 2)
+        self.assertEqual(block.get_bytes(1, 0), struct.pack('i', 2))
+
+    def test_read_block_bytes(self):
+        buffer = self._reader.read_block_bytes(len(self._first_block), len(self._second_block))
+
+        self.assertEqual(buffer, self._second_block)
+
+    def test_read_block_uses_single_read(self):
+        stream = mock.MagicMock()
+        stream.read = mock.Mock(return_value=self._first_block)
+        reader = ServiceBufferBlockReader(stream)
+
+        reader.read_block(5, len(self._first_block))
+
+        stream.seek.assert_called_once_with(5)
+        stream.read.assert_called_once_with(len(self._first_block))
+
+    def test_read_block_past_end(self):
+        with self.assertRaises(IOError):
+            self._reader.read_block(len(self._first_block), len(self._second_block) + 1)
+
+    def test_read_error(self):
+        stream = mock.MagicMock()
+        stream.read = mock.Mock(side_effect=OSError())
+        reader = ServiceBufferBlockReader(stream)
+
+        with self.assertRaises(IOError):
+            reader.read_block(0, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+from unittest import mock
+import io
+
+from ossdbtoolsservice.query.data_storage import ServiceBufferBlock, ServiceBufferBlockWriter, StorageDataReader, get_column_codecs
+from ossdbtoolsservice.query.contracts import DbColumn
+from ossdbtoolsservice.parsers import datatypes
+from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
+from ossdbtoolsservice.query.data_storage.service_buffer_block import decompress_block
+import tests.utils as utils
+
+
+class TestServiceBufferBlockWriter(unittest.TestCase):
+
+    def setUp(self):
+        self._file_stream = io.BytesIO()
+        self._writer = ServiceBufferBlockWriter(self._file_stream, max_row_count=2, max_data_size=64)
+        self._columns_info = []
+
+        for data_type in [datatypes.DATATYPE_INTEGER, datatypes.DATATYPE_TEXT]:
+            column = DbColumn()
+            column.data_type = data_type
+            column.provider = PG_PROVIDER_NAME
+            self._columns_info.append(column)
+
+    def _get_reader(self, rows) -> StorageDataReader:
+        reader = StorageDataReader(utils.MockCursor(rows))
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=self._columns_info)):
+            reader.read_row()
+
+        return reader
+
+    def test_stream_none(self):
+        with self.assertRaises(ValueError):
+            ServiceBufferBlockWriter(None)
+
+    def test_stream_not_writable(self):
+        stream = mock.MagicMock()
+        stream.writable = mock.Mock(return_value=False)
+
+        with self.assertRaises(ValueError):
+            ServiceBufferBlockWriter(stream)
+
+    def test_write_row_is_buffered(self):
+        self._writer.write_row(self._get_reader([(1, 'one')]))
+
+        self.assertEqual(self._writer.pending_row_count, 1)
+        self.assertFalse(self._writer.is_block_full)
+        self.assertEqual(self._file_stream.tell(), 0)
+
+    def test_block_full_by_row_count(self):
+        self._writer.write_row(self._get_reader([(1, 'one')]))
+        self._writer.write_row(self._get_reader([(2, 'two')]))
+
+        self.assertTrue(self._writer.is_block_full)
+
+    def test_block_full_by_data_size(self):
+        self._writer.write_row(self._get_reader([(1, 'x' * 64)]))
+
+        self.assertTrue(self._writer.is_block_full)
+
+    def test_flush_block(self):
+        self._writer.write_row(self._get_reader([(1, 'one')]))
+        self._writer.write_row(self._get_reader([(None, 'two')]))
+
+        written = self._writer.flush_block()
+
+        self.assertEqual(written, len(self._file_stream.getvalue()))
+        self.assertEqual(self._writer.pending_row_count, 0)
+        self.assertFalse(self._writer.is_block_full)
+
+        block = ServiceBufferBlock(self._file_stream.getvalue())
+        codecs = get_column_codecs(self._columns_info)
+        self.assertEqual(block.row_count, 2)
+        self.assertEqual([cell.raw_object for cell in block.get_row(0, 0, codecs)], [1, 'one'])
+        self.assertEqual([cell.raw_object for cell in block.get_row(1, 1, codecs)], [None, 'two'])
+
+    def test_flush_block_stores_fixed_width_nulls_at_full_width(self):
+        self._writer.write_row(self._get_reader([(None, 'one')]))
+        self._writer.flush_block()
+
+        block = ServiceBufferBlock(self._file_stream.getvalue())
+
+        self.assertTrue(block.is_null(0, 0))
+        self.assertEqual(len(block.get_bytes(0, 0)), 4)
+        self.assertEqual(block.get_bytes(0, 1), b'one')
+
+    def test_flush_compressed_block(self):
+        writer = ServiceBufferBlockWriter(self._file_stream, is_compressed=True)
+        writer.write_row(self._get_reader([(1, 'one' * 100)]))
+
+        written = writer.flush_block()
+
+        self.assertEqual(written, len(self._file_stream.getvalue()))
+        block = ServiceBufferBlock(decompress_block(self._file_stream.getvalue()))
+        self.assertEqual(block.row_count, 1)
+        self.assertEqual(block.get_bytes(0, 1), b'one' * 100)
+        self.assertLess(written, len(block.get_bytes(0, 1)))
+
+    def test_flush_empty_block(self):
+        self.assertEqual(self._writer.flush_block(), 0)
+        self.assertEqual(self._file_stream.getvalue(), b'')
+
+    def test_flush_block_uses_single_write(self):
+        stream = mock.MagicMock()
+        stream.write = mock.Mock(return_value=10)
+        writer = ServiceBufferBlockWriter(stream)
+
+        writer.write_row(self._get_reader([(1, 'one')]))
+        writer.write_row(self._get_reader([(2, 'two')]))
+
+        self.assertEqual(writer.flush_block(), 10)
+        stream.write.assert_called_once()
+
+    def test_flush_block_write_error(self):
+        stream = mock.MagicMock()
+        stream.write = mock.Mock(side_effect=OSError())
+        writer = ServiceBufferBlockWriter(stream)
+
+        writer.write_row(self._get_reader([(1, 'one')]))
+
+        with self.assertRaises(IOError):
+            writer.flush_block()
+
+
+if __name__ == '__main__':
+    unittest.main()
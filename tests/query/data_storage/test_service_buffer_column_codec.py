@@ -0,0 +1,89 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+import struct
+
+from pymysql.constants import FIELD_TYPE
+
+from ossdbtoolsservice.query.data_storage import ServiceBufferColumnCodec, get_column_codecs
+from ossdbtoolsservice.query.contracts import DbColumn
+from ossdbtoolsservice.parsers import datatypes
+from ossdbtoolsservice.utils.constants import MYSQL_PROVIDER_NAME, PG_PROVIDER_NAME
+
+
+class TestServiceBufferColumnCodec(unittest.TestCase):
+
+    def _create_codec(self, data_type: str, provider: str = PG_PROVIDER_NAME) -> ServiceBufferColumnCodec:
+        column = DbColumn()
+        column.data_type = data_type
+        column.provider = provider
+        return ServiceBufferColumnCodec(column)
+
+    def test_fixed_width_column(self):
+        codec = self._create_codec(datatypes.DATATYPE_BIGINT)
+
+        self.assertTrue(codec.is_fixed_width)
+        self.assertEqual(codec.cell_size, 8)
+        self.assertFalse(codec.is_null_type)
+
+    def test_variable_width_column(self):
+        codec = self._create_codec(datatypes.DATATYPE_TEXT)
+
+        self.assertFalse(codec.is_fixed_width)
+        self.assertEqual(codec.decode(codec.encode('text')), 'text')
+
+    def test_null_type_column(self):
+        codec = self._create_codec(datatypes.DATATYPE_NULL)
+
+        self.assertTrue(codec.is_null_type)
+        self.assertFalse(codec.is_fixed_width)
+
+    def test_pack_column_matches_cell_converter(self):
+        codec = self._create_codec(datatypes.DATATYPE_INTEGER)
+
+        packed = codec.pack_column([1, 2, 3])
+
+        self.assertEqual(packed, b''.join(codec.encode(value) for value in [1, 2, 3]))
+
+    def test_pack_unpack_column(self):
+        codec = self._create_codec(datatypes.DATATYPE_DOUBLE)
+        buffer = b'prefix' + codec.pack_column([1.5, None, -2.25])
+
+        self.assertEqual(codec.unpack_column(buffer, len(b'prefix'), 3), (1.5, 0.0, -2.25))
+
+    def test_pack_column_bool(self):
+        codec = self._create_codec(datatypes.DATATYPE_BOOL)
+
+        self.assertEqual(codec.unpack_column(codec.pack_column([True, False]), 0, 2), (True, False))
+
+    def test_mysql_column(self):
+        codec = self._create_codec(FIELD_TYPE.LONGLONG, MYSQL_PROVIDER_NAME)
+
+        self.assertTrue(codec.is_fixed_width)
+        self.assertEqual(codec.pack_column([7]), struct.pack('q', 7))
+
+    def test_column_struct_cached(self):
+        codec = self._create_codec(datatypes.DATATYPE_INTEGER)
+
+        self.assertIs(codec._get_column_struct(10), codec._get_column_struct(10))
+        self.assertIsNot(codec._get_column_struct(10), codec._get_column_struct(11))
+
+    def test_get_column_codecs(self):
+        columns = []
+        for data_type in [datatypes.DATATYPE_INTEGER, datatypes.DATATYPE_TEXT]:
+            column = DbColumn()
+            column.data_type = data_type
+            column.provider = PG_PROVIDER_NAME
+            columns.append(column)
+
+        codecs = get_column_codecs(columns)
+
+        self.assertEqual([codec.column for codec in codecs], columns)
+        self.assertEqual([codec.is_fixed_width for codec in codecs], [True, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,7 @@ import unittest
 from unittest import mock
 
 import ossdbtoolsservice.query.data_storage.service_buffer_file_stream as stream
-from ossdbtoolsservice.query.data_storage import ServiceBufferFileStreamWriter, ServiceBufferFileStreamReader
+from ossdbtoolsservice.query.data_storage import ServiceBufferBlockWriter, ServiceBufferMemoryMappedReader
 
 
 class TestServiceBufferFileStream(unittest.TestCase):
@@ -28,7 +28,7 @@ class TestServiceBufferFileStream(unittest.TestCase):
         with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.io', new=io_mock):
             reader = stream.get_reader(self._file_name)
 
-            self.assertIsInstance(reader, ServiceBufferFileStreamReader)
+            self.assertIsInstance(reader, ServiceBufferMemoryMappedReader)
             io_mock.open.assert_called_once_with(self._file_name, 'rb')
 
     def test_get_writer(self):
@@ -37,9 +37,18 @@ class TestServiceBufferFileStream(unittest.TestCase):
         with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.io', new=io_mock):
             writer = stream.get_writer(self._file_name)
 
-            self.assertIsInstance(writer, ServiceBufferFileStreamWriter)
+            self.assertIsInstance(writer, ServiceBufferBlockWriter)
             io_mock.open.assert_called_once_with(self._file_name, 'wb')
 
+    def test_get_writer_for_append(self):
+        io_mock = mock.MagicMock()
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.io', new=io_mock):
+            writer = stream.get_writer(self._file_name, append=True)
+
+            self.assertIsInstance(writer, ServiceBufferBlockWriter)
+            io_mock.open.assert_called_once_with(self._file_name, 'r+b')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+from unittest import mock
+import io
+import os
+import struct
+import tempfile
+
+from ossdbtoolsservice.query.data_storage import ServiceBufferMemoryMappedReader
+from ossdbtoolsservice.query.data_storage.service_buffer_block import encode_block
+
+
+class TestServiceBufferMemoryMappedReader(unittest.TestCase):
+
+    def setUp(self):
+        self._first_block = encode_block(2, [[struct.pack('i', 1), struct.pack('i', 2)]])
+        self._second_block = encode_block(1, [[b'text']])
+
+        file_descriptor, self._file_name = tempfile.mkstemp()
+        os.close(file_descriptor)
+        self._append(self._first_block)
+
+        self._reader = ServiceBufferMemoryMappedReader(io.open(self._file_name, 'rb'))
+
+    def tearDown(self):
+        self._reader.close()
+        os.remove(self._file_name)
+
+    def _append(self, data: bytes):
+        with io.open(self._file_name, 'ab') as stream:
+            stream.write(data)
+
+    def test_stream_none(self):
+        with self.assertRaises(ValueError):
+            ServiceBufferMemoryMappedReader(None)
+
+    def test_stream_not_readable(self):
+        stream = mock.MagicMock()
+        stream.readable = mock.Mock(return_value=False)
+
+        with self.assertRaises(ValueError):
+            ServiceBufferMemoryMappedReader(stream)
+
+    def test_read_block(self):
+        block = self._reader.read_block(0, len(self._first_block))
+
+        self.assertEqual(block.row_count, 2)
+        self.assertEqual(bytes(block.get_bytes(1, 0)), struct.pack('i', 2))
+
+    def test_read_block_does_not_copy(self):
+        block = self._reader.read_block(0, len(self._first_block))
+
+        self.assertIsInstance(block.get_bytes(0, 0), memoryview)
+
+    def test_read_block_bytes(self):
+        self._append(self._second_block)
+
+        self.assertEqual(bytes(self._reader.read_block_bytes(len(self._first_block), len(self._second_block))), self._second_block)
+
+    def test_read_block_appended_after_mapping(self):
+        self._reader.read_block(0, len(self._first_block))
+        self._append(self._second_block)
+
+        block = self._reader.read_block(len(self._first_block), len(self._second_block))
+
+        self.assertEqual(block.row_count, 1)
+        self.assertEqual(bytes(block.get_bytes(0, 0)), b'text')
+
+    def test_read_block_past_end(self):
+        with self.assertRaises(IOError):
+            self._reader.read_block(0, len(self._first_block) + 1)
+
+    def test_read_block_from_empty_file(self):
+        with io.open(self._file_name, 'wb'):
+            pass
+
+        with ServiceBufferMemoryMappedReader(io.open(self._file_name, 'rb')) as reader:
+            with self.assertRaises(IOError):
+                reader.read_block(0, len(self._first_block))
+
+    def test_close_while_block_in_use(self):
+        block = self._reader.read_block(0, len(self._first_block))
+
+        self._reader.close()
+
+        self.assertEqual(bytes(block.get_bytes(0, 0)), struct.pack('i', 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
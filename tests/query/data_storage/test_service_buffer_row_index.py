@@ -0,0 +1,103 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import random
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.data_storage import ServiceBufferRowIndex
+
+
+class TestServiceBufferRowIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._index = ServiceBufferRowIndex()
+        self._index.extend(range(10))
+
+    def test_len(self):
+        self.assertEqual(len(self._index), 10)
+        self.assertEqual(len(ServiceBufferRowIndex()), 0)
+
+    def test_append(self):
+        self._index.append(20)
+
+        self.assertEqual(self._index[10], 20)
+        self.assertEqual(self._index[-1], 20)
+
+    def test_get_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self._index[10]
+
+    def test_set(self):
+        self._index[3] = 30
+
+        self.assertEqual(list(self._index), [0, 1, 2, 30, 4, 5, 6, 7, 8, 9])
+
+    def test_items_are_eight_byte_integers(self):
+        self.assertEqual(self._index._slots.itemsize, 8)
+
+    def test_delete_leaves_tombstone(self):
+        del self._index[3]
+        del self._index[3]
+
+        self.assertEqual(len(self._index), 8)
+        self.assertEqual(self._index._tombstones, [3, 4])
+        self.assertEqual(len(self._index._slots), 10)
+        self.assertEqual(self._index[3], 5)
+        self.assertEqual(list(self._index), [0, 1, 2, 5, 6, 7, 8, 9])
+
+    def test_set_after_delete(self):
+        del self._index[0]
+        self._index[0] = 10
+
+        self.assertEqual(list(self._index), [10, 2, 3, 4, 5, 6, 7, 8, 9])
+
+    def test_iterate_range(self):
+        del self._index[2]
+        del self._index[5]
+
+        self.assertEqual(list(self._index.iterate(1, 6)), [1, 3, 4, 5, 7])
+        self.assertEqual(list(self._index.iterate(3, 3)), [])
+
+    def test_tombstones_compacted(self):
+        with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_row_index.TOMBSTONE_COMPACTION_MIN_COUNT', new=3):
+            del self._index[0]
+            del self._index[0]
+            self.assertEqual(len(self._index._tombstones), 2)
+
+            del self._index[5]
+
+        self.assertEqual(self._index._tombstones, [])
+        self.assertEqual(list(self._index._slots), [2, 3, 4, 5, 6, 8, 9])
+        self.assertEqual(list(self._index), [2, 3, 4, 5, 6, 8, 9])
+
+    def test_matches_list(self):
+        random_generator = random.Random(0)
+        expected = list(range(2000))
+        self._index = ServiceBufferRowIndex()
+        self._index.extend(expected)
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_row_index.TOMBSTONE_COMPACTION_MIN_COUNT', new=50):
+            for step in range(1500):
+                row_id = random_generator.randrange(len(expected))
+
+                if step % 3 == 0:
+                    expected[row_id] = -step
+                    self._index[row_id] = -step
+                elif step % 7 == 0:
+                    expected.append(step)
+                    self._index.append(step)
+                else:
+                    del expected[row_id]
+                    del self._index[row_id]
+
+                self.assertEqual(self._index[row_id % len(expected)], expected[row_id % len(expected)])
+
+        self.assertEqual(list(self._index), expected)
+        self.assertEqual(list(self._index.iterate(100, 200)), expected[100:200])
+
+
+if __name__ == '__main__':
+    unittest.main()
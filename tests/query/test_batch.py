@@ -14,6 +14,7 @@ from ossdbtoolsservice.query.contracts import (SaveResultsRequestParams,
                                                SelectionData)
 from ossdbtoolsservice.query.file_storage_result_set import \
     FileStorageResultSet
+from ossdbtoolsservice.query.hybrid_result_set import HybridResultSet
 from ossdbtoolsservice.query.in_memory_result_set import InMemoryResultSet
 from tests.pgsmo_tests.utils import MockPGServerConnection
 
@@ -87,6 +88,37 @@ class TestBatch(unittest.TestCase):
 
         self.assertTrue(isinstance(result_set, FileStorageResultSet))
 
+    def test_create_result_set_with_compressed_buffer(self):
+        result_set = create_result_set(ResultSetStorageType.FILE_STORAGE, 1, 1, compress_result_buffers=True)
+        self.addCleanup(result_set.dispose)
+
+        self.assertTrue(result_set._is_compressed)
+
+    def test_create_result_set_with_type_hybrid(self):
+        result_set = create_result_set(ResultSetStorageType.HYBRID, 1, 1, memory_budget=100, memory_row_count=10)
+
+        self.assertTrue(isinstance(result_set, HybridResultSet))
+        self.assertEqual(result_set._memory_budget, 100)
+        self.assertEqual(result_set._memory_row_count, 10)
+
+    def test_create_result_set_with_events(self):
+        on_partially_loaded = mock.Mock()
+        self._batch_events = BatchEvents(on_result_set_partially_loaded=on_partially_loaded)
+        batch = self.create_batch_with(Batch, ResultSetStorageType.IN_MEMORY)
+
+        def read_result_to_end(cursor):
+            # The result set can be fetched from the batch while it is being read
+            self.assertIs(batch.result_set, self._result_set)
+
+        self._result_set.read_result_to_end = mock.Mock(side_effect=read_result_to_end)
+
+        with mock.patch('ossdbtoolsservice.query.batch.create_result_set', new=mock.Mock(return_value=self._result_set)) as create_result_set_mock:
+            batch.create_result_set(self._cursor)
+
+        events = create_result_set_mock.call_args[0][3]
+        self.assertIs(events._on_result_set_partially_loaded, on_partially_loaded)
+        self._result_set.read_result_to_end.assert_called_once_with(self._cursor)
+
     def test_create_batch_for_select(self):
 
         batch_text = ''' Select
@@ -134,6 +166,18 @@ class TestBatch(unittest.TestCase):
         self.assertEqual(expected_subset, subset)
         self._result_set.get_subset.assert_called_once_with(0, 10)
 
+    def test_dispose(self):
+        batch = self.create_and_execute_batch(Batch)
+
+        batch.dispose()
+
+        self._result_set.dispose.assert_called_once()
+
+    def test_dispose_before_execution(self):
+        batch = self.create_batch_with(Batch, ResultSetStorageType.IN_MEMORY)
+
+        batch.dispose()
+
     def test_batch_calls_close_on_cursor_when_executed(self):
         self.create_and_execute_batch(Batch)
 
@@ -152,9 +196,12 @@ class TestBatch(unittest.TestCase):
         result_set_save_as_mock = mock.MagicMock()
         batch._result_set.save_as = result_set_save_as_mock
 
-        batch.save_as(params, file_factory, on_success, on_error)
+        progress = mock.MagicMock()
+        executor = mock.MagicMock()
+
+        batch.save_as(params, file_factory, on_success, on_error, progress, executor)
 
-        result_set_save_as_mock.assert_called_once_with(params, file_factory, on_success, on_error)
+        result_set_save_as_mock.assert_called_once_with(params, file_factory, on_success, on_error, progress, executor)
 
     def test_save_as_with_invalid_batch_index(self):
         batch = self.create_and_execute_batch(Batch)
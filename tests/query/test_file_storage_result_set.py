@@ -3,6 +3,10 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import csv
+import io
+import os
+import tempfile
 import unittest
 from unittest import mock
 from typing import Callable, List
@@ -10,7 +14,14 @@ from typing import Callable, List
 import tests.utils as utils
 from ossdbtoolsservice.query.result_set import ResultSetEvents
 from ossdbtoolsservice.query.file_storage_result_set import FileStorageResultSet
-from ossdbtoolsservice.query.contracts import DbCellValue, SaveResultsRequestParams
+from ossdbtoolsservice.query.result_set_page_cache import ResultSetPageCache
+from ossdbtoolsservice.query.save_as_fan_out import SaveAsTarget
+from ossdbtoolsservice.query.contracts import DbCellValue, DbColumn, SaveResultsRequestParams
+from ossdbtoolsservice.query.data_storage import SaveAsCsvFileStreamFactory, SaveAsNdjsonFileStreamFactory, ServiceBufferBlockWriter
+from ossdbtoolsservice.query.data_storage.service_buffer_block import decompress_block
+from ossdbtoolsservice.query_execution.contracts import SaveResultsAsCsvRequestParams
+from ossdbtoolsservice.parsers import datatypes
+from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
 
 
 class TestFileStorageResultSet(unittest.TestCase):
@@ -35,20 +46,31 @@ class TestFileStorageResultSet(unittest.TestCase):
             with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.get_writer', new=mock.Mock(return_value=self._writer)):
                 with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.get_reader', new=mock.Mock(return_value=self._reader)):
                     with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=[])):
-                        self._result_set = FileStorageResultSet(self._id, self._batch_id, self._events)
+                        self._result_set = FileStorageResultSet(self._id, self._batch_id, self._events, page_cache=ResultSetPageCache())
                         test()
 
+    def set_up_blocks(self):
+        # Three rows written in two blocks, the first one holding two rows
+        self._result_set._has_been_read = True
+        self._result_set._is_complete = True
+        self._result_set._block_offsets = [0, 20]
+        self._result_set._block_first_rows = [0, 2]
+        self._result_set._written_row_count = 3
+        self._result_set._total_bytes_written = 30
+        self._result_set._row_locations.extend([0, 1, 2])
+
     def test_construction(self):
         def validate():
             self.assertEqual(self._result_set._total_bytes_written, 0)
             self.assertEqual(self._result_set._has_been_read, False)
             self.assertEqual(self._result_set._output_file_name, self._file)
-            self.assertEqual(len(self._result_set._file_offsets), 0)
+            self.assertEqual(len(self._result_set._row_locations), 0)
+            self.assertEqual(len(self._result_set._block_offsets), 0)
 
         self.execute_with_patch(validate)
 
     def test_row_count(self):
-        self.execute_with_patch(lambda: self.assertEqual(len(self._result_set._file_offsets), self._result_set.row_count))
+        self.execute_with_patch(lambda: self.assertEqual(len(self._result_set._row_locations), self._result_set.row_count))
 
     def test_get_subset_when_has_read_false(self):
         def test():
@@ -78,25 +100,51 @@ class TestFileStorageResultSet(unittest.TestCase):
 
     def test_get_subset_valid(self):
         def test():
-            self._result_set._has_been_read = True
-            self._result_set._file_offsets = [5, 6, 3]
+            self.set_up_blocks()
 
             subset = self._result_set.get_subset(0, 2)
 
             self.assertEqual(subset.row_count, 2)
             self.assertEqual(subset.rows[0], self._row)
             self.assertEqual(subset.rows[1], self._row)
-            self.assertEqual(self._reader.read_row.call_count, 2)
 
-            call_args = self._reader.read_row.call_args_list
+            # Both rows are in the first block, so it should only be read once
+            self._reader.read_block.assert_called_once_with(0, 20)
+
+            call_args = self._reader.block.get_row.call_args_list
+
+            self.assertEqual(call_args[0][0], (0, 0, self._result_set._get_codecs()))
+            self.assertEqual(call_args[1][0], (1, 1, self._result_set._get_codecs()))
+
+        self.execute_with_patch(test)
+
+    def test_get_subset_across_blocks(self):
+        def test():
+            self.set_up_blocks()
+
+            subset = self._result_set.get_subset(1, 3)
+
+            self.assertEqual(subset.row_count, 2)
+
+            call_args = self._reader.read_block.call_args_list
+            self.assertEqual(len(call_args), 2)
+            self.assertEqual(call_args[0][0], (0, 20))
+            self.assertEqual(call_args[1][0], (20, 10))
+
+            call_args = self._reader.block.get_row.call_args_list
+            self.assertEqual(call_args[0][0], (1, 1, self._result_set._get_codecs()))
+            self.assertEqual(call_args[1][0], (0, 2, self._result_set._get_codecs()))
+
+        self.execute_with_patch(test)
+
+    def test_get_subset_returns_rows_read_so_far(self):
+        def test():
+            self.set_up_blocks()
+            self._result_set._is_complete = False
 
-            self.assertEqual(call_args[0][0][0], self._result_set._file_offsets[0])
-            self.assertEqual(call_args[0][0][1], 0)
-            self.assertEqual(call_args[0][0][2], self._result_set.columns_info)
+            subset = self._result_set.get_subset(1, 10)
 
-            self.assertEqual(call_args[1][0][0], self._result_set._file_offsets[1])
-            self.assertEqual(call_args[1][0][1], 1)
-            self.assertEqual(call_args[1][0][2], self._result_set.columns_info)
+            self.assertEqual(subset.row_count, 2)
 
         self.execute_with_patch(test)
 
@@ -109,8 +157,10 @@ class TestFileStorageResultSet(unittest.TestCase):
             self._writer.seek.assert_called_once_with(10)
             self.assertEqual(self._result_set._total_bytes_written, self._bytes_to_write + 10)
             self._writer.write_row.assert_called_once()
+            self._writer.flush_block.assert_called_once()
 
-            self.assertEqual(self._result_set._file_offsets[0], 10)
+            self.assertEqual(self._result_set._block_offsets, [10])
+            self.assertEqual(list(self._result_set._row_locations), [0])
 
         self.execute_with_patch(test)
 
@@ -124,31 +174,31 @@ class TestFileStorageResultSet(unittest.TestCase):
 
     def test_remove_row(self):
         def test():
-            self._result_set._has_been_read = True
-            self._result_set._file_offsets = [5, 6, 3]
+            self.set_up_blocks()
 
             self._result_set.remove_row(1)
 
-            self.assertEqual(len(self._result_set._file_offsets), 2)
-            self.assertEqual(self._result_set._file_offsets[0], 5)
-            self.assertEqual(self._result_set._file_offsets[1], 3)
+            self.assertEqual(self._result_set.row_count, 2)
+            self.assertEqual(list(self._result_set._row_locations), [0, 2])
 
         self.execute_with_patch(test)
 
     def test_update_row(self):
         def test():
-            self._result_set._has_been_read = True
-            self._result_set._total_bytes_written = 10
-
-            self._result_set._file_offsets = [5, 6, 3]
+            self.set_up_blocks()
 
             self._result_set.update_row(1, self._cursor)
 
-            self._writer.seek.assert_called_once_with(10)
-            self.assertEqual(self._result_set._total_bytes_written, self._bytes_to_write + 10)
+            self._writer.seek.assert_called_once_with(30)
+            self.assertEqual(self._result_set._total_bytes_written, self._bytes_to_write + 30)
             self._writer.write_row.assert_called_once()
 
-            self.assertEqual(self._result_set._file_offsets[1], 10)
+            self.assertEqual(self._result_set._block_offsets[-1], 30)
+            self.assertEqual(list(self._result_set._row_locations), [0, 3, 2])
+
+            self._result_set.get_row(1)
+            self._reader.read_block.assert_called_once_with(30, self._bytes_to_write)
+            self.assertEqual(self._reader.block.get_row.call_args[0], (0, 1, self._result_set._get_codecs()))
 
         self.execute_with_patch(test)
 
@@ -171,20 +221,14 @@ class TestFileStorageResultSet(unittest.TestCase):
 
     def test_get_row(self):
         def test():
-            self._result_set._has_been_read = True
-            self._result_set._file_offsets = [5, 6, 3]
+            self.set_up_blocks()
 
-            row = self._result_set.get_row(1)
+            row = self._result_set.get_row(2)
 
             self.assertEqual(row, self._row)
 
-            self._reader.read_row.assert_called_once()
-
-            call_args = self._reader.read_row.call_args_list
-
-            self.assertEqual(call_args[0][0][0], self._result_set._file_offsets[1])
-            self.assertEqual(call_args[0][0][1], 1)
-            self.assertEqual(call_args[0][0][2], self._result_set.columns_info)
+            self._reader.read_block.assert_called_once_with(20, 10)
+            self._reader.block.get_row.assert_called_once_with(0, 2, self._result_set._get_codecs())
 
         self.execute_with_patch(test)
 
@@ -202,10 +246,65 @@ class TestFileStorageResultSet(unittest.TestCase):
 
             self.assertTrue(self._result_set._has_been_read)
 
-            self.assertEqual(len(self._result_set._file_offsets), 2)
-            self.assertEqual(self._result_set._file_offsets[1], 10)
+            self.assertEqual(self._result_set.row_count, 2)
+            self.assertEqual(list(self._result_set._row_locations), [0, 1])
 
+            # Both rows fit in a single block
             self.assertEqual(self._writer.write_row.call_count, 2)
+            self._writer.flush_block.assert_called_once()
+            self.assertEqual(self._result_set._block_offsets, [0])
+            self.assertEqual(self._result_set._total_bytes_written, self._bytes_to_write)
+
+        self.execute_with_patch(test)
+
+    def test_read_result_to_end_with_full_blocks(self):
+        def test():
+            self._writer.max_row_count = 1
+            self._result_set.read_result_to_end(self._cursor)
+
+            self.assertEqual(self._result_set.row_count, 2)
+            self.assertEqual(self._writer.flush_block.call_count, 2)
+            self.assertEqual(self._result_set._block_offsets, [0, self._bytes_to_write])
+            self.assertEqual(self._result_set._block_first_rows, [0, 1])
+
+        self.execute_with_patch(test)
+
+    def test_read_result_to_end_is_complete(self):
+        def test():
+            self.assertFalse(self._result_set.result_set_summary.complete)
+
+            self._result_set.read_result_to_end(self._cursor)
+
+            self.assertTrue(self._result_set.result_set_summary.complete)
+
+        self.execute_with_patch(test)
+
+    def test_read_result_to_end_reports_first_rows(self):
+        row_counts = []
+        self._events = ResultSetEvents(on_result_set_partially_loaded=lambda result_set: row_counts.append(result_set.row_count))
+
+        def test():
+            self._result_set.read_result_to_end(self._cursor)
+
+            # The first row is written and reported right away, the next one waits for the update interval
+            self.assertEqual(row_counts, [1])
+            self.assertEqual(self._writer.flush_block.call_count, 2)
+            self.assertEqual(self._result_set._block_first_rows, [0, 1])
+            self.assertEqual(self._result_set.row_count, 2)
+
+        self.execute_with_patch(test)
+
+    def test_read_result_to_end_reports_rows_periodically(self):
+        on_partially_loaded = mock.Mock()
+        self._events = ResultSetEvents(on_result_set_partially_loaded=on_partially_loaded)
+
+        def test():
+            with mock.patch.object(FileStorageResultSet, 'RESULT_SET_UPDATE_INTERVAL', new=0):
+                self._result_set.read_result_to_end(self._cursor)
+
+            self.assertEqual(on_partially_loaded.call_count, 2)
+            on_partially_loaded.assert_called_with(self._result_set)
+            self.assertEqual(self._writer.flush_block.call_count, 2)
 
         self.execute_with_patch(test)
 
@@ -225,21 +324,213 @@ class TestFileStorageResultSet(unittest.TestCase):
 
             on_success = mock.MagicMock()
 
-            self._result_set._has_been_read = True
-            self._result_set._file_offsets = [1]
+            self.set_up_blocks()
 
             self._result_set.save_as(params, mock_file_factory, on_success, None)
+            self._result_set._save_as_threads[params.file_path].join()
 
             mock_file_factory.get_writer.assert_called_once_with(params.file_path)
 
-            mock_reader.read_row.assert_called_once_with(self._result_set._file_offsets[0], 0, self._result_set.columns_info)
-            mock_writer.write_row.assert_called_once_with(self._row, self._result_set.columns_info)
+            # All three rows are saved, reading each of the two blocks once
+            self.assertEqual(mock_reader.read_block.call_count, 2)
+            self.assertEqual(mock_reader.block.get_row.call_count, 3)
+            self.assertEqual(mock_writer.write_row.call_count, 3)
+            mock_writer.write_row.assert_called_with(self._row, self._result_set.columns_info)
 
             mock_writer.complete_write.assert_called_once()
             on_success.assert_called_once()
 
         self.execute_with_patch(test)
 
+    def test_reader_is_reused_across_reads(self):
+        def test():
+            self.set_up_blocks()
+
+            get_reader_path = 'ossdbtoolsservice.query.data_storage.service_buffer_file_stream.get_reader'
+            with mock.patch(get_reader_path, new=mock.Mock(return_value=self._reader)) as get_reader:
+                self._result_set.get_subset(0, 3)
+                self._result_set.get_row(2)
+
+                get_reader.assert_called_once_with(self._file)
+
+        self.execute_with_patch(test)
+
+    def test_dispose(self):
+        def test():
+            self.set_up_blocks()
+            self._result_set.get_subset(0, 1)
+
+            with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.delete_file', new=mock.Mock()) as delete_file:
+                self._result_set.dispose()
+
+                self._reader.close.assert_called_once()
+                delete_file.assert_called_once_with(self._file)
+
+        self.execute_with_patch(test)
+
+    def test_dispose_when_file_in_use(self):
+        def test():
+            with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.delete_file', new=mock.Mock(side_effect=OSError())):
+                self._result_set.dispose()
+
+            self._reader.close.assert_not_called()
+
+        self.execute_with_patch(test)
+
+
+class TestCompressedFileStorageResultSet(unittest.TestCase):
+
+    def setUp(self):
+        self._rows = [(index, 'text ' * 20) for index in range(5)]
+        self._columns_info = []
+
+        for data_type in [datatypes.DATATYPE_INTEGER, datatypes.DATATYPE_TEXT]:
+            column = DbColumn()
+            column.data_type = data_type
+            column.provider = PG_PROVIDER_NAME
+            self._columns_info.append(column)
+
+        self._page_cache = ResultSetPageCache()
+        self._result_set = FileStorageResultSet(1, 1, is_compressed=True, page_cache=self._page_cache)
+        self.addCleanup(self._result_set.dispose)
+
+        patch = mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=self._columns_info))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        # Blocks of two rows
+        with mock.patch('ossdbtoolsservice.query.data_storage.service_buffer_file_stream.get_writer',
+                        new=lambda file_name, append=False, is_compressed=False: ServiceBufferBlockWriter(
+                            io.open(file_name, 'r+b' if append else 'wb'), max_row_count=2, is_compressed=is_compressed)):
+            self._result_set.read_result_to_end(utils.MockCursor(self._rows))
+
+    def test_blocks_compressed(self):
+        self.assertEqual(len(self._result_set._block_offsets), 3)
+        self.assertLess(self._result_set._total_bytes_written, sum(len(row[1]) for row in self._rows))
+
+    def test_get_subset(self):
+        subset = self._result_set.get_subset(0, 5)
+
+        self.assertEqual([tuple(cell.raw_object for cell in row) for row in subset.rows], self._rows)
+
+    def test_blocks_read_once_for_consecutive_pages(self):
+        with mock.patch('ossdbtoolsservice.query.file_storage_result_set.decompress_block', side_effect=decompress_block) as decompress:
+            self._result_set.get_subset(0, 1)
+            self._result_set.get_subset(1, 3)
+            self._result_set.get_row(2)
+
+        # The pages span the first two blocks
+        self.assertEqual(decompress.call_count, 2)
+
+    def test_update_row(self):
+        self._result_set.update_row(1, utils.MockCursor([(10, 'updated')]))
+
+        self.assertEqual([cell.raw_object for cell in self._result_set.get_row(1)], [10, 'updated'])
+        self.assertEqual([cell.raw_object for cell in self._result_set.get_row(2)], list(self._rows[2]))
+
+    def test_dispose_clears_cache(self):
+        with mock.patch('ossdbtoolsservice.query.file_storage_result_set.PAGE_ROW_COUNT', new=2):
+            self._result_set.get_subset(0, 5)
+
+        self._result_set.dispose()
+
+        self.assertEqual(len(self._result_set._block_cache), 0)
+        self.assertEqual(self._page_cache.size, 0)
+
+    def test_get_subset_from_page_cache(self):
+        with mock.patch('ossdbtoolsservice.query.file_storage_result_set.PAGE_ROW_COUNT', new=2):
+            first_subset = self._result_set.get_subset(1, 4)
+
+            with mock.patch.object(self._result_set, '_iterate_rows') as iterate_rows:
+                second_subset = self._result_set.get_subset(0, 4)
+
+        # Rows 0 to 3 fill two whole pages that are cached by the first subset
+        iterate_rows.assert_not_called()
+        self.assertEqual(self._page_cache.miss_count, 2)
+        self.assertEqual(self._page_cache.hit_count, 2)
+        self.assertIs(second_subset.rows[1], first_subset.rows[0])
+        self.assertEqual([row[0].raw_object for row in second_subset.rows], [0, 1, 2, 3])
+
+    def test_last_page_not_cached(self):
+        with mock.patch('ossdbtoolsservice.query.file_storage_result_set.PAGE_ROW_COUNT', new=2):
+            subset = self._result_set.get_subset(4, 5)
+
+        self.assertEqual(subset.rows[0][0].raw_object, 4)
+        self.assertEqual(self._page_cache.size, 0)
+
+    def test_page_cache_invalidated_on_edit(self):
+        with mock.patch('ossdbtoolsservice.query.file_storage_result_set.PAGE_ROW_COUNT', new=2):
+            self._result_set.get_subset(0, 4)
+            self._result_set.update_row(2, utils.MockCursor([(20, 'updated')]))
+            self.assertEqual([row[0].raw_object for row in self._result_set.get_subset(0, 4).rows], [0, 1, 20, 3])
+
+            self._result_set.remove_row(0)
+            self.assertEqual([row[0].raw_object for row in self._result_set.get_subset(0, 4).rows], [1, 20, 3, 4])
+            self.assertEqual([row[0].row_id for row in self._result_set.get_subset(0, 4).rows], [0, 1, 2, 3])
+
+            self._result_set.add_row(utils.MockCursor([(5, 'added')]))
+            self.assertEqual([row[0].raw_object for row in self._result_set.get_subset(0, 5).rows], [1, 20, 3, 4, 5])
+
+    def test_save_as_csv(self):
+        self._result_set.update_row(1, utils.MockCursor([(10, None)]))
+        self._result_set.remove_row(3)
+
+        params = SaveResultsAsCsvRequestParams()
+        params.include_headers = False
+        success_file_sizes = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'results.csv')
+            on_success = mock.Mock(side_effect=lambda: success_file_sizes.append(os.path.getsize(file_path)))
+            self._result_set.do_save_as(file_path, 0, 4, SaveAsCsvFileStreamFactory(params), on_success, None)
+
+            with io.open(file_path, newline='') as file:
+                saved_rows = list(csv.reader(file))
+
+            # The success is reported once the file is flushed and closed
+            self.assertEqual(success_file_sizes, [os.path.getsize(file_path)])
+
+        # The rows are saved from the blocks with the display values of their cells
+        expected_rows = [[cell.display_value for cell in row] for row in self._result_set.get_subset(0, 4).rows]
+        self.assertEqual(saved_rows, expected_rows)
+        self.assertEqual([row[0] for row in saved_rows], ['0', '10', '2', '4'])
+        self.assertEqual(saved_rows[1][1], 'NULL')
+        on_success.assert_called_once()
+
+    def test_save_as_multi(self):
+        params = SaveResultsRequestParams()
+        on_complete = mock.Mock()
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_params = SaveResultsAsCsvRequestParams()
+            csv_params.include_headers = False
+            targets = [
+                SaveAsTarget('csv', os.path.join(directory, 'results.csv'), SaveAsCsvFileStreamFactory(csv_params)),
+                SaveAsTarget('ndjson', os.path.join(directory, 'results.ndjson'), SaveAsNdjsonFileStreamFactory(SaveResultsRequestParams()))
+            ]
+
+            with mock.patch('ossdbtoolsservice.query.file_storage_result_set.decompress_block', side_effect=decompress_block) as decompress:
+                self._result_set.save_as_multi(params, targets, None, on_complete)
+
+                for thread in set(self._result_set._save_as_threads.values()):
+                    thread.join()
+
+            # Both files are written from a single scan, which decompresses each block once
+            self.assertEqual(decompress.call_count, 3)
+            on_complete.assert_called_once_with({})
+
+            with io.open(targets[0].file_path, newline='') as file:
+                self.assertEqual([int(row[0]) for row in csv.reader(file)], [row[0] for row in self._rows])
+
+            with io.open(targets[1].file_path) as file:
+                self.assertEqual(len(file.readlines()), len(self._rows))
+
+    def test_save_as_multi_same_file_twice(self):
+        targets = [SaveAsTarget('csv', 'results.csv', mock.MagicMock()), SaveAsTarget('json', 'results.csv', mock.MagicMock())]
+
+        with self.assertRaises(ValueError):
+            self._result_set.save_as_multi(SaveResultsRequestParams(), targets, None, None)
+
 
 class MockType:
     def __enter__(cls):
@@ -251,14 +542,32 @@ class MockType:
 
 class MockReader(MockType):
     def __init__(self, row: List[DbCellValue]) -> None:
-        self.read_row = mock.Mock(return_value=row)
+        self.block = mock.MagicMock()
+        self.block.get_row = mock.Mock(return_value=row)
+        self.read_block = mock.Mock(return_value=self.block)
+        self.close = mock.MagicMock()
 
 
 class MockWriter(MockType):
-    def __init__(self, bytes_written: int) -> None:
-        self.write_row = mock.Mock(return_value=bytes_written)
+    def __init__(self, bytes_written: int, max_row_count: int = 1000) -> None:
+        self.max_row_count = max_row_count
+        self.pending_row_count = 0
+        self.write_row = mock.Mock(side_effect=self._write_row)
+        self.flush_block = mock.Mock(side_effect=self._flush_block)
         self.seek = mock.MagicMock()
         self.complete_write = mock.MagicMock()
+        self._bytes_written = bytes_written
+
+    @property
+    def is_block_full(self) -> bool:
+        return self.pending_row_count >= self.max_row_count
+
+    def _write_row(self, *args):
+        self.pending_row_count += 1
+
+    def _flush_block(self):
+        self.pending_row_count = 0
+        return self._bytes_written
 
 
 if __name__ == '__main__':
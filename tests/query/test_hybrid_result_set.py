@@ -0,0 +1,134 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+from unittest import mock
+
+import tests.utils as utils
+from ossdbtoolsservice.query.result_set import ResultSetEvents
+from ossdbtoolsservice.query.file_storage_result_set import FileStorageResultSet
+from ossdbtoolsservice.query.hybrid_result_set import HybridResultSet, estimate_row_size
+from ossdbtoolsservice.query.contracts import DbColumn
+from ossdbtoolsservice.parsers import datatypes
+from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
+
+
+class TestHybridResultSet(unittest.TestCase):
+
+    def setUp(self):
+        self._rows = [(index, f'row {index}') for index in range(5)]
+        self._columns_info = []
+        self._set_columns([datatypes.DATATYPE_INTEGER, datatypes.DATATYPE_TEXT])
+
+        self._patch = mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=self._columns_info))
+        self._patch.start()
+
+    def tearDown(self):
+        self._patch.stop()
+
+    def _set_columns(self, data_types):
+        self._columns_info.clear()
+
+        for data_type in data_types:
+            column = DbColumn()
+            column.data_type = data_type
+            column.provider = PG_PROVIDER_NAME
+            self._columns_info.append(column)
+
+    def _read(self, memory_budget: int, events: ResultSetEvents = None, fetch_batch_size: int = 2, memory_row_count: int = 1000) -> HybridResultSet:
+        result_set = HybridResultSet(1, 1, events, fetch_batch_size, memory_budget, memory_row_count=memory_row_count)
+        result_set.read_result_to_end(utils.MockCursor(self._rows))
+        self.addCleanup(result_set.dispose)
+        return result_set
+
+    def _get_values(self, result_set: HybridResultSet):
+        return [tuple(cell.raw_object for cell in row) for row in result_set.get_subset(0, result_set.row_count).rows]
+
+    def test_rows_within_budget_kept_in_memory(self):
+        result_set = self._read(memory_budget=1024 * 1024)
+
+        self.assertFalse(result_set.is_spilled)
+        self.assertTrue(result_set._is_complete)
+        self.assertEqual(result_set.row_count, len(self._rows))
+        self.assertEqual(result_set.columns_info, self._columns_info)
+        self.assertEqual(self._get_values(result_set), self._rows)
+
+    def test_rows_over_budget_spilled_to_file(self):
+        # The budget holds two rows, the third one moves them and the rest of the cursor to a file
+        result_set = self._read(memory_budget=2 * estimate_row_size(self._rows[0]))
+
+        self.assertTrue(result_set.is_spilled)
+        self.assertTrue(result_set._is_complete)
+        self.assertEqual(result_set.row_count, len(self._rows))
+        self.assertEqual(result_set.columns_info, self._columns_info)
+        self.assertEqual(self._get_values(result_set), self._rows)
+        self.assertEqual([cell.raw_object for cell in result_set.get_row(4)], [4, 'row 4'])
+
+    def test_rows_over_row_count_spilled_to_file(self):
+        result_set = self._read(memory_budget=1024 * 1024, memory_row_count=3)
+
+        self.assertTrue(result_set.is_spilled)
+        self.assertEqual(self._get_values(result_set), self._rows)
+
+    def test_rows_in_memory_displayed_as_file_storage_rows(self):
+        # Values of the driver are displayed as the file storage displays them, NULL cells included
+        self._set_columns([datatypes.DATATYPE_BYTEA, datatypes.DATATYPE_JSON, datatypes.DATATYPE_TEXT, datatypes.DATATYPE_INTEGER])
+        self._rows = [(memoryview(b'ab'), {'a': 1}, None, None), (memoryview(b''), [1, 'x'], 'text', 7)]
+
+        result_set = self._read(memory_budget=1024 * 1024)
+        file_storage = FileStorageResultSet(1, 1)
+        file_storage.read_result_to_end(utils.MockCursor(self._rows))
+        self.addCleanup(file_storage.dispose)
+
+        self.assertFalse(result_set.is_spilled)
+        for row_id in range(len(self._rows)):
+            hybrid_row = result_set.get_row(row_id)
+            file_row = file_storage.get_row(row_id)
+            self.assertEqual([cell.display_value for cell in hybrid_row], [cell.display_value for cell in file_row])
+            self.assertEqual([cell.is_null for cell in hybrid_row], [cell.is_null for cell in file_row])
+            self.assertEqual([cell.raw_object for cell in hybrid_row], [cell.raw_object for cell in file_row])
+
+        self.assertEqual(result_set.get_row(0)[2].display_value, 'NULL')
+
+    def test_row_count_never_goes_back_when_spilled(self):
+        # The rows in memory are served until the file holds as many, so the reported row counts only grow
+        self._rows = [(index, f'row {index}') for index in range(20)]
+        row_counts = []
+        events = ResultSetEvents(on_result_set_partially_loaded=lambda result_set: row_counts.append(result_set.row_count))
+
+        with mock.patch.object(HybridResultSet, 'RESULT_SET_UPDATE_INTERVAL', new=0), \
+                mock.patch.object(FileStorageResultSet, 'RESULT_SET_UPDATE_INTERVAL', new=0):
+            result_set = self._read(memory_budget=1024 * 1024, events=events, memory_row_count=10)
+
+        self.assertTrue(result_set.is_spilled)
+        self.assertEqual(row_counts, sorted(row_counts))
+        self.assertGreater(len(row_counts), 10)
+        self.assertEqual(self._get_values(result_set), self._rows)
+
+    def test_partially_loaded_reported_for_hybrid_result_set(self):
+        on_partially_loaded = mock.Mock()
+
+        with mock.patch.object(HybridResultSet, 'RESULT_SET_UPDATE_INTERVAL', new=0):
+            result_set = self._read(memory_budget=0, events=ResultSetEvents(on_result_set_partially_loaded=on_partially_loaded))
+
+        self.assertTrue(result_set.is_spilled)
+        on_partially_loaded.assert_called_with(result_set)
+
+    def test_dispose_spilled_result_set(self):
+        result_set = self._read(memory_budget=0)
+        file_storage = result_set._storage
+
+        with mock.patch.object(file_storage, 'dispose') as dispose:
+            result_set.dispose()
+
+        dispose.assert_called_once()
+
+    def test_estimate_row_size(self):
+        self.assertGreater(estimate_row_size((1, 'x' * 100)), estimate_row_size((1, 'x')))
+        self.assertGreater(estimate_row_size((b'x' * 100,)), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
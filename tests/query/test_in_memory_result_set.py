@@ -3,13 +3,17 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
+import tempfile
 import unittest
 from unittest import mock
 
 import tests.utils as utils
+from ossdbtoolsservice.hosting.executors import ExecutorPool, WorkItem
 from ossdbtoolsservice.query.result_set import ResultSetEvents
 from ossdbtoolsservice.query.in_memory_result_set import InMemoryResultSet
 from ossdbtoolsservice.query.contracts import SaveResultsRequestParams
+from ossdbtoolsservice.query.save_as_progress import SaveAsProgress
 from tests.query.test_file_storage_result_set import MockWriter
 
 
@@ -111,11 +115,12 @@ class TestInMemoryResultSet(unittest.TestCase):
 
         on_success = mock.MagicMock()
 
-        self._result_set._has_been_read = True
+        self._result_set._is_complete = True
         self._result_set.rows.append(self._first_row)
         self._result_set.get_row = mock.Mock(return_value=self._first_row)
 
         self._result_set.save_as(params, mock_file_factory, on_success, None)
+        self._result_set._save_as_threads[params.file_path].join()
 
         mock_file_factory.get_writer.assert_called_once_with(params.file_path)
 
@@ -124,6 +129,97 @@ class TestInMemoryResultSet(unittest.TestCase):
         mock_writer.complete_write.assert_called_once()
         on_success.assert_called_once()
 
+    def test_save_as_on_executor(self):
+        params = SaveResultsRequestParams()
+        params.file_path = 'somepath'
+
+        mock_writer = MockWriter(10)
+
+        mock_file_factory = mock.MagicMock()
+        mock_file_factory.get_writer = mock.Mock(return_value=mock_writer)
+
+        on_success = mock.MagicMock()
+        executor = ExecutorPool('save_as', 1)
+
+        self._result_set._is_complete = True
+        self._result_set.rows.append(self._first_row)
+
+        self._result_set.save_as(params, mock_file_factory, on_success, None, executor=executor)
+        work_item = self._result_set._save_as_threads[params.file_path]
+        self.assertIsInstance(work_item, WorkItem)
+        work_item.join()
+
+        # The save should have run on the executor
+        mock_writer.write_row.assert_called_once()
+        on_success.assert_called_once()
+        self.assertEqual(executor.metrics.completed_count, 1)
+
+        executor.shutdown(wait=True)
+
+    def test_save_as_failing_to_close_file(self):
+        params = SaveResultsRequestParams()
+        params.file_path = 'somepath'
+
+        # The rows are written, but flushing them as the file is closed fails
+        class FailingCloseWriter(MockWriter):
+            def __exit__(self, typ, value, tb):
+                raise IOError('Disk full')
+
+        mock_writer = FailingCloseWriter(10)
+
+        mock_file_factory = mock.MagicMock()
+        mock_file_factory.get_writer = mock.Mock(return_value=mock_writer)
+
+        on_success = mock.MagicMock()
+        on_failure = mock.MagicMock()
+
+        self._result_set._is_complete = True
+        self._result_set.rows.append(self._first_row)
+
+        self._result_set.save_as(params, mock_file_factory, on_success, on_failure)
+        self._result_set._save_as_threads[params.file_path].join()
+
+        # The request is answered once, with the failure
+        mock_writer.complete_write.assert_called_once()
+        on_success.assert_not_called()
+        on_failure.assert_called_once_with('Disk full')
+
+    def test_canceled_save_as_removes_file(self):
+
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            file_path = file.name
+
+        params = SaveResultsRequestParams()
+        params.file_path = file_path
+
+        progress = SaveAsProgress()
+
+        # The save is canceled while the first row is written
+        mock_writer = MockWriter(10)
+        mock_writer.write_row = mock.Mock(side_effect=lambda row, columns: progress.cancel())
+
+        mock_file_factory = mock.MagicMock()
+        mock_file_factory.get_writer = mock.Mock(return_value=mock_writer)
+
+        on_success = mock.MagicMock()
+        on_failure = mock.MagicMock()
+
+        self._result_set._is_complete = True
+        self._result_set.rows.extend([self._first_row, self._second_row])
+
+        self._result_set.save_as(params, mock_file_factory, on_success, on_failure, progress)
+        self._result_set._save_as_threads[file_path].join()
+
+        mock_writer.write_row.assert_called_once()
+        mock_writer.complete_write.assert_not_called()
+        on_success.assert_not_called()
+        on_failure.assert_called_once_with('The save was canceled')
+
+        self.assertFalse(os.path.exists(file_path))
+        self.assertTrue(progress.is_complete)
+        self.assertEqual(progress.error_message, 'The save was canceled')
+        self.assertEqual(progress.rows_written, 0)
+
 
 if __name__ == '__main__':
     unittest.main()
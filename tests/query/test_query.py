@@ -203,6 +203,22 @@ select * from t1;'''
         self.assertEqual(expected_subset, subset)
         mock_batch.get_subset.assert_called_once_with(0, 10)
 
+    def test_query_creates_batches_with_fetch_batch_size(self):
+        """Test that the fetch batch size of the execution settings is given to the batches"""
+        query = Query(self.query_uri, self.statement_str, QueryExecutionSettings(ExecutionPlanOptions(), ResultSetStorageType.FILE_STORAGE, 10), QueryEvents())
+
+        for batch in query.batches:
+            self.assertEqual(batch._fetch_batch_size, 10)
+
+    def test_dispose(self):
+        mock_batches = [mock.MagicMock(), mock.MagicMock()]
+        self.query._batches = mock_batches
+
+        self.query.dispose()
+
+        for mock_batch in mock_batches:
+            mock_batch.dispose.assert_called_once()
+
     def test_save_as_with_invalid_batch_index(self):
 
         def execute_with_batch_index(index: int):
@@ -228,9 +244,12 @@ select * from t1;'''
         batch_save_as_mock = mock.MagicMock()
         self.query.batches[0].save_as = batch_save_as_mock
 
-        self.query.save_as(params, file_factory, on_success, on_error)
+        progress = mock.MagicMock()
+        executor = mock.MagicMock()
+
+        self.query.save_as(params, file_factory, on_success, on_error, progress, executor)
 
-        batch_save_as_mock.assert_called_once_with(params, file_factory, on_success, on_error)
+        batch_save_as_mock.assert_called_once_with(params, file_factory, on_success, on_error, progress, executor)
 
 
 def _tuple_from_selection_data(data: SelectionData):
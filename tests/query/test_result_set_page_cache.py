@@ -0,0 +1,101 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+from ossdbtoolsservice.query.contracts import DbCellValue
+from ossdbtoolsservice.query.result_set_page_cache import ResultSetPageCache, estimate_page_size
+
+
+class TestResultSetPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self._page = [[DbCellValue(index, False, index, index)] for index in range(2)]
+        self._page_size = estimate_page_size(self._page)
+        self._cache = ResultSetPageCache(max_size=self._page_size * 2)
+
+    def test_estimate_page_size(self):
+        # The size is estimated from the values of the cells, without converting them to display strings
+        small_page = [[DbCellValue(None, False, 'x', 0)]]
+        large_page = [[DbCellValue(None, False, 'x' * 100, 0)]]
+
+        self.assertGreater(estimate_page_size(large_page), estimate_page_size(small_page))
+        self.assertGreater(estimate_page_size([[DbCellValue(None, False, b'x' * 100, 0)]]), 100)
+
+        cell = DbCellValue(12345, False, 12345, 0)
+        estimate_page_size([[cell]])
+        self.assertEqual(cell._display_value, 12345)
+
+    def test_get_missing_page(self):
+        self.assertIsNone(self._cache.get('owner', 0))
+        self.assertEqual(self._cache.miss_count, 1)
+        self.assertEqual(self._cache.hit_count, 0)
+
+    def test_put_get(self):
+        self._cache.put('owner', 0, self._page, self._cache.get_generation('owner'))
+
+        self.assertIs(self._cache.get('owner', 0), self._page)
+        self.assertIsNone(self._cache.get('other owner', 0))
+        self.assertEqual(self._cache.hit_count, 1)
+        self.assertEqual(self._cache.miss_count, 1)
+        self.assertEqual(self._cache.size, self._page_size)
+
+    def test_least_recently_used_page_evicted(self):
+        self._cache.put('owner', 0, self._page, 0)
+        self._cache.put('other owner', 0, self._page, 0)
+
+        # The memory budget is shared by the owners: reading the first page makes the second one the least recently used
+        self._cache.get('owner', 0)
+        self._cache.put('owner', 1, self._page, 0)
+
+        self.assertEqual(self._cache.size, self._page_size * 2)
+        self.assertIsNotNone(self._cache.get('owner', 0))
+        self.assertIsNone(self._cache.get('other owner', 0))
+        self.assertIsNotNone(self._cache.get('owner', 1))
+
+    def test_page_over_budget_not_cached(self):
+        cache = ResultSetPageCache(max_size=self._page_size - 1)
+
+        cache.put('owner', 0, self._page, 0)
+
+        self.assertEqual(cache.size, 0)
+
+    def test_put_replaces_page(self):
+        self._cache.put('owner', 0, self._page, 0)
+        self._cache.put('owner', 0, self._page, 0)
+
+        self.assertEqual(self._cache.size, self._page_size)
+
+    def test_invalidate_from_page(self):
+        self._cache.put('owner', 0, self._page, 0)
+        self._cache.put('owner', 1, self._page, 0)
+
+        self._cache.invalidate('owner', 1)
+
+        self.assertIsNotNone(self._cache.get('owner', 0))
+        self.assertIsNone(self._cache.get('owner', 1))
+        self.assertEqual(self._cache.size, self._page_size)
+
+    def test_page_decoded_before_invalidation_not_cached(self):
+        generation = self._cache.get_generation('owner')
+
+        self._cache.invalidate('owner')
+        self._cache.put('owner', 0, self._page, generation)
+
+        self.assertIsNone(self._cache.get('owner', 0))
+
+    def test_remove_owner(self):
+        self._cache.put('owner', 0, self._page, 0)
+        self._cache.put('other owner', 0, self._page, 0)
+
+        self._cache.remove_owner('owner')
+
+        self.assertIsNone(self._cache.get('owner', 0))
+        self.assertIsNotNone(self._cache.get('other owner', 0))
+        self.assertEqual(self._cache.size, self._page_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.save_as_fan_out import FAN_OUT_QUEUE_SIZE, SaveAsFanOut, SaveAsTarget
+
+
+class RecordingWriter:
+    """ Writer recording the rows written to it, optionally failing or waiting on an event before each row """
+
+    def __init__(self, fail_on_row: int = None, wait_event: threading.Event = None, fail_on_complete: bool = False) -> None:
+        self.rows = []
+        self.is_complete = False
+        self.is_closed = False
+        self._fail_on_row = fail_on_row
+        self._wait_event = wait_event
+        self._fail_on_complete = fail_on_complete
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.is_closed = True
+
+    def write_row(self, row, columns):
+        if self._wait_event is not None:
+            self._wait_event.wait()
+
+        if self._fail_on_row is not None and len(self.rows) == self._fail_on_row:
+            raise IOError('Disk full')
+
+        self.rows.append(row)
+
+    def complete_write(self):
+        if self._fail_on_complete:
+            raise IOError('Disk full')
+
+        self.is_complete = True
+
+
+def create_target(file_path: str, writer: RecordingWriter) -> SaveAsTarget:
+    file_factory = mock.MagicMock()
+    file_factory.get_writer = mock.Mock(return_value=writer)
+    return SaveAsTarget('csv', file_path, file_factory)
+
+
+class TestSaveAsFanOut(unittest.TestCase):
+
+    def setUp(self):
+        self._rows = [[index] for index in range(2500)]
+        self._columns = []
+
+    def test_run_writes_all_targets(self):
+        writers = [RecordingWriter(), RecordingWriter()]
+        targets = [create_target('first', writers[0]), create_target('second', writers[1])]
+        on_progress = mock.Mock()
+
+        failures = SaveAsFanOut(targets, self._columns, len(self._rows), on_progress).run(iter(self._rows))
+
+        self.assertEqual(failures, {})
+
+        for target, writer in zip(targets, writers):
+            target.file_factory.get_writer.assert_called_once_with(target.file_path)
+            self.assertEqual(writer.rows, self._rows)
+            self.assertTrue(writer.is_complete)
+            self.assertTrue(writer.is_closed)
+
+            # Each target reports its completion
+            on_progress.assert_any_call(target, len(self._rows), len(self._rows), True, None)
+
+    def test_failed_writer_does_not_stop_other_targets(self):
+        failing_writer = RecordingWriter(fail_on_row=10)
+        writer = RecordingWriter()
+        targets = [create_target('failing', failing_writer), create_target('working', writer)]
+        on_progress = mock.Mock()
+
+        failures = SaveAsFanOut(targets, self._columns, len(self._rows), on_progress).run(iter(self._rows))
+
+        self.assertEqual(failures, {'failing': 'Disk full'})
+        self.assertFalse(failing_writer.is_complete)
+        self.assertTrue(failing_writer.is_closed)
+        self.assertEqual(writer.rows, self._rows)
+        self.assertTrue(writer.is_complete)
+        on_progress.assert_any_call(targets[0], 0, len(self._rows), True, 'Disk full')
+
+    def test_failed_complete_write_does_not_hang(self):
+        failing_writer = RecordingWriter(fail_on_complete=True)
+        writer = RecordingWriter()
+        targets = [create_target('failing', failing_writer), create_target('working', writer)]
+        on_progress = mock.Mock()
+        fan_out = SaveAsFanOut(targets, self._columns, len(self._rows), on_progress)
+        result = {}
+
+        thread = threading.Thread(target=lambda: result.update(failures=fan_out.run(iter(self._rows))), daemon=True)
+        thread.start()
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result['failures'], {'failing': 'Disk full'})
+        self.assertTrue(failing_writer.is_closed)
+        self.assertTrue(writer.is_complete)
+        on_progress.assert_any_call(targets[0], len(self._rows), len(self._rows), True, 'Disk full')
+
+    def test_failed_scan_fails_all_targets(self):
+        def rows():
+            yield [1]
+            raise IOError('Buffer file is corrupted')
+
+        writers = [RecordingWriter(), RecordingWriter()]
+        targets = [create_target('first', writers[0]), create_target('second', writers[1])]
+
+        failures = SaveAsFanOut(targets, self._columns, 2).run(rows())
+
+        self.assertEqual(failures, {'first': 'Buffer file is corrupted', 'second': 'Buffer file is corrupted'})
+        self.assertFalse(any(writer.is_complete for writer in writers))
+
+    def test_scan_waits_for_slowest_writer(self):
+        wait_event = threading.Event()
+        targets = [create_target('slow', RecordingWriter(wait_event=wait_event)), create_target('fast', RecordingWriter())]
+        scanned_rows = []
+
+        def rows():
+            for row in self._rows * 10:
+                scanned_rows.append(row)
+                yield row
+
+        with mock.patch('ossdbtoolsservice.query.save_as_fan_out.FAN_OUT_BATCH_SIZE', new=10):
+            fan_out_thread = threading.Thread(target=SaveAsFanOut(targets, self._columns, len(self._rows) * 10).run, args=(rows(),))
+            fan_out_thread.start()
+
+            fan_out_thread.join(0.5)
+            self.assertTrue(fan_out_thread.is_alive())
+
+            # The blocked writer holds a batch, its queue is full and the scan waits to put the next batch
+            self.assertLessEqual(len(scanned_rows), (FAN_OUT_QUEUE_SIZE + 2) * 10 + 1)
+
+            wait_event.set()
+            fan_out_thread.join()
+
+        self.assertEqual(len(scanned_rows), len(self._rows) * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
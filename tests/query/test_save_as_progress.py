@@ -0,0 +1,76 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.save_as_progress import SaveAsCanceledError, SaveAsProgress
+
+
+class TestSaveAsProgress(unittest.TestCase):
+
+    def setUp(self):
+        self._on_progress = mock.Mock()
+        self._progress = SaveAsProgress(self._on_progress)
+
+    def test_add_rows_reports_when_due(self):
+        with mock.patch('ossdbtoolsservice.query.save_as_progress.PROGRESS_INTERVAL', new=0):
+            self._progress.start('somepath', 10)
+            self._progress.add_rows(4)
+
+        self.assertEqual(self._progress.rows_written, 4)
+        self._on_progress.assert_called_once_with(self._progress)
+
+    def test_add_rows_does_not_report_before_interval(self):
+        with mock.patch('ossdbtoolsservice.query.save_as_progress.PROGRESS_INTERVAL', new=60):
+            self._progress.start('somepath', 10)
+            self._progress.add_rows(4)
+
+        self._on_progress.assert_not_called()
+
+    def test_add_rows_after_cancel(self):
+        self._progress.start('somepath', 10)
+        self._progress.cancel()
+
+        with self.assertRaises(SaveAsCanceledError):
+            self._progress.add_rows(1)
+
+        self.assertEqual(self._progress.rows_written, 0)
+
+    def test_throughput(self):
+        with mock.patch('ossdbtoolsservice.query.save_as_progress.time.monotonic', side_effect=[100, 102, 102]):
+            self._progress.start('somepath', 10)
+            self._progress.rows_written = 4
+
+            self.assertEqual(self._progress.rows_per_second, 2)
+            self.assertEqual(self._progress.remaining_time, 3)
+
+    def test_remaining_time_before_any_row(self):
+        self.assertIsNone(self._progress.remaining_time)
+        self.assertEqual(self._progress.rows_per_second, 0)
+
+    def test_complete_reports_bytes_written(self):
+        with tempfile.NamedTemporaryFile(delete=False) as file:
+            file.write(b'12345')
+
+        try:
+            self._progress.start(file.name, 1)
+            self.assertFalse(self._progress.wait(0))
+
+            self._progress.complete()
+        finally:
+            os.remove(file.name)
+
+        self.assertTrue(self._progress.wait(0))
+        self.assertTrue(self._progress.is_complete)
+        self.assertIsNone(self._progress.error_message)
+        self.assertEqual(self._progress.bytes_written, 5)
+        self._on_progress.assert_called_once_with(self._progress)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,21 +31,27 @@ from ossdbtoolsservice.query.contracts import (DbColumn, ResultSetSubset,
                                                SelectionData, SubsetResult)
 from ossdbtoolsservice.query.data_storage import (
     SaveAsCsvFileStreamFactory, SaveAsExcelFileStreamFactory,
-    SaveAsJsonFileStreamFactory)
+    SaveAsJsonFileStreamFactory, SaveAsNdjsonFileStreamFactory, SaveAsParquetFileStreamFactory, SaveAsArrowFileStreamFactory)
+from ossdbtoolsservice.query.hybrid_result_set import HybridResultSet
 from ossdbtoolsservice.query_execution.contracts import (
     BATCH_COMPLETE_NOTIFICATION, BATCH_START_NOTIFICATION,
     DEPLOY_BATCH_COMPLETE_NOTIFICATION, DEPLOY_BATCH_START_NOTIFICATION,
     DEPLOY_COMPLETE_NOTIFICATION, DEPLOY_MESSAGE_NOTIFICATION,
     MESSAGE_NOTIFICATION, QUERY_COMPLETE_NOTIFICATION,
-    RESULT_SET_COMPLETE_NOTIFICATION, ExecuteDocumentSelectionParams,
+    RESULT_SET_AVAILABLE_NOTIFICATION, RESULT_SET_COMPLETE_NOTIFICATION,
+    RESULT_SET_UPDATED_NOTIFICATION, ExecuteDocumentSelectionParams,
     ExecuteDocumentStatementParams, ExecuteRequestParamsBase,
     ExecuteStringParams, ExecutionPlanOptions, QueryCancelResult,
     QueryDisposeParams, SaveResultRequestResult, SaveResultsAsCsvRequestParams,
     SaveResultsAsExcelRequestParams, SaveResultsAsJsonRequestParams,
-    SimpleExecuteRequest, SubsetParams)
+    SaveResultsAsNdjsonRequestParams, SaveResultsAsMultiRequestParams, SaveResultsAsMultiTarget,
+    CANCEL_REQUEST, SAVE_AS_PROGRESS_NOTIFICATION, SimpleExecuteRequest, SubsetParams,
+    ExportQueryAsCsvRequestParams, ExportQueryResult, SaveResultsAsParquetRequestParams, SaveResultsAsArrowRequestParams)
 from ossdbtoolsservice.query_execution.query_execution_service import (
     NO_QUERY_MESSAGE, ExecuteRequestWorkerArgs, QueryExecutionService)
+from ossdbtoolsservice.tasks import Task, TaskStatus, TaskService
 from ossdbtoolsservice.utils import constants
+from ossdbtoolsservice.workspace import WorkspaceService
 from tests.integration import get_connection_details, integration_test
 from tests.pgsmo_tests.utils import MockPGServerConnection
 
@@ -69,7 +75,9 @@ class TestQueryService(unittest.TestCase):
         self.connection_service = ConnectionService()
         self.query_execution_service = QueryExecutionService()
         self.service_provider = ServiceProvider(None, {}, constants.PG_PROVIDER_NAME)
-        self.service_provider._services = {constants.CONNECTION_SERVICE_NAME: self.connection_service}
+        self.task_service = TaskService()
+        self.task_service.start_task = mock.Mock()
+        self.service_provider._services = {constants.CONNECTION_SERVICE_NAME: self.connection_service, constants.TASK_SERVICE_NAME: self.task_service}
         self.service_provider._is_initialized = True
         self.query_execution_service._service_provider = self.service_provider
         self.request_context = utils.MockRequestContext()
@@ -118,6 +126,9 @@ class TestQueryService(unittest.TestCase):
                 mock_call[1][0], IncomingMessageConfiguration)
             self.assertTrue(callable(mock_call[1][1]))
 
+        # ... The cancel request should be dispatched to a worker without waiting for the queued requests of its owner URI
+        mock_server_set_request.assert_any_call(CANCEL_REQUEST, service._handle_cancel_query_request, ordered=False)
+
     def test_get_query_full(self):
         """Test getting a query for a URI from the entire file"""
         # Set up the service and the query
@@ -643,6 +654,84 @@ class TestQueryService(unittest.TestCase):
         self.assertEqual(call_methods_list.count(BATCH_COMPLETE_NOTIFICATION), 1)
         self.assertEqual(call_methods_list.count(QUERY_COMPLETE_NOTIFICATION), 1)
 
+    def test_query_execution_reports_result_set_while_reading(self):
+        """Test that the result set is announced and updated before its rows are all read"""
+        params = get_execute_string_params()
+
+        columns_info = []
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=columns_info)):
+            with mock.patch.object(HybridResultSet, 'RESULT_SET_UPDATE_INTERVAL', new=0):
+                self.query_execution_service._handle_execute_query_request(self.request_context, params)
+                self.query_execution_service.owner_to_thread_map[params.owner_uri].join()
+
+        # Each row is reported while it is read: the first one makes the result set available, the others update it
+        call_methods_list = [call[1][0] for call in self.request_context.send_notification.mock_calls]
+        row_count = len(self.rows)
+        self.assertEqual(call_methods_list.count(RESULT_SET_AVAILABLE_NOTIFICATION), 1)
+        self.assertEqual(call_methods_list.count(RESULT_SET_UPDATED_NOTIFICATION), row_count - 1)
+        self.assertEqual(call_methods_list.count(RESULT_SET_COMPLETE_NOTIFICATION), 1)
+        self.assertLess(call_methods_list.index(RESULT_SET_AVAILABLE_NOTIFICATION), call_methods_list.index(RESULT_SET_COMPLETE_NOTIFICATION))
+
+        available_params = self.request_context.send_notification.mock_calls[call_methods_list.index(RESULT_SET_AVAILABLE_NOTIFICATION)][1][1]
+        complete_params = self.request_context.send_notification.mock_calls[call_methods_list.index(RESULT_SET_COMPLETE_NOTIFICATION)][1][1]
+        self.assertFalse(available_params.result_set_summary.complete)
+        self.assertTrue(complete_params.result_set_summary.complete)
+        self.assertEqual(complete_params.result_set_summary.row_count, row_count)
+
+    def test_query_execution_spills_results_over_memory_budget(self):
+        """Test that results over the configured memory budget are moved to a buffer file"""
+        workspace_service = WorkspaceService()
+        workspace_service.configuration.sql.query.result_set_memory_budget = 0
+        self.service_provider._services[constants.WORKSPACE_SERVICE_NAME] = workspace_service
+        params = get_execute_string_params()
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=[])):
+            self.query_execution_service._handle_execute_query_request(self.request_context, params)
+            self.query_execution_service.owner_to_thread_map[params.owner_uri].join()
+
+        result_set = self.query_execution_service.query_results[params.owner_uri].batches[0].result_set
+        self.assertTrue(result_set.is_spilled)
+        self.assertEqual(result_set.row_count, len(self.rows))
+
+    def test_query_execution_spills_results_over_memory_row_count(self):
+        """Test that results over the configured memory row count are moved to a buffer file"""
+        workspace_service = WorkspaceService()
+        workspace_service.configuration.sql.query.result_set_memory_row_count = 1
+        self.service_provider._services[constants.WORKSPACE_SERVICE_NAME] = workspace_service
+        params = get_execute_string_params()
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=[])):
+            self.query_execution_service._handle_execute_query_request(self.request_context, params)
+            self.query_execution_service.owner_to_thread_map[params.owner_uri].join()
+
+        result_set = self.query_execution_service.query_results[params.owner_uri].batches[0].result_set
+        self.assertTrue(result_set.is_spilled)
+        self.assertEqual(result_set.row_count, len(self.rows))
+
+    def test_query_execution_fetch_batch_size(self):
+        """Test that query results are fetched in batches of the configured size"""
+        workspace_service = WorkspaceService()
+        workspace_service.configuration.sql.query.fetch_batch_size = 1
+        self.service_provider._services[constants.WORKSPACE_SERVICE_NAME] = workspace_service
+        params = get_execute_string_params()
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=[])):
+            self.query_execution_service._handle_execute_query_request(self.request_context, params)
+            self.query_execution_service.owner_to_thread_map[params.owner_uri].join()
+
+        self.cursor.fetchmany.assert_called_with(1)
+        self.assertEqual(self.cursor.fetchmany.call_count, len(self.rows) + 1)
+
+    def test_query_execution_default_fetch_batch_size(self):
+        """Test that query results are fetched in batches of the default size when there is no workspace configuration"""
+        params = get_execute_string_params()
+
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=[])):
+            self.query_execution_service._handle_execute_query_request(self.request_context, params)
+            self.query_execution_service.owner_to_thread_map[params.owner_uri].join()
+
+        self.cursor.fetchmany.assert_called_with(constants.DEFAULT_FETCH_BATCH_SIZE)
+
     def test_deploy_execution(self):
         """Test that deploy sends the proper response/notices to the client"""
         # Set up params that are sent as part of a query execution request
@@ -814,6 +903,20 @@ class TestQueryService(unittest.TestCase):
         self.request_context.send_error.assert_not_called()
         self.cursor_cancel.execute.assert_not_called()
 
+    def test_query_disposal_disposes_query(self):
+        """Test that handling a query/dispose request releases the results held by the query"""
+        uri = 'test_uri'
+        query = mock.MagicMock()
+        query.execution_state = ExecutionState.EXECUTED
+        self.query_execution_service.query_results[uri] = query
+        params = QueryDisposeParams()
+        params.owner_uri = uri
+
+        self.query_execution_service._handle_dispose_request(self.request_context, params)
+
+        query.dispose.assert_called_once()
+        self.assertTrue(uri not in self.query_execution_service.query_results)
+
     def test_query_disposal_failure(self):
         """Test for handling query/dispose request in case where disposal is not possible"""
         # Note that query_results[uri] is never populated
@@ -1079,6 +1182,76 @@ class TestQueryService(unittest.TestCase):
 
         self.assertEqual('Failed to save File.csv: Something went wrong', self.request_context.last_error_message)
 
+    def test_handle_save_as_request_starts_task(self):
+
+        request_params = SaveResultsAsCsvRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.file_path = os.path.join('SomeFolder', 'File.csv')
+
+        mock_query = mock.MagicMock()
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_csv_request(self.request_context, request_params)
+
+        # The save is followed by a task, which reports the progress of the save
+        task: Task = self.task_service.start_task.call_args[0][0]
+        progress = mock_query.save_as.call_args[0][4]
+        self.assertEqual(task.description, 'File: File.csv')
+
+        task.status = TaskStatus.IN_PROGRESS
+        progress.start(request_params.file_path, 10)
+        progress.add_rows(4)
+        progress._report()
+
+        progress_params = self.request_context.last_notification_params
+        self.assertEqual(self.request_context.last_notification_method, 'tasks/statuschanged')
+        self.assertTrue(progress_params['message'].startswith('4 of 10 rows saved'))
+
+        progress.complete()
+        self.assertEqual(self.request_context.last_notification_method, SAVE_AS_PROGRESS_NOTIFICATION)
+        self.assertEqual(self.request_context.last_notification_params.format, 'csv')
+        self.assertEqual(self.request_context.last_notification_params.rows_written, 4)
+        self.assertTrue(self.request_context.last_notification_params.is_complete)
+
+        self.assertIs(task._action(task).status, TaskStatus.SUCCEEDED)
+
+    def test_canceled_save_as_task(self):
+
+        request_params = SaveResultsAsCsvRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.file_path = 'File.csv'
+
+        mock_query = mock.MagicMock()
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_csv_request(self.request_context, request_params)
+
+        task: Task = self.task_service.start_task.call_args[0][0]
+        progress = mock_query.save_as.call_args[0][4]
+
+        # A task canceled before it waits for the save cancels the save
+        task.canceled = True
+        progress.complete('The save was canceled')
+
+        self.assertIs(task._action(task).status, TaskStatus.CANCELED)
+        self.assertTrue(progress.is_canceled)
+        self.assertEqual(task.on_cancel, progress.cancel)
+
+    def test_handle_save_as_request_that_cannot_start(self):
+
+        request_params = SaveResultsAsCsvRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.file_path = 'File.csv'
+
+        mock_query = mock.MagicMock()
+        mock_query.save_as = mock.Mock(side_effect=RuntimeError('A save request to the same path is in progress'))
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_csv_request(self.request_context, request_params)
+
+        self.task_service.start_task.assert_not_called()
+        self.assertEqual('Failed to save File.csv: A save request to the same path is in progress', self.request_context.last_error_message)
+
     def test_handle_save_as_json_request(self):
 
         request_params = SaveResultsAsJsonRequestParams()
@@ -1098,6 +1271,142 @@ class TestQueryService(unittest.TestCase):
 
         self.assertIsInstance(save_as_args[1], SaveAsJsonFileStreamFactory)
 
+    def test_handle_save_as_ndjson_request(self):
+
+        request_params = SaveResultsAsNdjsonRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.file_path = r'C:\SomeFolder\File.ndjson'
+
+        mock_query = mock.MagicMock()
+
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_ndjson_request(self.request_context, request_params)
+
+        save_as_args = mock_query.save_as.call_args_list[0][0]
+
+        self.assertEqual(request_params.owner_uri, save_as_args[0].owner_uri)
+        self.assertIsInstance(save_as_args[0], SaveResultsAsNdjsonRequestParams)
+
+        self.assertIsInstance(save_as_args[1], SaveAsNdjsonFileStreamFactory)
+
+    def test_handle_save_as_multi_request(self):
+
+        csv_target = SaveResultsAsMultiTarget()
+        csv_target.format = 'csv'
+        csv_target.file_path = r'C:\SomeFolder\File.csv'
+        csv_target.include_headers = True
+        csv_target.delimiter = ';'
+
+        json_target = SaveResultsAsMultiTarget()
+        json_target.format = 'json'
+        json_target.file_path = r'C:\SomeFolder\File.json'
+
+        request_params = SaveResultsAsMultiRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.batch_index = 0
+        request_params.column_start_index = 1
+        request_params.targets = [csv_target, json_target]
+
+        mock_query = mock.MagicMock()
+
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_multi_request(self.request_context, request_params)
+
+        save_as_args = mock_query.save_as_multi.call_args_list[0][0]
+        targets = save_as_args[1]
+
+        self.assertIs(request_params, save_as_args[0])
+        self.assertEqual([target.file_path for target in targets], [csv_target.file_path, json_target.file_path])
+        self.assertIsInstance(targets[0].file_factory, SaveAsCsvFileStreamFactory)
+        self.assertIsInstance(targets[1].file_factory, SaveAsJsonFileStreamFactory)
+
+        # Each file factory gets the rows and columns of the request and the options of its target
+        csv_params = targets[0].file_factory._params
+        self.assertIsInstance(csv_params, SaveResultsAsCsvRequestParams)
+        self.assertEqual(csv_params.file_path, csv_target.file_path)
+        self.assertEqual(csv_params.column_start_index, 1)
+        self.assertEqual(csv_params.delimiter, ';')
+        self.assertTrue(csv_params.include_headers)
+
+        # Progress is notified by file, and the response is sent once all the files are saved
+        save_as_args[2](targets[0], 10, 20, False, None)
+
+        self.assertEqual(self.request_context.last_notification_method, SAVE_AS_PROGRESS_NOTIFICATION)
+        self.assertEqual(self.request_context.last_notification_params.format, 'csv')
+        self.assertEqual(self.request_context.last_notification_params.rows_written, 10)
+
+        save_as_args[3]({})
+        self.assertIsInstance(self.request_context.last_response_params, SaveResultRequestResult)
+
+        save_as_args[3]({json_target.file_path: 'Disk full'})
+        self.assertEqual('Failed to save File.json: Disk full', self.request_context.last_error_message)
+
+    def test_handle_save_as_multi_request_with_unknown_format(self):
+
+        target = SaveResultsAsMultiTarget()
+        target.format = 'pdf'
+        target.file_path = 'File.pdf'
+
+        request_params = SaveResultsAsMultiRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.targets = [target]
+
+        mock_query = mock.MagicMock()
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_multi_request(self.request_context, request_params)
+
+        mock_query.save_as_multi.assert_not_called()
+        self.assertEqual('Failed to save results: Unsupported save format: pdf', self.request_context.last_error_message)
+
+    def test_export_query_as_csv(self):
+        request_params = ExportQueryAsCsvRequestParams()
+        request_params.owner_uri = 'test_uri'
+        request_params.query = 'SELECT * FROM t'
+        request_params.file_path = r'C:\SomeFolder\File.csv'
+
+        connection_info = ConnectionInfo('test_connection_url', ConnectionDetails.from_data({}))
+        self.connection_service.get_connection_info = mock.Mock(return_value=connection_info)
+        self.connection_service.connect = mock.Mock()
+        self.connection_service.disconnect = mock.Mock()
+        mock_export = mock.Mock(return_value=5)
+
+        with mock.patch('ossdbtoolsservice.query_execution.query_execution_service.export_query_as_csv', new=mock_export):
+            self.query_execution_service._export_query_as_csv(self.request_context, request_params)
+
+        # The export runs on a connection of its own, which is closed once the file is written
+        connect_params = self.connection_service.connect.call_args[0][0]
+        self.assertNotEqual(connect_params.owner_uri, request_params.owner_uri)
+        self.assertEqual(connect_params.type, ConnectionType.QUERY)
+
+        export_args = mock_export.call_args[0]
+        self.assertIs(export_args[0], self.connection)
+        self.assertEqual(export_args[1:4], (request_params.query, request_params.file_path, request_params))
+
+        self.assertIsInstance(self.request_context.last_response_params, ExportQueryResult)
+        self.assertEqual(self.request_context.last_response_params.row_count, 5)
+        self.connection_service.disconnect.assert_called_once_with(connect_params.owner_uri, ConnectionType.QUERY)
+
+    def test_export_query_as_csv_failure(self):
+        request_params = ExportQueryAsCsvRequestParams()
+        request_params.owner_uri = 'test_uri'
+        request_params.query = 'SELECT * FROM t'
+        request_params.file_path = 'File.csv'
+
+        connection_info = ConnectionInfo('test_connection_url', ConnectionDetails.from_data({}))
+        self.connection_service.get_connection_info = mock.Mock(return_value=connection_info)
+        self.connection_service.connect = mock.Mock()
+        self.connection_service.disconnect = mock.Mock()
+
+        with mock.patch('ossdbtoolsservice.query_execution.query_execution_service.export_query_as_csv', new=mock.Mock(side_effect=IOError('Disk full'))):
+            self.query_execution_service._export_query_as_csv(self.request_context, request_params)
+
+        self.assertIsNone(self.request_context.last_response_params)
+        self.assertEqual(self.request_context.last_error_message, 'Failed to export File.csv: Disk full')
+        self.connection_service.disconnect.assert_called_once()
+
     def test_handle_save_as_excel_request(self):
 
         request_params = SaveResultsAsExcelRequestParams()
@@ -1117,6 +1426,44 @@ class TestQueryService(unittest.TestCase):
 
         self.assertIsInstance(save_as_args[1], SaveAsExcelFileStreamFactory)
 
+    def test_handle_save_as_parquet_request(self):
+
+        request_params = SaveResultsAsParquetRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.file_path = r'C:\SomeFolder\File.parquet'
+
+        mock_query = mock.MagicMock()
+
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_parquet_request(self.request_context, request_params)
+
+        save_as_args = mock_query.save_as.call_args_list[0][0]
+
+        self.assertEqual(request_params.owner_uri, save_as_args[0].owner_uri)
+        self.assertIsInstance(save_as_args[0], SaveResultsAsParquetRequestParams)
+
+        self.assertIsInstance(save_as_args[1], SaveAsParquetFileStreamFactory)
+
+    def test_handle_save_as_arrow_request(self):
+
+        request_params = SaveResultsAsArrowRequestParams()
+        request_params.owner_uri = 'testOwner_uri'
+        request_params.file_path = r'C:\SomeFolder\File.arrow'
+
+        mock_query = mock.MagicMock()
+
+        self.query_execution_service.query_results[request_params.owner_uri] = mock_query
+
+        self.query_execution_service._handle_save_as_arrow_request(self.request_context, request_params)
+
+        save_as_args = mock_query.save_as.call_args_list[0][0]
+
+        self.assertEqual(request_params.owner_uri, save_as_args[0].owner_uri)
+        self.assertIsInstance(save_as_args[0], SaveResultsAsArrowRequestParams)
+
+        self.assertIsInstance(save_as_args[1], SaveAsArrowFileStreamFactory)
+
     @integration_test
     def test_query_execution_and_retrieval(self):
         """Perform an end-to-end test of query execution"""
@@ -0,0 +1,89 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ossdbtoolsservice.query.contracts import DbColumn
+from ossdbtoolsservice.query_execution.contracts import ExportQueryAsCsvRequestParams
+from ossdbtoolsservice.query_execution.query_export import export_query_as_csv
+import tests.utils as utils
+
+
+class TestQueryExport(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(tempfile.mkdtemp(), 'export.csv')
+
+        self.params = ExportQueryAsCsvRequestParams()
+        self.params.include_headers = True
+
+        id_column = DbColumn()
+        id_column.column_name = 'id'
+        text_column = DbColumn()
+        text_column.column_name = 'text'
+        self.columns_info = [id_column, text_column]
+
+        self.cursor = utils.MockCursor([(1, 'Text 1'), (2, None)])
+        self.connection = mock.MagicMock()
+        self.connection.cursor = mock.Mock(return_value=self.cursor)
+
+    def tearDown(self):
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_export_with_copy(self):
+        def copy_query_to(query, stream, *args):
+            stream.write('id,text\n1,Text 1\n')
+            return 1
+
+        self.connection.supports_copy_to = True
+        self.connection.copy_query_to = mock.Mock(side_effect=copy_query_to)
+
+        row_count = export_query_as_csv(self.connection, 'SELECT 1', self.file_path, self.params)
+
+        # The server writes the file, with the defaults of the CSV format of save as
+        self.assertEqual(row_count, 1)
+        self.connection.copy_query_to.assert_called_once_with('SELECT 1', mock.ANY, ',', '"', 'NULL', False, True)
+        self.connection.cursor.assert_not_called()
+
+        with io.open(self.file_path, encoding='utf-8', newline='') as file:
+            self.assertEqual(file.read(), 'id,text\n1,Text 1\n')
+
+    def test_export_without_copy_support(self):
+        self.connection.supports_copy_to = False
+
+        row_count = self._export_cursor_rows()
+
+        self.assertEqual(row_count, 2)
+        self.connection.copy_query_to.assert_not_called()
+        self.cursor.execute.assert_called_once_with('SELECT 1')
+        self.cursor.close.assert_called_once()
+
+        with io.open(self.file_path, encoding='utf-8', newline='') as file:
+            self.assertEqual(file.read(), 'id,text\n1,Text 1\n2,NULL\n')
+
+    def test_export_with_line_separator_not_written_by_copy(self):
+        self.connection.supports_copy_to = True
+        self.params.line_seperator = '\r\n'
+
+        row_count = self._export_cursor_rows()
+
+        self.assertEqual(row_count, 2)
+        self.connection.copy_query_to.assert_not_called()
+
+        with io.open(self.file_path, encoding='utf-8', newline='') as file:
+            self.assertEqual(file.read(), 'id,text\r\n1,Text 1\r\n2,NULL\r\n')
+
+    def _export_cursor_rows(self) -> int:
+        with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=self.columns_info)):
+            return export_query_as_csv(self.connection, 'SELECT 1', self.file_path, self.params)
+
+
+if __name__ == '__main__':
+    unittest.main()
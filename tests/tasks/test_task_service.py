@@ -37,7 +37,10 @@ class TaskServiceTests(unittest.TestCase):
 
         # Then CANCEL_TASK_REQUEST and LIST_TASKS_REQUEST should have been registered
         self.service_provider.server.set_request_handler.assert_has_calls(
-            [mock.call(CANCEL_TASK_REQUEST, self.task_service.handle_cancel_request), mock.call(LIST_TASKS_REQUEST, self.task_service.handle_list_request)],
+            [
+                mock.call(CANCEL_TASK_REQUEST, self.task_service.handle_cancel_request, inline=True),
+                mock.call(LIST_TASKS_REQUEST, self.task_service.handle_list_request)
+            ],
             any_order=True)
 
     def test_start_task(self):
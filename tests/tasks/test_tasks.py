@@ -119,6 +119,32 @@ class TestTasks(unittest.TestCase):
         task.on_cancel.assert_called_once()
         self.assertTrue(task.canceled)
 
+    def test_report_progress(self):
+        """Test that reporting the progress of a running task sends a status notification that keeps its status"""
+        # Set up a task that is in progress
+        task = self.create_task()
+        task.status = TaskStatus.IN_PROGRESS
+
+        # If I report its progress
+        task.report_progress('50% done')
+
+        # Then the task keeps its status and sends a tasks/statuschanged notification with the message
+        self.assertIs(task.status, TaskStatus.IN_PROGRESS)
+        self.assertEqual(task.status_message, '50% done')
+        self.assertEqual(self.request_context.last_notification_method, 'tasks/statuschanged')
+        self.assertEqual(self.request_context.last_notification_params['status'], TaskStatus.IN_PROGRESS)
+        self.assertEqual(self.request_context.last_notification_params['message'], '50% done')
+
+    def test_report_progress_not_in_progress(self):
+        """Test that reporting the progress of a task that is not running does nothing"""
+        task = self.create_task()
+
+        task.report_progress('50% done')
+
+        self.assertIs(task.status, TaskStatus.NOT_STARTED)
+        self.assertIsNone(task.status_message)
+        self.assertEqual(self.request_context.last_notification_method, 'tasks/newtaskcreated')
+
     def test_cancel_not_in_progress(self):
         """Test that canceling a task that is not in progress does not succeed"""
         # Set up the task with a cancellation callback
@@ -5,9 +5,12 @@
 
 """Test utils.py"""
 
+import datetime
 import enum
+import json
 from typing import Optional
 import unittest
+from unittest import mock
 
 import ossdbtoolsservice.utils as utils
 from ossdbtoolsservice.serialization import Serializable
@@ -26,6 +29,75 @@ class TestUtils(unittest.TestCase):
         converted_dict = utils.serialization.convert_to_dict(test_object)
         self.assertEqual(converted_dict, test_object.expected_dict())
 
+    def test_convert_to_dict_registered_serializer(self):
+        """Test that objects of a registered type are converted by their serializer instead of by attribute reflection"""
+        utils.serialization.register_serializer(_SlotsTestClass, lambda obj: {'value': obj.value, 'custom': True})
+        test_object = _NestedTestClass()
+        test_object.test_string = _SlotsTestClass()
+
+        converted_dict = utils.serialization.convert_to_dict(test_object)
+
+        self.assertEqual(converted_dict, {'testInt': 1, 'testString': {'value': 5, 'custom': True}})
+
+    def test_convert_to_dict_unserializable_values(self):
+        """Test that values json cannot encode, and dictionary keys of basic types, are converted as json would"""
+        converted_dict = utils.serialization.convert_to_dict({
+            'date': datetime.date(2020, 1, 1),
+            'objects': [object()],
+            1: (_TestEnum.FIRST_OPTION, 2.5),
+            None: True
+        })
+
+        self.assertEqual(converted_dict, {'date': None, 'objects': [None], '1': [1, 2.5], 'null': True})
+
+    def test_convert_to_dict_caches_camel_case_names(self):
+        """Test that the camelCase names of the attributes of a class are computed once"""
+        utils.serialization.convert_to_dict(_NestedTestClass())
+
+        with mock.patch('ossdbtoolsservice.utils.serialization.inflection.camelize') as camelize:
+            converted_dict = utils.serialization.convert_to_dict([_NestedTestClass(), _NestedTestClass()])
+
+        camelize.assert_not_called()
+        self.assertEqual(converted_dict, [_NestedTestClass().expected_dict()] * 2)
+
+    def test_encode_json(self):
+        """Test that json-ready objects are encoded to compact UTF-8 JSON, with or without orjson"""
+        obj = {'text': 'caf\u00e9', 'list': [1, None, True], 'nested': {'float': 1.5}}
+
+        for backend in [utils.serialization.orjson, None]:
+            with mock.patch('ossdbtoolsservice.utils.serialization.orjson', new=backend):
+                encoded = utils.serialization.encode_json(obj)
+
+            self.assertEqual(json.loads(encoded.decode('utf-8')), obj)
+            self.assertNotIn(b' ', encoded)
+
+    def test_encode_json_large_integer(self):
+        """Test that integers orjson does not support are encoded by json"""
+        encoded = utils.serialization.encode_json({'value': 2 ** 100})
+
+        self.assertEqual(json.loads(encoded.decode('utf-8')), {'value': 2 ** 100})
+
+    def test_decode_json(self):
+        """Test that JSON is decoded from a view of a buffer, with or without orjson"""
+        buffer = bytearray(b'xx{"text": "caf\xc3\xa9", "list": [1, null]}xx')
+
+        for backend in [utils.serialization.orjson, None]:
+            with mock.patch('ossdbtoolsservice.utils.serialization.orjson', new=backend):
+                decoded = utils.serialization.decode_json(memoryview(buffer)[2:-2])
+
+            self.assertEqual(decoded, {'text': 'caf\u00e9', 'list': [1, None]})
+
+    def test_decode_json_other_encoding(self):
+        """Test that JSON in an encoding other than UTF-8 is decoded"""
+        decoded = utils.serialization.decode_json('{"text": "caf\u00e9"}'.encode('utf-16-le'), 'utf-16-le')
+
+        self.assertEqual(decoded, {'text': 'caf\u00e9'})
+
+    def test_decode_json_invalid(self):
+        """Test that invalid JSON raises a ValueError"""
+        with self.assertRaises(ValueError):
+            utils.serialization.decode_json(b'abcdefghij')
+
     def test_convert_from_dict(self):
         """
         Test that the convert_from_dict function creates the proper object representation of a complex object
@@ -90,6 +162,14 @@ class _NestedTestClass(Serializable):
         }
 
 
+class _SlotsTestClass:
+    """Test class without an instance dictionary, converted through a registered serializer"""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 5
+
+
 class _TestEnum(enum.Enum):
     """Test enum to be included in the _ConversionTestClass to ensure enum conversion works"""
     FIRST_OPTION = 1
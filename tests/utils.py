@@ -152,6 +152,7 @@ class MockCursor:
         self.execute = mock.Mock(side_effect=self.execute_success_side_effects)
         self.fetchall = mock.Mock(return_value=query_results)
         self.fetchone = mock.Mock(side_effect=self.execute_fetch_one_side_effects)
+        self.fetchmany = mock.Mock(side_effect=self.execute_fetch_many_side_effects)
         self.close = mock.Mock()
         self.connection = connection
         self.description = [self.create_column_description(name=name) for name in columns_names]
@@ -188,6 +189,11 @@ class MockCursor:
             self._fetched_count += 1
             return row
 
+    def execute_fetch_many_side_effects(self, size=1):
+        rows = self._query_results[self._fetched_count:self._fetched_count + size]
+        self._fetched_count += len(rows)
+        return rows
+
     def create_column_description(self, **kwargs):
         description = {
             'name': None,
@@ -225,3 +231,17 @@ class MockThread():
         self.args = args
         self.start = mock.Mock(side_effect=lambda: self.target(*self.args))
         return self
+
+
+def read_rows_from_buffer_file(test_case: unittest.TestCase, columns_info: list, rows: list, hybrid: bool = False) -> list:
+    """Writes the rows of the driver to the buffer file of a result set and returns the rows read back from it"""
+    from ossdbtoolsservice.query.file_storage_result_set import FileStorageResultSet
+    from ossdbtoolsservice.query.hybrid_result_set import HybridResultSet
+
+    with mock.patch('ossdbtoolsservice.query.data_storage.storage_data_reader.get_columns_info', new=mock.Mock(return_value=columns_info)):
+        # A hybrid result set within its memory budget keeps the rows in memory, decoded as the file storage decodes them
+        result_set = HybridResultSet(1, 1, memory_budget=1024 * 1024) if hybrid else FileStorageResultSet(1, 1)
+        result_set.read_result_to_end(MockCursor(rows))
+
+    test_case.addCleanup(result_set.dispose)
+    return [result_set.get_row(row_id) for row_id in range(result_set.row_count)]
@@ -22,7 +22,9 @@ from ossdbtoolsservice.workspace.contracts import (
     Position,
     Range
 )
-from ossdbtoolsservice.utils.constants import PG_PROVIDER_NAME
+from ossdbtoolsservice.utils.constants import (
+    DEFAULT_FETCH_BATCH_SIZE, DEFAULT_RESULT_SET_MEMORY_BUDGET, DEFAULT_RESULT_SET_MEMORY_ROW_COUNT, PG_PROVIDER_NAME
+)
 import tests.utils as utils
 
 
@@ -116,6 +118,16 @@ class TestWorkspaceService(unittest.TestCase):
         self.assertFalse(format_options.strip_comments)
         self.assertTrue(format_options.reindent)
 
+    def test_query_config_defaults(self):
+        # Setup: Create a workspace service
+        ws: WorkspaceService = WorkspaceService()
+
+        # Then: The config should have sensible default values
+        self.assertEqual(ws.configuration.sql.query.fetch_batch_size, DEFAULT_FETCH_BATCH_SIZE)
+        self.assertEqual(ws.configuration.sql.query.result_set_memory_budget, DEFAULT_RESULT_SET_MEMORY_BUDGET)
+        self.assertEqual(ws.configuration.sql.query.result_set_memory_row_count, DEFAULT_RESULT_SET_MEMORY_ROW_COUNT)
+        self.assertFalse(ws.configuration.sql.query.compress_result_buffers)
+
     def test_handle_did_change_config(self):
         # Setup: Create a workspace service with two mock config change handlers
         ws: WorkspaceService = WorkspaceService()
@@ -129,6 +141,9 @@ class TestWorkspaceService(unittest.TestCase):
                 'sql': {
                     'intellisense': {
                         'enable_intellisense': False
+                    },
+                    'query': {
+                        'fetch_batch_size': 500
                     }
                 },
                 'pgsql': {
@@ -153,6 +168,7 @@ class TestWorkspaceService(unittest.TestCase):
         self.assertEqual(ws.configuration.pgsql.format.identifier_case, 'lower')
         self.assertTrue(ws.configuration.pgsql.format.strip_comments)
         self.assertFalse(ws.configuration.pgsql.format.reindent)
+        self.assertEqual(ws.configuration.sql.query.fetch_batch_size, 500)
         # ... And default values that weren't specified in the notification are preserved
         self.assertTrue(ws.configuration.sql.intellisense.enable_suggestions)
 